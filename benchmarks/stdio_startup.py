@@ -0,0 +1,71 @@
+# benchmarks/stdio_startup.py
+"""
+Startup-time benchmark for the MCP stdio transport.
+
+Spawns `python -m mcp_pdb.stdio_server` repeatedly, sends an `initialize`
+request and measures wall time from process spawn to the first response line.
+Target: median well under 200 ms on a developer laptop.
+
+Run with:  python benchmarks/stdio_startup.py [runs]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+TARGET_MS = 200.0
+HEAVY_MODULES = ("fastapi", "uvicorn", "pydantic", "httpx")
+
+INITIALIZE = json.dumps({"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}}) + "\n"
+PROBE = (
+    "import sys, json; from mcp_pdb.stdio_server import StdioServer; "
+    "StdioServer().handle_message({'jsonrpc': '2.0', 'id': 1, 'method': 'tools/list'}); "
+    f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+)
+
+
+def time_first_response() -> float:
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "mcp_pdb.stdio_server"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    proc.stdin.write(INITIALIZE)
+    proc.stdin.flush()
+    line = proc.stdout.readline()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    proc.stdin.close()
+    proc.wait()
+    if not line:
+        raise RuntimeError("stdio server exited without responding")
+    return elapsed_ms
+
+
+def main(runs: int = 20) -> None:
+    # Baseline: bare interpreter startup, which no amount of lazy importing can remove.
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    interpreter_ms = (time.perf_counter() - start) * 1000
+
+    samples = sorted(time_first_response() for _ in range(runs))
+    median = statistics.median(samples)
+    p95 = samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))]
+
+    loaded = subprocess.run([sys.executable, "-c", PROBE], check=True, capture_output=True, text=True).stdout.strip()
+
+    print(f"runs: {runs}")
+    print(f"bare interpreter:         {interpreter_ms:7.1f} ms")
+    print(f"first response (median):  {median:7.1f} ms")
+    print(f"first response (p95):     {p95:7.1f} ms")
+    print(f"target:                   {TARGET_MS:7.1f} ms -> {'OK' if median < TARGET_MS else 'OVER'}")
+    print(f"heavy modules loaded before first tool call: {loaded}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,229 @@
+# mcp_pdb/adapter/admission.py
+"""
+mcp_pdb.adapter.admission
+~~~~~~~~~~~~~~~~~~~~~~~~~
+Admission control in front of upstream calls.
+
+`FairScheduler` caps in-flight upstream calls and the queue behind them.
+Queued calls are dispatched by start-time fair queueing over flows of
+(client, priority): each flow's share is proportional to its weight (client
+weight × `ADMISSION_INTERACTIVE_WEIGHT` for interactive work), so a bulk job
+cannot starve interactive agent calls and no client can monopolise the queue.
+Work that would exceed the queue caps, or wait longer than
+`ADMISSION_MAX_QUEUE_WAIT_SECONDS`, is shed immediately with OverloadedError.
+
+The calling client and priority travel in a context variable
+(`admission_context`), set per HTTP request by the FastAPI middleware.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from mcp_pdb.config import (
+    ADMISSION_CLIENT_WEIGHTS,
+    ADMISSION_INTERACTIVE_WEIGHT,
+    ADMISSION_MAX_IN_FLIGHT,
+    ADMISSION_MAX_QUEUE_WAIT_SECONDS,
+    ADMISSION_MAX_QUEUED,
+    ADMISSION_MAX_QUEUED_PER_CLIENT,
+)
+from mcp_pdb.exceptions import OverloadedError
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+PRIORITIES = (INTERACTIVE, BULK)
+ANONYMOUS = "anonymous"
+
+_current: contextvars.ContextVar[Tuple[str, str]] = contextvars.ContextVar("admission_client", default=(ANONYMOUS, INTERACTIVE))
+
+
+@contextmanager
+def admission_context(client_id: Optional[str], priority: str = INTERACTIVE) -> Iterator[None]:
+    """Attributes upstream calls made inside the block to `client_id` at `priority`."""
+    if priority not in PRIORITIES:
+        raise ValueError(f"priority must be one of {PRIORITIES}")
+    token = _current.set((client_id or ANONYMOUS, priority))
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def current_client() -> Tuple[str, str]:
+    """(client ID, priority) of the calling context."""
+    return _current.get()
+
+
+def parse_client_weights(spec: str) -> Dict[str, float]:
+    """`"key-a=4,key-b=0.5"` -> {"key-a": 4.0, "key-b": 0.5}; malformed items are ignored."""
+    weights = {}
+    for item in spec.split(","):
+        name, _, value = item.partition("=")
+        try:
+            weight = float(value)
+        except ValueError:
+            continue
+        if name.strip() and weight > 0:
+            weights[name.strip()] = weight
+    return weights
+
+
+@dataclass(order=True)
+class _Waiter:
+    tag: float  # Virtual finish time
+    seq: int
+    start: float = field(compare=False)  # Virtual start time
+    client_id: str = field(compare=False)
+    future: "asyncio.Future[None]" = field(compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+class FairScheduler:
+    def __init__(
+        self,
+        max_in_flight: int = ADMISSION_MAX_IN_FLIGHT,
+        max_queued: int = ADMISSION_MAX_QUEUED,
+        max_queued_per_client: int = ADMISSION_MAX_QUEUED_PER_CLIENT,
+        interactive_weight: float = ADMISSION_INTERACTIVE_WEIGHT,
+        client_weights: Optional[Dict[str, float]] = None,
+        max_queue_wait: float = ADMISSION_MAX_QUEUE_WAIT_SECONDS,
+    ):
+        if max_in_flight < 1 or max_queued < 0:
+            raise ValueError("max_in_flight must be at least 1 and max_queued non-negative")
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.max_queued_per_client = max_queued_per_client
+        self.interactive_weight = interactive_weight
+        self.client_weights = parse_client_weights(ADMISSION_CLIENT_WEIGHTS) if client_weights is None else client_weights
+        self.max_queue_wait = max_queue_wait
+
+        self._heap: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._virtual_time = 0.0
+        self._last_tag: Dict[Tuple[str, str], float] = {}
+        self._in_flight = 0
+        self._queued = 0
+        self._queued_per_client: Dict[str, int] = {}
+        self._service_time = 0.1  # EWMA of seconds per call, for wait estimates
+        self.admitted = {priority: 0 for priority in PRIORITIES}
+        self.shed = {priority: 0 for priority in PRIORITIES}
+
+    # --- public API --------------------------------------------------------------
+    @asynccontextmanager
+    async def slot(self, client_id: Optional[str] = None, priority: Optional[str] = None) -> AsyncIterator[None]:
+        """
+        Holds one in-flight slot for the block; defaults to the calling context's client.
+
+        Raises:
+            OverloadedError: if the call would exceed the queue caps or wait too long.
+        """
+        context_client, context_priority = current_client()
+        client_id = client_id or context_client
+        priority = priority or context_priority
+        await self._acquire(client_id, priority)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - started)
+
+    def check(self, client_id: Optional[str] = None) -> None:
+        """Raises OverloadedError now if a new call from `client_id` would be shed (used to reject requests up front)."""
+        if self._in_flight < self.max_in_flight and not self._queued:
+            return
+        self._check_capacity(client_id or ANONYMOUS)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self._in_flight,
+            "queued": self._queued,
+            "max_in_flight": self.max_in_flight,
+            "max_queued": self.max_queued,
+            "estimated_wait_seconds": round(self._estimated_wait(), 3),
+            "admitted": dict(self.admitted),
+            "shed": dict(self.shed),
+        }
+
+    # --- internals ---------------------------------------------------------------
+    def _weight(self, client_id: str, priority: str) -> float:
+        weight = self.client_weights.get(client_id, 1.0)
+        return weight * self.interactive_weight if priority == INTERACTIVE else weight
+
+    def _estimated_wait(self, ahead: Optional[int] = None) -> float:
+        ahead = self._queued if ahead is None else ahead
+        return ahead * self._service_time / self.max_in_flight
+
+    def _check_capacity(self, client_id: str) -> None:
+        wait = self._estimated_wait(self._queued + 1)
+        if (
+            self._queued >= self.max_queued
+            or self._queued_per_client.get(client_id, 0) >= self.max_queued_per_client
+            or wait > self.max_queue_wait
+        ):
+            retry_after = max(1, math.ceil(wait))
+            raise OverloadedError(
+                message=f"Upstream capacity exhausted ({self._in_flight} in flight, {self._queued} queued); retry in {retry_after}s.",
+                retry_after=retry_after,
+            )
+
+    async def _acquire(self, client_id: str, priority: str) -> None:
+        flow = (client_id, priority)
+        tag = max(self._virtual_time, self._last_tag.get(flow, 0.0)) + 1.0 / self._weight(client_id, priority)
+        if self._in_flight < self.max_in_flight and not self._queued:
+            self._last_tag[flow] = tag
+            self._virtual_time = tag - 1.0 / self._weight(client_id, priority)
+            self._in_flight += 1
+            self.admitted[priority] += 1
+            return
+        try:
+            self._check_capacity(client_id)
+        except OverloadedError:
+            self.shed[priority] += 1
+            raise
+
+        self._last_tag[flow] = tag
+        start = tag - 1.0 / self._weight(client_id, priority)
+        waiter = _Waiter(tag, next(self._seq), start, client_id, asyncio.get_running_loop().create_future())
+        heapq.heappush(self._heap, waiter)
+        self._queued += 1
+        self._queued_per_client[client_id] = self._queued_per_client.get(client_id, 0) + 1
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(None)  # Granted just before the cancellation: pass the slot on
+            else:
+                waiter.cancelled = True
+                self._dequeued(client_id)
+            raise
+        self.admitted[priority] += 1
+
+    def _release(self, service_time: Optional[float]) -> None:
+        self._in_flight -= 1
+        if service_time is not None:
+            self._service_time = 0.9 * self._service_time + 0.1 * service_time
+        while self._heap and self._in_flight < self.max_in_flight:
+            waiter = heapq.heappop(self._heap)
+            if waiter.cancelled or waiter.future.done():
+                continue  # Cancelled (its task dequeues itself when it wakes)
+            self._dequeued(waiter.client_id)
+            self._virtual_time = max(self._virtual_time, waiter.start)
+            self._in_flight += 1
+            waiter.future.set_result(None)
+        if len(self._last_tag) > 4096:
+            self._last_tag = {flow: tag for flow, tag in self._last_tag.items() if tag > self._virtual_time}
+
+    def _dequeued(self, client_id: str) -> None:
+        self._queued -= 1
+        remaining = self._queued_per_client.get(client_id, 1) - 1
+        if remaining:
+            self._queued_per_client[client_id] = remaining
+        else:
+            self._queued_per_client.pop(client_id, None)
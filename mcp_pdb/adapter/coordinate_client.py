@@ -0,0 +1,370 @@
+# mcp_pdb/adapter/coordinate_client.py
+"""
+mcp_pdb.adapter.coordinate_client
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Streaming coordinate ingestion: mmCIF `_atom_site` → columnar NumPy arrays.
+
+The gzip-compressed mmCIF file is streamed through httpx, decompressed and
+split into lines incrementally, and the `_atom_site` loop is decoded in
+fixed-size chunks of rows. Neither the compressed nor the decompressed text
+is ever held in memory as a whole; peak memory is the compact output arrays
+plus one chunk of rows. The download stops as soon as the `_atom_site` loop
+ends.
+
+Only the first model is kept (NMR ensembles), and for alternate locations only
+the first conformer ('A' or unlabelled) is kept.
+"""
+
+import codecs
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+from mcp_pdb.adapter.transport import PoolMetrics, TransportSettings, build_async_client
+from mcp_pdb.config import COORDINATE_CHUNK_ATOMS, COORDINATE_READ_TIMEOUT_SECONDS, PDB_FILES_BASE_URL
+from mcp_pdb.exceptions import DataValidationError, NetworkError, PDBAPIError, PDBClientError
+
+
+@dataclass(frozen=True)
+class AtomArrays:
+    """
+    Columnar atom table for one entry.
+
+    Categorical columns (element, residue name, atom name, chain) are stored as
+    integer codes into the matching `*_names` vocabulary tuple.
+    """
+
+    pdb_id: str
+    xyz: np.ndarray  # (N, 3) float32, Å
+    element: np.ndarray  # (N,) uint16 codes into element_names
+    res_name: np.ndarray  # (N,) uint16 codes into res_names
+    atom_name: np.ndarray  # (N,) uint16 codes into atom_names
+    chain: np.ndarray  # (N,) int32 codes into chain_ids (author chain IDs)
+    res_seq: np.ndarray  # (N,) int32 author residue numbers
+    hetero: np.ndarray  # (N,) bool, True for HETATM records
+    element_names: Tuple[str, ...]
+    res_names: Tuple[str, ...]
+    atom_names: Tuple[str, ...]
+    chain_ids: Tuple[str, ...]
+
+    def __len__(self) -> int:
+        return int(self.xyz.shape[0])
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the array columns (vocabularies excluded)."""
+        return sum(getattr(self, name).nbytes for name in ARRAY_FIELDS)
+
+
+ARRAY_FIELDS = ("xyz", "element", "res_name", "atom_name", "chain", "res_seq", "hetero")
+VOCAB_FIELDS = ("element_names", "res_names", "atom_names", "chain_ids")
+
+# mmCIF tokens: a quoted value ends at a matching quote followed by whitespace (so O5' stays intact).
+_TOKEN_RE = re.compile(r"'(?:[^']|'(?!\s|$))*'|\"(?:[^\"]|\"(?!\s|$))*\"|\S+")
+
+# Start of anything that terminates a loop's data rows
+_LOOP_END_RE = re.compile(r"^(?:#|_|loop_|data_)", re.M)
+
+# Required column → preferred mmCIF item names, in order of preference
+_COLUMNS = {
+    "group": ("group_PDB",),
+    "element": ("type_symbol",),
+    "atom_name": ("label_atom_id", "auth_atom_id"),
+    "alt_id": ("label_alt_id",),
+    "res_name": ("label_comp_id", "auth_comp_id"),
+    "chain": ("auth_asym_id", "label_asym_id"),
+    "res_seq": ("auth_seq_id", "label_seq_id"),
+    "x": ("Cartn_x",),
+    "y": ("Cartn_y",),
+    "z": ("Cartn_z",),
+    "model": ("pdbx_PDB_model_num",),
+}
+_OPTIONAL_COLUMNS = {"group", "alt_id", "model"}
+
+
+class AtomSiteParser:
+    """
+    Incremental decoder for the `_atom_site` loop of an mmCIF file.
+
+    Feed it bytes (`feed_bytes`) or lines (`feed_line`) in order, then call `finish()`.
+    """
+
+    def __init__(self, pdb_id: str, chunk_atoms: int = COORDINATE_CHUNK_ATOMS):
+        self.pdb_id = pdb_id
+        self.chunk_atoms = max(1, chunk_atoms)
+        self.done = False  # True once the _atom_site loop has ended; later input is ignored
+
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._partial_line = ""
+        self._state = "scan"  # scan → loop → header → rows → done
+        self._header: List[str] = []
+        self._col_index: Dict[str, int] = {}
+        self._rows: List[str] = []  # Buffered row text (single lines or multi-line blocks)
+        self._row_count = 0
+        self._first_model: Optional[str] = None
+
+        self._chunks: Dict[str, List[np.ndarray]] = {name: [] for name in ARRAY_FIELDS}
+        self._vocabs: Dict[str, Dict[str, int]] = {name: {} for name in ("element", "res_name", "atom_name", "chain")}
+
+    # --- input -----------------------------------------------------------------
+    def feed_bytes(self, data: bytes) -> None:
+        if self.done or not data:
+            return
+        text = self._partial_line + self._decoder.decode(data)
+        cut = text.rfind("\n")
+        if cut < 0:
+            self._partial_line = text
+            return
+        self._partial_line = text[cut + 1:]
+        self._feed_text(text[:cut])
+
+    def feed_line(self, line: str) -> None:
+        if self.done:
+            return
+        line = line.rstrip("\r")
+        if self._state == "scan":
+            if line.startswith("loop_"):
+                self._state = "loop"
+        elif self._state == "loop":
+            if line.startswith("_atom_site."):
+                self._state = "header"
+                self._header.append(line.split()[0][len("_atom_site."):])
+            elif line.strip():
+                self._state = "scan"  # Some other category's loop
+        elif self._state == "header":
+            if line.startswith("_atom_site."):
+                self._header.append(line.split()[0][len("_atom_site."):])
+            else:
+                self._start_rows()
+                self._state = "rows"
+                self.feed_line(line)
+        elif self._state == "rows":
+            if _LOOP_END_RE.match(line):
+                self._end_rows()
+            elif line.strip():
+                self._add_rows(line, 1)
+
+    def finish(self) -> AtomArrays:
+        """
+        Flushes any buffered rows and returns the assembled arrays.
+
+        Raises:
+            DataValidationError: If no `_atom_site` loop was found.
+        """
+        if self._partial_line:
+            line, self._partial_line = self._partial_line, ""
+            self.feed_line(line)
+        if self._state == "rows":
+            self._end_rows()
+        if not self._col_index:
+            raise DataValidationError(f"No _atom_site loop found in the coordinate file for '{self.pdb_id}'.")
+
+        arrays = {}
+        for name in ARRAY_FIELDS:
+            chunks = self._chunks[name]
+            arrays[name] = np.concatenate(chunks) if len(chunks) > 1 else (chunks[0] if chunks else _empty(name))
+            chunks.clear()  # Drop chunk references as soon as they are merged
+        return AtomArrays(
+            pdb_id=self.pdb_id,
+            element_names=tuple(self._vocabs["element"]),
+            res_names=tuple(self._vocabs["res_name"]),
+            atom_names=tuple(self._vocabs["atom_name"]),
+            chain_ids=tuple(self._vocabs["chain"]),
+            **arrays,
+        )
+
+    # --- internals -------------------------------------------------------------
+    def _feed_text(self, text: str) -> None:
+        """Consumes complete lines; data rows are sliced out in bulk rather than line by line."""
+        pos, end = 0, len(text)
+        while pos <= end and not self.done:
+            if self._state == "rows":
+                match = _LOOP_END_RE.search(text, pos)
+                stop = match.start() if match else end
+                if stop > pos:
+                    block = text[pos:stop]
+                    self._add_rows(block, block.count("\n") + 1)
+                if match:
+                    self._end_rows()
+                return
+            newline = text.find("\n", pos)
+            if newline < 0:
+                newline = end
+            self.feed_line(text[pos:newline])
+            pos = newline + 1
+
+    def _add_rows(self, text: str, count: int) -> None:
+        self._rows.append(text)
+        self._row_count += count
+        if self._row_count >= self.chunk_atoms:
+            self._flush_rows()
+
+    def _end_rows(self) -> None:
+        self._flush_rows()
+        self._state = "done"
+        self.done = True
+
+    def _start_rows(self) -> None:
+        positions = {name: i for i, name in enumerate(self._header)}
+        for column, candidates in _COLUMNS.items():
+            for candidate in candidates:
+                if candidate in positions:
+                    self._col_index[column] = positions[candidate]
+                    break
+            else:
+                if column not in _OPTIONAL_COLUMNS:
+                    raise DataValidationError(f"_atom_site loop for '{self.pdb_id}' lacks the '{candidates[0]}' column.")
+
+    def _flush_rows(self) -> None:
+        if not self._rows:
+            return
+        text = "\n".join(self._rows)
+        self._rows = []
+        self._row_count = 0
+        if "'" in text or '"' in text:
+            tokens = [_unquote(token) for token in _TOKEN_RE.findall(text)]
+        else:
+            tokens = text.split()
+        ncols = len(self._header)
+        if len(tokens) % ncols:
+            raise DataValidationError(f"Malformed _atom_site row for '{self.pdb_id}': token count is not a multiple of {ncols}.")
+        col = self._col_index
+        # Column views are strided slices of the token list: no per-row Python work.
+        columns = {name: np.array(tokens[index::ncols], dtype=object) for name, index in col.items()}
+        del tokens
+
+        keep = None
+        if "model" in columns:
+            models = columns["model"]
+            if self._first_model is None:
+                self._first_model = models[0]
+            keep = models == self._first_model
+        if "alt_id" in columns:
+            alt = columns["alt_id"]
+            alt_keep = (alt == ".") | (alt == "?") | (alt == "A")
+            keep = alt_keep if keep is None else keep & alt_keep
+        if keep is not None and not keep.all():
+            columns = {name: values[keep] for name, values in columns.items()}
+        n_rows = len(columns["x"])
+        if n_rows == 0:
+            return
+
+        xyz = np.empty((n_rows, 3), dtype=np.float32)
+        for axis, name in enumerate(("x", "y", "z")):
+            xyz[:, axis] = columns[name].astype(np.float32)
+        self._chunks["xyz"].append(xyz)
+        self._chunks["element"].append(self._encode("element", columns["element"], np.uint16))
+        self._chunks["res_name"].append(self._encode("res_name", columns["res_name"], np.uint16))
+        self._chunks["atom_name"].append(self._encode("atom_name", columns["atom_name"], np.uint16))
+        self._chunks["chain"].append(self._encode("chain", columns["chain"], np.int32))
+        self._chunks["res_seq"].append(_to_int(columns["res_seq"]))
+        if "group" in columns:
+            self._chunks["hetero"].append(columns["group"] == "HETATM")
+        else:
+            self._chunks["hetero"].append(np.zeros(n_rows, dtype=bool))
+
+    def _encode(self, vocab_name: str, values: np.ndarray, dtype) -> np.ndarray:
+        """Maps a chunk of strings to integer codes in the running vocabulary."""
+        vocab = self._vocabs[vocab_name]
+        for value in dict.fromkeys(values.tolist()):  # Unique values, first-seen order
+            if value not in vocab:
+                vocab[value] = len(vocab)
+        if len(vocab) - 1 > np.iinfo(dtype).max:
+            raise DataValidationError(f"Too many distinct '{vocab_name}' values in '{self.pdb_id}'.")
+        return np.fromiter(map(vocab.__getitem__, values), dtype=dtype, count=len(values))
+
+
+class CoordinateClient:
+    """Async client that streams coordinate files from the RCSB file server."""
+
+    def __init__(
+        self,
+        base_url: str = PDB_FILES_BASE_URL,
+        client: Optional[httpx.AsyncClient] = None,
+        chunk_atoms: int = COORDINATE_CHUNK_ATOMS,
+        transport_settings: Optional[TransportSettings] = None,
+    ):
+        self.base_url = base_url.rstrip('/')
+        self.chunk_atoms = chunk_atoms
+        self._client = client
+        self._created_client = False
+        self.transport_settings = transport_settings or TransportSettings().with_read_timeout(COORDINATE_READ_TIMEOUT_SECONDS)
+        self.pool_metrics = PoolMetrics()
+
+    async def _get_async_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = build_async_client(self.base_url, self.transport_settings, self.pool_metrics)
+            self._created_client = True
+        return self._client
+
+    async def close(self):
+        """Closes the underlying httpx.AsyncClient if it was created by this instance."""
+        if self._client and self._created_client:
+            await self._client.aclose()
+            self._client = None
+            self._created_client = False
+
+    def coordinate_url(self, pdb_id: str) -> str:
+        return f"{self.base_url}/download/{pdb_id.upper()}.cif.gz"
+
+    async def stream_atom_arrays(self, pdb_id: str) -> AtomArrays:
+        """
+        Streams `<PDB_ID>.cif.gz` and decodes its `_atom_site` loop into AtomArrays.
+
+        Raises:
+            PDBAPIError: If the file server answers with an HTTP error (404 for unknown entries).
+            NetworkError: For transport failures.
+            DataValidationError: If the file has no usable `_atom_site` loop.
+        """
+        client = await self._get_async_client()
+        url = self.coordinate_url(pdb_id)
+        parser = AtomSiteParser(pdb_id.upper(), chunk_atoms=self.chunk_atoms)
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)  # gzip container
+
+        try:
+            async with client.stream("GET", url) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    raise PDBAPIError(
+                        pdb_id=pdb_id,
+                        status_code=response.status_code,
+                        detail=f"Coordinate file request failed with status {response.status_code} for '{pdb_id}' at {url}.",
+                        resource="Coordinate file",
+                    )
+                async for raw_chunk in response.aiter_raw():
+                    parser.feed_bytes(decompressor.decompress(raw_chunk))
+                    if parser.done:
+                        break  # Everything after _atom_site is irrelevant; stop downloading
+                if not parser.done:
+                    parser.feed_bytes(decompressor.flush())
+        except httpx.RequestError as e:
+            raise NetworkError(message=f"Network error while streaming coordinates for '{pdb_id}' from {url}: {str(e)}") from e
+        except zlib.error as e:
+            raise PDBClientError(message=f"Corrupt gzip stream for '{pdb_id}' from {url}: {str(e)}") from e
+
+        return parser.finish()
+
+
+def _unquote(token: str) -> str:
+    if len(token) >= 2 and token[0] == token[-1] and token[0] in "'\"":
+        return token[1:-1]
+    return token
+
+
+def _to_int(values: np.ndarray) -> np.ndarray:
+    """Parses integer strings, mapping mmCIF null markers ('.' / '?') to -1."""
+    missing = (values == ".") | (values == "?")
+    if missing.any():
+        values = np.where(missing, "-1", values)
+    return values.astype(np.int32)
+
+
+def _empty(name: str) -> np.ndarray:
+    if name == "xyz":
+        return np.empty((0, 3), dtype=np.float32)
+    dtypes = {"element": np.uint16, "res_name": np.uint16, "atom_name": np.uint16, "chain": np.int32, "res_seq": np.int32, "hetero": bool}
+    return np.empty(0, dtype=dtypes[name])
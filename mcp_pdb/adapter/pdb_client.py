@@ -1,164 +1,427 @@
 # mcp_pdb/adapter/pdb_client.py
+import asyncio
+import hashlib
+import logging
+import re
+from collections import OrderedDict
 import httpx
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+from typing import Iterable, List, Dict, Any, Optional, Set
+from urllib.parse import urlsplit
 
-from mcp_pdb.config import PDB_API_BASE_URL
+from mcp_pdb.adapter.admission import FairScheduler
+from mcp_pdb.adapter.routing import Source, SourceRouter
+from mcp_pdb.adapter.resilience import RETRYABLE_STATUS_CODES, CircuitBreaker, Hedger, RetryPolicy, TokenBucket, parse_retry_after
+from mcp_pdb.adapter.sources import RCSBAdapter, parse_sources
+from mcp_pdb.adapter.transport import PoolMetrics, TransportSettings, build_async_client
+from mcp_pdb.config import PDB_API_BASE_URL, PDB_HEDGE_ENABLED, PDB_SEARCH_API_URL, PDB_SOURCES, PDB_STALE_MAX_ENTRIES
+from mcp_pdb.utils.raw_store import RawDocumentStore, get_raw_store
 from mcp_pdb.schemas import (
     StructureDataset,
-    ChainInfo,
-    LigandDataset,
+    ChemicalComponent,
+    EntitySequence,
     Provenance,
+    SequenceDataset,
 )
 from mcp_pdb.exceptions import (
+    CircuitOpenError,
+    ConfigurationError,
     PDBClientError,
     PDBAPIError,
     NetworkError
 )
 
+logger = logging.getLogger(__name__)
+
+_PATH_TOKEN = re.compile(r"[A-Za-z0-9]+")
+
 
 class PDBClient:
-    def __init__(self, base_url: str = PDB_API_BASE_URL, client: Optional[httpx.AsyncClient] = None):
+    def __init__(
+        self,
+        base_url: str = PDB_API_BASE_URL,
+        client: Optional[httpx.AsyncClient] = None,
+        search_url: str = PDB_SEARCH_API_URL,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        stale_max_entries: int = PDB_STALE_MAX_ENTRIES,
+        transport_settings: Optional[TransportSettings] = None,
+        hedger: Optional[Hedger] = None,
+        hedging: bool = PDB_HEDGE_ENABLED,
+        scheduler: Optional[FairScheduler] = None,
+        sources: str = PDB_SOURCES,
+        raw_store: Optional[RawDocumentStore] = None,
+    ):
         self.base_url = base_url.rstrip('/') # Ensure no trailing slash
+        self.search_url = search_url
         self._client = client
         self._created_client = False # Flag to track if this instance created the client
+        self.rate_limiter = rate_limiter or TokenBucket()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.stale_max_entries = stale_max_entries
+        self._stale: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # GET URL -> last good body
+        self.transport_settings = transport_settings or TransportSettings()
+        self.pool_metrics = PoolMetrics()
+        self.hedger = hedger or (Hedger() if hedging else None)  # GETs only; None disables hedging
+        self.scheduler = scheduler or FairScheduler()
+        self.raw_store = raw_store or get_raw_store()  # Keeps the documents each entry summary was built from; None disables
+        # Entry summaries; empty `sources` means this host only
+        self.router = SourceRouter(self._build_sources(sources), raw_store=self.raw_store)
+
+    def _build_sources(self, spec: str) -> List[Source]:
+        """
+        One Source per entry in `spec` (see `parse_sources`). RCSB at this client's
+        base URL is served by this client; every other source gets its own client
+        (rate limiter, circuit breaker, pool) sharing this one's admission scheduler.
+        """
+        sources = []
+        for adapter, url in parse_sources(spec) or [(RCSBAdapter(), None)]:
+            default_url = self.base_url if adapter.name == RCSBAdapter.name else adapter.default_base_url
+            base_url = (url or default_url).rstrip('/')
+            if not base_url:
+                raise ConfigurationError(f"PDB source '{adapter.name}' needs a base URL (e.g. '{adapter.name}=https://...').")
+            if base_url == self.base_url:
+                client = self
+            else:
+                client = PDBClient(
+                    base_url=base_url,
+                    search_url=self.search_url,
+                    retry_policy=self.retry_policy,
+                    stale_max_entries=self.stale_max_entries,
+                    transport_settings=self.transport_settings,
+                    hedging=self.hedger is not None,
+                    scheduler=self.scheduler,
+                    sources="",
+                )
+            sources.append(Source(adapter, client))
+        return sources
 
     async def _get_async_client(self) -> httpx.AsyncClient:
         if self._client is None:
-            self._client = httpx.AsyncClient(base_url=self.base_url, timeout=10.0)
+            self._client = build_async_client(self.base_url, self.transport_settings, self.pool_metrics)
             self._created_client = True
         return self._client
 
     async def close(self):
-        """Closes the underlying httpx.AsyncClient if it was created by this instance."""
+        """Closes the underlying httpx.AsyncClient if it was created by this instance, and the other sources' clients."""
+        for source in self.router.sources:
+            if source.client is not self:
+                await source.client.close()
         if self._client and self._created_client:
             await self._client.aclose()
             self._client = None
             self._created_client = False
 
+    async def _get_json(self, api_path: str, resource_id: str, resource: str = "PDB entry", failover: bool = False) -> Dict[str, Any]:
+        """Issues a GET against the PDB Data API and returns the decoded JSON body."""
+        return await self._request_json("GET", api_path, resource_id, resource, failover=failover)
+
+    async def _request_json(
+        self,
+        method: str,
+        api_path: str,
+        resource_id: str,
+        resource: str = "PDB entry",
+        json_body: Optional[Dict[str, Any]] = None,
+        failover: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Issues a request and returns the decoded JSON body (empty for 204 No Content),
+        translating transport and HTTP failures into PDBClient exceptions.
+
+        `api_path` is relative to `base_url` unless it is an absolute URL
+        (e.g. the RCSB Search API, which lives on a different host).
+
+        Every request waits for a rate-limiter token. GETs are retried on 429,
+        5xx and transport errors with jittered backoff (honouring Retry-After);
+        while the circuit breaker is open nothing is sent upstream. When a GET
+        finally fails for one of those reasons, the last good body for the same
+        URL is served instead, if there is one. With hedging on, a slow GET is
+        raced against a duplicate (see Hedger). The whole call holds one
+        admission slot of the calling client (see FairScheduler).
+
+        With `failover=True` (another source will be tried next) the first
+        failure is raised at once: no retries and no stale body.
+        """
+        async with self.scheduler.slot():  # Fair share per calling client; may shed with OverloadedError
+            client = await self._get_async_client()
+            full_api_url = api_path if api_path.startswith(("http://", "https://")) else f"{self.base_url}{api_path}"
+            stale_key = full_api_url if method == "GET" else None
+            fallback_key = None if failover else stale_key  # Bodies are remembered either way, but only served without failover
+            max_attempts = 1 + (self.retry_policy.max_retries if method == "GET" and not failover else 0)
+
+            attempt = 0
+            while True:
+                if not self.circuit_breaker.allow():
+                    retry_after = self.circuit_breaker.retry_after()
+                    return self._serve_stale(fallback_key, CircuitOpenError(
+                        message=f"PDB API circuit is open; not requesting {resource} '{resource_id}' from {full_api_url} (retry in {retry_after:.0f}s).",
+                        retry_after=retry_after,
+                    ))
+                probing = self.circuit_breaker.state == CircuitBreaker.HALF_OPEN
+                try:
+                    await self.rate_limiter.acquire()
+
+                    retry_after = None
+                    try:
+                        response = await self._send(client, method, api_path, json_body)
+                    except httpx.RequestError as e:
+                        # Covers network errors like DNS failure, connection refused, timeouts, etc.
+                        self.circuit_breaker.record_failure()
+                        error: PDBClientError = NetworkError(
+                            message=f"Network error while requesting {resource} '{resource_id}' from {full_api_url}: {str(e)}"
+                        )
+                        error.__cause__ = e
+                    except Exception as e:
+                        # Fallback for any other unexpected errors during the request or initial processing
+                        self.circuit_breaker.record_failure()
+                        raise PDBClientError(
+                            message=f"An unexpected error occurred in PDBClient for {resource} '{resource_id}' at {full_api_url}: {str(e)}"
+                        ) from e
+                    else:
+                        status = response.status_code
+                        if status not in RETRYABLE_STATUS_CODES:
+                            self.circuit_breaker.record_success()
+                            self.rate_limiter.on_success()
+                            if status >= 400:
+                                raise self._status_error(response, resource_id, resource, full_api_url)
+                            data = {} if status == 204 or not response.content else response.json()
+                            self._remember(stale_key, data)
+                            return data
+                        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                        if status == 429:
+                            self.rate_limiter.on_throttled(retry_after)
+                        else:
+                            self.circuit_breaker.record_failure()
+                        error = self._status_error(response, resource_id, resource, full_api_url)
+                finally:
+                    if probing:
+                        self.circuit_breaker.release_probe()  # Settled on every outcome: 429 and cancellation too
+
+                attempt += 1
+                delay = self.retry_policy.delay(attempt - 1, retry_after) if attempt < max_attempts else None
+                if delay is None:
+                    return self._serve_stale(fallback_key, error)
+                logger.info(f"Retrying {method} {full_api_url} in {delay:.2f}s (attempt {attempt + 1}/{max_attempts}): {error.message}")
+                await asyncio.sleep(delay)
+
+    async def _send(self, client: httpx.AsyncClient, method: str, api_path: str, json_body: Optional[Dict[str, Any]]) -> httpx.Response:
+        async def send() -> httpx.Response:
+            return await client.request(method, api_path, json=json_body)
+
+        if self.hedger is None or method != "GET":
+            return await send()
+
+        async def send_hedge() -> httpx.Response:
+            await self.rate_limiter.acquire()  # Hedges count against the rate limit too
+            return await send()
+
+        return await self.hedger.run(send, hedge_send=send_hedge)
+
+    @staticmethod
+    def _status_error(response: httpx.Response, resource_id: str, resource: str, full_api_url: str) -> PDBAPIError:
+        if response.status_code == 404:
+            return PDBAPIError(
+                pdb_id=resource_id,
+                status_code=404,
+                detail=f"{resource} '{resource_id}' not found at {full_api_url}.",
+                resource=resource,
+            )
+        return PDBAPIError(
+            pdb_id=resource_id,
+            status_code=response.status_code,
+            detail=f"PDB API request failed with status {response.status_code} for {resource} '{resource_id}' at {full_api_url}. Response: {response.text}",
+            resource=resource,
+        )
+
+    def _remember(self, key: Optional[str], data: Dict[str, Any]) -> None:
+        """Keeps the last good body per GET URL (bounded, LRU) for `_serve_stale`."""
+        if key is None or self.stale_max_entries <= 0:
+            return
+        self._stale[key] = data
+        self._stale.move_to_end(key)
+        while len(self._stale) > self.stale_max_entries:
+            self._stale.popitem(last=False)
+
+    def _serve_stale(self, key: Optional[str], error: PDBClientError) -> Dict[str, Any]:
+        """Returns the last good body for `key` if there is one; otherwise raises `error`."""
+        if key is not None and key in self._stale:
+            logger.warning(f"Serving stale response for {key}: {error.message}")
+            self._stale.move_to_end(key)
+            return self._stale[key]
+        raise error
+
+    def invalidate(self, pdb_ids: Iterable[str]) -> int:
+        """
+        Forgets the last good bodies of every URL that names one of `pdb_ids`, here
+        and in the other sources' clients, so a failed refetch after an upstream
+        update cannot fall back to the old body. Returns how many were dropped.
+        """
+        ids = {pdb_id.strip().upper() for pdb_id in pdb_ids}
+        removed = self._forget_stale(ids)
+        for source in self.router.sources:
+            if source.client is not self:
+                removed += source.client._forget_stale(ids)
+        return removed
+
+    def _forget_stale(self, ids: Set[str]) -> int:
+        def names_entry(url: str) -> bool:
+            # A path segment naming the entry: "1ABC", "1ABC_1", "1abc-noatom.json", ...
+            for segment in urlsplit(url).path.split("/"):
+                token = _PATH_TOKEN.match(segment)
+                if token is not None and token.group().upper() in ids:
+                    return True
+            return False
+
+        keys = [key for key in self._stale if names_entry(key)]
+        for key in keys:
+            del self._stale[key]
+        return len(keys)
+
+    async def search(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Runs one page of an RCSB Search API query.
+
+        Args:
+            query: Full Search API request body, including `request_options.paginate`.
+
+        Returns:
+            The raw response: `{"total_count": int, "result_set": [{"identifier": ..., "score": ...}]}`.
+            A query without hits (HTTP 204) yields `{"total_count": 0, "result_set": []}`.
+        """
+        data = await self._request_json("POST", self.search_url, "search", resource="Search query", json_body=query)
+        data.setdefault("total_count", 0)
+        data.setdefault("result_set", [])
+        return data
+
     async def get_structure_summary(self, pdb_id: str) -> StructureDataset:
         """
-        Fetches a summary for a given PDB ID from the RCSB PDB Data API.
+        Fetches a summary for a given PDB ID from the best available source
+        (RCSB PDB by default; see `PDB_SOURCES` and SourceRouter for mirrors and failover).
+        """
+        return await self.router.get_structure_summary(pdb_id)
+
+    async def get_chemical_component(self, chem_id: str) -> ChemicalComponent:
+        """
+        Fetches formula, weight, SMILES and InChIKey for one Chemical Component
+        Dictionary entry (e.g., 'ATP') from the RCSB PDB Data API.
         """
-        client = await self._get_async_client()
-        # RCSB PDB API endpoint for core entry data
-        api_path = f"/rest/v1/core/entry/{pdb_id}"
+        api_path = f"/rest/v1/core/chemcomp/{chem_id}"
         full_api_url = f"{self.base_url}{api_path}"
+        data = await self._get_json(api_path, chem_id, resource="Chemical component")
 
+        chem_comp = data.get("chem_comp", {})
+        descriptor = data.get("rcsb_chem_comp_descriptor", {})
+
+        formula_weight = chem_comp.get("formula_weight")
         try:
-            response = await client.get(api_path)
-            response.raise_for_status()  # Raises HTTPStatusError for 4xx/5xx responses
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                raise PDBAPIError(
-                    pdb_id=pdb_id,
-                    status_code=404,
-                    detail=f"PDB entry '{pdb_id}' not found at {full_api_url}."
-                ) from e
-            else:
-                raise PDBAPIError(
-                    pdb_id=pdb_id,
-                    status_code=e.response.status_code,
-                    detail=f"PDB API request failed with status {e.response.status_code} for entry '{pdb_id}' at {full_api_url}. Response: {e.response.text}"
-                ) from e
-        except httpx.RequestError as e:
-            # Covers network errors like DNS failure, connection refused, timeouts, etc.
-            raise NetworkError(
-                message=f"Network error while requesting PDB entry '{pdb_id}' from {full_api_url}: {str(e)}"
-            ) from e
-        except Exception as e:
-            # Fallback for any other unexpected errors during the request or initial processing
-            raise PDBClientError(
-                message=f"An unexpected error occurred in PDBClient for PDB ID '{pdb_id}' at {full_api_url}: {str(e)}"
-            ) from e
-
-        data = response.json()
-
-        provenance = Provenance(
-            source="RCSB PDB",
-            retrieved=datetime.now(timezone.utc),
-            api_url=full_api_url
+            formula_weight = float(formula_weight) if formula_weight is not None else None
+        except (ValueError, TypeError):
+            formula_weight = None
+
+        return ChemicalComponent(
+            chem_id=str(chem_comp.get("id") or chem_id),
+            name=str(chem_comp.get("name") or "N/A"),
+            type=chem_comp.get("type"),
+            formula=chem_comp.get("formula"),
+            formula_weight=formula_weight if formula_weight and formula_weight > 0 else None,
+            smiles=descriptor.get("smilesstereo") or descriptor.get("smiles"),
+            inchikey=descriptor.get("in_ch_ikey"),
+            provenance=Provenance(
+                source="RCSB PDB",
+                retrieved=datetime.now(timezone.utc),
+                api_url=full_api_url,
+            ),
         )
 
-        title = data.get("struct", {}).get("title", "N/A")
-        method_list = data.get("exptl", [])
-        method = method_list[0].get("method", "N/A") if method_list else "N/A"
-        
-        resolution = None
-        refine_list = data.get("refine", [])
-        if refine_list:
-            res_val = refine_list[0].get("ls_d_res_high")
-            if res_val is not None:
-                try:
-                    resolution = float(res_val)
-                except (ValueError, TypeError):
-                    resolution = None
-
-        chains_data: List[ChainInfo] = []
-        processed_chain_ids = set()
-        polymer_entities = data.get("polymer_entities", [])
-        for entity in polymer_entities:
-            source_organisms = entity.get("rcsb_entity_source_organism", [])
-            organism_name = source_organisms[0].get("ncbi_scientific_name") if source_organisms else None
-            
-            seq_length = entity.get("entity_poly", {}).get("rcsb_sample_sequence_length", 0)
-            if seq_length == 0:
-                seq_code = entity.get("entity_poly", {}).get("pdbx_seq_one_letter_code_can")
-                if seq_code:
-                    seq_length = len(seq_code)
-
-            chain_id_str = entity.get("entity_poly", {}).get("pdbx_strand_id", "") # Comma-separated e.g., A,B
-            auth_asym_ids_from_entity_container = entity.get("rcsb_polymer_entity_container_identifiers", {}).get("auth_asym_ids", [])
-
-            current_entity_chain_ids = []
-            if chain_id_str:
-                current_entity_chain_ids.extend([c.strip() for c in chain_id_str.split(',') if c.strip()])
-            if auth_asym_ids_from_entity_container:
-                 current_entity_chain_ids.extend(auth_asym_ids_from_entity_container)
-            
-            unique_current_entity_chain_ids = sorted(list(set(current_entity_chain_ids)))
-
-            for chain_id_val in unique_current_entity_chain_ids:
-                if chain_id_val and chain_id_val not in processed_chain_ids:
-                    chains_data.append(
-                        ChainInfo(
-                            chain_id=str(chain_id_val)[:2],
-                            sequence_length=max(1, seq_length), # Ensure gt=0
-                            organism=organism_name,
-                        )
-                    )
-                    processed_chain_ids.add(chain_id_val)
-        
-        ligands_data: List[LigandDataset] = []
-        nonpolymer_entities = data.get("nonpolymer_entities", [])
-        for entity in nonpolymer_entities:
-            chem_id = entity.get("nonpolymer_comp", {}).get("chem_comp", {}).get("id")
-            name = entity.get("nonpolymer_comp", {}).get("chem_comp", {}).get("name")
-            if not name:
-                name = entity.get("pdbx_entity_nonpoly", {}).get("name", "N/A")
-
-            count = entity.get("rcsb_nonpolymer_entity_container_identifiers", {}).get("instance_count", 1)
-            count = max(1, count) # Ensure ge=1
-
-            if chem_id:
-                ligands_data.append(
-                    LigandDataset(
-                        chem_id=str(chem_id)[:3],
-                        name=str(name),
-                        count=count,
-                    )
-                )
+    async def get_sequences(self, pdb_id: str) -> SequenceDataset:
+        """
+        Fetches the canonical sequence of every polymer entity of an entry.
+
+        Entities embedded in the entry document are used directly; otherwise each
+        entity listed in `rcsb_entry_container_identifiers.polymer_entity_ids` is
+        fetched from `/rest/v1/core/polymer_entity/{pdb_id}/{entity_id}`. With a raw
+        store, the documents are attached to the entry's record so the sequences can
+        later be rebuilt locally (see `raw_documents.fresh_sequences`).
+        """
+        api_path = sequence_entry_path(pdb_id)
+        full_api_url = f"{self.base_url}{api_path}"
+        data = await self._get_json(api_path, pdb_id)
+
+        paths, documents = [api_path], [data]
+        entities = data.get("polymer_entities")
+        if entities is None:
+            entity_ids = polymer_entity_ids(data)
+            entities = await asyncio.gather(*(
+                self._get_json(polymer_entity_path(pdb_id, entity_id), f"{pdb_id}_{entity_id}", resource="Polymer entity")
+                for entity_id in entity_ids
+            ))
+            paths += [polymer_entity_path(pdb_id, entity_id) for entity_id in entity_ids]
+            documents += entities
+
+        retrieved = datetime.now(timezone.utc)
+        if self.raw_store is not None:
+            await self._keep_sequence_documents(pdb_id, full_api_url, retrieved, paths, documents)
+        return sequences_from_documents(pdb_id, entities, full_api_url, retrieved)
+
+    async def _keep_sequence_documents(self, pdb_id: str, api_url: str, retrieved: datetime, paths: List[str], documents: List[Any]) -> None:
+        """Attaches the documents to the entry's raw record (recording the entry first if needed); never fails the request."""
+        def keep() -> None:
+            if not self.raw_store.attach(pdb_id, paths, documents):
+                self.raw_store.record(pdb_id, RCSBAdapter.name, api_url, retrieved, paths[:1], documents[:1])
+                self.raw_store.attach(pdb_id, paths, documents)
+
+        try:
+            await asyncio.to_thread(keep)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not keep raw sequence documents for {pdb_id}: {e}")
+
 
-        return StructureDataset(
-            pdb_id=str(pdb_id),
-            title=str(title),
-            method=str(method),
-            resolution=resolution,
-            chains=chains_data,
-            ligands=ligands_data,
-            provenance=provenance,
+def sequence_entry_path(pdb_id: str) -> str:
+    return f"/rest/v1/core/entry/{pdb_id}"
+
+
+def polymer_entity_path(pdb_id: str, entity_id: Any) -> str:
+    return f"/rest/v1/core/polymer_entity/{pdb_id}/{entity_id}"
+
+
+def polymer_entity_ids(entry: Dict[str, Any]) -> List[Any]:
+    return entry.get("rcsb_entry_container_identifiers", {}).get("polymer_entity_ids", [])
+
+
+def sequences_from_documents(pdb_id: str, entities: List[Dict[str, Any]], api_url: str, retrieved: datetime) -> SequenceDataset:
+    """Builds a SequenceDataset from RCSB polymer-entity documents (embedded or fetched one by one)."""
+    sequences: List[EntitySequence] = []
+    for index, entity in enumerate(entities, start=1):
+        entity_poly = entity.get("entity_poly", {})
+        sequence = "".join((entity_poly.get("pdbx_seq_one_letter_code_can") or "").split())
+        if not sequence:
+            continue
+        identifiers = entity.get("rcsb_polymer_entity_container_identifiers", {})
+        chain_ids = [c.strip() for c in (entity_poly.get("pdbx_strand_id") or "").split(",") if c.strip()]
+        chain_ids = sorted(set(chain_ids) | set(identifiers.get("auth_asym_ids", [])))
+        source_organisms = entity.get("rcsb_entity_source_organism", [])
+        sequences.append(
+            EntitySequence(
+                entity_id=str(identifiers.get("entity_id") or index),
+                chain_ids=chain_ids,
+                description=entity.get("rcsb_polymer_entity", {}).get("pdbx_description"),
+                polymer_type=entity_poly.get("rcsb_entity_polymer_type"),
+                organism=source_organisms[0].get("ncbi_scientific_name") if source_organisms else None,
+                sequence=sequence,
+                digest=hashlib.sha256(sequence.encode()).hexdigest()[:16],
+            )
         )
 
+    return SequenceDataset(
+        pdb_id=str(pdb_id).upper(),
+        entities=sequences,
+        provenance=Provenance(source="RCSB PDB", retrieved=retrieved, api_url=api_url),
+    )
+
+
 async def main_test(pdb_id_to_test: str):
     client = PDBClient()
     print(f"Fetching summary for PDB ID: {pdb_id_to_test}")
@@ -185,7 +448,6 @@ async def main_test(pdb_id_to_test: str):
         await client.close()
 
 if __name__ == "__main__":
-    import asyncio
     # Test with: python -m mcp_pdb.adapter.pdb_client
     # Example PDB IDs: 1ehz (Human Insulin), 1tup (Lysozyme), 
     # 6wlc (SARS-CoV-2 main protease with inhibitor N3)
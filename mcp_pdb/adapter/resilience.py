@@ -0,0 +1,297 @@
+# mcp_pdb/adapter/resilience.py
+"""
+mcp_pdb.adapter.resilience
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+Building blocks that keep upstream clients near the rate limit instead of
+collapsing under error storms:
+
+•  TokenBucket    – client-side rate limiter; halves its rate on 429 and honours Retry-After
+•  RetryPolicy    – bounded retries with full-jitter exponential backoff
+•  CircuitBreaker – fails fast (closed → open → half-open probe) while upstream is down
+•  Hedger         – duplicates a request that outlives the observed pNN latency, within a budget
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from mcp_pdb.config import (
+    PDB_CIRCUIT_FAILURE_THRESHOLD,
+    PDB_CIRCUIT_RESET_SECONDS,
+    PDB_HEDGE_BUDGET,
+    PDB_HEDGE_MIN_DELAY_SECONDS,
+    PDB_HEDGE_MIN_SAMPLES,
+    PDB_HEDGE_QUANTILE,
+    PDB_MAX_RETRIES,
+    PDB_RATE_LIMIT_BURST,
+    PDB_RATE_LIMIT_PER_SECOND,
+    PDB_RETRY_BACKOFF_BASE_SECONDS,
+    PDB_RETRY_BACKOFF_MAX_SECONDS,
+)
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+T = TypeVar("T")
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date); None if absent or invalid."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+class TokenBucket:
+    """
+    Async token bucket with AIMD adaptation.
+
+    `acquire` waits for a token (waiters are served in arrival order). A 429
+    halves the refill rate (down to `min_rate`) and, with Retry-After, blocks
+    all callers until then; every accepted response raises the rate by 1% of
+    `max_rate` until it is back at the configured limit.
+    """
+
+    def __init__(
+        self,
+        rate: float = PDB_RATE_LIMIT_PER_SECOND,
+        burst: int = PDB_RATE_LIMIT_BURST,
+        min_rate: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.min_rate = float(min_rate) if min_rate else self.max_rate / 20
+        self.capacity = float(burst)
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._refill(now)
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+                await asyncio.sleep(wait)
+
+    def on_throttled(self, retry_after: Optional[float] = None) -> None:
+        """Called on a 429: multiplicative decrease, drain the bucket, honour Retry-After."""
+        now = self._clock()
+        self._refill(now)
+        self.rate = max(self.min_rate, self.rate / 2)
+        self._tokens = 0.0
+        if retry_after:
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def on_success(self) -> None:
+        """Called on an accepted response: additive increase back towards `max_rate`."""
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 100)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+@dataclass
+class RetryPolicy:
+    """Bounded retries with full-jitter exponential backoff (`uniform(0, min(max, base * 2**attempt))`)."""
+
+    max_retries: int = PDB_MAX_RETRIES
+    backoff_base: float = PDB_RETRY_BACKOFF_BASE_SECONDS
+    backoff_max: float = PDB_RETRY_BACKOFF_MAX_SECONDS
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Seconds to wait before retry number `attempt + 1`, or None if no retry should be made
+        (retries exhausted, or the server asked for a longer pause than `backoff_max`).
+        """
+        if attempt >= self.max_retries:
+            return None
+        if retry_after is not None:
+            return retry_after if retry_after <= self.backoff_max else None
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive upstream failures and rejects
+    calls for `reset_timeout` seconds; then lets one probe through (half-open),
+    closing again on its success or re-opening on its failure. A probe that ends
+    any other way (throttled, cancelled) must call `release_probe`.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = PDB_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = PDB_CIRCUIT_RESET_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if failure_threshold < 1 or reset_timeout <= 0:
+            raise ValueError("failure_threshold must be at least 1 and reset_timeout positive")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now (in half-open state, only one probe at a time)."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def release_probe(self) -> None:
+        """Ends a half-open probe without a verdict, so the next call probes again."""
+        self._probe_in_flight = False
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker will let a probe through (0 unless open)."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def record_success(self) -> None:
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._state = self.OPEN
+            self._opened_at = self._clock()
+            self._probe_in_flight = False
+
+
+class Hedger:
+    """
+    Hedged requests: if a call has not finished after the `quantile` latency of
+    recent successful calls, a duplicate is started and whichever succeeds first
+    wins (the other is cancelled). Hedges are capped at `budget` × calls, so at
+    most e.g. 5% extra upstream requests; no hedging happens until
+    `min_samples` latencies have been observed.
+
+    Only use it for idempotent requests.
+    """
+
+    def __init__(
+        self,
+        quantile: float = PDB_HEDGE_QUANTILE,
+        budget: float = PDB_HEDGE_BUDGET,
+        min_samples: int = PDB_HEDGE_MIN_SAMPLES,
+        min_delay: float = PDB_HEDGE_MIN_DELAY_SECONDS,
+        window: int = 1000,
+    ):
+        if not 0 < quantile < 1 or budget < 0:
+            raise ValueError("quantile must be in (0, 1) and budget non-negative")
+        self.quantile = quantile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self.calls = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self.budget_denied = 0
+
+    def delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there are too few samples."""
+        if len(self._latencies) < max(1, self.min_samples):
+            return None
+        ordered = sorted(self._latencies)
+        return max(self.min_delay, ordered[min(len(ordered) - 1, int(self.quantile * len(ordered)))])
+
+    def stats(self) -> Dict[str, Any]:
+        delay = self.delay()
+        return {
+            "calls": self.calls,
+            "hedges_fired": self.hedges_fired,
+            "hedges_won": self.hedges_won,
+            "budget_denied": self.budget_denied,
+            "fire_rate": round(self.hedges_fired / self.calls, 4) if self.calls else 0.0,
+            "win_rate": round(self.hedges_won / self.hedges_fired, 4) if self.hedges_fired else 0.0,
+            "hedge_delay_ms": round(delay * 1000, 3) if delay is not None else None,
+        }
+
+    async def run(self, send: Callable[[], Awaitable[T]], hedge_send: Optional[Callable[[], Awaitable[T]]] = None) -> T:
+        """
+        Awaits `send()`, racing it against `hedge_send()` (default: `send()` again)
+        if it is slow and the budget allows.
+        """
+        self.calls += 1
+        primary = asyncio.ensure_future(self._timed(send))
+        hedge: Optional["asyncio.Future[T]"] = None
+        try:
+            delay = self.delay()
+            if delay is None:
+                return await primary
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return primary.result()
+            if self.hedges_fired + 1 > self.budget * self.calls:
+                self.budget_denied += 1
+                return await primary
+
+            self.hedges_fired += 1
+            hedge = asyncio.ensure_future(self._timed(hedge_send or send))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in (primary, hedge):
+                    if task in done and not task.cancelled() and task.exception() is None:
+                        if task is hedge:
+                            self.hedges_won += 1
+                        return task.result()
+            return primary.result()  # Both failed: surface the primary's error
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def _timed(self, send: Callable[[], Awaitable[T]]) -> T:
+        started = time.perf_counter()
+        result = await send()
+        self._latencies.append(time.perf_counter() - started)
+        return result
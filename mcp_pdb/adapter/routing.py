@@ -0,0 +1,177 @@
+# mcp_pdb/adapter/routing.py
+"""
+mcp_pdb.adapter.routing
+~~~~~~~~~~~~~~~~~~~~~~~
+Latency-aware routing of entry lookups across equivalent sources (see
+`sources.py`). Each source keeps an exponentially weighted moving average of
+its latency and of its outcomes (its health); requests go to the source with
+the lowest latency ÷ health and fail over down the ranking on network errors,
+5xx / 429, open circuits or malformed responses, and on a 404 from a source
+that is not authoritative (a mirror that may lag behind new releases). A source that has not been
+used for `SOURCE_PROBE_INTERVAL_SECONDS` is tried first once, so its figures
+stay current and a recovered source wins traffic back.
+
+With a RawDocumentStore, the documents behind every successfully parsed entry
+are kept, so it can be rebuilt locally (see `mcp_pdb.processing.raw_documents`).
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from pydantic import ValidationError
+
+from mcp_pdb.adapter.resilience import CircuitBreaker
+from mcp_pdb.adapter.sources import SourceAdapter
+from mcp_pdb.config import SOURCE_LATENCY_EWMA_ALPHA, SOURCE_PROBE_INTERVAL_SECONDS
+from mcp_pdb.exceptions import DataValidationError, MCPError, NetworkError, PDBAPIError
+from mcp_pdb.schemas import StructureDataset
+from mcp_pdb.utils.raw_store import RawDocumentStore
+
+if TYPE_CHECKING:
+    from mcp_pdb.adapter.pdb_client import PDBClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SourceHealth:
+    latency: Optional[float] = None  # EWMA of successful fetch time, seconds
+    success: float = 1.0  # EWMA of outcomes: 1 per success, 0 per failure
+    requests: int = 0
+    failures: int = 0
+    last_used: Optional[float] = None
+
+    def record(self, ok: bool, latency: Optional[float], alpha: float) -> None:
+        self.requests += 1
+        self.success += alpha * ((1.0 if ok else 0.0) - self.success)
+        if not ok:
+            self.failures += 1
+        elif latency is not None:
+            self.latency = latency if self.latency is None else self.latency + alpha * (latency - self.latency)
+
+    def cost(self) -> float:
+        """Expected seconds per useful response; unmeasured sources rank last."""
+        if self.latency is None:
+            return float("inf")
+        return self.latency / max(self.success, 0.01)
+
+
+@dataclass
+class Source:
+    adapter: SourceAdapter
+    client: "PDBClient"
+    health: SourceHealth = field(default_factory=SourceHealth)
+
+    @property
+    def name(self) -> str:
+        return self.adapter.name
+
+    @property
+    def base_url(self) -> str:
+        return self.client.base_url
+
+
+class SourceRouter:
+    def __init__(
+        self,
+        sources: List[Source],
+        alpha: float = SOURCE_LATENCY_EWMA_ALPHA,
+        probe_interval: float = SOURCE_PROBE_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        raw_store: Optional[RawDocumentStore] = None,
+    ):
+        if not sources:
+            raise ValueError("at least one source is required")
+        self.sources = sources
+        self.alpha = alpha
+        self.probe_interval = probe_interval
+        self._clock = clock
+        self.raw_store = raw_store
+
+    def ranked(self) -> List[Source]:
+        """Sources in the order to try: one due probe, then by cost (ties keep configured order), open circuits last."""
+        now = self._clock()
+        available = [s for s in self.sources if s.client.circuit_breaker.state != CircuitBreaker.OPEN]
+        tripped = [s for s in self.sources if s not in available]
+        probe = next(
+            (s for s in available if s.health.last_used is None or now - s.health.last_used >= self.probe_interval),
+            None,
+        )
+        rest = sorted((s for s in available if s is not probe), key=lambda s: s.health.cost())
+        return ([probe] if probe else []) + rest + tripped
+
+    async def get_structure_summary(self, pdb_id: str) -> StructureDataset:
+        """
+        Fetches and normalises an entry from the best-ranked source, failing over to
+        the next on failure. A 404 from an archive (RCSB, PDBe, PDBj) is final; one
+        from a non-authoritative mirror fails over too. Only the last candidate
+        retries and may serve a stale body (see PDBClient).
+
+        Raises:
+            The first source's error when every source failed (a mirror's 404 only
+            if nothing else went wrong).
+        """
+        ranking = self.ranked()
+        first_error: Optional[MCPError] = None
+        mirror_miss: Optional[PDBAPIError] = None  # Only reported if no archive gave a better answer
+        for position, source in enumerate(ranking):
+            failover = position < len(ranking) - 1
+            paths = source.adapter.entry_paths(pdb_id)
+            source.health.last_used = self._clock()
+            started = time.perf_counter()
+            try:
+                documents = list(await asyncio.gather(*(
+                    source.client._get_json(path, pdb_id, failover=failover) for path in paths
+                )))
+                api_url, retrieved = f"{source.base_url}{paths[0]}", datetime.now(timezone.utc)
+                structure = source.adapter.parse_structure(pdb_id, documents, api_url, retrieved)
+            except PDBAPIError as e:
+                if e.status_code == 404:
+                    source.health.record(True, time.perf_counter() - started, self.alpha)  # Answered; not its fault
+                    if source.adapter.authoritative:
+                        raise
+                    logger.info(f"Source {source.name} does not have {pdb_id} (yet), trying the next source")
+                    mirror_miss = mirror_miss or e
+                    continue
+                error: MCPError = e
+            except NetworkError as e:  # Includes CircuitOpenError
+                error = e
+            except (ValidationError, AttributeError, KeyError, TypeError, ValueError) as e:
+                error = DataValidationError(f"Malformed response from {source.name} for PDB entry '{pdb_id}': {e}")
+            else:
+                source.health.record(True, time.perf_counter() - started, self.alpha)
+                if self.raw_store is not None:
+                    await self._keep_documents(pdb_id, source, api_url, retrieved, paths, documents)
+                return structure
+
+            source.health.record(False, None, self.alpha)
+            first_error = first_error or error
+            if failover:
+                logger.warning(f"Source {source.name} failed for {pdb_id}, failing over: {error.message}")
+        raise first_error or mirror_miss
+
+    async def _keep_documents(self, pdb_id: str, source: Source, api_url: str, retrieved: datetime, paths: List[str], documents: List[Any]) -> None:
+        """Records the documents in the raw store; a failure there never fails the request."""
+        try:
+            await asyncio.to_thread(self.raw_store.record, pdb_id, source.name, api_url, retrieved, paths, documents)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not keep raw documents for {pdb_id}: {e}")
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": source.name,
+                "source": source.adapter.label,
+                "base_url": source.base_url,
+                "latency_ms": round(source.health.latency * 1000, 3) if source.health.latency is not None else None,
+                "health": round(source.health.success, 4),
+                "requests": source.health.requests,
+                "failures": source.health.failures,
+                "circuit": source.client.circuit_breaker.state,
+            }
+            for source in self.sources
+        ]
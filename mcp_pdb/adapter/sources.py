@@ -0,0 +1,285 @@
+# mcp_pdb/adapter/sources.py
+"""
+mcp_pdb.adapter.sources
+~~~~~~~~~~~~~~~~~~~~~~~
+Response adapters for equivalent PDB entry sources. Each adapter names the
+documents to fetch from its source for one entry and normalises them into a
+StructureDataset, so routing can treat the wwPDB partners interchangeably:
+
+•  RCSBAdapter     – RCSB Data API `/rest/v1/core/entry/{id}`
+•  InternalAdapter – an RCSB Data API-compatible internal mirror
+•  PDBeAdapter     – PDBe REST API entry summary, experiment and molecules
+•  PDBjAdapter     – PDBj mmJSON (no atoms): column-oriented mmCIF categories
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+from mcp_pdb.config import INTERNAL_MIRROR_BASE_URL, PDB_API_BASE_URL, PDBE_API_BASE_URL, PDBJ_API_BASE_URL
+from mcp_pdb.exceptions import ConfigurationError
+from mcp_pdb.schemas import ChainInfo, LigandDataset, Provenance, StructureDataset
+
+# (chain IDs, sequence length, organism) per polymer entity / (chem ID, name, instance count) per ligand entity
+Polymer = Tuple[List[str], int, Optional[str]]
+Ligand = Tuple[str, str, int]
+
+CHAIN_ID_MAX_LENGTH = 2  # ChainInfo.chain_id limit; longer author chain IDs are truncated
+
+
+def summary_chain_id(chain_id: Any) -> str:
+    """The ChainInfo.chain_id an author chain ID is listed under."""
+    return str(chain_id)[:CHAIN_ID_MAX_LENGTH]
+
+
+def _as_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (ValueError, TypeError):
+        return None
+
+
+def _iso_date(value: Any) -> Optional[str]:
+    """'2024-05-01T00:00:00Z' / '2024-05-01' / '20240501' -> '2024-05-01'."""
+    text = str(value or "")[:10]
+    if len(text) >= 8 and text[:8].isdigit():
+        return f"{text[:4]}-{text[4:6]}-{text[6:8]}"
+    return text or None
+
+
+def build_structure_dataset(
+    pdb_id: str,
+    title: Optional[str],
+    method: Optional[str],
+    resolution: Optional[float],
+    release_date: Optional[str],
+    revision_date: Optional[str],
+    polymers: Iterable[Polymer],
+    ligands: Iterable[Ligand],
+    provenance: Provenance,
+) -> StructureDataset:
+    """Assembles a StructureDataset; each chain is listed once, under the first entity that claims it."""
+    chains: List[ChainInfo] = []
+    seen = set()
+    for chain_ids, length, organism in polymers:
+        for chain_id in sorted(set(chain_ids)):
+            if chain_id and chain_id not in seen:
+                chains.append(ChainInfo(chain_id=summary_chain_id(chain_id), sequence_length=max(1, length), organism=organism))
+                seen.add(chain_id)
+    return StructureDataset(
+        pdb_id=str(pdb_id),
+        title=str(title or "N/A"),
+        method=str(method or "N/A"),
+        resolution=resolution,
+        release_date=release_date,
+        revision_date=revision_date,
+        chains=chains,
+        ligands=[
+            LigandDataset(chem_id=str(chem_id)[:3], name=str(name or "N/A"), count=max(1, count))
+            for chem_id, name, count in ligands
+            if chem_id
+        ],
+        provenance=provenance,
+    )
+
+
+class SourceAdapter:
+    """Base class: `entry_paths` are fetched (relative to the source's base URL) and passed to `parse_structure` in order."""
+
+    name = ""  # Key in PDB_SOURCES
+    label = ""  # Provenance.source
+    default_base_url = ""
+    authoritative = True  # Whether its 404 means the entry does not exist (False for mirrors that may lag)
+
+    def entry_paths(self, pdb_id: str) -> List[str]:
+        raise NotImplementedError
+
+    def parse_structure(self, pdb_id: str, documents: List[Dict[str, Any]], api_url: str, retrieved: datetime) -> StructureDataset:
+        raise NotImplementedError
+
+    def provenance(self, api_url: str, retrieved: datetime) -> Provenance:
+        return Provenance(source=self.label, retrieved=retrieved, api_url=api_url)
+
+
+class RCSBAdapter(SourceAdapter):
+    name = "rcsb"
+    label = "RCSB PDB"
+    default_base_url = PDB_API_BASE_URL
+
+    def entry_paths(self, pdb_id: str) -> List[str]:
+        return [f"/rest/v1/core/entry/{pdb_id}"]
+
+    def parse_structure(self, pdb_id: str, documents: List[Dict[str, Any]], api_url: str, retrieved: datetime) -> StructureDataset:
+        data = documents[0]
+        method_list = data.get("exptl", [])
+        refine_list = data.get("refine", [])
+        accession_info = data.get("rcsb_accession_info", {})
+
+        polymers: List[Polymer] = []
+        for entity in data.get("polymer_entities", []):
+            entity_poly = entity.get("entity_poly", {})
+            source_organisms = entity.get("rcsb_entity_source_organism", [])
+            seq_length = entity_poly.get("rcsb_sample_sequence_length", 0)
+            if seq_length == 0:
+                seq_length = len(entity_poly.get("pdbx_seq_one_letter_code_can") or "")
+            chain_ids = [c.strip() for c in (entity_poly.get("pdbx_strand_id") or "").split(",") if c.strip()]
+            chain_ids += entity.get("rcsb_polymer_entity_container_identifiers", {}).get("auth_asym_ids", [])
+            polymers.append((chain_ids, seq_length, source_organisms[0].get("ncbi_scientific_name") if source_organisms else None))
+
+        ligands: List[Ligand] = []
+        for entity in data.get("nonpolymer_entities", []):
+            chem_comp = entity.get("nonpolymer_comp", {}).get("chem_comp", {})
+            name = chem_comp.get("name") or entity.get("pdbx_entity_nonpoly", {}).get("name", "N/A")
+            count = entity.get("rcsb_nonpolymer_entity_container_identifiers", {}).get("instance_count", 1)
+            ligands.append((chem_comp.get("id"), name, count))
+
+        return build_structure_dataset(
+            pdb_id,
+            title=data.get("struct", {}).get("title"),
+            method=method_list[0].get("method") if method_list else None,
+            resolution=_as_float(refine_list[0].get("ls_d_res_high")) if refine_list else None,
+            release_date=_iso_date(accession_info.get("initial_release_date")),
+            revision_date=_iso_date(accession_info.get("revision_date")),
+            polymers=polymers,
+            ligands=ligands,
+            provenance=self.provenance(api_url, retrieved),
+        )
+
+
+class InternalAdapter(RCSBAdapter):
+    name = "internal"
+    label = "Internal mirror"
+    default_base_url = INTERNAL_MIRROR_BASE_URL
+    authoritative = False  # May not have synced this week's new entries yet
+
+
+class PDBeAdapter(SourceAdapter):
+    name = "pdbe"
+    label = "PDBe"
+    default_base_url = PDBE_API_BASE_URL
+
+    def entry_paths(self, pdb_id: str) -> List[str]:
+        pdb_id = pdb_id.lower()
+        return [f"/pdb/entry/summary/{pdb_id}", f"/pdb/entry/experiment/{pdb_id}", f"/pdb/entry/molecules/{pdb_id}"]
+
+    def parse_structure(self, pdb_id: str, documents: List[Dict[str, Any]], api_url: str, retrieved: datetime) -> StructureDataset:
+        # Every PDBe response is {"<lower-case id>": [records]}
+        summary, experiments, molecules = (document.get(pdb_id.lower(), []) for document in documents)
+        summary = summary[0] if summary else {}
+        methods = summary.get("experimental_method") or [experiment.get("experimental_method") for experiment in experiments]
+        resolutions = [_as_float(experiment.get("resolution")) for experiment in experiments]
+
+        polymers: List[Polymer] = []
+        ligands: List[Ligand] = []
+        for molecule in molecules:
+            molecule_type = (molecule.get("molecule_type") or "").lower()
+            if molecule_type.startswith("poly"):
+                sources = molecule.get("source") or []
+                polymers.append((
+                    molecule.get("in_chains") or [],
+                    molecule.get("length") or len(molecule.get("sequence") or ""),
+                    sources[0].get("organism_scientific_name") if sources else None,
+                ))
+            elif molecule_type == "bound":
+                chem_ids = molecule.get("chem_comp_ids") or [None]
+                names = molecule.get("molecule_name") or ["N/A"]
+                count = len(molecule.get("in_struct_asyms") or molecule.get("in_chains") or [None])
+                ligands.append((chem_ids[0], names[0], count))
+
+        return build_structure_dataset(
+            pdb_id,
+            title=summary.get("title"),
+            method=methods[0].upper() if methods and methods[0] else None,  # PDBe spells methods in sentence case
+            resolution=next((r for r in resolutions if r is not None), None),
+            release_date=_iso_date(summary.get("release_date")),
+            revision_date=_iso_date(summary.get("revision_date")),
+            polymers=polymers,
+            ligands=ligands,
+            provenance=self.provenance(api_url, retrieved),
+        )
+
+
+class PDBjAdapter(SourceAdapter):
+    name = "pdbj"
+    label = "PDBj"
+    default_base_url = PDBJ_API_BASE_URL
+
+    def entry_paths(self, pdb_id: str) -> List[str]:
+        return [f"/pdbjplus/data/pdb/mmjson-noatom/{pdb_id.lower()}-noatom.json"]
+
+    def parse_structure(self, pdb_id: str, documents: List[Dict[str, Any]], api_url: str, retrieved: datetime) -> StructureDataset:
+        # mmJSON: {"data_<ID>": {category: {item: [value per row]}}}
+        block = next(iter(documents[0].values()), {})
+
+        def column(category: str, item: str) -> List[Any]:
+            return block.get(category, {}).get(item) or []
+
+        def first(category: str, item: str) -> Any:
+            values = column(category, item)
+            return values[0] if values else None
+
+        organisms: Dict[str, str] = {}
+        for category, item in (
+            ("pdbx_entity_src_syn", "organism_scientific"),
+            ("entity_src_nat", "pdbx_organism_scientific"),
+            ("entity_src_gen", "pdbx_gene_src_scientific_name"),
+        ):
+            organisms.update({str(e): name for e, name in zip(column(category, "entity_id"), column(category, item)) if name})
+
+        polymers: List[Polymer] = []
+        for entity_id, strands, sequence in zip(
+            column("entity_poly", "entity_id"),
+            column("entity_poly", "pdbx_strand_id"),
+            column("entity_poly", "pdbx_seq_one_letter_code_can"),
+        ):
+            chain_ids = [c.strip() for c in str(strands or "").split(",") if c.strip()]
+            polymers.append((chain_ids, len("".join(str(sequence or "").split())), organisms.get(str(entity_id))))
+
+        instances: Dict[str, set] = {}
+        for entity_id, asym_id in zip(column("pdbx_nonpoly_scheme", "entity_id"), column("pdbx_nonpoly_scheme", "asym_id")):
+            instances.setdefault(str(entity_id), set()).add(asym_id)
+        ligands: List[Ligand] = [
+            (chem_id, name, len(instances.get(str(entity_id), ())) or 1)
+            for entity_id, chem_id, name in zip(
+                column("pdbx_entity_nonpoly", "entity_id"),
+                column("pdbx_entity_nonpoly", "comp_id"),
+                column("pdbx_entity_nonpoly", "name"),
+            )
+            if chem_id != "HOH"  # Water is not a ligand entity in the RCSB model either
+        ]
+
+        revisions = sorted(_iso_date(d) for d in column("pdbx_audit_revision_history", "revision_date") if d)
+        return build_structure_dataset(
+            pdb_id,
+            title=first("struct", "title"),
+            method=first("exptl", "method"),
+            resolution=_as_float(first("refine", "ls_d_res_high")),
+            release_date=revisions[0] if revisions else None,
+            revision_date=revisions[-1] if revisions else None,
+            polymers=polymers,
+            ligands=ligands,
+            provenance=self.provenance(api_url, retrieved),
+        )
+
+
+SOURCE_ADAPTERS: Dict[str, Type[SourceAdapter]] = {
+    adapter.name: adapter for adapter in (RCSBAdapter, PDBeAdapter, PDBjAdapter, InternalAdapter)
+}
+
+
+def parse_sources(spec: str) -> List[Tuple[SourceAdapter, Optional[str]]]:
+    """
+    `"rcsb,pdbe,internal=https://pdb.mirror.local"` -> [(adapter, base URL override or None), ...] in order.
+
+    Raises:
+        ConfigurationError: for an unknown source name.
+    """
+    sources = []
+    for item in spec.split(","):
+        name, _, url = item.partition("=")
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name not in SOURCE_ADAPTERS:
+            raise ConfigurationError(f"Unknown PDB source '{name}'; expected one of {sorted(SOURCE_ADAPTERS)}.")
+        sources.append((SOURCE_ADAPTERS[name](), url.strip().rstrip("/") or None))
+    return sources
@@ -0,0 +1,105 @@
+# mcp_pdb/adapter/status_client.py
+"""
+mcp_pdb.adapter.status_client
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Reads the wwPDB weekly status lists (`added.pdb`, `modified.pdb`,
+`obsolete.pdb`: one PDB ID per line) from a URL prefix or a local directory.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import httpx
+
+from mcp_pdb.adapter.transport import TransportSettings, build_async_client
+from mcp_pdb.config import PDB_STATUS_BASE_URL
+from mcp_pdb.exceptions import NetworkError, PDBAPIError, PDBClientError
+
+LIST_NAMES = ("added", "modified", "obsolete")
+
+_PDB_ID_RE = re.compile(r"^[0-9][A-Za-z0-9]{3}$")
+
+
+@dataclass
+class UpdateLists:
+    """PDB IDs (upper case, de-duplicated, in file order) from one weekly update."""
+
+    source: str
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    obsolete: List[str] = field(default_factory=list)
+
+
+def parse_id_list(text: str) -> List[str]:
+    """First token of each line that looks like a PDB ID; blank and other lines are skipped."""
+    ids = []
+    for line in text.splitlines():
+        token = line.split(maxsplit=1)[0] if line.strip() else ""
+        if _PDB_ID_RE.match(token):
+            ids.append(token.upper())
+    return list(dict.fromkeys(ids))
+
+
+class StatusListClient:
+    """
+    Loads the update lists from `source`: an http(s) URL prefix (e.g. the wwPDB
+    `status/latest` directory) or a local directory holding the same files.
+    A missing local file counts as an empty list.
+    """
+
+    def __init__(self, source: str = PDB_STATUS_BASE_URL, client: Optional[httpx.AsyncClient] = None):
+        self.source = source.rstrip("/")
+        self._client = client
+        self._created_client = False
+
+    @property
+    def is_remote(self) -> bool:
+        return self.source.startswith(("http://", "https://"))
+
+    async def _get_async_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = build_async_client(settings=TransportSettings().with_read_timeout(30.0))
+            self._created_client = True
+        return self._client
+
+    async def close(self):
+        """Closes the underlying httpx.AsyncClient if it was created by this instance."""
+        if self._client and self._created_client:
+            await self._client.aclose()
+            self._client = None
+            self._created_client = False
+
+    async def get_update_lists(self) -> UpdateLists:
+        lists = UpdateLists(source=self.source)
+        for name in LIST_NAMES:
+            text = await self._read(f"{name}.pdb")
+            setattr(lists, name, parse_id_list(text))
+        return lists
+
+    async def _read(self, filename: str) -> str:
+        if not self.is_remote:
+            try:
+                with open(os.path.join(self.source, filename), encoding="utf-8") as fh:
+                    return fh.read()
+            except FileNotFoundError:
+                return ""
+            except OSError as e:
+                raise PDBClientError(message=f"Could not read update list {filename} from {self.source}: {e}") from e
+
+        url = f"{self.source}/{filename}"
+        client = await self._get_async_client()
+        try:
+            response = await client.get(url)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise PDBAPIError(
+                pdb_id=filename,
+                status_code=e.response.status_code,
+                detail=f"Update list request failed with status {e.response.status_code} at {url}.",
+                resource="Update list",
+            ) from e
+        except httpx.RequestError as e:
+            raise NetworkError(message=f"Network error while requesting update list {url}: {str(e)}") from e
+        return response.text
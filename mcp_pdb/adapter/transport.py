@@ -0,0 +1,164 @@
+# mcp_pdb/adapter/transport.py
+"""
+mcp_pdb.adapter.transport
+~~~~~~~~~~~~~~~~~~~~~~~~~
+Shared construction of the upstream `httpx.AsyncClient`s: HTTP/2, pool limits,
+keep-alive and per-phase timeouts come from config, and every request is timed
+through httpcore's trace hook so pool starvation shows up as a metric.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Any, Deque, Dict, Optional
+
+import httpx
+
+from mcp_pdb.config import (
+    UPSTREAM_CONNECT_TIMEOUT_SECONDS,
+    UPSTREAM_HTTP2,
+    UPSTREAM_KEEPALIVE_EXPIRY_SECONDS,
+    UPSTREAM_MAX_CONNECTIONS,
+    UPSTREAM_MAX_KEEPALIVE_CONNECTIONS,
+    UPSTREAM_POOL_TIMEOUT_SECONDS,
+    UPSTREAM_READ_TIMEOUT_SECONDS,
+    UPSTREAM_WRITE_TIMEOUT_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+_CONNECT_STARTED = ("connection.connect_tcp.started", "connection.connect_unix_socket.started")
+_CONNECT_COMPLETE = ("connection.connect_tcp.complete", "connection.connect_unix_socket.complete", "connection.start_tls.complete")
+
+
+@dataclass(frozen=True)
+class TransportSettings:
+    http2: bool = UPSTREAM_HTTP2
+    max_connections: int = UPSTREAM_MAX_CONNECTIONS
+    max_keepalive_connections: int = UPSTREAM_MAX_KEEPALIVE_CONNECTIONS
+    keepalive_expiry: float = UPSTREAM_KEEPALIVE_EXPIRY_SECONDS
+    connect_timeout: float = UPSTREAM_CONNECT_TIMEOUT_SECONDS
+    read_timeout: float = UPSTREAM_READ_TIMEOUT_SECONDS
+    write_timeout: float = UPSTREAM_WRITE_TIMEOUT_SECONDS
+    pool_timeout: float = UPSTREAM_POOL_TIMEOUT_SECONDS
+
+    def with_read_timeout(self, seconds: float) -> "TransportSettings":
+        return replace(self, read_timeout=seconds)
+
+
+class PoolMetrics:
+    """
+    Per-client request timing. `pool_wait` is the time from handing a request
+    to the connection pool until a connection starts working on it (a new
+    connection being opened, or headers going out on a reused one); `connect`
+    is TCP + TLS setup for new connections. Percentiles cover the most recent
+    `window` requests.
+    """
+
+    def __init__(self, window: int = 1024):
+        self._lock = threading.Lock()
+        self._waits: Deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.new_connections = 0
+        self.pool_wait_total = 0.0
+        self.pool_wait_max = 0.0
+        self.connect_total = 0.0
+
+    def record(self, pool_wait: Optional[float], connect: Optional[float]) -> None:
+        with self._lock:
+            self.requests += 1
+            if pool_wait is not None:
+                self._waits.append(pool_wait)
+                self.pool_wait_total += pool_wait
+                self.pool_wait_max = max(self.pool_wait_max, pool_wait)
+            if connect is not None:
+                self.new_connections += 1
+                self.connect_total += connect
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._waits)
+
+            def percentile(q: float) -> Optional[float]:
+                return round(waits[min(len(waits) - 1, int(q * len(waits)))] * 1000, 3) if waits else None
+
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "pool_wait_ms_p50": percentile(0.5),
+                "pool_wait_ms_p95": percentile(0.95),
+                "pool_wait_ms_p99": percentile(0.99),
+                "pool_wait_ms_max": round(self.pool_wait_max * 1000, 3),
+                "pool_wait_ms_total": round(self.pool_wait_total * 1000, 3),
+                "connect_ms_total": round(self.connect_total * 1000, 3),
+            }
+
+
+class MeteredTransport(httpx.AsyncHTTPTransport):
+    """`httpx.AsyncHTTPTransport` that records pool-wait and connect times into a PoolMetrics."""
+
+    def __init__(self, metrics: PoolMetrics, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.metrics = metrics
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        marks: Dict[str, float] = {}
+        downstream_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            now = time.perf_counter()
+            marks.setdefault("first", now)
+            if event_name in _CONNECT_STARTED:
+                marks["connect_started"] = now
+            elif event_name in _CONNECT_COMPLETE:
+                marks["connect_done"] = now
+            if downstream_trace is not None:
+                result = downstream_trace(event_name, info)
+                if hasattr(result, "__await__"):
+                    await result
+
+        request.extensions["trace"] = trace
+        try:
+            return await super().handle_async_request(request)
+        finally:
+            first = marks.get("first")
+            connect = None
+            if "connect_started" in marks and "connect_done" in marks:
+                connect = marks["connect_done"] - marks["connect_started"]
+            self.metrics.record(first - started if first is not None else None, connect)
+
+
+def build_async_client(
+    base_url: str = "",
+    settings: Optional[TransportSettings] = None,
+    metrics: Optional[PoolMetrics] = None,
+) -> httpx.AsyncClient:
+    """
+    An AsyncClient configured from `settings` (config defaults when omitted).
+    HTTP/2 needs the optional `h2` package (`httpx[http2]`); without it the
+    client falls back to HTTP/1.1 with a warning.
+    """
+    settings = settings or TransportSettings()
+    http2 = settings.http2
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+            http2 = False
+    limits = httpx.Limits(
+        max_connections=settings.max_connections,
+        max_keepalive_connections=settings.max_keepalive_connections,
+        keepalive_expiry=settings.keepalive_expiry,
+    )
+    timeout = httpx.Timeout(
+        connect=settings.connect_timeout,
+        read=settings.read_timeout,
+        write=settings.write_timeout,
+        pool=settings.pool_timeout,
+    )
+    transport = MeteredTransport(metrics or PoolMetrics(), http2=http2, limits=limits)
+    return httpx.AsyncClient(base_url=base_url, timeout=timeout, transport=transport)
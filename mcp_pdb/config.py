@@ -4,6 +4,52 @@ from enum import Enum
 
 # --- Core API Settings ---
 PDB_API_BASE_URL: str = "https://data.rcsb.org"  # Official RCSB Data API
+PDB_FILES_BASE_URL: str = os.getenv("PDB_FILES_BASE_URL", "https://files.rcsb.org")  # Coordinate file server
+PDB_SEARCH_API_URL: str = os.getenv("PDB_SEARCH_API_URL", "https://search.rcsb.org/rcsbsearch/v2/query")  # RCSB Search API
+
+# --- Equivalent entry sources (mirrors), tried in order of measured latency and health ---
+PDB_SOURCES: str = os.getenv("PDB_SOURCES", "rcsb")  # Ordered, e.g. "rcsb,pdbe,pdbj,internal"; "name=url" overrides a base URL
+PDBE_API_BASE_URL: str = os.getenv("PDBE_API_BASE_URL", "https://www.ebi.ac.uk/pdbe/api")  # PDBe REST API
+PDBJ_API_BASE_URL: str = os.getenv("PDBJ_API_BASE_URL", "https://data.pdbj.org")  # PDBj mmJSON files
+INTERNAL_MIRROR_BASE_URL: str = os.getenv("INTERNAL_MIRROR_BASE_URL", "")  # RCSB Data API-compatible mirror; empty disables it
+SOURCE_LATENCY_EWMA_ALPHA: float = float(os.getenv("SOURCE_LATENCY_EWMA_ALPHA", "0.2"))  # Weight of the newest latency / outcome
+SOURCE_PROBE_INTERVAL_SECONDS: float = float(os.getenv("SOURCE_PROBE_INTERVAL_SECONDS", "60"))  # Re-measure an unused source this often
+
+# --- Upstream HTTP transport (shared by the PDB, coordinate and status-list clients) ---
+UPSTREAM_HTTP2: bool = os.getenv("UPSTREAM_HTTP2", "True").lower() == "true"  # Multiplex requests over few connections (needs h2)
+UPSTREAM_MAX_CONNECTIONS: int = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "100"))
+UPSTREAM_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("UPSTREAM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+UPSTREAM_KEEPALIVE_EXPIRY_SECONDS: float = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY_SECONDS", "30"))
+UPSTREAM_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("UPSTREAM_CONNECT_TIMEOUT_SECONDS", "5"))
+UPSTREAM_READ_TIMEOUT_SECONDS: float = float(os.getenv("UPSTREAM_READ_TIMEOUT_SECONDS", "10"))
+UPSTREAM_WRITE_TIMEOUT_SECONDS: float = float(os.getenv("UPSTREAM_WRITE_TIMEOUT_SECONDS", "10"))
+UPSTREAM_POOL_TIMEOUT_SECONDS: float = float(os.getenv("UPSTREAM_POOL_TIMEOUT_SECONDS", "10"))  # Max wait for a free connection
+COORDINATE_READ_TIMEOUT_SECONDS: float = float(os.getenv("COORDINATE_READ_TIMEOUT_SECONDS", "60"))  # Large files stream slowly
+
+# --- Admission control (per-client fair queueing in front of PDBClient) ---
+ADMISSION_MAX_IN_FLIGHT: int = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "32"))  # Concurrent upstream calls
+ADMISSION_MAX_QUEUED: int = int(os.getenv("ADMISSION_MAX_QUEUED", "512"))  # Calls waiting behind them; more are shed
+ADMISSION_MAX_QUEUED_PER_CLIENT: int = int(os.getenv("ADMISSION_MAX_QUEUED_PER_CLIENT", "128"))
+ADMISSION_MAX_QUEUE_WAIT_SECONDS: float = float(os.getenv("ADMISSION_MAX_QUEUE_WAIT_SECONDS", "10"))  # Shed if the estimated wait is longer
+ADMISSION_INTERACTIVE_WEIGHT: float = float(os.getenv("ADMISSION_INTERACTIVE_WEIGHT", "8"))  # Interactive share relative to bulk
+ADMISSION_CLIENT_WEIGHTS: str = os.getenv("ADMISSION_CLIENT_WEIGHTS", "")  # e.g. "team-a=4,batch-key=0.5"; others weigh 1
+
+# --- Upstream resilience (PDBClient) ---
+PDB_RATE_LIMIT_PER_SECOND: float = float(os.getenv("PDB_RATE_LIMIT_PER_SECOND", "10"))  # Token refill rate; halved on each 429
+PDB_RATE_LIMIT_BURST: int = int(os.getenv("PDB_RATE_LIMIT_BURST", "20"))
+PDB_MAX_RETRIES: int = int(os.getenv("PDB_MAX_RETRIES", "3"))  # Retries of idempotent GETs on 429 / 5xx / transport errors
+PDB_RETRY_BACKOFF_BASE_SECONDS: float = float(os.getenv("PDB_RETRY_BACKOFF_BASE_SECONDS", "0.5"))
+PDB_RETRY_BACKOFF_MAX_SECONDS: float = float(os.getenv("PDB_RETRY_BACKOFF_MAX_SECONDS", "10"))
+PDB_CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("PDB_CIRCUIT_FAILURE_THRESHOLD", "5"))  # Consecutive failures that open the breaker
+PDB_CIRCUIT_RESET_SECONDS: float = float(os.getenv("PDB_CIRCUIT_RESET_SECONDS", "30"))
+# Opt-in hedging: duplicate a GET still running after the observed PDB_HEDGE_QUANTILE latency,
+# spending at most PDB_HEDGE_BUDGET extra requests (0.05 = 5%).
+PDB_HEDGE_ENABLED: bool = os.getenv("PDB_HEDGE_ENABLED", "False").lower() == "true"
+PDB_HEDGE_QUANTILE: float = float(os.getenv("PDB_HEDGE_QUANTILE", "0.95"))
+PDB_HEDGE_BUDGET: float = float(os.getenv("PDB_HEDGE_BUDGET", "0.05"))
+PDB_HEDGE_MIN_SAMPLES: int = int(os.getenv("PDB_HEDGE_MIN_SAMPLES", "20"))  # Latencies observed before hedging starts
+PDB_HEDGE_MIN_DELAY_SECONDS: float = float(os.getenv("PDB_HEDGE_MIN_DELAY_SECONDS", "0.05"))
+PDB_STALE_MAX_ENTRIES: int = int(os.getenv("PDB_STALE_MAX_ENTRIES", "1000"))  # Last good GET bodies served while upstream is down
 
 # --- Logging Configuration ---
 class LogLevel(str, Enum):
@@ -20,9 +66,71 @@ CACHE_ENABLED: bool = os.getenv("CACHE_ENABLED", "False").lower() == "true"
 CACHE_MAX_SIZE: int = int(os.getenv("CACHE_MAX_SIZE", "1000")) # Max items in cache
 CACHE_TTL_SECONDS: int = int(os.getenv("CACHE_TTL_SECONDS", "3600")) # Time-to-live for cache entries
 
+# Entry-derived caches use an adaptive TTL: a fraction of the time since the entry's last
+# release/revision, clamped to these bounds (see mcp_pdb.utils.ttl_policy).
+CACHE_TTL_MIN_SECONDS: int = int(os.getenv("CACHE_TTL_MIN_SECONDS", str(CACHE_TTL_SECONDS)))
+CACHE_TTL_MAX_SECONDS: int = int(os.getenv("CACHE_TTL_MAX_SECONDS", str(30 * 24 * 3600)))
+CACHE_TTL_AGE_FRACTION: float = float(os.getenv("CACHE_TTL_AGE_FRACTION", "0.1"))
+CACHE_MEMORY_SAMPLE: int = int(os.getenv("CACHE_MEMORY_SAMPLE", "1000"))  # Entries measured per cache by GET /cache/memory
+
+# Chemical components (ATP, HEM, NAG, ...) are shared by thousands of entries and rarely change,
+# so they get their own, much longer-lived cache.
+CHEMCOMP_CACHE_MAX_SIZE: int = int(os.getenv("CHEMCOMP_CACHE_MAX_SIZE", "5000"))
+CHEMCOMP_CACHE_TTL_SECONDS: int = int(os.getenv("CHEMCOMP_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# Search result pages are keyed by a normalized form of the query; the RCSB index updates weekly.
+SEARCH_CACHE_MAX_SIZE: int = int(os.getenv("SEARCH_CACHE_MAX_SIZE", "2000"))
+SEARCH_CACHE_TTL_SECONDS: int = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", str(24 * 3600)))
+SEARCH_PAGE_SIZE: int = int(os.getenv("SEARCH_PAGE_SIZE", "100"))  # Rows per upstream search page
+
+# --- Coordinates ---
+COORDINATE_CHUNK_ATOMS: int = int(os.getenv("COORDINATE_CHUNK_ATOMS", "65536"))  # _atom_site rows decoded per chunk
+# Memory-mapped on-disk store of decoded atom arrays; an empty directory disables it.
+COORDINATE_STORE_DIR: str = os.getenv("COORDINATE_STORE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "mcp_pdb", "coordinates"))
+COORDINATE_STORE_MAX_BYTES: int = int(os.getenv("COORDINATE_STORE_MAX_BYTES", str(10 * 1024**3)))  # LRU-evicted above this
+SPATIAL_GRID_CELL_SIZE: float = float(os.getenv("SPATIAL_GRID_CELL_SIZE", "5.0"))  # Å; cell edge of the neighbor-search grid
+BINDING_SITE_MAX_CUTOFF: float = 10.0  # Å; larger cutoffs stop describing a pocket
+CONTACT_MAP_CUTOFF: float = float(os.getenv("CONTACT_MAP_CUTOFF", "8.0"))  # Å between CA / C4' atoms
+CONTACT_MAP_MAX_CUTOFF: float = 15.0
+
+# --- Local sequence similarity index ---
+KMER_SIZE: int = int(os.getenv("KMER_SIZE", "4"))  # k-mer length of the local similarity index
+# Where the index is persisted (loaded on first use, saved on shutdown); empty keeps it in memory only.
+SEQUENCE_INDEX_PATH: str = os.getenv("SEQUENCE_INDEX_PATH", os.path.join(os.path.expanduser("~"), ".cache", "mcp_pdb", "sequence_index.npz"))
+
+# --- Local metadata index ---
+# SQLite file holding the scalar fields of every fetched entry; empty keeps it in memory only.
+METADATA_INDEX_PATH: str = os.getenv("METADATA_INDEX_PATH", os.path.join(os.path.expanduser("~"), ".cache", "mcp_pdb", "metadata.sqlite3"))
+
+# --- Raw upstream documents ---
+# Content-addressed, zstd-compressed store of the JSON each entry was built from; empty disables it.
+RAW_STORE_DIR: str = os.getenv("RAW_STORE_DIR", "")
+RAW_STORE_ZSTD_LEVEL: int = int(os.getenv("RAW_STORE_ZSTD_LEVEL", "9"))
+
+# --- Incremental sync from the wwPDB weekly update lists ---
+PDB_STATUS_BASE_URL: str = os.getenv("PDB_STATUS_BASE_URL", "https://files.wwpdb.org/pub/pdb/data/status/latest")
+SYNC_SOURCE: str = os.getenv("SYNC_SOURCE", "")  # URL prefix or local directory; empty uses PDB_STATUS_BASE_URL
+SYNC_INTERVAL_SECONDS: int = int(os.getenv("SYNC_INTERVAL_SECONDS", "0"))  # Periodic sync in the HTTP server; 0 disables it
+SYNC_REFRESH_MODIFIED: bool = os.getenv("SYNC_REFRESH_MODIFIED", "True").lower() == "true"  # Refetch modified entries we hold
+
+# --- Batch fetching ---
+BATCH_FETCH_CONCURRENCY: int = int(os.getenv("BATCH_FETCH_CONCURRENCY", "8"))  # Parallel entry fetches per batch
+
+# --- Bulk export (Arrow / Parquet) ---
+EXPORT_BATCH_ROWS: int = int(os.getenv("EXPORT_BATCH_ROWS", "1000"))  # Entries per record batch / Parquet row group
+
+# --- Admin-only profiling ---
+ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")  # Sent as X-Admin-Token; empty disables /admin endpoints and per-request profiling
+PROFILE_MAX_SECONDS: float = float(os.getenv("PROFILE_MAX_SECONDS", "60"))  # Longest sampling run
+PROFILE_SAMPLE_INTERVAL_MS: float = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+PROFILE_TOP_N: int = int(os.getenv("PROFILE_TOP_N", "15"))  # Functions reported per profiled request
+
 # --- Application Metadata (Optional - for __version__) ---
 APP_VERSION: str = "0.1.0-alpha"
 
+# --- MCP stdio transport ---
+MCP_PROTOCOL_VERSION: str = "2024-11-05"  # Protocol revision advertised during `initialize`
+
 if __name__ == "__main__":
     # Example of how to access settings
     print(f"PDB API Base URL: {PDB_API_BASE_URL}")
@@ -30,4 +138,5 @@ if __name__ == "__main__":
     print(f"Cache Enabled: {CACHE_ENABLED}")
     print(f"Cache Max Size: {CACHE_MAX_SIZE}")
     print(f"Cache TTL (seconds): {CACHE_TTL_SECONDS}")
+    print(f"Chemical component cache TTL (seconds): {CHEMCOMP_CACHE_TTL_SECONDS}")
     print(f"App Version: {APP_VERSION}")
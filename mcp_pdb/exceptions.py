@@ -11,9 +11,10 @@ class PDBClientError(MCPError):
 
 class PDBAPIError(PDBClientError):
     """Raised when the PDB API returns an error or unexpected response."""
-    def __init__(self, pdb_id: str = None, status_code: int = None, detail: str = "Error interacting with PDB API."):
+    def __init__(self, pdb_id: str = None, status_code: int = None, detail: str = "Error interacting with PDB API.", resource: str = "PDB entry"):
         self.pdb_id = pdb_id
         self.status_code = status_code
+        self.resource = resource  # What pdb_id identifies, e.g. "PDB entry" or "Chemical component"
         message = f"PDB API error for ID '{pdb_id}' (Status: {status_code}): {detail}" if pdb_id and status_code else detail
         super().__init__(message)
 
@@ -22,6 +23,18 @@ class NetworkError(PDBClientError):
     def __init__(self, message: str = "A network error occurred."):
         super().__init__(message)
 
+class CircuitOpenError(NetworkError):
+    """Raised without contacting upstream while the circuit breaker is open."""
+    def __init__(self, message: str = "Upstream service unavailable; failing fast.", retry_after: float = 0.0):
+        self.retry_after = retry_after
+        super().__init__(message)
+
+class OverloadedError(MCPError):
+    """Raised when upstream work is shed because the admission queues are full."""
+    def __init__(self, message: str = "Server overloaded; retry later.", retry_after: float = 1.0):
+        self.retry_after = retry_after
+        super().__init__(message)
+
 class ConfigurationError(MCPError):
     """Raised when there is a misconfiguration in the application settings."""
     def __init__(self, message: str = "Application configuration error."):
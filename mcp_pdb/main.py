@@ -1,39 +1,97 @@
 # mcp_pdb/main.py
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+import asyncio
+from fastapi import Body, FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from contextlib import asynccontextmanager
+from typing import List, Optional
 
+from mcp_pdb.adapter.admission import BULK, INTERACTIVE, PRIORITIES, admission_context
+from mcp_pdb.adapter.coordinate_client import CoordinateClient
 from mcp_pdb.adapter.pdb_client import PDBClient
-from mcp_pdb.processing.dataset_builder import build_structure_context
-from mcp_pdb.schemas import StructureDataset
-from mcp_pdb.config import LOG_LEVEL, APP_VERSION
+from mcp_pdb.processing.binding_site import build_binding_site_context
+from mcp_pdb.processing.cache_stats import memory_report, ttl_report
+from mcp_pdb.processing.dataset_builder import build_ligand_context, build_structure_context
+from mcp_pdb.processing.export import MEDIA_TYPES, iter_export, table_schema
+from mcp_pdb.processing.geometry import attach_chain_geometry
+from mcp_pdb.processing.metadata import filter_structures
+from mcp_pdb.processing.search import search_structures
+from mcp_pdb.processing.sequences import attach_sequences, build_sequence_context, iter_fasta
+from mcp_pdb.processing.similarity import find_similar_structures, save_sequence_index
+from mcp_pdb.processing.sync import run_periodic_sync
+from mcp_pdb.schemas import (
+    AdmissionStats,
+    BindingSiteDataset,
+    CacheMemoryStats,
+    CacheTTLStats,
+    ChemicalComponent,
+    ExportRequest,
+    MetadataFilter,
+    MetadataResults,
+    SearchRequest,
+    SearchResults,
+    SequenceDataset,
+    SimilarityRequest,
+    SimilarityResults,
+    SourceStats,
+    StructureDataset,
+    UpstreamPoolStats,
+)
+from mcp_pdb.config import (
+    ADMIN_TOKEN,
+    APP_VERSION,
+    LOG_LEVEL,
+    PDB_STATUS_BASE_URL,
+    PROFILE_MAX_SECONDS,
+    PROFILE_SAMPLE_INTERVAL_MS,
+    SYNC_INTERVAL_SECONDS,
+    SYNC_SOURCE,
+)
 from mcp_pdb.exceptions import (
+    CircuitOpenError,
     MCPError,
+    OverloadedError,
     PDBClientError,
     PDBAPIError,
     NetworkError,
     DataValidationError
 )
+from mcp_pdb.utils import profiling
 import logging
 
 # Configure logging
 logging.basicConfig(level=LOG_LEVEL.value)
 logger = logging.getLogger(__name__)
 
-# Global PDBClient instance, managed by lifespan
+# Global PDBClient / CoordinateClient instances, managed by lifespan
 pdb_client_instance: PDBClient
+coordinate_client_instance: CoordinateClient
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup: Initialize the PDBClient
-    global pdb_client_instance
+    global pdb_client_instance, coordinate_client_instance
     logger.info("Initializing PDBClient for the application...")
     pdb_client_instance = PDBClient()
+    coordinate_client_instance = CoordinateClient()
+    sync_task = None
+    if SYNC_INTERVAL_SECONDS > 0:
+        logger.info(f"Syncing update lists every {SYNC_INTERVAL_SECONDS}s")
+        sync_task = asyncio.create_task(
+            run_periodic_sync(SYNC_INTERVAL_SECONDS, pdb_client_instance, SYNC_SOURCE or PDB_STATUS_BASE_URL)
+        )
     yield
+    if sync_task is not None:
+        sync_task.cancel()
+        try:
+            await sync_task
+        except asyncio.CancelledError:
+            pass
     # Shutdown: Close the PDBClient
     logger.info("Closing PDBClient...")
     await pdb_client_instance.close()
+    await coordinate_client_instance.close()
     logger.info("PDBClient closed.")
+    save_sequence_index()
 
 app = FastAPI(
     title="PDB Model Context Protocol Server",
@@ -42,6 +100,48 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Per-request cProfile (X-Profile header) exists only when admins are configured; otherwise it costs nothing
+if ADMIN_TOKEN:
+    app.add_middleware(profiling.ProfilingMiddleware)
+
+# Routes that fan out into many upstream calls run as bulk work unless the caller says otherwise
+BULK_PATHS = ("/sequences/fasta", "/export")
+# Routes that never call upstream skip admission, so they stay reachable under overload
+ADMISSION_EXEMPT_PREFIXES = ("/filter", "/similar", "/metrics", "/cache", "/admin", "/docs", "/openapi.json", "/redoc")
+
+@app.middleware("http")
+async def admission_middleware(request: Request, call_next):
+    """
+    Attributes the request's upstream calls to its client (X-API-Key, else
+    X-Client-ID, else the peer address) and priority (X-Priority: interactive|bulk),
+    and sheds it up front with 503 when that client's work could not be queued.
+    """
+    path = request.url.path
+    if path == "/" or path.startswith(ADMISSION_EXEMPT_PREFIXES):
+        return await call_next(request)
+    client_id = (
+        request.headers.get("x-api-key")
+        or request.headers.get("x-client-id")
+        or (request.client.host if request.client else None)
+    )
+    priority = request.headers.get("x-priority", "").lower()
+    if priority not in PRIORITIES:
+        priority = BULK if path in BULK_PATHS else INTERACTIVE
+    try:
+        pdb_client_instance.scheduler.check(client_id)
+    except OverloadedError as exc:
+        return overloaded_response(request, exc)
+    with admission_context(client_id, priority):
+        return await call_next(request)
+
+def overloaded_response(request: Request, exc: OverloadedError) -> JSONResponse:
+    logger.warning(f"OverloadedError for {request.method} {request.url.path}: {exc.message}")
+    return JSONResponse(
+        status_code=503, # Service Unavailable
+        content={"message": "The server is at capacity; request shed.", "detail": exc.message},
+        headers={"Retry-After": str(max(1, round(exc.retry_after)))},
+    )
+
 # Exception Handlers
 @app.exception_handler(PDBAPIError)
 async def pdb_api_exception_handler(request: Request, exc: PDBAPIError):
@@ -53,7 +153,7 @@ async def pdb_api_exception_handler(request: Request, exc: PDBAPIError):
         logger.warning(log_message)
         return JSONResponse(
             status_code=404,
-            content={"message": f"PDB entry '{exc.pdb_id}' not found.", "detail": exc.message},
+            content={"message": f"{exc.resource} '{exc.pdb_id}' not found.", "detail": exc.message},
         )
     else:
         logger.error(log_message)
@@ -72,6 +172,19 @@ async def network_exception_handler(request: Request, exc: NetworkError):
         content={"message": "A network error occurred while connecting to an external service.", "detail": exc.message},
     )
 
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_exception_handler(request: Request, exc: CircuitOpenError):
+    logger.warning(f"CircuitOpenError for {request.method} {request.url.path}: {exc.message}")
+    return JSONResponse(
+        status_code=503, # Service Unavailable
+        content={"message": "The PDB API is currently unavailable; failing fast.", "detail": exc.message},
+        headers={"Retry-After": str(max(1, round(exc.retry_after)))},
+    )
+
+@app.exception_handler(OverloadedError)
+async def overloaded_exception_handler(request: Request, exc: OverloadedError):
+    return overloaded_response(request, exc)
+
 @app.exception_handler(DataValidationError)
 async def data_validation_exception_handler(request: Request, exc: DataValidationError):
     logger.warning(f"DataValidationError for {request.method} {request.url.path}: {exc.message} - Errors: {exc.errors}")
@@ -101,13 +214,29 @@ async def read_root():
     return {"message": "Welcome to the PDB-MCP API. See /docs for API documentation."}
 
 @app.get("/structure/{pdb_id}", response_model=StructureDataset)
-async def get_structure(pdb_id: str) -> StructureDataset:
+async def get_structure(
+    pdb_id: str,
+    include_ligand_details: bool = False,
+    include_geometry: bool = False,
+    contact_cutoff: Optional[float] = None,
+    include_sequences: bool = False,
+) -> StructureDataset:
     """
     Retrieve a token-efficient context bundle for a given PDB entry ID.
+
+    With `include_ligand_details=true`, each ligand also carries its chemical
+    component (formula, weight, SMILES, InChIKey) from the shared ligand cache.
+    With `include_geometry=true`, each chain carries its centroid, radius of
+    gyration and bounding box; `contact_cutoff` (Å) adds a sparse residue contact map.
+    With `include_sequences=true`, polymer sequences are attached once per entity.
     """
     logger.info(f"Received request for PDB ID: {pdb_id}")
     try:
-        summary = await build_structure_context(pdb_id, pdb_client_instance)
+        summary = await build_structure_context(pdb_id, pdb_client_instance, include_ligand_details=include_ligand_details)
+        if include_geometry or contact_cutoff is not None:
+            summary = await attach_chain_geometry(summary, pdb_client_instance, coordinate_client_instance, contact_cutoff)
+        if include_sequences:
+            summary = await attach_sequences(summary, pdb_client_instance)
         logger.info(f"Successfully retrieved summary for PDB ID: {pdb_id}")
         return summary
     except MCPError as e: 
@@ -120,6 +249,202 @@ async def get_structure(pdb_id: str) -> StructureDataset:
         logger.exception(f"An unhandled exception occurred while processing PDB ID: {pdb_id} - {str(e)}")
         raise HTTPException(status_code=500, detail="An unexpected internal server error occurred.")
 
+@app.get("/structure/{pdb_id}/sequences", response_model=SequenceDataset)
+async def get_sequences(pdb_id: str) -> SequenceDataset:
+    """
+    Polymer sequences of an entry, one record per entity with the chain IDs that share it.
+    """
+    logger.info(f"Received sequence request for PDB ID: {pdb_id}")
+    try:
+        return await build_sequence_context(pdb_id, pdb_client_instance)
+    except MCPError as e:
+        raise e
+    except Exception as e:
+        logger.exception(f"An unhandled exception occurred while processing sequences for PDB ID: {pdb_id} - {str(e)}")
+        raise HTTPException(status_code=500, detail="An unexpected internal server error occurred.")
+
+@app.post("/sequences/fasta")
+async def stream_fasta(pdb_ids: List[str] = Body(..., min_items=1, example=["4HHB", "1ATP"])) -> StreamingResponse:
+    """
+    Streams FASTA (one record per entity) for a batch of entries, in request order.
+    Entries that cannot be fetched are skipped and logged.
+    """
+    logger.info(f"Received FASTA request for {len(pdb_ids)} entries")
+    return StreamingResponse(iter_fasta(pdb_ids, pdb_client_instance), media_type="text/x-fasta")
+
+@app.post("/export")
+async def export_structures(request: ExportRequest) -> StreamingResponse:
+    """
+    Streams StructureDataset bundles as Parquet or an Arrow IPC stream for ML
+    pipelines, in request order. Entries come from the cache or are fetched in
+    batches; memory stays bounded by EXPORT_BATCH_ROWS however many IDs are sent.
+    Entries that cannot be fetched are skipped and logged.
+    """
+    logger.info(f"Received export request for {len(request.pdb_ids)} entries ({request.table}, {request.format})")
+    table_schema(request.table)  # Fails with ConfigurationError before streaming if pyarrow is missing
+    extension = "parquet" if request.format == "parquet" else "arrows"
+    return StreamingResponse(
+        iter_export(request.pdb_ids, pdb_client_instance, request.table, request.format),
+        media_type=MEDIA_TYPES[request.format],
+        headers={"Content-Disposition": f'attachment; filename="structures-{request.table}.{extension}"'},
+    )
+
+@app.post("/filter", response_model=MetadataResults)
+async def filter_entries(request: MetadataFilter) -> MetadataResults:
+    """
+    Filter every entry this server has fetched by method, resolution, organism,
+    bound ligands, chain count and release date. Makes no upstream calls.
+    """
+    logger.info(f"Received metadata filter request: {request.dict(exclude_defaults=True)}")
+    try:
+        return filter_structures(request)
+    except MCPError as e:
+        raise e
+    except Exception as e:
+        logger.exception(f"An unhandled exception occurred while processing filter request - {str(e)}")
+        raise HTTPException(status_code=500, detail="An unexpected internal server error occurred.")
+
+@app.post("/similar", response_model=SimilarityResults)
+async def find_similar(request: SimilarityRequest) -> SimilarityResults:
+    """
+    Top-k entries whose sequences share the most k-mers with the query, from the
+    local index of every sequence this server has fetched. Makes no upstream calls.
+    """
+    logger.info(f"Received similarity request (length {len(request.sequence)}, top_k {request.top_k})")
+    try:
+        return find_similar_structures(request)
+    except MCPError as e:
+        raise e
+    except Exception as e:
+        logger.exception(f"An unhandled exception occurred while processing similarity request - {str(e)}")
+        raise HTTPException(status_code=500, detail="An unexpected internal server error occurred.")
+
+@app.get("/structure/{pdb_id}/binding_site/{chem_id}", response_model=BindingSiteDataset)
+async def get_binding_site(pdb_id: str, chem_id: str, cutoff: float = 4.0) -> BindingSiteDataset:
+    """
+    Residues within `cutoff` Å of each instance of ligand `chem_id` in the entry.
+    """
+    logger.info(f"Received binding-site request for PDB ID: {pdb_id}, ligand: {chem_id}, cutoff: {cutoff}")
+    try:
+        return await build_binding_site_context(pdb_id, chem_id, cutoff, pdb_client_instance, coordinate_client_instance)
+    except MCPError as e:
+        raise e
+    except Exception as e:
+        logger.exception(f"An unhandled exception occurred while processing binding site {pdb_id}/{chem_id} - {str(e)}")
+        raise HTTPException(status_code=500, detail="An unexpected internal server error occurred.")
+
+@app.get("/ligand/{chem_id}", response_model=ChemicalComponent)
+async def get_ligand(chem_id: str) -> ChemicalComponent:
+    """
+    Retrieve formula, weight, SMILES and InChIKey for a chemical component (e.g., 'ATP').
+    """
+    logger.info(f"Received request for chemical component: {chem_id}")
+    try:
+        return await build_ligand_context(chem_id, pdb_client_instance)
+    except MCPError as e:
+        raise e
+    except Exception as e:
+        logger.exception(f"An unhandled exception occurred while processing chemical component: {chem_id} - {str(e)}")
+        raise HTTPException(status_code=500, detail="An unexpected internal server error occurred.")
+
+@app.post("/search", response_model=SearchResults)
+async def search(request: SearchRequest) -> SearchResults:
+    """
+    Search the PDB by text, attributes, sequence and/or SMILES (clauses are AND-ed).
+
+    Result pages are cached by normalized query, so repeated searches cost nothing upstream.
+    Set `hydrate=true` to also receive a StructureDataset bundle per hit.
+    """
+    logger.info(f"Received search request (max_results={request.max_results}, hydrate={request.hydrate})")
+    try:
+        return await search_structures(request, pdb_client_instance)
+    except MCPError as e:
+        raise e
+    except Exception as e:
+        logger.exception(f"An unhandled exception occurred while processing a search - {str(e)}")
+        raise HTTPException(status_code=500, detail="An unexpected internal server error occurred.")
+
+@app.get("/cache/ttl", response_model=List[CacheTTLStats])
+async def get_cache_ttl() -> List[CacheTTLStats]:
+    """
+    Effective TTL distribution of each cache. Entry-derived caches use an adaptive
+    TTL (bounded by CACHE_TTL_MIN_SECONDS / CACHE_TTL_MAX_SECONDS), so old,
+    unrevised entries sit in the long buckets.
+    """
+    return ttl_report()
+
+@app.get("/cache/memory", response_model=List[CacheMemoryStats])
+async def get_cache_memory() -> List[CacheMemoryStats]:
+    """
+    Measured memory per entry of each cache (CACHE_MEMORY_SAMPLE entries each).
+    The structure cache also reports what its entries would cost as full models.
+    """
+    return await asyncio.to_thread(memory_report)
+
+@app.get("/metrics/upstream", response_model=List[UpstreamPoolStats])
+async def get_upstream_metrics() -> List[UpstreamPoolStats]:
+    """
+    Connection-pool wait and connect times of the upstream clients. A growing
+    pool wait means requests are queuing for connections (raise
+    UPSTREAM_MAX_CONNECTIONS or keep HTTP/2 on). With PDB_HEDGE_ENABLED, the
+    PDB client also reports how often hedges fire and win.
+    """
+    return [
+        UpstreamPoolStats(
+            client=name,
+            http2=upstream.transport_settings.http2,
+            max_connections=upstream.transport_settings.max_connections,
+            hedging=getattr(upstream, "hedger", None) and upstream.hedger.stats(),
+            **upstream.pool_metrics.snapshot(),
+        )
+        for name, upstream in (("pdb", pdb_client_instance), ("coordinates", coordinate_client_instance))
+    ]
+
+@app.get("/metrics/sources", response_model=List[SourceStats])
+async def get_source_metrics() -> List[SourceStats]:
+    """
+    Latency and health of each configured entry source (PDB_SOURCES), in
+    configured order. Entry summaries go to the lowest latency ÷ health source
+    and fail over to the next one.
+    """
+    return [SourceStats(**stats) for stats in pdb_client_instance.router.stats()]
+
+@app.get("/metrics/admission", response_model=AdmissionStats)
+async def get_admission_metrics() -> AdmissionStats:
+    """
+    Upstream admission: calls in flight and queued, the estimated queue wait, and
+    how many calls were admitted or shed per priority. Sustained shedding of
+    interactive calls means ADMISSION_MAX_IN_FLIGHT is too low for the load.
+    """
+    return AdmissionStats(**pdb_client_instance.scheduler.stats())
+
+@app.get("/admin/profile", response_class=PlainTextResponse)
+async def profile_process(
+    seconds: float = Query(10.0, gt=0, le=PROFILE_MAX_SECONDS),
+    interval_ms: float = Query(PROFILE_SAMPLE_INTERVAL_MS, ge=1, le=1000),
+    x_admin_token: Optional[str] = Header(None),
+) -> PlainTextResponse:
+    """
+    Samples every thread's stack for `seconds` and returns collapsed stacks
+    (`frame;frame;frame count` per line): pipe into flamegraph.pl or load into
+    speedscope. Admin only (X-Admin-Token); one profile runs at a time.
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not profiling.is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required.")
+    if not profiling.try_acquire():
+        raise HTTPException(status_code=409, detail="A profile is already running.")
+    logger.info(f"Sampling stacks for {seconds}s every {interval_ms}ms")
+    sampler = profiling.StackSampler(interval_ms / 1000)
+    try:
+        sampler.start()
+        await asyncio.sleep(seconds)
+    finally:
+        await asyncio.to_thread(sampler.stop)
+        profiling.release()
+    return PlainTextResponse(sampler.collapsed(), headers={"X-Profile-Samples": str(sampler.samples)})
+
 if __name__ == "__main__":
     import uvicorn
     # To run: uvicorn mcp_pdb.main:app --reload
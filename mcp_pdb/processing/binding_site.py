@@ -0,0 +1,143 @@
+"""
+mcp_pdb.processing.binding_site
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"Which residues line the pocket for this ligand?"
+
+Ligand atoms are looked up by component ID in the entry's AtomArrays, grouped
+into instances by (chain, residue number), and all of them are queried against
+a CellGrid built once over the whole entry. Contacts are reduced to one
+minimum distance per (instance, residue) with NumPy grouping, so there is no
+per-atom Python loop anywhere on the path. Grids and results are cached.
+"""
+
+import asyncio
+import logging
+from typing import List, Optional
+
+import numpy as np
+
+from mcp_pdb.adapter.coordinate_client import AtomArrays, CoordinateClient
+from mcp_pdb.adapter.pdb_client import PDBClient
+from mcp_pdb.config import BINDING_SITE_MAX_CUTOFF, SPATIAL_GRID_CELL_SIZE
+from mcp_pdb.exceptions import DataValidationError
+from mcp_pdb.processing.coordinates import load_coordinates
+from mcp_pdb.schemas import BindingSite, BindingSiteDataset, BindingSiteResidue
+from mcp_pdb.utils.cache import LRUCache
+from mcp_pdb.utils.spatial_index import CellGrid
+
+logger = logging.getLogger(__name__)
+
+binding_site_cache = LRUCache()  # (PDB ID, chem ID, cutoff) -> BindingSiteDataset
+grid_cache = LRUCache()  # PDB ID -> CellGrid over all atoms of the entry
+
+WATER_NAMES = ("HOH", "DOD", "WAT")
+
+
+def get_cell_grid(atoms: AtomArrays) -> CellGrid:
+    """Returns the entry-wide CellGrid, building it on first use."""
+    grid = grid_cache.get(atoms.pdb_id)
+    if grid is None or len(grid) != len(atoms):
+        grid = CellGrid(atoms.xyz, cell_size=SPATIAL_GRID_CELL_SIZE)
+        grid_cache.set(atoms.pdb_id, grid)
+    return grid
+
+
+def find_binding_sites(atoms: AtomArrays, chem_id: str, cutoff: float, grid: Optional[CellGrid] = None) -> List[BindingSite]:
+    """
+    Returns the contacting residues for every instance of `chem_id` in `atoms`.
+
+    Waters and the ligand instance's own atoms are not reported as contacts;
+    other HETATM groups (ions, cofactors, other ligand copies) are, flagged `hetero`.
+    """
+    chem_id = chem_id.strip().upper()
+    if chem_id not in atoms.res_names:
+        return []
+    ligand_mask = (atoms.res_name == atoms.res_names.index(chem_id)) & atoms.hetero
+    ligand_atoms = np.nonzero(ligand_mask)[0]
+    if len(ligand_atoms) == 0:
+        return []
+
+    # One int64 key per (chain, residue number) identifies a residue / ligand instance.
+    residue_key = (atoms.chain.astype(np.int64) << 32) | (atoms.res_seq.astype(np.int64) & 0xFFFFFFFF)
+    instance_keys, instance_of_atom = np.unique(residue_key[ligand_atoms], return_inverse=True)
+    instance_of_atom = instance_of_atom.reshape(-1)
+    atoms_per_instance = np.bincount(instance_of_atom, minlength=len(instance_keys))
+
+    grid = grid if grid is not None else get_cell_grid(atoms)
+    query_idx, atom_idx, distance = grid.query_radius(atoms.xyz[ligand_atoms], cutoff)
+    instance = instance_of_atom[query_idx]
+
+    water_codes = [atoms.res_names.index(name) for name in WATER_NAMES if name in atoms.res_names]
+    keep = ~np.isin(atoms.res_name[atom_idx], water_codes)
+    keep &= ~(ligand_mask[atom_idx] & (residue_key[atom_idx] == instance_keys[instance]))
+    instance, atom_idx, distance = instance[keep], atom_idx[keep], distance[keep]
+
+    # Reduce atom contacts to one minimum distance per (instance, residue).
+    groups = np.stack([instance, residue_key[atom_idx], atoms.res_name[atom_idx].astype(np.int64)], axis=1)
+    unique_groups, group_of_contact, first_contact = _unique_rows(groups)
+    min_distance = np.full(len(unique_groups), np.inf, dtype=np.float32)
+    np.minimum.at(min_distance, group_of_contact, distance)
+    group_atom = atom_idx[first_contact]
+
+    sites: List[BindingSite] = []
+    for i, key in enumerate(instance_keys):
+        members = np.nonzero(unique_groups[:, 0] == i)[0]
+        members = members[np.argsort(min_distance[members], kind="stable")]
+        chain_code, res_seq = int(key >> 32), int(np.int32(key & 0xFFFFFFFF))
+        sites.append(BindingSite(
+            chem_id=chem_id,
+            chain_id=atoms.chain_ids[chain_code],
+            res_seq=res_seq,
+            atom_count=int(atoms_per_instance[i]),
+            residues=[
+                BindingSiteResidue(
+                    chain_id=atoms.chain_ids[atoms.chain[group_atom[g]]],
+                    res_seq=int(atoms.res_seq[group_atom[g]]),
+                    res_name=atoms.res_names[atoms.res_name[group_atom[g]]],
+                    min_distance=round(float(min_distance[g]), 2),
+                    hetero=bool(atoms.hetero[group_atom[g]]),
+                )
+                for g in members
+            ],
+        ))
+    return sites
+
+
+async def build_binding_site_context(
+    pdb_id: str,
+    chem_id: str,
+    cutoff: float,
+    pdb_client: PDBClient,
+    coordinate_client: CoordinateClient,
+) -> BindingSiteDataset:
+    """
+    Cached binding-site lookup for one ligand in one entry.
+
+    Raises:
+        DataValidationError: If the cutoff is out of range or the coordinates cannot be decoded.
+        PDBClientError (and its subclasses) if fetching the entry or its coordinates fails.
+    """
+    if not 0 < cutoff <= BINDING_SITE_MAX_CUTOFF:
+        raise DataValidationError(f"cutoff must be in (0, {BINDING_SITE_MAX_CUTOFF}] Å, got {cutoff}.")
+    pdb_id, chem_id = pdb_id.strip().upper(), chem_id.strip().upper()
+    key = (pdb_id, chem_id, round(float(cutoff), 2))
+
+    cached = binding_site_cache.get(key)
+    if isinstance(cached, BindingSiteDataset):
+        logger.debug(f"Binding-site cache hit for {key}")
+        return cached
+
+    atoms, provenance = await load_coordinates(pdb_id, pdb_client, coordinate_client)
+    # Building the grid over a large assembly takes seconds; keep it off the event loop.
+    sites = await asyncio.to_thread(find_binding_sites, atoms, chem_id, key[2])
+    result = BindingSiteDataset(pdb_id=pdb_id, chem_id=chem_id, cutoff=key[2], sites=sites, provenance=provenance)
+    binding_site_cache.set(key, result)
+    return result
+
+
+def _unique_rows(rows: np.ndarray):
+    """np.unique over rows → (unique rows, inverse index, index of first occurrence)."""
+    if len(rows) == 0:
+        return rows.reshape(0, rows.shape[1] if rows.ndim == 2 else 0), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    unique, first, inverse = np.unique(rows, axis=0, return_index=True, return_inverse=True)
+    return unique, inverse.reshape(-1), first
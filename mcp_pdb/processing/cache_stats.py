@@ -0,0 +1,34 @@
+"""
+mcp_pdb.processing.cache_stats
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Reports over every in-process cache, by name.
+"""
+
+from typing import Dict, List
+
+from mcp_pdb.processing import binding_site, coordinates, dataset_builder, geometry, search, sequences
+from mcp_pdb.schemas import CacheMemoryStats, CacheTTLStats
+from mcp_pdb.utils.cache import LRUCache
+
+
+def named_caches() -> Dict[str, LRUCache]:
+    return {
+        "structure": dataset_builder.cache,
+        "ligand": dataset_builder.ligand_cache,
+        "sequence": sequences.sequence_cache,
+        "coordinate": coordinates.coordinate_cache,
+        "geometry": geometry.geometry_cache,
+        "binding_site": binding_site.binding_site_cache,
+        "grid": binding_site.grid_cache,
+        "search": search.search_cache,
+    }
+
+
+def ttl_report() -> List[CacheTTLStats]:
+    """Effective TTL distribution of each cache (adaptive TTLs show up as spread within one cache)."""
+    return [CacheTTLStats(cache=name, **cache.ttl_distribution()) for name, cache in named_caches().items()]
+
+
+def memory_report() -> List[CacheMemoryStats]:
+    """Measured memory per entry of each cache, from a sample of its most recently used entries."""
+    return [CacheMemoryStats(cache=name, **cache.memory_usage()) for name, cache in named_caches().items()]
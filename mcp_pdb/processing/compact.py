@@ -0,0 +1,129 @@
+"""
+mcp_pdb.processing.compact
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+Compact cache-resident form of StructureDataset.
+
+A cached bundle is a handful of plain tuples instead of a tree of pydantic models:
+
+•  repeated values (method, organism, ligand ID and name, source, chain IDs) are
+   interned, so "Homo sapiens" is stored once however many entries mention it
+•  consecutive chains with the same length and organism (the copies of one entity)
+   collapse into one `(chain_ids, length, organism)` group
+•  the provenance URL is kept as a plain string rather than a parsed HttpUrl
+
+`CompactStructureCache` packs on `set` and materializes a StructureDataset on
+`get`, so callers never see the packed form. Bundles carrying optional extras
+(chain geometry, ligand components, sequences, coordinate URLs) are rare in the
+cache and are stored unpacked.
+"""
+
+import sys
+from datetime import date, datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from mcp_pdb.config import CACHE_MEMORY_SAMPLE
+from mcp_pdb.schemas import ChainInfo, LigandDataset, Provenance, StructureDataset
+from mcp_pdb.utils.cache import LRUCache, deep_sizeof
+
+# (comma-joined chain IDs, sequence length, organism) per entity
+ChainGroup = Tuple[str, int, Optional[str]]
+# (chem_id, name, count)
+PackedLigand = Tuple[str, str, int]
+
+
+class PackedStructure(NamedTuple):
+    pdb_id: str
+    title: str
+    method: str
+    resolution: Optional[float]
+    release_date: Optional[date]
+    revision_date: Optional[date]
+    chains: Tuple[ChainGroup, ...]
+    ligands: Tuple[PackedLigand, ...]
+    source: str
+    retrieved: datetime
+    api_url: str
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return None if value is None else sys.intern(value)
+
+
+def _group_chains(chains: List[ChainInfo]) -> Tuple[ChainGroup, ...]:
+    groups: List[List[Any]] = []
+    for chain in chains:
+        if groups and groups[-1][1] == chain.sequence_length and groups[-1][2] == chain.organism:
+            groups[-1][0].append(chain.chain_id)
+        else:
+            groups.append([[chain.chain_id], chain.sequence_length, chain.organism])
+    return tuple((sys.intern(",".join(ids)), length, _intern(organism)) for ids, length, organism in groups)
+
+
+def pack_structure(structure: StructureDataset) -> Optional[PackedStructure]:
+    """The compact form of `structure`, or None if it carries extras the compact form does not hold."""
+    if (
+        structure.sequences is not None
+        or structure.provenance.coordinates_url is not None
+        or any(chain.geometry is not None for chain in structure.chains)
+        or any(ligand.component is not None for ligand in structure.ligands)
+    ):
+        return None
+    return PackedStructure(
+        pdb_id=structure.pdb_id,
+        title=structure.title,
+        method=sys.intern(structure.method),
+        resolution=structure.resolution,
+        release_date=structure.release_date,
+        revision_date=structure.revision_date,
+        chains=_group_chains(structure.chains),
+        ligands=tuple((sys.intern(ligand.chem_id), sys.intern(ligand.name), ligand.count) for ligand in structure.ligands),
+        source=sys.intern(structure.provenance.source),
+        retrieved=structure.provenance.retrieved,
+        api_url=str(structure.provenance.api_url),
+    )
+
+
+def unpack_structure(packed: PackedStructure) -> StructureDataset:
+    """
+    Materializes the StructureDataset that `packed` was made from. The values were
+    validated when the bundle was built, so only the provenance URL is re-parsed.
+    """
+    chains = [
+        ChainInfo.construct(chain_id=chain_id, sequence_length=length, organism=organism)
+        for chain_ids, length, organism in packed.chains
+        for chain_id in chain_ids.split(",")
+    ]
+    ligands = [LigandDataset.construct(chem_id=chem_id, name=name, count=count) for chem_id, name, count in packed.ligands]
+    provenance = Provenance(source=packed.source, retrieved=packed.retrieved, api_url=packed.api_url)
+    return StructureDataset.construct(
+        pdb_id=packed.pdb_id,
+        title=packed.title,
+        method=packed.method,
+        resolution=packed.resolution,
+        release_date=packed.release_date,
+        revision_date=packed.revision_date,
+        chains=chains,
+        ligands=ligands,
+        provenance=provenance,
+    )
+
+
+class CompactStructureCache(LRUCache):
+    """LRUCache that holds StructureDatasets packed and hands them out materialized."""
+
+    def set(self, key: Any, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        if isinstance(value, StructureDataset):
+            value = pack_structure(value) or value
+        super().set(key, value, ttl_seconds=ttl_seconds)
+
+    def get(self, key: Any) -> Optional[Any]:
+        value = super().get(key)
+        return unpack_structure(value) if isinstance(value, PackedStructure) else value
+
+    def memory_usage(self, sample: int = CACHE_MEMORY_SAMPLE) -> Dict[str, Any]:
+        """LRUCache.memory_usage, plus what the same sample costs as materialized models."""
+        usage = super().memory_usage(sample)
+        values = self._sample_values(sample)
+        models = [unpack_structure(v) if isinstance(v, PackedStructure) else v for v in values]
+        usage["materialized_bytes_per_entry"] = deep_sizeof(models) / len(models) if models else None
+        return usage
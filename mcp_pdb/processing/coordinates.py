@@ -0,0 +1,99 @@
+"""
+mcp_pdb.processing.coordinates
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Tiered access to decoded atom arrays.
+
+    memory (`coordinate_cache`, LRUCache)  →  disk (`coordinate_store`, memory-mapped .npy)
+    →  upstream (CoordinateClient stream)
+
+Entries are written to the disk tier once and always handed out as memory
+maps, so repeated geometric queries neither re-parse nor copy. The stored
+record carries the same Provenance as the entry's StructureDataset, extended
+with the coordinate file URL, so the summary bundle and the coordinate data
+share one provenance record.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from mcp_pdb.adapter.coordinate_client import ARRAY_FIELDS, VOCAB_FIELDS, AtomArrays, CoordinateClient
+from mcp_pdb.adapter.pdb_client import PDBClient
+from mcp_pdb.config import COORDINATE_STORE_DIR
+from mcp_pdb.processing.dataset_builder import build_structure_context, structure_ttl
+from mcp_pdb.schemas import Provenance
+from mcp_pdb.utils.cache import LRUCache
+from mcp_pdb.utils.coordinate_store import CoordinateStore
+
+logger = logging.getLogger(__name__)
+
+coordinate_cache = LRUCache()  # Memory tier: (AtomArrays, Provenance), arrays memory-mapped when the store is on
+coordinate_store: Optional[CoordinateStore] = CoordinateStore() if COORDINATE_STORE_DIR else None
+
+
+async def load_coordinates(pdb_id: str, pdb_client: PDBClient, coordinate_client: CoordinateClient) -> Tuple[AtomArrays, Provenance]:
+    """
+    Returns the entry's atom arrays and their provenance, fetching and storing them on a miss.
+
+    Raises:
+        PDBClientError (and its subclasses) if the summary or coordinate download fails.
+        DataValidationError if the coordinate file cannot be decoded.
+    """
+    key = pdb_id.strip().upper()
+
+    cached = coordinate_cache.get(key)
+    if cached is not None:
+        return cached
+
+    if coordinate_store is not None:
+        record = coordinate_store.get(key)
+        if record is not None:
+            logger.debug(f"Coordinate store hit for PDB ID: {key}")
+            loaded = record_to_coordinates(*record)
+            coordinate_cache.set(key, loaded)
+            return loaded
+
+    logger.info(f"Coordinate miss for PDB ID: {key}. Streaming from {coordinate_client.coordinate_url(key)}")
+    summary = await build_structure_context(key, pdb_client)
+    atoms = await coordinate_client.stream_atom_arrays(key)
+    provenance = summary.provenance.copy(update={"coordinates_url": coordinate_client.coordinate_url(key)})
+
+    loaded = (atoms, provenance)
+    if coordinate_store is not None:
+        coordinate_store.put(key, *coordinates_to_record(atoms, provenance))
+        # Hand out the memory-mapped copy so the freshly decoded arrays can be freed.
+        loaded = record_to_coordinates(*coordinate_store.get(key))
+    coordinate_cache.set(key, loaded, ttl_seconds=structure_ttl(summary))
+    return loaded
+
+
+def coordinates_to_record(atoms: AtomArrays, provenance: Provenance) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """Splits AtomArrays + Provenance into the store's (arrays, meta) form."""
+    arrays = {name: getattr(atoms, name) for name in ARRAY_FIELDS}
+    meta = {name: list(getattr(atoms, name)) for name in VOCAB_FIELDS}
+    meta["pdb_id"] = atoms.pdb_id
+    meta["provenance"] = json.loads(provenance.json())
+    return arrays, meta
+
+
+def record_to_coordinates(arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> Tuple[AtomArrays, Provenance]:
+    """Inverse of coordinates_to_record; arrays are used as given (memory maps stay memory maps)."""
+    atoms = AtomArrays(
+        pdb_id=meta["pdb_id"],
+        **{name: arrays[name] for name in ARRAY_FIELDS},
+        **{name: tuple(meta[name]) for name in VOCAB_FIELDS},
+    )
+    return atoms, Provenance.parse_obj(meta["provenance"])
+
+
+def invalidate_coordinates(pdb_id: str) -> bool:
+    """Removes an entry from both the memory and disk tiers; returns whether either held it."""
+    key = pdb_id.strip().upper()
+    present = key in coordinate_cache
+    coordinate_cache.delete(key)
+    if coordinate_store is not None:
+        present = present or key in coordinate_store
+        coordinate_store.delete(key)
+    return present
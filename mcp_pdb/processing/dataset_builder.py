@@ -1,26 +1,42 @@
+import asyncio
 import logging
+from typing import Dict, Iterable, List, Optional
 
 from mcp_pdb.adapter.pdb_client import PDBClient
-from mcp_pdb.schemas import StructureDataset
+from mcp_pdb.config import BATCH_FETCH_CONCURRENCY, CHEMCOMP_CACHE_MAX_SIZE, CHEMCOMP_CACHE_TTL_SECONDS
+from mcp_pdb.processing.compact import CompactStructureCache
+from mcp_pdb.processing.metadata import index_structure
+from mcp_pdb.processing.raw_documents import fresh_structure, remaining_ttl
+from mcp_pdb.schemas import ChemicalComponent, StructureDataset
 from mcp_pdb.utils.cache import LRUCache
+from mcp_pdb.utils.ttl_policy import adaptive_ttl
 # from mcp_pdb.config import settings # If we need more specific config here beyond cache defaults
 
 logger = logging.getLogger(__name__)
 
 # Initialize a global cache instance for this module, or pass it around.
 # For simplicity, we'll instantiate it here. Consider dependency injection for more complex apps.
-cache = LRUCache() # Uses default CACHE_MAX_SIZE and CACHE_TTL_SECONDS from config
+# Bundles are held packed (interned strings, chains grouped by entity) and materialized on each hit.
+cache = CompactStructureCache() # Uses default CACHE_MAX_SIZE and CACHE_TTL_SECONDS from config
 
-async def build_structure_context(pdb_id: str, pdb_client: PDBClient) -> StructureDataset:
+# Chemical components are keyed by CCD ID only, so one fetch of ATP/HEM/NAG serves every entry that binds it.
+ligand_cache = LRUCache(max_size=CHEMCOMP_CACHE_MAX_SIZE, ttl_seconds=CHEMCOMP_CACHE_TTL_SECONDS)
+# In-flight component fetches, so concurrent misses for the same CCD ID share one upstream request.
+_ligand_fetches: Dict[str, "asyncio.Future[ChemicalComponent]"] = {}
+
+async def build_structure_context(pdb_id: str, pdb_client: PDBClient, include_ligand_details: bool = False) -> StructureDataset:
     """
     Builds a structure dataset for a given PDB ID.
 
-    It first checks a local cache for the data. If not found or expired,
-    it fetches the data using the PDBClient and then caches the result.
+    It first checks a local cache for the data. If not found or expired, it
+    rebuilds the entry from the client's raw document store when those documents
+    are still fresh, else fetches it using the PDBClient, and then caches the result.
 
     Args:
         pdb_id: The PDB ID to fetch data for.
         pdb_client: An instance of PDBClient to use for API calls.
+        include_ligand_details: If True, attach each ligand's ChemicalComponent
+            (formula, weight, SMILES, InChIKey) from the shared ligand cache.
 
     Returns:
         A StructureDataset object.
@@ -36,12 +52,24 @@ async def build_structure_context(pdb_id: str, pdb_client: PDBClient) -> Structu
     if cached_data:
         logger.info(f"Cache hit for PDB ID: {pdb_id}")
         if isinstance(cached_data, StructureDataset):
+            if include_ligand_details:
+                return await attach_ligand_details(cached_data, pdb_client)
             return cached_data
         else:
             # This case should ideally not happen if only StructureDataset objects are cached.
             logger.warning(f"Cached data for {pdb_id} is not a StructureDataset instance. Fetching again.")
             cache.delete(pdb_id) # Remove invalid entry
 
+    raw_store = getattr(pdb_client, "raw_store", None)
+    structure_data = await asyncio.to_thread(fresh_structure, pdb_id, raw_store) if raw_store is not None else None
+    if structure_data is not None:
+        logger.info(f"Cache miss for PDB ID: {pdb_id}. Rebuilt from local raw documents.")
+        cache.set(pdb_id, structure_data, ttl_seconds=remaining_ttl(structure_data))
+        index_structure(structure_data)
+        if include_ligand_details:
+            return await attach_ligand_details(structure_data, pdb_client)
+        return structure_data
+
     logger.info(f"Cache miss for PDB ID: {pdb_id}. Fetching from PDB API.")
     # If not in cache or expired, fetch from PDB API
     try:
@@ -53,10 +81,123 @@ async def build_structure_context(pdb_id: str, pdb_client: PDBClient) -> Structu
     # Store in cache
     if structure_data:
         logger.info(f"Storing fetched data for PDB ID: {pdb_id} in cache.")
-        cache.set(pdb_id, structure_data)
+        cache.set(pdb_id, structure_data, ttl_seconds=structure_ttl(structure_data))
+        index_structure(structure_data)
+        if include_ligand_details:
+            return await attach_ligand_details(structure_data, pdb_client)
     
     return structure_data
 
+def structure_ttl(structure: StructureDataset) -> float:
+    """Cache lifetime for data derived from an entry, from its release / revision dates."""
+    return adaptive_ttl(structure.release_date, structure.revision_date)
+
+async def build_structure_contexts(
+    pdb_ids: Iterable[str],
+    pdb_client: PDBClient,
+    concurrency: int = BATCH_FETCH_CONCURRENCY,
+    include_ligand_details: bool = False,
+    skip_errors: bool = False,
+) -> List[StructureDataset]:
+    """
+    Batch variant of build_structure_context: fetches many entries with bounded concurrency.
+
+    Each entry goes through the same cache as single lookups, and chemical
+    components are shared across the batch via the ligand cache.
+
+    Args:
+        pdb_ids: PDB IDs to fetch; duplicates are fetched once.
+        pdb_client: An instance of PDBClient to use for API calls.
+        concurrency: Maximum number of entries fetched at the same time.
+        include_ligand_details: Attach ChemicalComponent details to each ligand.
+        skip_errors: If True, entries that fail are logged and omitted instead of raising.
+
+    Returns:
+        StructureDataset objects in the order of first appearance in `pdb_ids`.
+    """
+    unique_ids = list(dict.fromkeys(pdb_ids))
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch_one(pdb_id: str) -> StructureDataset:
+        async with semaphore:
+            return await build_structure_context(pdb_id, pdb_client, include_ligand_details=include_ligand_details)
+
+    results = await asyncio.gather(*(fetch_one(pdb_id) for pdb_id in unique_ids), return_exceptions=True)
+
+    datasets: List[StructureDataset] = []
+    for pdb_id, result in zip(unique_ids, results):
+        if isinstance(result, BaseException):
+            if not skip_errors or not isinstance(result, Exception):
+                raise result
+            logger.warning(f"Skipping PDB ID {pdb_id} in batch: {result}")
+        elif result is not None:
+            datasets.append(result)
+    return datasets
+
+async def build_ligand_context(chem_id: str, pdb_client: PDBClient) -> ChemicalComponent:
+    """
+    Returns the ChemicalComponent for a CCD ID, served from the long-TTL ligand cache when possible.
+
+    Concurrent callers missing on the same ID await a single upstream fetch.
+
+    Raises:
+        PDBClientError (and its subclasses) if the API call fails.
+    """
+    key = chem_id.strip().upper()
+
+    cached_component = ligand_cache.get(key)
+    if isinstance(cached_component, ChemicalComponent):
+        logger.debug(f"Ligand cache hit for chemical component: {key}")
+        return cached_component
+
+    task = _ligand_fetches.get(key)
+    if task is None:
+        logger.info(f"Ligand cache miss for chemical component: {key}. Fetching from PDB API.")
+        # The fetch is not owned by any one caller, so a cancelled caller never cancels it for the others.
+        task = asyncio.ensure_future(_fetch_ligand(key, pdb_client))
+        _ligand_fetches[key] = task
+        task.add_done_callback(lambda done: _ligand_settled(key, done))
+    return await asyncio.shield(task)
+
+async def _fetch_ligand(key: str, pdb_client: PDBClient) -> ChemicalComponent:
+    component = await pdb_client.get_chemical_component(key)
+    ligand_cache.set(key, component)
+    return component
+
+def _ligand_settled(key: str, task: "asyncio.Future[ChemicalComponent]") -> None:
+    if _ligand_fetches.get(key) is task:
+        del _ligand_fetches[key]
+    if not task.cancelled():
+        task.exception()  # Mark retrieved so a failure nobody awaited is not logged as "never retrieved"
+
+async def attach_ligand_details(structure: StructureDataset, pdb_client: PDBClient) -> StructureDataset:
+    """
+    Returns a copy of `structure` whose ligands carry their ChemicalComponent.
+
+    Components that cannot be fetched are left as None rather than failing the whole bundle.
+    """
+    chem_ids = sorted({ligand.chem_id.upper() for ligand in structure.ligands if ligand.component is None})
+    if not chem_ids:
+        return structure
+
+    results = await asyncio.gather(
+        *(build_ligand_context(chem_id, pdb_client) for chem_id in chem_ids), return_exceptions=True
+    )
+    components: Dict[str, Optional[ChemicalComponent]] = {}
+    for chem_id, result in zip(chem_ids, results):
+        if isinstance(result, ChemicalComponent):
+            # Provenance is already on the bundle; dropping it here keeps the embedded copy token-light.
+            components[chem_id] = ChemicalComponent(**result.dict(exclude={"provenance"}))
+        else:
+            logger.warning(f"Could not fetch chemical component {chem_id} for {structure.pdb_id}: {result}")
+            components[chem_id] = None
+
+    ligands = [
+        ligand.copy(update={"component": components.get(ligand.chem_id.upper())}) if ligand.component is None else ligand
+        for ligand in structure.ligands
+    ]
+    return structure.copy(update={"ligands": ligands})
+
 # Example of how this might be used (for illustration, not part of the module's core logic)
 # async def main_example():
 #     import httpx
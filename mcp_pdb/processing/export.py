@@ -0,0 +1,288 @@
+"""
+mcp_pdb.processing.export
+~~~~~~~~~~~~~~~~~~~~~~~~~
+Bulk export of StructureDataset bundles to Arrow for ML pipelines.
+
+Entries are read in input order from the structure cache, or fetched with
+bounded concurrency, and are written out in record batches of
+EXPORT_BATCH_ROWS entries. Each batch is flushed before the next one is built.
+Memory therefore depends on the batch size and BATCH_FETCH_CONCURRENCY, never
+on the number of entries.
+
+Tables:
+
+•  nested  – one row per entry, `chains` and `ligands` as list<struct> columns
+•  entries – one row per entry, scalar columns only
+•  chains  – one row per chain (exploded), keyed by `pdb_id`
+•  ligands – one row per ligand entity (exploded), keyed by `pdb_id`
+
+Formats are Parquet (one row group per batch) and the Arrow IPC stream format.
+Both are produced incrementally, so `iter_export` can back a streaming HTTP
+response. Needs the optional `pyarrow` package.
+
+Write Parquet files from the command line (one PDB ID per line, "-" for stdin):
+
+    python -m mcp_pdb.processing.export ids.txt out_dir [nested|exploded]
+"""
+
+import asyncio
+import io
+import json
+import logging
+import os
+import sys
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterable, List, Tuple
+
+from mcp_pdb.adapter.admission import BULK, admission_context
+from mcp_pdb.adapter.pdb_client import PDBClient
+from mcp_pdb.config import BATCH_FETCH_CONCURRENCY, EXPORT_BATCH_ROWS
+from mcp_pdb.exceptions import ConfigurationError, DataValidationError
+from mcp_pdb.processing.dataset_builder import build_structure_context
+from mcp_pdb.schemas import StructureDataset
+
+logger = logging.getLogger(__name__)
+
+TABLES = ("nested", "entries", "chains", "ligands")
+FORMATS = ("parquet", "arrow")
+MEDIA_TYPES = {"parquet": "application/vnd.apache.parquet", "arrow": "application/vnd.apache.arrow.stream"}
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ConfigurationError("Arrow/Parquet export needs the 'pyarrow' package (pip install pyarrow).") from e
+    return pyarrow
+
+
+def table_schema(table: str) -> Any:
+    """The pyarrow schema of one export table."""
+    pa = _pyarrow()
+    entry = [
+        ("pdb_id", pa.string()),
+        ("title", pa.string()),
+        ("method", pa.string()),
+        ("resolution", pa.float64()),
+        ("release_date", pa.date32()),
+        ("revision_date", pa.date32()),
+        ("source", pa.string()),
+        ("retrieved", pa.timestamp("us", tz="UTC")),
+    ]
+    chain = [("chain_id", pa.string()), ("sequence_length", pa.int32()), ("organism", pa.string())]
+    ligand = [("chem_id", pa.string()), ("name", pa.string()), ("count", pa.int32())]
+    fields = {
+        "nested": entry + [("chains", pa.list_(pa.struct(chain))), ("ligands", pa.list_(pa.struct(ligand)))],
+        "entries": entry,
+        "chains": [("pdb_id", pa.string())] + chain,
+        "ligands": [("pdb_id", pa.string())] + ligand,
+    }
+    return pa.schema(fields[table])
+
+
+def _entry_row(structure: StructureDataset) -> Dict[str, Any]:
+    return {
+        "pdb_id": structure.pdb_id,
+        "title": structure.title,
+        "method": structure.method,
+        "resolution": structure.resolution,
+        "release_date": structure.release_date,
+        "revision_date": structure.revision_date,
+        "source": structure.provenance.source,
+        "retrieved": structure.provenance.retrieved,
+    }
+
+
+def _chain_row(chain: Any) -> Dict[str, Any]:
+    return {"chain_id": chain.chain_id, "sequence_length": chain.sequence_length, "organism": chain.organism}
+
+
+def _ligand_row(ligand: Any) -> Dict[str, Any]:
+    return {"chem_id": ligand.chem_id, "name": ligand.name, "count": ligand.count}
+
+
+ROWS: Dict[str, Callable[[StructureDataset], List[Dict[str, Any]]]] = {
+    "nested": lambda s: [{
+        **_entry_row(s),
+        "chains": [_chain_row(c) for c in s.chains],
+        "ligands": [_ligand_row(ligand) for ligand in s.ligands],
+    }],
+    "entries": lambda s: [_entry_row(s)],
+    "chains": lambda s: [{"pdb_id": s.pdb_id, **_chain_row(c)} for c in s.chains],
+    "ligands": lambda s: [{"pdb_id": s.pdb_id, **_ligand_row(ligand)} for ligand in s.ligands],
+}
+
+
+def record_batch(structures: List[StructureDataset], table: str) -> Any:
+    """One pyarrow RecordBatch of `table` rows for `structures`."""
+    pa = _pyarrow()
+    return pa.RecordBatch.from_pylist([row for s in structures for row in ROWS[table](s)], schema=table_schema(table))
+
+
+async def iter_structure_batches(
+    pdb_ids: Iterable[str],
+    pdb_client: PDBClient,
+    batch_rows: int = EXPORT_BATCH_ROWS,
+    concurrency: int = BATCH_FETCH_CONCURRENCY,
+) -> AsyncIterator[List[StructureDataset]]:
+    """
+    Yields lists of up to `batch_rows` StructureDatasets in input order, while at most
+    `concurrency` entries are fetched ahead. Entries that fail are logged and skipped.
+    IDs are not de-duplicated, so the input can be an unbounded iterator.
+    """
+    remaining = (pdb_id.strip().upper() for pdb_id in pdb_ids if pdb_id.strip())
+    window: Deque[Tuple[str, "asyncio.Task[StructureDataset]"]] = deque()
+
+    def schedule_next() -> None:
+        pdb_id = next(remaining, None)
+        if pdb_id is not None:
+            window.append((pdb_id, asyncio.ensure_future(build_structure_context(pdb_id, pdb_client))))
+
+    for _ in range(max(1, concurrency)):
+        schedule_next()
+    batch: List[StructureDataset] = []
+    try:
+        while window:
+            pdb_id, task = window.popleft()
+            try:
+                batch.append(await task)
+            except Exception as e:
+                logger.warning(f"Skipping PDB ID {pdb_id} in export: {e}")
+            schedule_next()  # Only after the head finished, so at most `concurrency` fetches run
+            if len(batch) >= batch_rows:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        for _, task in window:
+            task.cancel()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that buffers what a pyarrow writer emits until `drain`."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _open_writer(sink: Any, table: str, fmt: str) -> Any:
+    pa = _pyarrow()
+    schema = table_schema(table)
+    if fmt == "parquet":
+        return pa.parquet.ParquetWriter(sink, schema)
+    return pa.ipc.new_stream(sink, schema)
+
+
+def _write_batch(writer: Any, structures: List[StructureDataset], table: str) -> Any:
+    """Builds and writes one record batch; run in a worker thread so encoding stays off the event loop."""
+    batch = record_batch(structures, table)
+    writer.write_batch(batch)
+    return batch
+
+
+async def iter_export(
+    pdb_ids: Iterable[str],
+    pdb_client: PDBClient,
+    table: str = "nested",
+    fmt: str = "parquet",
+    batch_rows: int = EXPORT_BATCH_ROWS,
+) -> AsyncIterator[bytes]:
+    """
+    Yields the bytes of a Parquet file or Arrow IPC stream as each batch is written.
+
+    Raises:
+        DataValidationError: for an unknown table or format.
+        ConfigurationError: if pyarrow is not installed.
+    """
+    if table not in TABLES or fmt not in FORMATS:
+        raise DataValidationError(f"table must be one of {TABLES} and format one of {FORMATS}.")
+    sink = _ChunkSink()
+    writer = _open_writer(sink, table, fmt)
+    async for structures in iter_structure_batches(pdb_ids, pdb_client, batch_rows):
+        await asyncio.to_thread(_write_batch, writer, structures, table)
+        yield sink.drain()
+    await asyncio.to_thread(writer.close)
+    yield sink.drain()
+
+
+@dataclass
+class ExportReport:
+    entries: int = 0
+    rows: Dict[str, int] = field(default_factory=dict)
+    files: List[str] = field(default_factory=list)
+
+
+async def export_parquet(
+    pdb_ids: Iterable[str],
+    pdb_client: PDBClient,
+    out_dir: str,
+    layout: str = "nested",
+    batch_rows: int = EXPORT_BATCH_ROWS,
+) -> ExportReport:
+    """
+    Writes `structures.parquet` (layout "nested") or `entries.parquet`, `chains.parquet`
+    and `ligands.parquet` (layout "exploded") to `out_dir` in a single pass over the entries.
+    """
+    if layout not in ("nested", "exploded"):
+        raise DataValidationError("layout must be 'nested' or 'exploded'.")
+    pa = _pyarrow()
+    tables = {"nested": "structures"} if layout == "nested" else {t: t for t in ("entries", "chains", "ligands")}
+    os.makedirs(out_dir, exist_ok=True)
+    report = ExportReport(rows={name: 0 for name in tables.values()})
+    writers = {}
+    try:
+        for table, name in tables.items():
+            path = os.path.join(out_dir, f"{name}.parquet")
+            writers[table] = pa.parquet.ParquetWriter(path, table_schema(table))
+            report.files.append(path)
+        async for structures in iter_structure_batches(pdb_ids, pdb_client, batch_rows):
+            report.entries += len(structures)
+            for table, writer in writers.items():
+                batch = await asyncio.to_thread(_write_batch, writer, structures, table)
+                report.rows[tables[table]] += batch.num_rows
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return report
+
+
+async def _main(ids_path: str, out_dir: str, layout: str) -> ExportReport:
+    pdb_client = PDBClient()
+    ids_file = sys.stdin if ids_path == "-" else open(ids_path)
+    try:
+        with admission_context("export", BULK):
+            return await export_parquet((line for line in ids_file), pdb_client, out_dir, layout)
+    finally:
+        await pdb_client.close()
+        if ids_file is not sys.stdin:
+            ids_file.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) < 3:
+        sys.exit("usage: python -m mcp_pdb.processing.export IDS_FILE|- OUT_DIR [nested|exploded]")
+    layout_arg = sys.argv[3] if len(sys.argv) > 3 else "nested"
+    print(json.dumps(asdict(asyncio.run(_main(sys.argv[1], sys.argv[2], layout_arg))), indent=2))
@@ -0,0 +1,185 @@
+"""
+mcp_pdb.processing.geometry
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Per-chain geometric descriptors: centroid, radius of gyration, bounding box and
+an optional sparse residue contact map.
+
+Everything is computed for all chains of an entry in one batch: per-chain sums
+are `np.bincount` reductions over chain codes, bounding boxes are
+`reduceat` over chain-sorted atoms, and contacts come from a single CellGrid
+query over one representative atom per residue (CA, else C4', else the
+residue's first atom). Results are cached per entry and contact cutoff.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+
+from mcp_pdb.adapter.coordinate_client import AtomArrays, CoordinateClient
+from mcp_pdb.adapter.pdb_client import PDBClient
+from mcp_pdb.adapter.sources import summary_chain_id
+from mcp_pdb.config import CONTACT_MAP_MAX_CUTOFF, SPATIAL_GRID_CELL_SIZE
+from mcp_pdb.exceptions import DataValidationError
+from mcp_pdb.processing.coordinates import load_coordinates
+from mcp_pdb.schemas import ChainGeometry, ResidueContactMap, StructureDataset
+from mcp_pdb.utils.cache import LRUCache
+from mcp_pdb.utils.spatial_index import CellGrid
+
+logger = logging.getLogger(__name__)
+
+geometry_cache = LRUCache()  # (PDB ID, contact cutoff or None) -> {chain ID: ChainGeometry}
+
+# Representative atoms for the contact map, lowest priority first (later ones win).
+REPRESENTATIVE_ATOMS = ("C4'", "CA")
+
+
+def compute_chain_geometry(atoms: AtomArrays, contact_cutoff: Optional[float] = None) -> Dict[str, ChainGeometry]:
+    """
+    Descriptors for every chain with polymer (ATOM) records, keyed by author chain ID.
+
+    Contact maps are only computed when `contact_cutoff` is given.
+    """
+    polymer = np.nonzero(~atoms.hetero)[0]
+    if len(polymer) == 0:
+        return {}
+    chain = atoms.chain[polymer].astype(np.int64)
+    xyz = atoms.xyz[polymer].astype(np.float64)
+    n_chains = len(atoms.chain_ids)
+
+    atom_count = np.bincount(chain, minlength=n_chains)
+    present = np.nonzero(atom_count)[0]
+    safe_count = np.maximum(atom_count, 1)[:, None]
+    centroid = np.stack([np.bincount(chain, xyz[:, k], n_chains) for k in range(3)], axis=1) / safe_count
+    sq_dev = np.einsum("ij,ij->i", xyz - centroid[chain], xyz - centroid[chain])
+    rg = np.sqrt(np.bincount(chain, sq_dev, n_chains) / safe_count[:, 0])
+
+    order = np.argsort(chain, kind="stable")
+    starts = np.searchsorted(chain[order], present)
+    bbox_min = np.minimum.reduceat(xyz[order], starts, axis=0)
+    bbox_max = np.maximum.reduceat(xyz[order], starts, axis=0)
+
+    # Residues, ordered by (chain, residue number); `residue_of_atom` maps polymer atoms to them.
+    residue_key = (chain << 32) | (atoms.res_seq[polymer].astype(np.int64) & 0xFFFFFFFF)
+    residue_keys, first_atom, residue_of_atom = np.unique(residue_key, return_index=True, return_inverse=True)
+    residue_of_atom = residue_of_atom.reshape(-1)
+    residue_chain = residue_keys >> 32
+    residue_count = np.bincount(residue_chain, minlength=n_chains)
+
+    contact_maps: Dict[int, ResidueContactMap] = {}
+    if contact_cutoff is not None:
+        contact_maps = _contact_maps(atoms, polymer, residue_keys, first_atom, residue_of_atom, contact_cutoff)
+
+    result: Dict[str, ChainGeometry] = {}
+    for i, code in enumerate(present):
+        result[atoms.chain_ids[code]] = ChainGeometry(
+            atom_count=int(atom_count[code]),
+            residue_count=int(residue_count[code]),
+            centroid=_rounded(centroid[code]),
+            radius_of_gyration=round(float(rg[code]), 3),
+            bbox_min=_rounded(bbox_min[i]),
+            bbox_max=_rounded(bbox_max[i]),
+            contact_map=contact_maps.get(int(code)),
+        )
+    return result
+
+
+def _contact_maps(
+    atoms: AtomArrays,
+    polymer: np.ndarray,
+    residue_keys: np.ndarray,
+    first_atom: np.ndarray,
+    residue_of_atom: np.ndarray,
+    cutoff: float,
+) -> Dict[int, ResidueContactMap]:
+    """Intra-chain contacts between representative atoms, one COO map per chain code."""
+    representative = first_atom.copy()  # Indexes into `polymer`
+    names = atoms.atom_name[polymer]
+    for name in REPRESENTATIVE_ATOMS:
+        if name in atoms.atom_names:
+            hits = np.nonzero(names == atoms.atom_names.index(name))[0]
+            residues, first_hit = np.unique(residue_of_atom[hits], return_index=True)
+            representative[residues] = hits[first_hit]
+
+    residue_chain = residue_keys >> 32
+    residue_seq = (residue_keys & 0xFFFFFFFF).astype(np.uint32).astype(np.int32)
+    points = atoms.xyz[polymer[representative]]
+    # Cells as wide as the cutoff: each query visits only the 27 surrounding cells.
+    q, p, _ = CellGrid(points, cell_size=max(cutoff, SPATIAL_GRID_CELL_SIZE)).query_radius(points, cutoff)
+    keep = (q < p) & (residue_chain[q] == residue_chain[p])
+    q, p = q[keep], p[keep]
+    order = np.lexsort((p, q))
+    q, p = q[order], p[order]
+
+    # Residues are sorted by chain, so each chain's residues are one contiguous block.
+    chains, chain_start = np.unique(residue_chain, return_index=True)
+    chain_end = np.append(chain_start[1:], len(residue_chain))
+    pair_start = np.searchsorted(q, chain_start)
+    pair_end = np.searchsorted(q, chain_end)
+
+    maps: Dict[int, ResidueContactMap] = {}
+    for code, r0, r1, c0, c1 in zip(chains, chain_start, chain_end, pair_start, pair_end):
+        maps[int(code)] = ResidueContactMap(
+            cutoff=cutoff,
+            residues=residue_seq[r0:r1].tolist(),
+            row=(q[c0:c1] - r0).tolist(),
+            col=(p[c0:c1] - r0).tolist(),
+        )
+    return maps
+
+
+async def build_chain_geometry(
+    pdb_id: str,
+    pdb_client: PDBClient,
+    coordinate_client: CoordinateClient,
+    contact_cutoff: Optional[float] = None,
+) -> Dict[str, ChainGeometry]:
+    """
+    Cached per-chain descriptors for one entry.
+
+    Raises:
+        DataValidationError: If the contact cutoff is out of range or the coordinates cannot be decoded.
+        PDBClientError (and its subclasses) if fetching the entry or its coordinates fails.
+    """
+    if contact_cutoff is not None:
+        if not 0 < contact_cutoff <= CONTACT_MAP_MAX_CUTOFF:
+            raise DataValidationError(f"contact_cutoff must be in (0, {CONTACT_MAP_MAX_CUTOFF}] Å, got {contact_cutoff}.")
+        contact_cutoff = round(float(contact_cutoff), 2)
+    key = (pdb_id.strip().upper(), contact_cutoff)
+
+    cached = geometry_cache.get(key)
+    if cached is not None:
+        logger.debug(f"Geometry cache hit for {key}")
+        return cached
+
+    atoms, _ = await load_coordinates(key[0], pdb_client, coordinate_client)
+    # Grid build and contact search take seconds for ribosome-sized entries; keep them off the event loop.
+    geometry = await asyncio.to_thread(compute_chain_geometry, atoms, contact_cutoff)
+    geometry_cache.set(key, geometry)
+    return geometry
+
+
+async def attach_chain_geometry(
+    structure: StructureDataset,
+    pdb_client: PDBClient,
+    coordinate_client: CoordinateClient,
+    contact_cutoff: Optional[float] = None,
+) -> StructureDataset:
+    """
+    Returns a copy of `structure` whose chains carry their ChainGeometry (None for
+    chains without coordinates). Geometry is matched to chains through
+    `summary_chain_id`, the same truncation the chains were listed under; author
+    chain IDs that truncate to the same summary ID are ambiguous and get None.
+    """
+    geometry = await build_chain_geometry(structure.pdb_id, pdb_client, coordinate_client, contact_cutoff)
+    by_chain: Dict[str, Optional[ChainGeometry]] = {}
+    for chain_id, chain_geometry in geometry.items():
+        key = summary_chain_id(chain_id)
+        by_chain[key] = None if key in by_chain else chain_geometry
+    chains = [chain.copy(update={"geometry": by_chain.get(chain.chain_id)}) for chain in structure.chains]
+    return structure.copy(update={"chains": chains})
+
+
+def _rounded(vector: np.ndarray) -> list:
+    return [round(float(v), 3) for v in vector]
@@ -0,0 +1,73 @@
+"""
+mcp_pdb.processing.metadata
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Offline filtering ("X-ray < 2.0 Å, Homo sapiens, binds HEM") over every entry
+this server has fetched.
+
+`build_structure_context` hands each freshly fetched StructureDataset to
+`index_structure`, which upserts its scalar fields into one SQLite
+MetadataIndex at `METADATA_INDEX_PATH`. `filter_structures` queries it and never
+calls the Search API.
+"""
+
+import logging
+import sqlite3
+import threading
+from typing import Optional
+
+from mcp_pdb.config import METADATA_INDEX_PATH
+from mcp_pdb.schemas import MetadataFilter, MetadataResults, MetadataRow, StructureDataset
+from mcp_pdb.utils.metadata_index import MetadataIndex
+
+logger = logging.getLogger(__name__)
+
+_metadata_index: Optional[MetadataIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_metadata_index() -> MetadataIndex:
+    """Returns the process-wide index, opening (or creating) the SQLite file on first use."""
+    global _metadata_index
+    with _index_lock:
+        if _metadata_index is None:
+            _metadata_index = MetadataIndex(METADATA_INDEX_PATH or ":memory:")
+        return _metadata_index
+
+
+def index_structure(structure: StructureDataset) -> None:
+    """Records a bundle's scalar fields. Index failures are logged, never raised to the caller."""
+    try:
+        get_metadata_index().upsert(
+            structure.pdb_id,
+            method=structure.method,
+            resolution=structure.resolution,
+            release_date=structure.release_date.isoformat() if structure.release_date else None,
+            chain_count=len(structure.chains),
+            organisms=[chain.organism for chain in structure.chains if chain.organism],
+            ligands=[ligand.chem_id for ligand in structure.ligands],
+        )
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Could not index metadata for {structure.pdb_id}: {e}")
+
+
+def filter_structures(request: MetadataFilter) -> MetadataResults:
+    """Entries of the local index matching every condition of `request`."""
+    index = get_metadata_index()
+    total, rows = index.query(
+        method=request.method,
+        min_resolution=request.min_resolution,
+        max_resolution=request.max_resolution,
+        organism=request.organism,
+        ligands=request.ligands,
+        min_chains=request.min_chains,
+        max_chains=request.max_chains,
+        released_after=request.released_after.isoformat() if request.released_after else None,
+        released_before=request.released_before.isoformat() if request.released_before else None,
+        limit=request.limit,
+        offset=request.offset,
+    )
+    return MetadataResults(
+        total_count=total,
+        indexed_entries=len(index),
+        entries=[MetadataRow(**row) for row in rows],
+    )
@@ -0,0 +1,148 @@
+"""
+mcp_pdb.processing.raw_documents
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Derived data from the raw upstream documents kept in the RawDocumentStore.
+
+Each stored entry records which source it came from, so `rebuild_structure`
+runs that source's adapter over the local documents. No network is involved.
+A changed builder, a new output field or a new endpoint therefore costs local
+CPU rather than a refetch of every entry.
+
+`build_structure_context` uses `fresh_structure` on a cache miss: an entry whose
+documents are younger than its adaptive TTL is rebuilt locally instead of fetched.
+`build_sequence_context` does the same with `fresh_sequences`, from the RCSB
+entry and polymer-entity documents `PDBClient.get_sequences` attached to the
+record. Chemical components are not kept; they have their own long-TTL cache.
+
+Re-derive every stored entry (and refresh the metadata index), drop unreferenced
+blobs, or print store statistics from the command line:
+
+    python -m mcp_pdb.processing.raw_documents [rebuild|gc|stats]
+"""
+
+import json
+import logging
+import sys
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from mcp_pdb.adapter.pdb_client import polymer_entity_ids, polymer_entity_path, sequence_entry_path, sequences_from_documents
+from mcp_pdb.adapter.sources import SOURCE_ADAPTERS
+from mcp_pdb.config import PDB_API_BASE_URL
+from mcp_pdb.exceptions import DataValidationError
+from mcp_pdb.processing.metadata import index_structure
+from mcp_pdb.schemas import SequenceDataset, StructureDataset
+from mcp_pdb.utils.raw_store import RawDocumentStore, get_raw_store
+from mcp_pdb.utils.ttl_policy import adaptive_ttl
+
+logger = logging.getLogger(__name__)
+
+
+def structure_from_entry(store: RawDocumentStore, entry: Dict[str, Any]) -> StructureDataset:
+    """
+    Runs the recording source's adapter over a stored entry's documents.
+
+    Raises:
+        DataValidationError: if the entry's source is unknown or its documents no longer parse.
+        KeyError: if one of its blobs is missing.
+    """
+    adapter_type = SOURCE_ADAPTERS.get(entry["source"])
+    if adapter_type is None:
+        raise DataValidationError(f"Raw documents for {entry['pdb_id']} come from unknown source '{entry['source']}'.")
+    try:
+        return adapter_type().parse_structure(
+            entry["pdb_id"], store.documents(entry), entry["api_url"], datetime.fromisoformat(entry["retrieved"])
+        )
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        raise DataValidationError(f"Raw documents for {entry['pdb_id']} no longer parse: {e}") from e
+
+
+def rebuild_structure(pdb_id: str, store: RawDocumentStore) -> Optional[StructureDataset]:
+    """The StructureDataset derived from local documents, or None if the entry is not stored."""
+    entry = store.entry(pdb_id)
+    return structure_from_entry(store, entry) if entry is not None else None
+
+
+def remaining_ttl(structure: StructureDataset) -> float:
+    """Seconds until data retrieved at `structure.provenance.retrieved` outlives its adaptive TTL."""
+    age = (datetime.now(timezone.utc) - structure.provenance.retrieved).total_seconds()
+    return adaptive_ttl(structure.release_date, structure.revision_date) - age
+
+
+def fresh_structure(pdb_id: str, store: Optional[RawDocumentStore]) -> Optional[StructureDataset]:
+    """
+    The entry rebuilt from local documents if they were retrieved within its adaptive
+    TTL (see `remaining_ttl`), else None. Unreadable documents count as absent.
+    """
+    if store is None:
+        return None
+    try:
+        structure = rebuild_structure(pdb_id, store)
+    except (DataValidationError, KeyError, OSError, ValueError) as e:
+        logger.warning(f"Ignoring stored raw documents for {pdb_id}: {e}")
+        return None
+    return structure if structure is not None and remaining_ttl(structure) > 0 else None
+
+
+def fresh_sequences(pdb_id: str, store: Optional[RawDocumentStore]) -> Optional[SequenceDataset]:
+    """
+    The entry's sequences rebuilt from attached RCSB documents, under the same
+    freshness rule as `fresh_structure`; None if any document is missing or unreadable.
+    """
+    structure = fresh_structure(pdb_id, store)
+    if structure is None:
+        return None
+    key = pdb_id.strip().upper()
+    try:
+        entry = store.entry(key)
+        if entry is None:
+            return None
+        data = store.document(entry, sequence_entry_path(key))
+        entities = data.get("polymer_entities")
+        if entities is None:
+            entities = [store.document(entry, polymer_entity_path(key, entity_id)) for entity_id in polymer_entity_ids(data)]
+        return sequences_from_documents(key, entities, f"{PDB_API_BASE_URL.rstrip('/')}{sequence_entry_path(key)}", structure.provenance.retrieved)
+    except (DataValidationError, KeyError, OSError, ValueError, AttributeError, TypeError) as e:
+        logger.debug(f"No local sequences for {key}: {e}")
+        return None
+
+
+@dataclass
+class RebuildReport:
+    entries: int = 0
+    rebuilt: int = 0
+    failed: List[str] = field(default_factory=list)
+
+
+def rebuild_all(store: RawDocumentStore) -> RebuildReport:
+    """Re-derives every stored entry and upserts it into the metadata index."""
+    report = RebuildReport()
+    for pdb_id in store.entry_ids():
+        report.entries += 1
+        try:
+            structure = rebuild_structure(pdb_id, store)
+        except (DataValidationError, KeyError, OSError, ValueError) as e:
+            logger.warning(f"Could not rebuild {pdb_id} from raw documents: {e}")
+            report.failed.append(pdb_id)
+            continue
+        if structure is not None:
+            index_structure(structure)
+            report.rebuilt += 1
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    command = sys.argv[1] if len(sys.argv) > 1 else "rebuild"
+    raw_store = get_raw_store()
+    if raw_store is None:
+        sys.exit("Set RAW_STORE_DIR (and install zstandard) to use the raw document store.")
+    if command == "rebuild":
+        print(json.dumps(asdict(rebuild_all(raw_store)), indent=2))
+    elif command == "gc":
+        print(json.dumps({"removed_objects": raw_store.gc()}, indent=2))
+    elif command == "stats":
+        print(json.dumps(raw_store.stats(), indent=2))
+    else:
+        sys.exit("usage: python -m mcp_pdb.processing.raw_documents [rebuild|gc|stats]")
@@ -0,0 +1,205 @@
+"""
+mcp_pdb.processing.search
+~~~~~~~~~~~~~~~~~~~~~~~~~
+Structure search via the RCSB Search API.
+
+Queries are normalized before hashing so that equivalent agent queries (clause
+order, whitespace, sequence case) share one cache key. Result pages are cached
+under `(query_key, start, rows)`, hits are produced lazily by an async
+generator that only fetches the pages it reaches, and hits can be hydrated into
+`StructureDataset` bundles through the batch fetch path.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from mcp_pdb.adapter.pdb_client import PDBClient
+from mcp_pdb.config import SEARCH_CACHE_MAX_SIZE, SEARCH_CACHE_TTL_SECONDS, SEARCH_PAGE_SIZE
+from mcp_pdb.exceptions import DataValidationError, PDBAPIError
+from mcp_pdb.processing.dataset_builder import build_structure_contexts
+from mcp_pdb.schemas import SearchHit, SearchRequest, SearchResults
+from mcp_pdb.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+search_cache = LRUCache(max_size=SEARCH_CACHE_MAX_SIZE, ttl_seconds=SEARCH_CACHE_TTL_SECONDS)
+
+
+def build_search_query(request: SearchRequest) -> Dict[str, Any]:
+    """
+    Translates a SearchRequest into a normalized RCSB Search API query node.
+
+    Raises:
+        DataValidationError: If the request contains no clauses.
+    """
+    nodes: List[Dict[str, Any]] = []
+
+    if request.text and request.text.strip():
+        nodes.append({
+            "type": "terminal",
+            "service": "full_text",
+            "parameters": {"value": " ".join(request.text.split())},
+        })
+
+    for clause in request.attributes:
+        parameters: Dict[str, Any] = {"attribute": clause.attribute.strip(), "operator": clause.operator.strip()}
+        if clause.value is not None:
+            parameters["value"] = _sorted_values(clause.value) if isinstance(clause.value, list) else clause.value
+        if clause.negation:
+            parameters["negation"] = True
+        nodes.append({"type": "terminal", "service": "text", "parameters": parameters})
+
+    if request.sequence and request.sequence.strip():
+        nodes.append({
+            "type": "terminal",
+            "service": "sequence",
+            "parameters": {
+                "value": "".join(request.sequence.split()).upper(),
+                "sequence_type": request.sequence_type.lower(),
+                "identity_cutoff": request.identity_cutoff,
+                "evalue_cutoff": request.evalue_cutoff,
+            },
+        })
+
+    if request.smiles and request.smiles.strip():
+        nodes.append({
+            "type": "terminal",
+            "service": "chemical",
+            "parameters": {
+                "value": request.smiles.strip(),
+                "type": "descriptor",
+                "descriptor_type": "SMILES",
+                "match_type": request.chem_match_type,
+            },
+        })
+
+    if not nodes:
+        raise DataValidationError("A search needs at least one of: text, attributes, sequence or smiles.")
+    if len(nodes) == 1:
+        return nodes[0]
+    # AND is commutative, so clause order must not change the cache key.
+    nodes.sort(key=_canonical_json)
+    return {"type": "group", "logical_operator": "and", "nodes": nodes}
+
+
+def query_cache_key(query: Dict[str, Any]) -> str:
+    """Stable hash of a normalized query node."""
+    return hashlib.sha256(_canonical_json(query).encode("utf-8")).hexdigest()[:32]
+
+
+async def fetch_search_page(query: Dict[str, Any], pdb_client: PDBClient, start: int, rows: int = SEARCH_PAGE_SIZE) -> Dict[str, Any]:
+    """
+    Returns one raw result page (`total_count`, `result_set`), from the search cache when possible.
+
+    Raises:
+        DataValidationError: If the Search API rejects the query (HTTP 400).
+        PDBClientError (and its subclasses) for other upstream failures.
+    """
+    key = (query_cache_key(query), start, rows)
+    cached_page = search_cache.get(key)
+    if cached_page is not None:
+        logger.debug(f"Search cache hit for page {key}")
+        return cached_page
+
+    body = {
+        "query": query,
+        "return_type": "entry",
+        "request_options": {"paginate": {"start": start, "rows": rows}},
+    }
+    try:
+        page = await pdb_client.search(body)
+    except PDBAPIError as e:
+        if e.status_code == 400:
+            raise DataValidationError(f"The RCSB Search API rejected the query: {e.message}") from e
+        raise
+
+    search_cache.set(key, page)
+    return page
+
+
+async def iter_search_pages(
+    query: Dict[str, Any],
+    pdb_client: PDBClient,
+    page_size: int = SEARCH_PAGE_SIZE,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yields raw result pages in order, fetching each one only when the consumer asks for it."""
+    start = 0
+    while True:
+        page = await fetch_search_page(query, pdb_client, start, page_size)
+        yield page
+        start += page_size
+        if len(page.get("result_set", [])) < page_size or start >= page.get("total_count", 0):
+            return
+
+
+async def iter_search_hits(
+    query: Dict[str, Any],
+    pdb_client: PDBClient,
+    max_results: Optional[int] = None,
+    page_size: int = SEARCH_PAGE_SIZE,
+    on_page: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> AsyncIterator[SearchHit]:
+    """
+    Yields hits in score order, fetching result pages only as the consumer advances.
+
+    Args:
+        query: A normalized query node from build_search_query.
+        pdb_client: An instance of PDBClient to use for API calls.
+        max_results: Stop after this many hits (None = exhaust the result set).
+        page_size: Rows per upstream page; part of the page cache key.
+        on_page: Called with each raw page as it is fetched (e.g. to read `total_count`).
+    """
+    if max_results is not None and max_results <= 0:
+        return
+    yielded = 0
+    async for page in iter_search_pages(query, pdb_client, page_size):
+        if on_page is not None:
+            on_page(page)
+        for item in page.get("result_set", []):
+            yield SearchHit(pdb_id=str(item["identifier"]), score=float(item.get("score", 0.0)))
+            yielded += 1
+            if max_results is not None and yielded >= max_results:
+                return
+
+
+async def search_structures(request: SearchRequest, pdb_client: PDBClient, page_size: int = SEARCH_PAGE_SIZE) -> SearchResults:
+    """
+    Runs a search and collects up to `request.max_results` hits.
+
+    With `request.hydrate`, the hits are also fetched as StructureDataset bundles
+    through build_structure_contexts; entries that fail to load are omitted.
+    """
+    query = build_search_query(request)
+
+    # Pages are always `page_size` rows, so max_results never splits the page cache.
+    total_count = 0
+
+    def note_total(page: Dict[str, Any]) -> None:
+        nonlocal total_count
+        total_count = page.get("total_count", 0)
+
+    hits = [hit async for hit in iter_search_hits(query, pdb_client, request.max_results, page_size, on_page=note_total)]
+
+    structures = None
+    if request.hydrate and hits:
+        structures = await build_structure_contexts([hit.pdb_id for hit in hits], pdb_client, skip_errors=True)
+
+    return SearchResults(
+        query_key=query_cache_key(query),
+        total_count=total_count,
+        hits=hits,
+        structures=structures,
+    )
+
+
+def _sorted_values(values: List[Any]) -> List[Any]:
+    """Order-normalizes a clause's value list; mixed or structured items are ordered by their JSON."""
+    if all(isinstance(v, str) for v in values) or all(isinstance(v, (int, float)) for v in values):
+        return sorted(values)
+    return sorted(values, key=_canonical_json)
+
+
+def _canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
@@ -0,0 +1,148 @@
+"""
+mcp_pdb.processing.sequences
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Polymer sequences keyed by entity.
+
+A homo-tetramer is one EntitySequence with four chain IDs, not four copies of
+the same string. Sequence strings are interned when an entry is cached, so an
+identical sequence seen in many entries (lysozyme, ubiquitin, ...) is held in
+memory once. Every fetched entry is also added to the local similarity index
+(see `similarity.py`). FASTA output for many entries is streamed entry by
+entry with a bounded window of concurrent fetches.
+"""
+
+import asyncio
+import logging
+import sys
+from collections import deque
+from typing import AsyncIterator, Deque, Iterable, List, Tuple
+
+from mcp_pdb.adapter.pdb_client import PDBClient
+from mcp_pdb.config import BATCH_FETCH_CONCURRENCY
+from mcp_pdb.processing.raw_documents import fresh_sequences
+from mcp_pdb.processing.similarity import index_sequences
+from mcp_pdb.schemas import SequenceDataset, StructureDataset
+from mcp_pdb.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+sequence_cache = LRUCache()  # PDB ID -> SequenceDataset
+
+FASTA_LINE_WIDTH = 80
+
+
+async def build_sequence_context(pdb_id: str, pdb_client: PDBClient) -> SequenceDataset:
+    """
+    Returns the entry's sequences, one record per polymer entity.
+
+    Raises:
+        PDBClientError (and its subclasses) if the API call fails.
+    """
+    key = pdb_id.strip().upper()
+    cached = sequence_cache.get(key)
+    if isinstance(cached, SequenceDataset):
+        logger.debug(f"Sequence cache hit for PDB ID: {key}")
+        return cached
+
+    raw_store = getattr(pdb_client, "raw_store", None)
+    local = await asyncio.to_thread(fresh_sequences, key, raw_store) if raw_store is not None else None
+    if local is not None:
+        logger.info(f"Sequence cache miss for PDB ID: {key}. Rebuilt from local raw documents.")
+    dataset = _share_sequences(local or await pdb_client.get_sequences(key))
+    sequence_cache.set(key, dataset)
+    index_sequences(dataset)
+    return dataset
+
+
+async def build_sequence_contexts(
+    pdb_ids: Iterable[str],
+    pdb_client: PDBClient,
+    concurrency: int = BATCH_FETCH_CONCURRENCY,
+    skip_errors: bool = False,
+) -> List[SequenceDataset]:
+    """
+    Batch variant of build_sequence_context, with at most `concurrency` entries in
+    flight. Results keep the order of first appearance; with `skip_errors`, entries
+    that fail are logged and omitted (as `iter_fasta` does) instead of raising.
+    """
+    unique_ids = list(dict.fromkeys(pdb_id.strip().upper() for pdb_id in pdb_ids if pdb_id.strip()))
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch_one(pdb_id: str) -> SequenceDataset:
+        async with semaphore:
+            return await build_sequence_context(pdb_id, pdb_client)
+
+    results = await asyncio.gather(*(fetch_one(pdb_id) for pdb_id in unique_ids), return_exceptions=True)
+
+    datasets: List[SequenceDataset] = []
+    for pdb_id, result in zip(unique_ids, results):
+        if isinstance(result, BaseException):
+            if not skip_errors or not isinstance(result, Exception):
+                raise result
+            logger.warning(f"Skipping PDB ID {pdb_id} in batch: {result}")
+        else:
+            datasets.append(result)
+    return datasets
+
+
+async def attach_sequences(structure: StructureDataset, pdb_client: PDBClient) -> StructureDataset:
+    """Returns a copy of `structure` carrying its entity sequences."""
+    dataset = await build_sequence_context(structure.pdb_id, pdb_client)
+    return structure.copy(update={"sequences": dataset.entities})
+
+
+def format_fasta(dataset: SequenceDataset, line_width: int = FASTA_LINE_WIDTH) -> str:
+    """
+    One FASTA record per entity, RCSB-style headers:
+
+        >4HHB_1|Chains A, C|Hemoglobin subunit alpha|Homo sapiens
+    """
+    records = []
+    for entity in dataset.entities:
+        label = "Chain" if len(entity.chain_ids) == 1 else "Chains"
+        header = [f"{dataset.pdb_id}_{entity.entity_id}", f"{label} {', '.join(entity.chain_ids)}"]
+        header += [field for field in (entity.description, entity.organism) if field]
+        lines = [entity.sequence[i:i + line_width] for i in range(0, len(entity.sequence), line_width)]
+        records.append(">" + "|".join(header) + "\n" + "\n".join(lines) + "\n")
+    return "".join(records)
+
+
+async def iter_fasta(
+    pdb_ids: Iterable[str],
+    pdb_client: PDBClient,
+    concurrency: int = BATCH_FETCH_CONCURRENCY,
+) -> AsyncIterator[str]:
+    """
+    Yields FASTA text per entry, in input order, while at most `concurrency`
+    entries are being fetched ahead. Entries that fail are logged and skipped,
+    since a stream that has already started cannot change its status.
+    """
+    remaining = iter(dict.fromkeys(pdb_id.strip().upper() for pdb_id in pdb_ids if pdb_id.strip()))
+    window: Deque[Tuple[str, "asyncio.Task[SequenceDataset]"]] = deque()
+
+    def schedule_next() -> None:
+        pdb_id = next(remaining, None)
+        if pdb_id is not None:
+            window.append((pdb_id, asyncio.ensure_future(build_sequence_context(pdb_id, pdb_client))))
+
+    for _ in range(max(1, concurrency)):
+        schedule_next()
+    try:
+        while window:
+            pdb_id, task = window.popleft()
+            schedule_next()
+            try:
+                dataset = await task
+            except Exception as e:
+                logger.warning(f"Skipping PDB ID {pdb_id} in FASTA stream: {e}")
+                continue
+            yield format_fasta(dataset)
+    finally:
+        for _, task in window:
+            task.cancel()
+
+
+def _share_sequences(dataset: SequenceDataset) -> SequenceDataset:
+    """Interns sequence strings so identical sequences across cached entries share one object."""
+    entities = [entity.copy(update={"sequence": sys.intern(entity.sequence)}) for entity in dataset.entities]
+    return dataset.copy(update={"entities": entities})
@@ -0,0 +1,67 @@
+"""
+mcp_pdb.processing.similarity
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"Find structures similar to this sequence" without calling the Search API.
+
+Every entity sequence that enters the sequence cache is added to one
+process-wide KmerIndex. The index is loaded from `SEQUENCE_INDEX_PATH` on
+first use and written back by `save_sequence_index` (called on shutdown), so it
+keeps growing across restarts.
+"""
+
+import logging
+import threading
+from typing import Optional
+
+from mcp_pdb.config import KMER_SIZE, SEQUENCE_INDEX_PATH
+from mcp_pdb.schemas import SequenceDataset, SimilarityHit, SimilarityRequest, SimilarityResults
+from mcp_pdb.utils.kmer_index import KmerIndex
+
+logger = logging.getLogger(__name__)
+
+_sequence_index: Optional[KmerIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_sequence_index() -> KmerIndex:
+    """Returns the process-wide index, loading the persisted copy on first use."""
+    global _sequence_index
+    with _index_lock:
+        if _sequence_index is None:
+            loaded = KmerIndex.load(SEQUENCE_INDEX_PATH, k=KMER_SIZE) if SEQUENCE_INDEX_PATH else None
+            if loaded is not None:
+                logger.info(f"Loaded sequence index with {len(loaded)} entities from {SEQUENCE_INDEX_PATH}")
+            _sequence_index = loaded or KmerIndex(KMER_SIZE)
+        return _sequence_index
+
+
+def index_sequences(dataset: SequenceDataset) -> int:
+    """Adds an entry's entity sequences to the index; returns how many were new."""
+    index = get_sequence_index()
+    return sum(index.add(dataset.pdb_id, entity.entity_id, entity.sequence) for entity in dataset.entities)
+
+
+def find_similar_structures(request: SimilarityRequest) -> SimilarityResults:
+    """Top-k indexed entries by k-mer similarity to `request.sequence`."""
+    index = get_sequence_index()
+    hits = index.query(request.sequence, top_k=request.top_k)
+    return SimilarityResults(
+        query_length=len("".join(request.sequence.split())),
+        kmer_size=index.k,
+        indexed_entities=len(index),
+        hits=[
+            SimilarityHit(pdb_id=pdb_id, entity_id=entity_id, score=score, shared_kmers=shared)
+            for pdb_id, entity_id, score, shared in hits
+        ],
+    )
+
+
+def save_sequence_index() -> None:
+    """Persists the index if it was ever loaded and persistence is enabled."""
+    if _sequence_index is None or not SEQUENCE_INDEX_PATH:
+        return
+    try:
+        _sequence_index.save(SEQUENCE_INDEX_PATH)
+        logger.info(f"Saved sequence index with {len(_sequence_index)} entities to {SEQUENCE_INDEX_PATH}")
+    except OSError as e:
+        logger.warning(f"Could not save sequence index to {SEQUENCE_INDEX_PATH}: {e}")
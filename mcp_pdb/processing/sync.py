@@ -0,0 +1,214 @@
+"""
+mcp_pdb.processing.sync
+~~~~~~~~~~~~~~~~~~~~~~~
+Incremental invalidation from the wwPDB weekly update lists.
+
+`sync_updates` reads `added.pdb`, `modified.pdb` and `obsolete.pdb` (via
+StatusListClient) and drops exactly those entries from every tier: the
+structure, sequence, geometry, binding-site and grid caches, the coordinate
+memory cache and on-disk store, the SQLite metadata index, the k-mer
+sequence index, the raw document store and the PDB client's last good bodies, with one pass over each cache for
+the whole list. Modified entries that any of those tiers held are then
+refetched so the indexes stay populated. Search result pages are cleared
+whenever entries were added or obsoleted, since any query may now match
+differently.
+
+With the job running weekly, unchanged entries no longer need a short
+CACHE_TTL_SECONDS to pick up upstream changes.
+
+Run once from the command line:
+
+    python -m mcp_pdb.processing.sync [directory-or-url]
+
+or periodically inside the FastAPI app by setting SYNC_INTERVAL_SECONDS.
+"""
+
+import asyncio
+import json
+import logging
+import sys
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from mcp_pdb.adapter.admission import BULK, admission_context
+from mcp_pdb.adapter.pdb_client import PDBClient
+from mcp_pdb.adapter.status_client import StatusListClient
+from mcp_pdb.config import PDB_STATUS_BASE_URL, SYNC_REFRESH_MODIFIED, SYNC_SOURCE
+from mcp_pdb.processing import binding_site, dataset_builder, geometry, sequences
+from mcp_pdb.processing.coordinates import invalidate_coordinates
+from mcp_pdb.processing.dataset_builder import build_structure_contexts
+from mcp_pdb.processing.metadata import get_metadata_index
+from mcp_pdb.processing.search import search_cache
+from mcp_pdb.processing.sequences import build_sequence_context
+from mcp_pdb.processing.similarity import get_sequence_index, save_sequence_index
+from mcp_pdb.utils.raw_store import get_raw_store
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EntryInvalidation:
+    """What `invalidate_entry` found (and removed) for one entry."""
+
+    pdb_id: str
+    cache_entries: int = 0
+    was_indexed: bool = False
+    had_sequences: bool = False
+    had_raw_documents: bool = False
+    had_coordinates: bool = False
+
+    @property
+    def was_known(self) -> bool:
+        """Whether any tier held the entry, i.e. this server had fetched it before."""
+        return bool(self.cache_entries or self.was_indexed or self.had_sequences or self.had_raw_documents or self.had_coordinates)
+
+
+@dataclass
+class SyncReport:
+    source: str
+    added: int = 0
+    modified: int = 0
+    obsolete: int = 0
+    cache_entries_removed: int = 0
+    index_entries_removed: int = 0
+    refreshed: List[str] = field(default_factory=list)
+    refresh_failed: List[str] = field(default_factory=list)
+    search_cache_cleared: bool = False
+
+
+PER_ENTRY_CACHES = (
+    dataset_builder.cache,
+    sequences.sequence_cache,
+    geometry.geometry_cache,
+    binding_site.binding_site_cache,
+    binding_site.grid_cache,
+)
+
+
+def invalidate_entries(pdb_ids: Iterable[str], pdb_client: Optional[PDBClient] = None) -> Dict[str, EntryInvalidation]:
+    """
+    Removes entries from every cache tier and local index, with one pass over each
+    cache, and from `pdb_client`'s last-good-body store (see PDBClient.invalidate).
+    """
+    results = {pdb_id.strip().upper(): EntryInvalidation(pdb_id=pdb_id.strip().upper()) for pdb_id in pdb_ids}
+
+    def listed(key: Any) -> bool:
+        first = key[0] if isinstance(key, tuple) and key else key
+        result = results.get(first.strip().upper()) if isinstance(first, str) else None
+        if result is not None:
+            result.cache_entries += 1
+        return result is not None
+
+    for per_entry_cache in PER_ENTRY_CACHES:
+        per_entry_cache.delete_matching(listed)
+    if pdb_client is not None:
+        pdb_client.invalidate(results)
+
+    metadata_index = get_metadata_index()
+    sequence_index = get_sequence_index()
+    raw_store = get_raw_store()
+    for pdb_id, result in results.items():
+        result.had_coordinates = invalidate_coordinates(pdb_id)
+        result.was_indexed = pdb_id in metadata_index
+        if result.was_indexed:
+            metadata_index.delete(pdb_id)
+        result.had_sequences = sequence_index.discard(pdb_id) > 0
+        result.had_raw_documents = raw_store is not None and raw_store.delete(pdb_id)  # Blobs go at the next gc
+    return results
+
+
+def invalidate_entry(pdb_id: str, pdb_client: Optional[PDBClient] = None) -> EntryInvalidation:
+    """Removes one entry from every cache tier and local index."""
+    return next(iter(invalidate_entries([pdb_id], pdb_client).values()))
+
+
+async def sync_updates(
+    source: str = PDB_STATUS_BASE_URL,
+    pdb_client: Optional[PDBClient] = None,
+    refresh_modified: bool = SYNC_REFRESH_MODIFIED,
+    status_client: Optional[StatusListClient] = None,
+) -> SyncReport:
+    """
+    Applies one set of update lists.
+
+    Args:
+        source: URL prefix or local directory holding added/modified/obsolete.pdb.
+        pdb_client: Used to refetch modified entries; required if `refresh_modified`.
+        refresh_modified: Refetch modified entries that any cache, index or store held before.
+        status_client: Reader to use instead of one built from `source`.
+
+    Raises:
+        PDBClientError (and its subclasses) if the update lists cannot be read.
+    """
+    reader = status_client or StatusListClient(source)
+    try:
+        lists = await reader.get_update_lists()
+    finally:
+        if status_client is None:
+            await reader.close()
+
+    report = SyncReport(source=lists.source, added=len(lists.added), modified=len(lists.modified), obsolete=len(lists.obsolete))
+    to_refresh: List[str] = []
+    with_sequences: List[str] = []
+    modified, obsolete = set(lists.modified), set(lists.obsolete)
+    for pdb_id, result in invalidate_entries(lists.added + lists.modified + lists.obsolete, pdb_client).items():
+        report.cache_entries_removed += result.cache_entries
+        report.index_entries_removed += int(result.was_indexed) + int(result.had_sequences)
+        if pdb_id in modified and pdb_id not in obsolete and result.was_known:
+            to_refresh.append(pdb_id)
+            if result.had_sequences:
+                with_sequences.append(pdb_id)
+
+    if lists.added or lists.obsolete:
+        search_cache.clear()
+        report.search_cache_cleared = True
+
+    if refresh_modified and to_refresh:
+        if pdb_client is None:
+            raise ValueError("pdb_client is required to refresh modified entries")
+        refreshed = await build_structure_contexts(to_refresh, pdb_client, skip_errors=True)
+        report.refreshed = [structure.pdb_id.upper() for structure in refreshed]
+        report.refresh_failed = [pdb_id for pdb_id in to_refresh if pdb_id not in report.refreshed]
+        for pdb_id in with_sequences:
+            try:
+                await build_sequence_context(pdb_id, pdb_client)
+            except Exception as e:
+                logger.warning(f"Could not refresh sequences for {pdb_id}: {e}")
+
+    logger.info(
+        f"Applied update lists from {report.source}: {report.added} added, {report.modified} modified, "
+        f"{report.obsolete} obsolete; {report.cache_entries_removed} cache entries and "
+        f"{report.index_entries_removed} index entries removed, {len(report.refreshed)} refreshed"
+    )
+    return report
+
+
+async def run_periodic_sync(interval_seconds: float, pdb_client: PDBClient, source: str = SYNC_SOURCE or PDB_STATUS_BASE_URL) -> None:
+    """
+    Runs `sync_updates` every `interval_seconds` until cancelled; failures are logged and
+    retried next round. Its upstream calls are queued as bulk work, behind interactive requests.
+    """
+    while True:
+        try:
+            with admission_context("sync", BULK):
+                await sync_updates(source, pdb_client)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception(f"Update-list sync from {source} failed")
+        await asyncio.sleep(interval_seconds)
+
+
+async def _main(source: str) -> SyncReport:
+    pdb_client = PDBClient()
+    try:
+        return await sync_updates(source, pdb_client)
+    finally:
+        await pdb_client.close()
+        save_sequence_index()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    source_arg = sys.argv[1] if len(sys.argv) > 1 else (SYNC_SOURCE or PDB_STATUS_BASE_URL)
+    print(json.dumps(asdict(asyncio.run(_main(source_arg))), indent=2))
@@ -5,11 +5,20 @@ Typed data models returned to an LLM via MCP JSON-RPC calls.
 
 •  StructureDataset – high-level summary of one PDB entry
 •  LigandDataset   – individual ligand or ion bound in that entry
+•  ChemicalComponent – chemistry of one CCD component (formula, SMILES, InChIKey)
 •  Provenance      – where / when the data was fetched
+•  SequenceDataset / EntitySequence – polymer sequences, one per entity with its chain IDs
+•  MetadataFilter / MetadataResults – offline filtering over the local metadata index
+•  SimilarityRequest / SimilarityResults – top-k similar entries from the local k-mer index
+•  ChainGeometry   – optional coordinate-derived chain descriptors and sparse contact map
+•  BindingSiteDataset – residues lining each instance of a ligand
+•  SearchRequest / SearchResults – RCSB Search API queries and their (optionally hydrated) hits
+•  CacheTTLStats   – effective TTL distribution of one cache
+•  UpstreamPoolStats / HedgeStats – connection-pool timings and hedging counters of one upstream client
 """
 
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, HttpUrl, constr
 
@@ -17,6 +26,27 @@ from pydantic import BaseModel, Field, HttpUrl, constr
 # ────────────────────────────────────────────────────────────
 # Helper / nested models
 # ────────────────────────────────────────────────────────────
+class ResidueContactMap(BaseModel):
+    """Sparse residue contact map of one chain: upper-triangle (row < col) pairs in COO form."""
+
+    cutoff: float = Field(..., gt=0, description="Distance cutoff between representative atoms (CA / C4') in Å", example=8.0)
+    residues: List[int] = Field(..., description="Author residue numbers; `row` / `col` index into this list")
+    row: List[int] = Field(..., description="First residue index of each contact")
+    col: List[int] = Field(..., description="Second residue index of each contact")
+
+
+class ChainGeometry(BaseModel):
+    """Coordinate-derived descriptors of one chain's polymer atoms (first model)."""
+
+    atom_count: int = Field(..., ge=1, description="Polymer atoms in the chain", example=1754)
+    residue_count: int = Field(..., ge=1, description="Residues with at least one modelled atom", example=228)
+    centroid: List[float] = Field(..., min_items=3, max_items=3, description="Mean atom position (x, y, z) in Å")
+    radius_of_gyration: float = Field(..., ge=0, description="Radius of gyration in Å", example=16.8)
+    bbox_min: List[float] = Field(..., min_items=3, max_items=3, description="Bounding box lower corner in Å")
+    bbox_max: List[float] = Field(..., min_items=3, max_items=3, description="Bounding box upper corner in Å")
+    contact_map: Optional[ResidueContactMap] = Field(None, description="Residue contact map (only when requested)")
+
+
 class ChainInfo(BaseModel):
     """Minimal per-chain summary to keep token cost low."""
 
@@ -36,6 +66,55 @@ class ChainInfo(BaseModel):
         description="Source organism of the expressed chain (if available)",
         example="Homo sapiens",
     )
+    geometry: Optional[ChainGeometry] = Field(
+        None,
+        description="Coordinate-derived descriptors (only when requested)",
+    )
+
+
+class ChemicalComponent(BaseModel):
+    """Chemistry of one Chemical Component Dictionary (CCD) entry, shared by every structure that binds it."""
+
+    chem_id: constr(strip_whitespace=True, min_length=1, max_length=5) = Field(
+        ...,
+        description="CCD identifier (e.g., 'ATP', 'HEM', 'NAG')",
+        example="ATP",
+    )
+    name: str = Field(
+        ...,
+        description="IUPAC-style or common name of the component",
+        example="ADENOSINE-5'-TRIPHOSPHATE",
+    )
+    type: Optional[str] = Field(
+        None,
+        description="CCD component type",
+        example="NON-POLYMER",
+    )
+    formula: Optional[str] = Field(
+        None,
+        description="Chemical formula",
+        example="C10 H16 N5 O13 P3",
+    )
+    formula_weight: Optional[float] = Field(
+        None,
+        gt=0,
+        description="Formula weight in Da",
+        example=507.181,
+    )
+    smiles: Optional[str] = Field(
+        None,
+        description="SMILES string (stereo-aware when available)",
+        example="c1nc(c2c(n1)n(cn2)[C@H]3[C@@H]([C@@H]([C@H](O3)CO[P@@](=O)(O)O[P@](=O)(O)OP(=O)(O)O)O)O)N",
+    )
+    inchikey: Optional[str] = Field(
+        None,
+        description="Standard InChIKey",
+        example="ZKHQWZAMYRWXGA-KQYNXXCUSA-N",
+    )
+    provenance: Optional["Provenance"] = Field(
+        None,
+        description="Where/when the component was fetched (omitted when embedded in a structure bundle)",
+    )
 
 
 class LigandDataset(BaseModel):
@@ -57,6 +136,22 @@ class LigandDataset(BaseModel):
         description="Number of copies present in the asymmetric unit / biological assembly",
         example=1,
     )
+    component: Optional[ChemicalComponent] = Field(
+        None,
+        description="Formula, weight, SMILES and InChIKey (only when ligand details are requested)",
+    )
+
+
+class EntitySequence(BaseModel):
+    """One polymer entity's sequence, listed once however many chains share it."""
+
+    entity_id: str = Field(..., description="Polymer entity ID within the entry", example="1")
+    chain_ids: List[str] = Field(..., description="Author chain IDs that are copies of this entity", example=["A", "C"])
+    description: Optional[str] = Field(None, description="Entity description", example="Hemoglobin subunit alpha")
+    polymer_type: Optional[str] = Field(None, description="Polymer type (Protein, DNA, RNA, ...)", example="Protein")
+    organism: Optional[str] = Field(None, description="Source organism", example="Homo sapiens")
+    sequence: str = Field(..., min_length=1, description="Canonical one-letter sequence")
+    digest: str = Field(..., description="SHA-256 prefix of the sequence; equal digests mean identical sequences")
 
 
 class Provenance(BaseModel):
@@ -77,6 +172,11 @@ class Provenance(BaseModel):
         description="Exact URL (or GraphQL query) used to obtain raw JSON",
         example="https://data.rcsb.org/rest/v1/core/entry/1ABC",
     )
+    coordinates_url: Optional[HttpUrl] = Field(
+        None,
+        description="Coordinate file the atom-level data was decoded from (coordinate-derived results only)",
+        example="https://files.rcsb.org/download/1ABC.cif.gz",
+    )
 
 
 # ────────────────────────────────────────────────────────────
@@ -106,6 +206,16 @@ class StructureDataset(BaseModel):
         description="Reported resolution in Å (null for NMR models)",
         example=2.0,
     )
+    release_date: Optional[date] = Field(
+        None,
+        description="Initial public release date",
+        example="2012-10-17",
+    )
+    revision_date: Optional[date] = Field(
+        None,
+        description="Date of the latest revision of the entry",
+        example="2023-11-01",
+    )
     chains: List[ChainInfo] = Field(
         ...,
         description="List of polymer chains with basic metadata",
@@ -118,9 +228,267 @@ class StructureDataset(BaseModel):
         ...,
         description="Where/how/when this context bundle was sourced",
     )
+    sequences: Optional[List[EntitySequence]] = Field(
+        None,
+        description="Polymer sequences keyed by entity (only when requested)",
+    )
 
     class Config:
         """Pydantic settings."""
 
         orm_mode = True
         allow_mutation = False  # Keep datasets immutable after creation
+
+
+class SequenceDataset(BaseModel):
+    """Polymer sequences of one entry, one record per entity."""
+
+    pdb_id: str = Field(..., description="PDB identifier", example="4HHB")
+    entities: List[EntitySequence] = Field(..., description="Distinct polymer entities")
+    provenance: Provenance = Field(..., description="Where/how/when the sequences were sourced")
+
+    class Config:
+        allow_mutation = False
+
+
+class ExportRequest(BaseModel):
+    """Bulk export of StructureDataset bundles as one Arrow table."""
+
+    pdb_ids: List[str] = Field(..., min_items=1, description="Entries to export, in output order", example=["4HHB", "1ATP"])
+    table: Literal["nested", "entries", "chains", "ligands"] = Field(
+        "nested", description="`nested` keeps chains / ligands as list columns; the others are flat, exploded tables"
+    )
+    format: Literal["parquet", "arrow"] = Field("parquet", description="Parquet file or Arrow IPC stream")
+
+
+class SimilarityRequest(BaseModel):
+    """Query for the local k-mer similarity index."""
+
+    sequence: constr(strip_whitespace=True, min_length=1) = Field(..., description="Query sequence (one-letter codes)")
+    top_k: int = Field(10, ge=1, le=1000, description="Maximum number of entries to return")
+
+
+class SimilarityHit(BaseModel):
+    """An indexed entry whose best entity shares k-mers with the query."""
+
+    pdb_id: str = Field(..., description="PDB identifier", example="4HHB")
+    entity_id: str = Field(..., description="Best-matching polymer entity", example="1")
+    score: float = Field(..., ge=0, le=1, description="Jaccard similarity of the k-mer sets", example=0.87)
+    shared_kmers: int = Field(..., ge=1, description="Distinct k-mers shared with the query", example=120)
+
+
+class SimilarityResults(BaseModel):
+    """Top-k nearest entries from the local index (no upstream calls)."""
+
+    query_length: int = Field(..., description="Length of the query sequence")
+    kmer_size: int = Field(..., description="k used by the index")
+    indexed_entities: int = Field(..., description="Entities currently in the index")
+    hits: List[SimilarityHit] = Field(..., description="Best first")
+
+
+class MetadataFilter(BaseModel):
+    """Filter over the local metadata index; all given conditions must hold."""
+
+    method: Optional[str] = Field(None, description="Experimental method prefix, case-insensitive", example="X-RAY")
+    min_resolution: Optional[float] = Field(None, gt=0, description="Lower resolution bound in Å (inclusive)")
+    max_resolution: Optional[float] = Field(None, gt=0, description="Upper resolution bound in Å (inclusive)", example=2.0)
+    organism: Optional[str] = Field(None, description="Source organism of any chain, case-insensitive", example="Homo sapiens")
+    ligands: List[str] = Field([], description="CCD IDs that must all be bound", example=["HEM"])
+    min_chains: Optional[int] = Field(None, ge=0, description="Minimum number of polymer chains")
+    max_chains: Optional[int] = Field(None, ge=0, description="Maximum number of polymer chains")
+    released_after: Optional[date] = Field(None, description="Released on or after this date")
+    released_before: Optional[date] = Field(None, description="Released on or before this date")
+    limit: int = Field(100, ge=1, le=10000, description="Maximum number of entries to return")
+    offset: int = Field(0, ge=0, description="Entries to skip (for paging)")
+
+
+class MetadataRow(BaseModel):
+    """Scalar fields of one indexed entry."""
+
+    pdb_id: str = Field(..., example="4HHB")
+    method: Optional[str] = Field(None, example="X-RAY DIFFRACTION")
+    resolution: Optional[float] = Field(None, example=1.74)
+    release_date: Optional[date] = Field(None, example="1984-07-17")
+    chain_count: int = Field(..., ge=0, example=4)
+
+
+class MetadataResults(BaseModel):
+    """Entries of the local metadata index matching a MetadataFilter (no upstream calls)."""
+
+    total_count: int = Field(..., description="Matching entries in the index")
+    indexed_entries: int = Field(..., description="Entries currently in the index")
+    entries: List[MetadataRow] = Field(..., description="Best resolution first, then PDB ID")
+
+
+# ────────────────────────────────────────────────────────────
+# Binding sites
+# ────────────────────────────────────────────────────────────
+class BindingSiteResidue(BaseModel):
+    """A residue (or other non-water group) with an atom within the cutoff of the ligand."""
+
+    chain_id: str = Field(..., description="Author chain identifier", example="A")
+    res_seq: int = Field(..., description="Author residue number", example=72)
+    res_name: str = Field(..., description="Residue / component name", example="LYS")
+    min_distance: float = Field(..., ge=0, description="Closest atom-atom distance to the ligand in Å", example=2.9)
+    hetero: bool = Field(False, description="True for HETATM groups (ions, cofactors, modified residues)")
+
+
+class BindingSite(BaseModel):
+    """Contacts of one ligand instance."""
+
+    chem_id: str = Field(..., description="Chemical component ID of the ligand", example="ATP")
+    chain_id: str = Field(..., description="Author chain the ligand instance belongs to", example="A")
+    res_seq: int = Field(..., description="Author residue number of the ligand instance", example=401)
+    atom_count: int = Field(..., ge=1, description="Number of ligand atoms in this instance", example=31)
+    residues: List[BindingSiteResidue] = Field(..., description="Contacting residues, closest first")
+
+
+class BindingSiteDataset(BaseModel):
+    """Binding pockets for every instance of one ligand in one entry."""
+
+    pdb_id: str = Field(..., description="PDB identifier", example="1ATP")
+    chem_id: str = Field(..., description="Chemical component ID queried", example="ATP")
+    cutoff: float = Field(..., gt=0, description="Contact distance cutoff in Å", example=4.0)
+    sites: List[BindingSite] = Field(..., description="One entry per ligand instance (empty if the ligand is absent)")
+    provenance: Provenance = Field(..., description="Provenance shared with the entry's bundle and coordinates")
+
+
+# ────────────────────────────────────────────────────────────
+# Search
+# ────────────────────────────────────────────────────────────
+class AttributeFilter(BaseModel):
+    """One RCSB Search API attribute clause (service `text`)."""
+
+    attribute: str = Field(
+        ...,
+        description="Search attribute path",
+        example="rcsb_entity_source_organism.taxonomy_lineage.name",
+    )
+    operator: str = Field(
+        "exact_match",
+        description="Search API comparison operator (exact_match, less, greater_or_equal, in, ...)",
+        example="exact_match",
+    )
+    value: Any = Field(
+        None,
+        description="Value to compare against (omit for the `exists` operator)",
+        example="Homo sapiens",
+    )
+    negation: bool = Field(False, description="Invert the clause")
+
+
+class SearchRequest(BaseModel):
+    """Structure search combining text, attribute, sequence and chemical clauses (AND-ed together)."""
+
+    text: Optional[str] = Field(None, description="Full-text query", example="insulin receptor")
+    attributes: List[AttributeFilter] = Field(default_factory=list, description="Attribute clauses")
+    sequence: Optional[str] = Field(None, description="Protein or nucleic-acid sequence for similarity search")
+    sequence_type: str = Field("protein", description="protein, dna or rna")
+    identity_cutoff: float = Field(0.9, ge=0, le=1, description="Minimum sequence identity (0-1)")
+    evalue_cutoff: float = Field(0.1, gt=0, description="Maximum E-value for sequence hits")
+    smiles: Optional[str] = Field(None, description="SMILES for chemical similarity search")
+    chem_match_type: str = Field("graph-relaxed", description="Chemical match type, e.g. graph-exact, fingerprint-similarity")
+    max_results: int = Field(25, ge=1, le=10000, description="Stop after this many hits")
+    hydrate: bool = Field(False, description="Return StructureDataset bundles for the hits")
+
+
+class SearchHit(BaseModel):
+    """One entry returned by a search."""
+
+    pdb_id: str = Field(..., description="PDB identifier of the hit", example="4HHB")
+    score: float = Field(..., description="Relevance score reported by the Search API", example=1.0)
+
+
+class SearchResults(BaseModel):
+    """Search hits, optionally hydrated into context bundles."""
+
+    query_key: str = Field(..., description="Hash of the normalized query; identical queries share cached pages")
+    total_count: int = Field(..., ge=0, description="Total hits reported upstream")
+    hits: List[SearchHit] = Field(..., description="Hits in score order, truncated to max_results")
+    structures: Optional[List[StructureDataset]] = Field(
+        None,
+        description="Context bundles for the hits (only when hydrate=true)",
+    )
+
+
+
+class CacheTTLStats(BaseModel):
+    """Effective TTLs of the live entries of one cache."""
+
+    cache: str = Field(..., description="Cache name", example="structure")
+    entries: int = Field(..., ge=0, description="Live (unexpired) entries")
+    min_seconds: Optional[float] = Field(None, description="Shortest TTL among live entries")
+    median_seconds: Optional[float] = Field(None, description="Median TTL among live entries")
+    max_seconds: Optional[float] = Field(None, description="Longest TTL among live entries")
+    histogram: Dict[str, int] = Field(..., description="Entry counts per TTL bucket", example={"<=1h": 3, "<=1d": 10, ">30d": 0})
+
+
+class CacheMemoryStats(BaseModel):
+    """Measured memory footprint of one cache."""
+
+    cache: str = Field(..., description="Cache name", example="structure")
+    entries: int = Field(..., ge=0, description="Stored entries, including expired ones not yet evicted")
+    sampled: int = Field(..., ge=0, description="Most recently used entries that were measured")
+    bytes_per_entry: Optional[float] = Field(None, description="Mean deep size of a sampled entry; shared objects count once")
+    estimated_bytes: int = Field(..., ge=0, description="bytes_per_entry × entries")
+    materialized_bytes_per_entry: Optional[float] = Field(
+        None, description="The same entries as full models (compact caches only)", example=5700.0
+    )
+
+
+
+class HedgeStats(BaseModel):
+    """How often hedged duplicates were sent and how often they beat the original."""
+
+    calls: int = Field(..., ge=0, description="Hedge-eligible requests")
+    hedges_fired: int = Field(..., ge=0, description="Duplicates sent")
+    hedges_won: int = Field(..., ge=0, description="Duplicates that finished first")
+    budget_denied: int = Field(..., ge=0, description="Slow requests not hedged because the budget was spent")
+    fire_rate: float = Field(..., description="hedges_fired / calls")
+    win_rate: float = Field(..., description="hedges_won / hedges_fired")
+    hedge_delay_ms: Optional[float] = Field(None, description="Current hedge trigger (observed pNN latency)")
+
+
+class UpstreamPoolStats(BaseModel):
+    """Connection-pool timings of one upstream client; percentiles cover recent requests."""
+
+    client: str = Field(..., description="Upstream client name", example="pdb")
+    http2: bool = Field(..., description="Whether HTTP/2 multiplexing is enabled")
+    max_connections: int = Field(..., description="Configured pool size")
+    requests: int = Field(..., ge=0, description="Requests sent since startup")
+    new_connections: int = Field(..., ge=0, description="Connections opened since startup")
+    pool_wait_ms_p50: Optional[float] = Field(None, description="Median wait for a pooled connection")
+    pool_wait_ms_p95: Optional[float] = Field(None, description="95th percentile wait for a pooled connection")
+    pool_wait_ms_p99: Optional[float] = Field(None, description="99th percentile wait for a pooled connection")
+    pool_wait_ms_max: float = Field(..., description="Longest wait since startup")
+    pool_wait_ms_total: float = Field(..., description="Summed wait since startup")
+    connect_ms_total: float = Field(..., description="Summed TCP + TLS setup time since startup")
+    hedging: Optional[HedgeStats] = Field(None, description="Hedged-request counters (null when hedging is off)")
+
+
+class AdmissionStats(BaseModel):
+    """Upstream admission-control state; counters run since startup."""
+
+    in_flight: int = Field(..., ge=0, description="Upstream calls currently running")
+    queued: int = Field(..., ge=0, description="Upstream calls waiting for a slot")
+    max_in_flight: int = Field(..., description="Configured concurrency limit")
+    max_queued: int = Field(..., description="Configured queue limit; further calls are shed")
+    estimated_wait_seconds: float = Field(..., ge=0, description="Expected wait for a newly queued call")
+    admitted: Dict[str, int] = Field(..., description="Calls admitted per priority", example={"interactive": 120, "bulk": 900})
+    shed: Dict[str, int] = Field(..., description="Calls shed with 503 per priority", example={"interactive": 0, "bulk": 14})
+
+
+class SourceStats(BaseModel):
+    """Routing figures of one entry source; moving averages weight recent requests most."""
+
+    name: str = Field(..., description="Source key in PDB_SOURCES", example="pdbe")
+    source: str = Field(..., description="Provider named in provenance", example="PDBe")
+    base_url: str = Field(..., description="Base URL requests are sent to")
+    latency_ms: Optional[float] = Field(None, description="Moving-average latency of successful fetches (null until measured)")
+    health: float = Field(..., ge=0, le=1, description="Moving-average success rate")
+    requests: int = Field(..., ge=0, description="Entry fetches routed here since startup")
+    failures: int = Field(..., ge=0, description="Fetches that failed over or failed")
+    circuit: str = Field(..., description="Circuit-breaker state", example="closed")
+
+
+ChemicalComponent.update_forward_refs()
@@ -0,0 +1,434 @@
+# mcp_pdb/stdio_server.py
+"""
+mcp_pdb.stdio_server
+~~~~~~~~~~~~~~~~~~~~
+MCP stdio transport: newline-delimited JSON-RPC 2.0 over stdin/stdout.
+
+Desktop agent hosts spawn one server process per session, so startup time is
+on the critical path of the first tool call. This module therefore imports only
+the standard library and `mcp_pdb.config` at load time. `initialize`,
+`tools/list` and `ping` are answered without touching the HTTP stack; the
+asyncio loop, `PDBClient` (httpx) and the Pydantic schemas are imported on the
+first `tools/call` that needs them. Tool calls go through the same
+`build_structure_context` builder and module-level cache as the FastAPI app.
+
+Run with:  python -m mcp_pdb.stdio_server
+"""
+
+import json
+import logging
+import sys
+from typing import Any, Dict, Optional, TextIO
+
+from mcp_pdb.config import APP_VERSION, LOG_LEVEL, MCP_PROTOCOL_VERSION
+
+logger = logging.getLogger(__name__)
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class InvalidParams(Exception):
+    """Raised by tool handlers when the call arguments are unusable."""
+
+
+def _bool_argument(arguments: Dict[str, Any], name: str) -> bool:
+    value = arguments.get(name, False)
+    if not isinstance(value, bool):
+        raise InvalidParams(f"'{name}' must be a boolean")
+    return value
+
+
+# ────────────────────────────────────────────────────────────
+# Tool handlers – each one imports what it needs on first call
+# ────────────────────────────────────────────────────────────
+async def _call_get_structure(server: "StdioServer", arguments: Dict[str, Any]) -> str:
+    from mcp_pdb.processing import dataset_builder
+
+    pdb_id = arguments.get("pdb_id")
+    if not isinstance(pdb_id, str) or not pdb_id.strip():
+        raise InvalidParams("'pdb_id' must be a non-empty string")
+    include_ligand_details = _bool_argument(arguments, "include_ligand_details")
+    summary = await dataset_builder.build_structure_context(
+        pdb_id.strip(), server.get_pdb_client(), include_ligand_details=include_ligand_details
+    )
+    contact_cutoff = arguments.get("contact_cutoff")
+    if contact_cutoff is not None and (isinstance(contact_cutoff, bool) or not isinstance(contact_cutoff, (int, float))):
+        raise InvalidParams("'contact_cutoff' must be a number")
+    if _bool_argument(arguments, "include_geometry") or contact_cutoff is not None:
+        from mcp_pdb.processing.geometry import attach_chain_geometry
+
+        summary = await attach_chain_geometry(
+            summary, server.get_pdb_client(), server.get_coordinate_client(), contact_cutoff
+        )
+    if arguments.get("include_sequences"):
+        from mcp_pdb.processing.sequences import attach_sequences
+
+        summary = await attach_sequences(summary, server.get_pdb_client())
+    return summary.json()
+
+
+async def _call_get_ligand(server: "StdioServer", arguments: Dict[str, Any]) -> str:
+    from mcp_pdb.processing import dataset_builder
+
+    chem_id = arguments.get("chem_id")
+    if not isinstance(chem_id, str) or not chem_id.strip():
+        raise InvalidParams("'chem_id' must be a non-empty string")
+    component = await dataset_builder.build_ligand_context(chem_id, server.get_pdb_client())
+    return component.json()
+
+
+async def _call_search_structures(server: "StdioServer", arguments: Dict[str, Any]) -> str:
+    from mcp_pdb.processing.search import search_structures
+    from mcp_pdb.schemas import SearchRequest
+
+    try:
+        request = SearchRequest(**arguments)
+    except ValueError as e:  # pydantic.ValidationError
+        raise InvalidParams(str(e)) from e
+    results = await search_structures(request, server.get_pdb_client())
+    return results.json(exclude_none=True)
+
+
+async def _call_get_sequences(server: "StdioServer", arguments: Dict[str, Any]) -> str:
+    from mcp_pdb.processing.sequences import build_sequence_contexts, iter_fasta
+
+    pdb_ids = arguments.get("pdb_ids")
+    if not isinstance(pdb_ids, list) or not pdb_ids or not all(isinstance(p, str) and p.strip() for p in pdb_ids):
+        raise InvalidParams("'pdb_ids' must be a non-empty list of strings")
+    fmt = arguments.get("format", "json")
+    if fmt not in ("json", "fasta"):
+        raise InvalidParams("'format' must be 'json' or 'fasta'")
+    # Both formats fetch concurrently and leave out entries that fail.
+    if fmt == "fasta":
+        return "".join([chunk async for chunk in iter_fasta(pdb_ids, server.get_pdb_client())])
+    datasets = await build_sequence_contexts(pdb_ids, server.get_pdb_client(), skip_errors=True)
+    return "[" + ",".join(dataset.json() for dataset in datasets) + "]"
+
+
+async def _call_filter_structures(server: "StdioServer", arguments: Dict[str, Any]) -> str:
+    from mcp_pdb.processing.metadata import filter_structures
+    from mcp_pdb.schemas import MetadataFilter
+
+    try:
+        request = MetadataFilter(**arguments)
+    except ValueError as e:  # pydantic.ValidationError
+        raise InvalidParams(str(e)) from e
+    return filter_structures(request).json()
+
+
+async def _call_find_similar_sequences(server: "StdioServer", arguments: Dict[str, Any]) -> str:
+    from mcp_pdb.processing.similarity import find_similar_structures
+    from mcp_pdb.schemas import SimilarityRequest
+
+    try:
+        request = SimilarityRequest(**arguments)
+    except ValueError as e:  # pydantic.ValidationError
+        raise InvalidParams(str(e)) from e
+    return find_similar_structures(request).json()
+
+
+async def _call_get_binding_site(server: "StdioServer", arguments: Dict[str, Any]) -> str:
+    from mcp_pdb.processing.binding_site import build_binding_site_context
+
+    pdb_id, chem_id = arguments.get("pdb_id"), arguments.get("chem_id")
+    if not isinstance(pdb_id, str) or not pdb_id.strip():
+        raise InvalidParams("'pdb_id' must be a non-empty string")
+    if not isinstance(chem_id, str) or not chem_id.strip():
+        raise InvalidParams("'chem_id' must be a non-empty string")
+    cutoff = arguments.get("cutoff", 4.0)
+    if isinstance(cutoff, bool) or not isinstance(cutoff, (int, float)):
+        raise InvalidParams("'cutoff' must be a number")
+    result = await build_binding_site_context(
+        pdb_id, chem_id, float(cutoff), server.get_pdb_client(), server.get_coordinate_client()
+    )
+    return result.json()
+
+
+TOOLS: Dict[str, Dict[str, Any]] = {
+    "get_structure": {
+        "description": "Token-efficient summary of one PDB entry: title, method, resolution, chains, ligands and provenance.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "pdb_id": {"type": "string", "description": "PDB identifier, e.g. '4HHB'"},
+                "include_ligand_details": {
+                    "type": "boolean",
+                    "description": "Attach formula, weight, SMILES and InChIKey to each ligand",
+                    "default": False,
+                },
+                "include_geometry": {
+                    "type": "boolean",
+                    "description": "Attach centroid, radius of gyration and bounding box to each chain",
+                    "default": False,
+                },
+                "contact_cutoff": {
+                    "type": "number",
+                    "description": "If set, also attach a sparse residue contact map per chain at this CA-CA cutoff in Å",
+                },
+                "include_sequences": {
+                    "type": "boolean",
+                    "description": "Attach polymer sequences, one per entity with its chain IDs",
+                    "default": False,
+                },
+            },
+            "required": ["pdb_id"],
+        },
+        "handler": _call_get_structure,
+    },
+    "get_ligand": {
+        "description": "Chemical component details (formula, weight, SMILES, InChIKey) for a CCD ID such as 'ATP'.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"chem_id": {"type": "string", "description": "Chemical Component Dictionary ID, e.g. 'HEM'"}},
+            "required": ["chem_id"],
+        },
+        "handler": _call_get_ligand,
+    },
+    "get_sequences": {
+        "description": "Polymer sequences of one or more PDB entries, one record per entity (homo-oligomer chains share one sequence). Entries that cannot be fetched are left out.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "pdb_ids": {"type": "array", "items": {"type": "string"}, "description": "PDB identifiers"},
+                "format": {"type": "string", "enum": ["json", "fasta"], "default": "json"},
+            },
+            "required": ["pdb_ids"],
+        },
+        "handler": _call_get_sequences,
+    },
+    "filter_structures": {
+        "description": "Filter all entries seen so far by method, resolution, organism, bound ligands, chain count and release date, from a local index (no remote search).",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "method": {"type": "string", "description": "Method prefix, e.g. 'X-RAY'"},
+                "min_resolution": {"type": "number"},
+                "max_resolution": {"type": "number", "description": "Å, inclusive"},
+                "organism": {"type": "string", "description": "e.g. 'Homo sapiens'"},
+                "ligands": {"type": "array", "items": {"type": "string"}, "description": "CCD IDs that must all be bound"},
+                "min_chains": {"type": "integer"},
+                "max_chains": {"type": "integer"},
+                "released_after": {"type": "string", "format": "date"},
+                "released_before": {"type": "string", "format": "date"},
+                "limit": {"type": "integer", "default": 100},
+                "offset": {"type": "integer", "default": 0},
+            },
+        },
+        "handler": _call_filter_structures,
+    },
+    "find_similar_sequences": {
+        "description": "Entries whose sequences are most similar to a query sequence, from a local k-mer index of every entry seen so far (no remote search).",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "sequence": {"type": "string", "description": "Query sequence in one-letter codes"},
+                "top_k": {"type": "integer", "default": 10},
+            },
+            "required": ["sequence"],
+        },
+        "handler": _call_find_similar_sequences,
+    },
+    "get_binding_site": {
+        "description": "Residues within a distance cutoff of each instance of a ligand in a PDB entry, closest first.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "pdb_id": {"type": "string", "description": "PDB identifier, e.g. '1ATP'"},
+                "chem_id": {"type": "string", "description": "Chemical Component Dictionary ID of the ligand, e.g. 'ATP'"},
+                "cutoff": {"type": "number", "description": "Contact distance in Å (max 10)", "default": 4.0},
+            },
+            "required": ["pdb_id", "chem_id"],
+        },
+        "handler": _call_get_binding_site,
+    },
+    "search_structures": {
+        "description": "Find PDB entries by full text, attribute clauses, sequence similarity and/or SMILES (clauses are AND-ed).",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "text": {"type": "string", "description": "Full-text query"},
+                "attributes": {
+                    "type": "array",
+                    "description": "Attribute clauses, e.g. {attribute: 'exptl.method', operator: 'exact_match', value: 'X-RAY DIFFRACTION'}",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "attribute": {"type": "string"},
+                            "operator": {"type": "string"},
+                            "value": {},
+                            "negation": {"type": "boolean"},
+                        },
+                        "required": ["attribute"],
+                    },
+                },
+                "sequence": {"type": "string", "description": "Sequence for similarity search"},
+                "smiles": {"type": "string", "description": "SMILES for chemical search"},
+                "max_results": {"type": "integer", "default": 25},
+                "hydrate": {"type": "boolean", "description": "Include a structure bundle per hit", "default": False},
+            },
+        },
+        "handler": _call_search_structures,
+    },
+}
+
+
+class StdioServer:
+    """Dispatches MCP JSON-RPC messages read from a text stream."""
+
+    def __init__(self, stdin: TextIO = sys.stdin, stdout: TextIO = sys.stdout):
+        self._stdin = stdin
+        self._stdout = stdout
+        self._loop = None  # asyncio event loop, created on the first tool call
+        self._pdb_client = None  # PDBClient, created on the first tool call that needs it
+        self._coordinate_client = None  # CoordinateClient, likewise
+
+    # --- lazily created resources -------------------------------------------------
+    def get_pdb_client(self):
+        if self._pdb_client is None:
+            from mcp_pdb.adapter.pdb_client import PDBClient
+
+            self._pdb_client = PDBClient()
+        return self._pdb_client
+
+    def get_coordinate_client(self):
+        if self._coordinate_client is None:
+            from mcp_pdb.adapter.coordinate_client import CoordinateClient
+
+            self._coordinate_client = CoordinateClient()
+        return self._coordinate_client
+
+    def _run(self, coro):
+        if self._loop is None:
+            import asyncio
+
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+
+    def close(self) -> None:
+        """Closes the HTTP clients and event loop if they were ever created, and persists the sequence index."""
+        if "mcp_pdb.processing.similarity" in sys.modules:
+            sys.modules["mcp_pdb.processing.similarity"].save_sequence_index()
+        if self._loop is None:
+            return
+        if self._pdb_client is not None:
+            self._loop.run_until_complete(self._pdb_client.close())
+            self._pdb_client = None
+        if self._coordinate_client is not None:
+            self._loop.run_until_complete(self._coordinate_client.close())
+            self._coordinate_client = None
+        self._loop.close()
+        self._loop = None
+
+    # --- JSON-RPC dispatch ------------------------------------------------------
+    def handle_message(self, message: Any) -> Optional[Dict[str, Any]]:
+        """
+        Handles one decoded JSON-RPC message.
+
+        Returns:
+            The response object, or None for notifications (messages without an id).
+        """
+        if not isinstance(message, dict) or message.get("jsonrpc") != "2.0" or not isinstance(message.get("method"), str):
+            return _error_response(None, INVALID_REQUEST, "Invalid JSON-RPC 2.0 request.")
+
+        msg_id = message.get("id")
+        is_notification = "id" not in message
+        method = message["method"]
+        params = message.get("params") or {}
+        if not isinstance(params, dict):
+            return None if is_notification else _error_response(msg_id, INVALID_PARAMS, "Invalid params: 'params' must be an object.")
+
+        if method == "initialize":
+            result = {
+                "protocolVersion": MCP_PROTOCOL_VERSION,
+                "capabilities": {"tools": {"listChanged": False}},
+                "serverInfo": {"name": "pdb-mcp", "version": APP_VERSION},
+            }
+        elif method == "ping":
+            result = {}
+        elif method == "tools/list":
+            result = {
+                "tools": [
+                    {"name": name, "description": spec["description"], "inputSchema": spec["inputSchema"]}
+                    for name, spec in TOOLS.items()
+                ]
+            }
+        elif method == "tools/call":
+            if is_notification:
+                return None
+            return self._handle_tool_call(msg_id, params)
+        elif method.startswith("notifications/"):
+            return None
+        else:
+            return None if is_notification else _error_response(msg_id, METHOD_NOT_FOUND, f"Method '{method}' not found.")
+
+        return None if is_notification else {"jsonrpc": "2.0", "id": msg_id, "result": result}
+
+    def _handle_tool_call(self, msg_id: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+        name = params.get("name")
+        if not isinstance(name, str):
+            return _error_response(msg_id, INVALID_PARAMS, "Invalid params: 'name' must be a string.")
+        spec = TOOLS.get(name)
+        if spec is None:
+            return _error_response(msg_id, INVALID_PARAMS, f"Unknown tool '{name}'.")
+        arguments = params.get("arguments") or {}
+        if not isinstance(arguments, dict):
+            return _error_response(msg_id, INVALID_PARAMS, "'arguments' must be an object.")
+
+        from mcp_pdb.exceptions import MCPError
+
+        try:
+            text = self._run(spec["handler"](self, arguments))
+            is_error = False
+        except InvalidParams as e:
+            return _error_response(msg_id, INVALID_PARAMS, str(e))
+        except MCPError as e:
+            # Tool execution errors are reported inside the result so the model can see them.
+            logger.warning(f"Tool '{name}' failed: {e.message}")
+            text, is_error = e.message, True
+        except Exception as e:
+            logger.exception(f"Unhandled exception in tool '{name}': {e}")
+            return _error_response(msg_id, INTERNAL_ERROR, "An unexpected internal server error occurred.")
+
+        return {
+            "jsonrpc": "2.0",
+            "id": msg_id,
+            "result": {"content": [{"type": "text", "text": text}], "isError": is_error},
+        }
+
+    def serve_forever(self) -> None:
+        """Reads requests line by line until EOF, writing one response line per request."""
+        try:
+            for line in self._stdin:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError as e:
+                    response = _error_response(None, PARSE_ERROR, f"Parse error: {e}")
+                else:
+                    response = self.handle_message(message)
+                if response is not None:
+                    self._stdout.write(json.dumps(response, separators=(",", ":")) + "\n")
+                    self._stdout.flush()
+        finally:
+            self.close()
+
+
+def _error_response(msg_id: Any, code: int, message: str) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": msg_id, "error": {"code": code, "message": message}}
+
+
+def main() -> None:
+    # stdout carries the protocol; all logging goes to stderr.
+    logging.basicConfig(level=LOG_LEVEL.value, stream=sys.stderr)
+    StdioServer().serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,54 @@
+import sys
 import time
+import types
 from collections import OrderedDict
-from typing import Any, Optional, Tuple
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 import threading
 
-from mcp_pdb.config import CACHE_ENABLED, CACHE_MAX_SIZE, CACHE_TTL_SECONDS
+from mcp_pdb.config import CACHE_ENABLED, CACHE_MAX_SIZE, CACHE_MEMORY_SAMPLE, CACHE_TTL_SECONDS
+
+# Upper bounds (seconds) of the buckets reported by LRUCache.ttl_distribution
+TTL_BUCKETS: Tuple[Tuple[str, float], ...] = (
+    ("<=1h", 3600),
+    ("<=6h", 6 * 3600),
+    ("<=1d", 24 * 3600),
+    ("<=7d", 7 * 24 * 3600),
+    ("<=30d", 30 * 24 * 3600),
+    (">30d", float("inf")),
+)
+
+# Shared by every value that references them, never owned by a cache entry
+_NOT_OWNED = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+def deep_sizeof(values: Iterable[Any]) -> int:
+    """
+    Bytes held by `values` and everything reachable from them (containers, instance
+    dicts and slots, NumPy array buffers). Objects shared between values count once.
+    """
+    seen = set()
+    stack = list(values)
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _NOT_OWNED):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        if hasattr(obj, "__dict__"):
+            stack.append(vars(obj))
+        for cls in type(obj).__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                if slot not in ("__dict__", "__weakref__") and hasattr(obj, slot):
+                    stack.append(getattr(obj, slot))
+        if hasattr(obj, "nbytes") and getattr(obj, "base", None) is not None:
+            stack.append(obj.base)  # A NumPy view: the buffer belongs to its base
+    return total
 
 class LRUCache:
     def __init__(self, max_size: int = CACHE_MAX_SIZE, ttl_seconds: int = CACHE_TTL_SECONDS):
@@ -14,7 +59,7 @@ class LRUCache:
             
         self.max_size = max_size
         self.ttl = ttl_seconds
-        self._cache = OrderedDict() # Stores key -> (value, expiry_time)
+        self._cache = OrderedDict() # Stores key -> (value, expiry_time, ttl)
         self._lock = threading.Lock() # For thread safety
 
     def get(self, key: Any) -> Optional[Any]:
@@ -25,7 +70,7 @@ class LRUCache:
             if key not in self._cache:
                 return None
 
-            value, expiry_time = self._cache[key]
+            value, expiry_time, _ = self._cache[key]
 
             if time.time() > expiry_time:
                 # Entry has expired
@@ -36,12 +81,16 @@ class LRUCache:
             self._cache.move_to_end(key)
             return value
 
-    def set(self, key: Any, value: Any) -> None:
+    def set(self, key: Any, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Stores `value`; `ttl_seconds` overrides the cache-wide TTL for this entry."""
         if not CACHE_ENABLED:
             return
+        ttl = self.ttl if ttl_seconds is None else ttl_seconds
+        if ttl <= 0:
+            raise ValueError("ttl_seconds must be a positive number")
 
         with self._lock:
-            expiry_time = time.time() + self.ttl
+            expiry_time = time.time() + ttl
             
             if key in self._cache:
                 # Key exists, update it and move to end
@@ -50,7 +99,7 @@ class LRUCache:
                 # Cache is full, remove the least recently used item (first item)
                 self._cache.popitem(last=False)
             
-            self._cache[key] = (value, expiry_time)
+            self._cache[key] = (value, expiry_time, ttl)
 
     def delete(self, key: Any) -> None:
         if not CACHE_ENABLED:
@@ -60,6 +109,17 @@ class LRUCache:
             if key in self._cache:
                 del self._cache[key]
 
+    def delete_matching(self, predicate: Callable[[Any], bool]) -> int:
+        """Removes every key for which `predicate(key)` is true; returns how many were removed."""
+        if not CACHE_ENABLED:
+            return 0
+
+        with self._lock:
+            keys = [k for k in self._cache if predicate(k)]
+            for k in keys:
+                del self._cache[k]
+            return len(keys)
+
     def clear(self) -> None:
         with self._lock:
             self._cache.clear()
@@ -69,12 +129,46 @@ class LRUCache:
             # Prune expired items before returning length
             current_time = time.time()
             keys_to_delete = [
-                k for k, (_, expiry) in self._cache.items() if expiry < current_time
+                k for k, (_, expiry, _) in self._cache.items() if expiry < current_time
             ]
             for k in keys_to_delete:
                 del self._cache[k]
             return len(self._cache)
 
+    def ttl_distribution(self) -> Dict[str, Any]:
+        """Effective TTLs of the live entries: count, min / median / max seconds and a TTL_BUCKETS histogram."""
+        with self._lock:
+            current_time = time.time()
+            ttls = sorted(ttl for _, expiry, ttl in self._cache.values() if expiry >= current_time)
+        histogram = {label: 0 for label, _ in TTL_BUCKETS}
+        for ttl in ttls:
+            histogram[next(label for label, bound in TTL_BUCKETS if ttl <= bound)] += 1
+        return {
+            "entries": len(ttls),
+            "min_seconds": ttls[0] if ttls else None,
+            "median_seconds": ttls[len(ttls) // 2] if ttls else None,
+            "max_seconds": ttls[-1] if ttls else None,
+            "histogram": histogram,
+        }
+
+    def _sample_values(self, sample: int) -> List[Any]:
+        """Up to `sample` stored values, most recently used first, as held in memory."""
+        with self._lock:
+            return [value for value, _, _ in islice(reversed(self._cache.values()), sample)]
+
+    def memory_usage(self, sample: int = CACHE_MEMORY_SAMPLE) -> Dict[str, Any]:
+        """Deep size of up to `sample` entries, extrapolated to the whole cache."""
+        with self._lock:
+            entries = len(self._cache)
+        values = self._sample_values(sample)
+        per_entry = deep_sizeof(values) / len(values) if values else None
+        return {
+            "entries": entries,
+            "sampled": len(values),
+            "bytes_per_entry": per_entry,
+            "estimated_bytes": round(per_entry * entries) if per_entry is not None else 0,
+        }
+
     def __contains__(self, key: Any) -> bool:
         return self.get(key) is not None # Relies on get() to handle expiry
 
@@ -0,0 +1,184 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from mcp_pdb.config import COORDINATE_STORE_DIR, COORDINATE_STORE_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+META_FILE = "meta.json"
+
+
+class CoordinateStore:
+    """
+    On-disk store of per-entry NumPy arrays, read back as memory maps.
+
+    Each key gets one directory holding one `.npy` file per array plus a
+    `meta.json` with arbitrary JSON metadata:
+
+        <root>/<KEY>/xyz.npy, chain.npy, ..., meta.json
+
+    Reads use `np.load(mmap_mode="r")`, so repeated queries involve no parsing
+    and no copies; pages are shared through the OS page cache. Total disk usage
+    is bounded by `max_bytes` with least-recently-used eviction. Recency
+    survives restarts through the mtime of `meta.json`, which is touched on read.
+    """
+
+    def __init__(self, root: str = COORDINATE_STORE_DIR, max_bytes: int = COORDINATE_STORE_MAX_BYTES):
+        if not isinstance(max_bytes, int) or max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer")
+        self.root = root
+        self.max_bytes = max_bytes
+        self._index: "OrderedDict[str, int]" = OrderedDict()  # key -> bytes on disk, LRU first
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    # --- public API --------------------------------------------------------------
+    def put(self, key: str, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> None:
+        """Writes (or replaces) an entry atomically, then evicts LRU entries over the size budget."""
+        key = _safe_key(key)
+        with self._lock:
+            self._ensure_loaded()
+            tmp_dir = os.path.join(self.root, f".tmp-{key}-{uuid.uuid4().hex}")
+            os.makedirs(tmp_dir)
+            try:
+                for name, array in arrays.items():
+                    np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(array), allow_pickle=False)
+                with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as fh:
+                    json.dump({"arrays": sorted(arrays), "meta": meta}, fh)
+                size = _dir_size(tmp_dir)
+
+                entry_dir = os.path.join(self.root, key)
+                if key in self._index:
+                    self._forget(key)
+                    shutil.rmtree(entry_dir, ignore_errors=True)
+                os.replace(tmp_dir, entry_dir)
+            except BaseException:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                raise
+
+            self._index[key] = size
+            self._total_bytes += size
+            self._evict(keep=key)
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, np.ndarray], Dict[str, Any]]]:
+        """
+        Returns `(arrays, meta)` with every array memory-mapped read-only, or None if absent.
+        """
+        key = _safe_key(key)
+        with self._lock:
+            self._ensure_loaded()
+            if key not in self._index:
+                return None
+            entry_dir = os.path.join(self.root, key)
+            try:
+                with open(os.path.join(entry_dir, META_FILE), encoding="utf-8") as fh:
+                    record = json.load(fh)
+                arrays = {
+                    name: np.load(os.path.join(entry_dir, f"{name}.npy"), mmap_mode="r", allow_pickle=False)
+                    for name in record["arrays"]
+                }
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Dropping unreadable coordinate store entry {key}: {e}")
+                self._forget(key)
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                return None
+            self._index.move_to_end(key)
+            _touch(os.path.join(entry_dir, META_FILE))
+            return arrays, record["meta"]
+
+    def delete(self, key: str) -> None:
+        key = _safe_key(key)
+        with self._lock:
+            self._ensure_loaded()
+            if key in self._index:
+                self._forget(key)
+                shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ensure_loaded()
+            for key in list(self._index):
+                shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+            self._index.clear()
+            self._total_bytes = 0
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return self._total_bytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            self._ensure_loaded()
+            return _safe_key(key) in self._index
+
+    # --- internals ---------------------------------------------------------------
+    def _ensure_loaded(self) -> None:
+        """Builds the LRU index from disk on first use (oldest `meta.json` mtime first)."""
+        if self._loaded:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        entries = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name.startswith(".tmp-"):
+                shutil.rmtree(path, ignore_errors=True)  # Leftover from an interrupted write
+                continue
+            meta_path = os.path.join(path, META_FILE)
+            if os.path.isfile(meta_path):
+                entries.append((os.path.getmtime(meta_path), name, _dir_size(path)))
+        for _, name, size in sorted(entries):
+            self._index[name] = size
+            self._total_bytes += size
+        self._loaded = True
+        self._evict()
+
+    def _forget(self, key: str) -> None:
+        self._total_bytes -= self._index.pop(key)
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        while self._total_bytes > self.max_bytes and self._index:
+            oldest = next(iter(self._index))
+            if oldest == keep:
+                if len(self._index) == 1:
+                    break  # A single entry larger than the budget is still kept
+                self._index.move_to_end(oldest)
+                continue
+            logger.info(f"Evicting {oldest} from coordinate store ({self._total_bytes} > {self.max_bytes} bytes)")
+            self._forget(oldest)
+            shutil.rmtree(os.path.join(self.root, oldest), ignore_errors=True)
+
+
+def _safe_key(key: str) -> str:
+    key = str(key).strip().upper()
+    if not key or not key.replace("_", "").replace("-", "").isalnum():
+        raise ValueError(f"Invalid coordinate store key: {key!r}")
+    return key
+
+
+def _dir_size(path: str) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+def _touch(path: str) -> None:
+    try:
+        now = time.time()
+        os.utime(path, (now, now))
+    except OSError:
+        pass
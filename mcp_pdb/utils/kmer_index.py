@@ -0,0 +1,279 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from mcp_pdb.config import KMER_SIZE
+
+logger = logging.getLogger(__name__)
+
+ALPHABET_BITS = 5  # One-letter codes map to 0..31 (A-Z, everything else shares one code)
+
+_CODE_TABLE = np.full(256, 26, dtype=np.int64)
+_CODE_TABLE[np.frombuffer(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", dtype=np.uint8)] = np.arange(26)
+_CODE_TABLE[np.frombuffer(b"abcdefghijklmnopqrstuvwxyz", dtype=np.uint8)] = np.arange(26)
+
+
+class KmerIndex:
+    """
+    In-memory inverted index from sequence k-mers to sequences, for offline
+    "find similar entries" queries.
+
+    Layout (sparse CSR): `codes` holds the sorted k-mer codes that occur at
+    least once, and `offsets[i]:offsets[i + 1]` is the slice of `postings`
+    holding the IDs of every sequence that contains `codes[i]`. Query k-mers are
+    located with `np.searchsorted`, so memory grows with the data, not with the
+    32**k possible codes. Each distinct sequence is indexed once (keyed by
+    SHA-256), however many entries share it.
+
+    Additions are buffered and merged into the CSR arrays in one pass before the
+    next query, so adding entries one at a time stays cheap. A query gathers
+    the posting lists of its k-mers, counts shared k-mers per sequence with
+    `np.bincount`, and ranks by Jaccard similarity of the k-mer sets.
+
+    Discarded entries leave their sequence's postings behind until the next
+    compaction, which runs on `save` and whenever at least `COMPACT_DEAD_FRACTION`
+    of the sequences are no longer used by any entry.
+    """
+
+    FORMAT_VERSION = 2
+    COMPACT_DEAD_FRACTION = 0.25
+
+    def __init__(self, k: int = KMER_SIZE):
+        if not isinstance(k, int) or not 1 <= k <= 6:
+            raise ValueError("k must be an integer between 1 and 6")
+        self.k = k
+        self._lock = threading.Lock()
+
+        self._codes = np.empty(0, dtype=np.int64)  # Sorted k-mer codes present in the index
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._postings = np.empty(0, dtype=np.int32)
+        self._pending_codes: List[np.ndarray] = []
+        self._pending_ids: List[np.ndarray] = []
+
+        self._digests: Dict[str, int] = {}  # sequence SHA-256 -> sequence ID
+        self._kmer_counts = array("i")  # sequence ID -> number of distinct k-mers
+        self._entries: Dict[Tuple[str, str], int] = {}  # (PDB ID, entity ID) -> sequence ID
+        self._seq_entries: List[List[Tuple[str, str]]] = []  # sequence ID -> entries using it
+
+    # --- public API --------------------------------------------------------------
+    def add(self, pdb_id: str, entity_id: str, sequence: str) -> bool:
+        """
+        Indexes one entity's sequence. Returns False if it was already indexed unchanged
+        (or is shorter than k). Re-adding an entity with a new sequence re-points it.
+        """
+        label = (pdb_id.upper(), str(entity_id))
+        digest = hashlib.sha256(sequence.encode()).hexdigest()
+        with self._lock:
+            seq_id = self._digests.get(digest)
+            if seq_id is not None and self._entries.get(label) == seq_id:
+                return False
+            if seq_id is None:
+                codes = self._kmer_codes(sequence)
+                if len(codes) == 0:
+                    return False
+                seq_id = len(self._kmer_counts)
+                self._digests[digest] = seq_id
+                self._kmer_counts.append(len(codes))
+                self._seq_entries.append([])
+                self._pending_codes.append(codes)
+                self._pending_ids.append(np.full(len(codes), seq_id, dtype=np.int32))
+            self._unlink(label)
+            self._entries[label] = seq_id
+            self._seq_entries[seq_id].append(label)
+            return True
+
+    def discard(self, pdb_id: str) -> int:
+        """Forgets every entity of an entry; returns how many were removed. Postings stay until compacted."""
+        pdb_id = pdb_id.upper()
+        with self._lock:
+            labels = [label for label in self._entries if label[0] == pdb_id]
+            for label in labels:
+                self._unlink(label)
+            return len(labels)
+
+    def query(self, sequence: str, top_k: int = 10) -> List[Tuple[str, str, float, int]]:
+        """
+        Returns up to `top_k` entries most similar to `sequence`, best first, as
+        `(pdb_id, entity_id, score, shared_kmers)`; each entry appears once, with its best entity.
+        """
+        query = self._kmer_codes(sequence)
+        if len(query) == 0 or top_k <= 0:
+            return []
+        with self._lock:
+            self._merge_pending()
+            positions = np.searchsorted(self._codes, query)
+            in_range = positions < len(self._codes)
+            positions, present = positions[in_range], query[in_range]
+            found = positions[self._codes[positions] == present]
+            starts, ends = self._offsets[found], self._offsets[found + 1]
+            counts = ends - starts
+            total = int(counts.sum())
+            if total == 0:
+                return []
+            # Gather all posting slices without a Python loop.
+            gather = np.arange(total) + np.repeat(starts - np.cumsum(counts) + counts, counts)
+            shared = np.bincount(self._postings[gather], minlength=len(self._kmer_counts))
+            candidates = np.nonzero(shared)[0]
+            sizes = np.frombuffer(self._kmer_counts, dtype=np.int32)[candidates]
+            scores = shared[candidates] / (len(query) + sizes - shared[candidates])
+            ranked = np.argsort(-scores, kind="stable")
+
+            hits: List[Tuple[str, str, float, int]] = []
+            seen = set()
+            for i in ranked:
+                seq_id = int(candidates[i])
+                for pdb_id, entity_id in sorted(self._seq_entries[seq_id]):
+                    if pdb_id in seen:
+                        continue
+                    seen.add(pdb_id)
+                    hits.append((pdb_id, entity_id, round(float(scores[i]), 4), int(shared[seq_id])))
+                    if len(hits) == top_k:
+                        return hits
+            return hits
+
+    def __len__(self) -> int:
+        """Number of indexed entities."""
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def sequence_count(self) -> int:
+        """Number of distinct sequences indexed."""
+        with self._lock:
+            return len(self._kmer_counts)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the index arrays (Python-side maps excluded)."""
+        with self._lock:
+            pending = sum(c.nbytes + i.nbytes for c, i in zip(self._pending_codes, self._pending_ids))
+            arrays = self._codes.nbytes + self._offsets.nbytes + self._postings.nbytes
+            return arrays + pending + len(self._kmer_counts) * self._kmer_counts.itemsize
+
+    # --- persistence -------------------------------------------------------------
+    def save(self, path: str) -> None:
+        """Compacts the index and writes it to one `.npz` file, atomically."""
+        with self._lock:
+            self._merge_pending(compact=True)
+            meta = {
+                "version": self.FORMAT_VERSION,
+                "k": self.k,
+                "digests": sorted(self._digests, key=self._digests.__getitem__),
+                "entries": [[pdb_id, entity_id, seq_id] for (pdb_id, entity_id), seq_id in self._entries.items()],
+            }
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = os.path.join(directory, f".tmp-{uuid.uuid4().hex}.npz")
+            try:
+                np.savez(
+                    tmp_path,
+                    codes=self._codes,
+                    offsets=self._offsets,
+                    postings=self._postings,
+                    kmer_counts=np.frombuffer(self._kmer_counts, dtype=np.int32),
+                    meta=np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8),
+                )
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+    @classmethod
+    def load(cls, path: str, k: int = KMER_SIZE) -> Optional["KmerIndex"]:
+        """Reads an index written by `save`; returns None if it is missing, unreadable or built with another k."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(data["meta"].tobytes().decode())
+                if meta.get("version") != cls.FORMAT_VERSION or meta.get("k") != k:
+                    logger.info(f"Ignoring sequence index at {path}: built with different settings")
+                    return None
+                index = cls(k)
+                index._codes = data["codes"].astype(np.int64)
+                index._offsets = data["offsets"].astype(np.int64)
+                index._postings = data["postings"].astype(np.int32)
+                index._kmer_counts = array("i", data["kmer_counts"].astype(np.int32).tobytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable sequence index at {path}: {e}")
+            return None
+
+        index._digests = {digest: seq_id for seq_id, digest in enumerate(meta["digests"])}
+        index._seq_entries = [[] for _ in meta["digests"]]
+        for pdb_id, entity_id, seq_id in meta["entries"]:
+            index._entries[(pdb_id, entity_id)] = seq_id
+            index._seq_entries[seq_id].append((pdb_id, entity_id))
+        return index
+
+    # --- internals ---------------------------------------------------------------
+    def _kmer_codes(self, sequence: str) -> np.ndarray:
+        """Distinct k-mer codes of a sequence (whitespace ignored)."""
+        raw = np.frombuffer("".join(sequence.split()).encode("ascii", "replace"), dtype=np.uint8)
+        if len(raw) < self.k:
+            return np.empty(0, dtype=np.int64)
+        letters = _CODE_TABLE[raw]
+        n = len(letters) - self.k + 1
+        codes = np.zeros(n, dtype=np.int64)
+        for j in range(self.k):
+            codes = (codes << ALPHABET_BITS) | letters[j:j + n]
+        return np.unique(codes)
+
+    def _merge_pending(self, compact: bool = False) -> None:
+        """
+        Merges buffered additions into the CSR arrays (linear in the index size) and
+        compacts away sequences no entry uses any more when `compact` is set or
+        COMPACT_DEAD_FRACTION of them are dead.
+        """
+        dead = np.fromiter((not entries for entries in self._seq_entries), dtype=bool, count=len(self._seq_entries))
+        n_dead = int(dead.sum())
+        compact = n_dead > 0 and (compact or n_dead >= self.COMPACT_DEAD_FRACTION * len(dead))
+        if not self._pending_codes and not compact:
+            return
+        codes = np.concatenate(self._pending_codes) if self._pending_codes else np.empty(0, dtype=np.int64)
+        ids = np.concatenate(self._pending_ids) if self._pending_ids else np.empty(0, dtype=np.int32)
+        self._pending_codes.clear()
+        self._pending_ids.clear()
+        if compact:
+            # Rebuild from every posting; the existing ones are already sorted by code.
+            codes = np.concatenate((np.repeat(self._codes, np.diff(self._offsets)), codes))
+            ids = np.concatenate((self._postings, ids))
+            codes, ids = self._drop_dead(dead, codes, ids)
+            order = np.argsort(codes, kind="stable")
+            self._codes, counts = np.unique(codes[order], return_counts=True)
+            self._offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+            self._postings = ids[order].astype(np.int32)
+            return
+        order = np.argsort(codes, kind="stable")  # Order within a posting list does not matter
+        codes, ids = codes[order], ids[order]
+        # Append each new posting at the end of its code's slice: one copy of the postings.
+        self._postings = np.insert(self._postings, self._offsets[np.searchsorted(self._codes, codes, side="right")], ids)
+        merged = np.union1d(self._codes, codes)
+        counts = np.zeros(len(merged), dtype=np.int64)
+        counts[np.searchsorted(merged, self._codes)] = np.diff(self._offsets)
+        counts += np.bincount(np.searchsorted(merged, codes), minlength=len(merged))
+        self._codes = merged
+        self._offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+    def _drop_dead(self, dead: np.ndarray, codes: np.ndarray, ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Renumbers live sequences 0..n-1 and returns the postings that still belong to one."""
+        remap = (np.cumsum(~dead) - 1).astype(np.int32)
+        live_ids = np.nonzero(~dead)[0]
+        self._kmer_counts = array("i", (self._kmer_counts[i] for i in live_ids))
+        self._seq_entries = [self._seq_entries[i] for i in live_ids]
+        self._digests = {digest: int(remap[i]) for digest, i in self._digests.items() if not dead[i]}
+        self._entries = {label: int(remap[i]) for label, i in self._entries.items()}
+        keep = ~dead[ids]
+        return codes[keep], remap[ids[keep]]
+
+    def _unlink(self, label: Tuple[str, str]) -> None:
+        old = self._entries.pop(label, None)
+        if old is not None:
+            self._seq_entries[old].remove(label)
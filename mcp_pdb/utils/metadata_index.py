@@ -0,0 +1,171 @@
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    pdb_id       TEXT PRIMARY KEY,
+    method       TEXT,
+    resolution   REAL,
+    release_date TEXT,
+    chain_count  INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_method ON entries (method COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS entries_resolution ON entries (resolution);
+CREATE INDEX IF NOT EXISTS entries_release_date ON entries (release_date);
+
+CREATE TABLE IF NOT EXISTS entry_organisms (
+    organism TEXT NOT NULL COLLATE NOCASE,
+    pdb_id   TEXT NOT NULL,
+    PRIMARY KEY (organism, pdb_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entry_organisms_pdb_id ON entry_organisms (pdb_id);
+
+CREATE TABLE IF NOT EXISTS entry_ligands (
+    chem_id TEXT NOT NULL,
+    pdb_id  TEXT NOT NULL,
+    PRIMARY KEY (chem_id, pdb_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entry_ligands_pdb_id ON entry_ligands (pdb_id);
+"""
+
+ROW_COLUMNS = ("pdb_id", "method", "resolution", "release_date", "chain_count")
+
+
+class MetadataIndex:
+    """
+    SQLite index of per-entry scalar fields for offline filtering.
+
+    One row per entry in `entries` (method, resolution, release date, chain
+    count) plus `(organism, pdb_id)` and `(chem_id, pdb_id)` link tables, each
+    with covering indexes, so filters such as "X-ray, < 2.0 Å, Homo sapiens,
+    binds HEM" are index lookups. `path=":memory:"` keeps everything in memory.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def upsert(self, pdb_id: str, method: Optional[str], resolution: Optional[float], release_date: Optional[str],
+               chain_count: int, organisms: Iterable[str] = (), ligands: Iterable[str] = ()) -> None:
+        """Inserts or replaces one entry and its organism / ligand links."""
+        self.upsert_many([(pdb_id, method, resolution, release_date, chain_count, organisms, ligands)])
+
+    def upsert_many(self, rows: Iterable[Tuple[str, Optional[str], Optional[float], Optional[str], int, Iterable[str], Iterable[str]]]) -> None:
+        """Bulk variant of `upsert`, in a single transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for pdb_id, method, resolution, release_date, chain_count, organisms, ligands in rows:
+                    pdb_id = pdb_id.upper()
+                    self._delete(pdb_id)
+                    self._conn.execute(
+                        "INSERT INTO entries VALUES (?, ?, ?, ?, ?)",
+                        (pdb_id, method, resolution, release_date, chain_count),
+                    )
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO entry_organisms VALUES (?, ?)",
+                        [(organism, pdb_id) for organism in set(organisms) if organism],
+                    )
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO entry_ligands VALUES (?, ?)",
+                        [(chem_id.upper(), pdb_id) for chem_id in set(ligands) if chem_id],
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, pdb_id: str) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._delete(pdb_id.upper())
+            self._conn.execute("COMMIT")
+
+    def query(
+        self,
+        method: Optional[str] = None,
+        min_resolution: Optional[float] = None,
+        max_resolution: Optional[float] = None,
+        organism: Optional[str] = None,
+        ligands: Sequence[str] = (),
+        min_chains: Optional[int] = None,
+        max_chains: Optional[int] = None,
+        released_after: Optional[str] = None,
+        released_before: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Returns `(total matching, rows)`; rows are ordered by resolution (unknown last), then PDB ID.
+        """
+        clauses, params = [], []
+        if method:
+            clauses.append("e.method LIKE ? ESCAPE '\\'")
+            params.append(_like_prefix(method))
+        if min_resolution is not None:
+            clauses.append("e.resolution >= ?")
+            params.append(min_resolution)
+        if max_resolution is not None:
+            clauses.append("e.resolution <= ?")
+            params.append(max_resolution)
+        if min_chains is not None:
+            clauses.append("e.chain_count >= ?")
+            params.append(min_chains)
+        if max_chains is not None:
+            clauses.append("e.chain_count <= ?")
+            params.append(max_chains)
+        if released_after:
+            clauses.append("e.release_date >= ?")
+            params.append(released_after)
+        if released_before:
+            clauses.append("e.release_date <= ?")
+            params.append(released_before)
+        if organism:
+            clauses.append("e.pdb_id IN (SELECT pdb_id FROM entry_organisms WHERE organism = ?)")
+            params.append(organism)
+        for chem_id in dict.fromkeys(c.upper() for c in ligands if c):
+            clauses.append("e.pdb_id IN (SELECT pdb_id FROM entry_ligands WHERE chem_id = ?)")
+            params.append(chem_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM entries e {where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT {', '.join('e.' + c for c in ROW_COLUMNS)} FROM entries e {where} "
+                "ORDER BY e.resolution IS NULL, e.resolution, e.pdb_id LIMIT ? OFFSET ?",
+                [*params, limit, offset],
+            ).fetchall()
+        return total, [dict(zip(ROW_COLUMNS, row)) for row in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def __contains__(self, pdb_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM entries WHERE pdb_id = ?", (pdb_id.upper(),)).fetchone() is not None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _delete(self, pdb_id: str) -> None:
+        for table in ("entries", "entry_organisms", "entry_ligands"):
+            self._conn.execute(f"DELETE FROM {table} WHERE pdb_id = ?", (pdb_id,))
+
+
+def _like_prefix(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
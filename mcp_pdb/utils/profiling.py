@@ -0,0 +1,187 @@
+"""
+mcp_pdb.utils.profiling
+~~~~~~~~~~~~~~~~~~~~~~~
+On-demand profiling of the live server, for admins only (ADMIN_TOKEN):
+
+•  StackSampler        – samples every thread's stack on a timer for a fixed window and
+                         returns collapsed stacks (`frame;frame;frame count`), the input
+                         format of flamegraph.pl, speedscope and inferno
+•  ProfilingMiddleware – runs one request under cProfile when it carries `X-Profile`,
+                         and reports its top functions in a `Server-Timing` header
+
+Nothing runs while profiling is idle: the sampler thread only exists for the
+requested window, and the middleware is only installed when ADMIN_TOKEN is set.
+"""
+
+import cProfile
+import hmac
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from mcp_pdb.config import ADMIN_TOKEN, PROFILE_SAMPLE_INTERVAL_MS, PROFILE_TOP_N
+
+ADMIN_HEADER = "x-admin-token"
+PROFILE_HEADER = "x-profile"
+# Per-request reports keep functions from these modules: the builders and PDBClient parsing, and serialization
+PROFILE_MODULES = ("mcp_pdb", "pydantic", "fastapi", "json")
+
+# Python allows one cProfile per thread at a time, and both tools observe the whole process
+_active = threading.Lock()
+
+
+def is_admin(token: Optional[str], admin_token: str = ADMIN_TOKEN) -> bool:
+    """Constant-time check of an X-Admin-Token value; always False while ADMIN_TOKEN is unset."""
+    return bool(admin_token) and token is not None and hmac.compare_digest(token.encode(), admin_token.encode())
+
+
+def _frame_label(code: Any) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples the stacks of all other threads every `interval` seconds from a
+    background thread. Async code shows up as the coroutine chain running on
+    the event-loop thread at each tick; an idle loop shows up in `select`.
+    """
+
+    def __init__(self, interval: float = PROFILE_SAMPLE_INTERVAL_MS / 1000):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.interval = interval
+        self.samples = 0
+        self._stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="mcp-pdb-stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def collapsed(self) -> str:
+        """One `thread;outer;...;inner count` line per distinct stack, most frequent first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                labels.append(names.get(ident, f"thread-{ident}"))
+                self._stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+
+def try_acquire() -> bool:
+    """Claims the process-wide profiling slot without waiting; pair with `release()`."""
+    return _active.acquire(blocking=False)
+
+
+def release() -> None:
+    _active.release()
+
+
+def top_functions(
+    profile: cProfile.Profile,
+    limit: int = PROFILE_TOP_N,
+    modules: Iterable[str] = PROFILE_MODULES,
+) -> List[Tuple[str, int, float]]:
+    """(label, calls, cumulative seconds) of the costliest functions defined in `modules`."""
+    modules = tuple(modules)
+    stats = pstats.Stats(profile).stats  # {(file, line, name): (prim_calls, calls, tottime, cumtime, callers)}
+    rows = [
+        (f"{os.path.basename(filename)}:{line}({name})", calls, cumtime)
+        for (filename, line, name), (_, calls, _, cumtime, _) in stats.items()
+        if any(module in filename for module in modules) and filename != __file__
+    ]
+    return sorted(rows, key=lambda row: row[2], reverse=True)[:limit]
+
+
+def server_timing(rows: List[Tuple[str, int, float]]) -> str:
+    """Formats `top_functions` rows as a Server-Timing header value (durations in ms)."""
+    return ", ".join(
+        f'f{rank};dur={cumtime * 1000:.3f};desc="{label.replace(chr(34), chr(39))} x{calls}"'
+        for rank, (label, calls, cumtime) in enumerate(rows, start=1)
+    )
+
+
+ASGIApp = Callable[..., Awaitable[None]]
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware: a request with `X-Profile` and a valid `X-Admin-Token`
+    runs under cProfile until its response headers are sent, and gets its top
+    functions back in `Server-Timing`. cProfile sees the whole event-loop thread,
+    so concurrent requests contribute too; profile on a quiet instance. Other
+    requests only pay one header scan.
+    """
+
+    def __init__(self, app: ASGIApp, admin_token: str = ADMIN_TOKEN, limit: int = PROFILE_TOP_N):
+        self.app = app
+        self.admin_token = admin_token
+        self.limit = limit
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        headers = {
+            name.decode("latin-1"): value.decode("latin-1")
+            for name, value in scope.get("headers", ())
+            if name in (b"x-profile", b"x-admin-token")
+        }
+        if PROFILE_HEADER not in headers or not is_admin(headers.get(ADMIN_HEADER), self.admin_token):
+            return await self.app(scope, receive, send)
+        if not try_acquire():
+            return await self._unprofiled(scope, receive, send)
+
+        profile = cProfile.Profile()
+        running = True
+
+        def finish() -> Optional[str]:
+            nonlocal running
+            if not running:
+                return None
+            running = False
+            profile.disable()
+            release()
+            return server_timing(top_functions(profile, self.limit))
+
+        async def send_with_timing(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                timing = finish()
+                if timing is not None:
+                    header = (b"server-timing", timing.encode("latin-1", "replace"))
+                    message = {**message, "headers": list(message.get("headers", [])) + [header]}
+            await send(message)
+
+        profile.enable()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            finish()
+
+    async def _unprofiled(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        """Another profile is running: serve the request normally and say so."""
+
+        async def send_busy(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"x-profile", b"busy")]}
+            await send(message)
+
+        await self.app(scope, receive, send_busy)
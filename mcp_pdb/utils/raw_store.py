@@ -0,0 +1,250 @@
+"""
+mcp_pdb.utils.raw_store
+~~~~~~~~~~~~~~~~~~~~~~~
+Content-addressed, zstd-compressed store of raw upstream JSON documents.
+
+    <root>/objects/<2 hex>/<sha256>.json.zst   one blob per distinct document
+    <root>/entries/<PDB_ID>.json               which blobs make up an entry, and where from
+
+A document is addressed by the SHA-256 of its canonical JSON (sorted keys, no
+whitespace), so an unchanged entry fetched again, or the same document served
+for two entries, is written once. Entry records only point at blobs. Replacing
+or deleting an entry leaves its old blobs behind until `gc`.
+
+An entry's `documents` are what its structure summary is built from. Other
+endpoints `attach` the further documents they read (the RCSB entry and
+polymer-entity documents behind `get_sequences`) under their request paths,
+so those endpoints can be served locally too. Re-recording an entry drops them.
+
+The store holds upstream documents only, never derived bundles, so the builder
+can derive new fields and formats from it without going back to the network.
+Needs the optional `zstandard` package.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from mcp_pdb.config import RAW_STORE_DIR, RAW_STORE_ZSTD_LEVEL
+from mcp_pdb.exceptions import ConfigurationError, DataValidationError
+
+logger = logging.getLogger(__name__)
+
+BLOB_SUFFIX = ".json.zst"
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ConfigurationError("The raw document store needs the 'zstandard' package (pip install zstandard).") from e
+    return zstandard
+
+
+def canonical_json(document: Any) -> bytes:
+    """The bytes a document is hashed and stored as."""
+    return json.dumps(document, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.tmp-{uuid.uuid4().hex}"
+    try:
+        with open(tmp_path, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class RawDocumentStore:
+    def __init__(self, root: str = RAW_STORE_DIR, level: int = RAW_STORE_ZSTD_LEVEL):
+        if not root:
+            raise ValueError("root must be a directory path")
+        self._zstd = _zstandard()
+        self.root = root
+        self.level = level
+        self._objects = os.path.join(root, "objects")
+        self._entries = os.path.join(root, "entries")
+        self._lock = threading.Lock()  # Serializes read-modify-write of entry records
+        os.makedirs(self._objects, exist_ok=True)
+        os.makedirs(self._entries, exist_ok=True)
+
+    # --- blobs -------------------------------------------------------------------
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self._objects, digest[:2], f"{digest}{BLOB_SUFFIX}")
+
+    def put(self, document: Any) -> str:
+        """Stores one document (if not already present) and returns its SHA-256 hex digest."""
+        data = canonical_json(document)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        try:
+            os.utime(path)  # Already stored: mark it fresh so a concurrent `gc` keeps it
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _write_atomic(path, self._zstd.ZstdCompressor(level=self.level).compress(data))
+        return digest
+
+    def get(self, digest: str) -> Any:
+        """
+        The document stored under `digest`.
+
+        Raises:
+            KeyError: if there is no such blob.
+            DataValidationError: if the blob no longer matches its digest.
+        """
+        try:
+            with open(self._blob_path(digest), "rb") as fh:
+                data = self._zstd.ZstdDecompressor().decompress(fh.read())
+        except FileNotFoundError:
+            raise KeyError(digest) from None
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise DataValidationError(f"Raw document {digest} is corrupt (content does not match its hash).")
+        return json.loads(data)
+
+    # --- entries -----------------------------------------------------------------
+    def _entry_path(self, pdb_id: str) -> str:
+        key = pdb_id.strip().upper()
+        if not key.isalnum():
+            raise ValueError(f"invalid PDB ID: {pdb_id!r}")
+        return os.path.join(self._entries, f"{key}.json")
+
+    def record(self, pdb_id: str, source: str, api_url: str, retrieved: datetime, paths: List[str], documents: List[Any]) -> Dict[str, Any]:
+        """Stores an entry's documents and points the entry at them, replacing any previous record."""
+        entry = {
+            "pdb_id": pdb_id.strip().upper(),
+            "source": source,
+            "api_url": api_url,
+            "retrieved": retrieved.isoformat(),
+            "documents": [{"path": path, "sha256": self.put(document)} for path, document in zip(paths, documents)],
+        }
+        with self._lock:
+            _write_atomic(self._entry_path(pdb_id), json.dumps(entry).encode("utf-8"))
+        return entry
+
+    def entry(self, pdb_id: str) -> Optional[Dict[str, Any]]:
+        """The record written by `record`, or None if the entry is not stored."""
+        try:
+            with open(self._entry_path(pdb_id), encoding="utf-8") as fh:
+                return json.load(fh)
+        except FileNotFoundError:
+            return None
+
+    def documents(self, entry: Dict[str, Any]) -> List[Any]:
+        """An entry's documents, in the order they were recorded."""
+        return [self.get(document["sha256"]) for document in entry["documents"]]
+
+    def attach(self, pdb_id: str, paths: List[str], documents: List[Any]) -> bool:
+        """
+        Stores further documents for a recorded entry, replacing any attached at the
+        same path; returns False (and stores nothing) if the entry is not recorded.
+        """
+        digests = [self.put(document) for document in documents]
+        with self._lock:
+            entry = self.entry(pdb_id)
+            if entry is None:
+                return False
+            attached = {document["path"]: document for document in entry.get("attached", [])}
+            for path, digest in zip(paths, digests):
+                attached[path] = {"path": path, "sha256": digest}
+            entry["attached"] = list(attached.values())
+            _write_atomic(self._entry_path(pdb_id), json.dumps(entry).encode("utf-8"))
+        return True
+
+    def document(self, entry: Dict[str, Any], path: str) -> Any:
+        """
+        The document an entry holds for a request path, attached ones first.
+
+        Raises:
+            KeyError: if the entry holds no document for `path`.
+        """
+        for document in entry.get("attached", []) + entry["documents"]:
+            if document["path"].upper() == path.upper():
+                return self.get(document["sha256"])
+        raise KeyError(path)
+
+    def delete(self, pdb_id: str) -> bool:
+        """Forgets an entry (its blobs stay until `gc`); returns whether it was stored."""
+        try:
+            os.remove(self._entry_path(pdb_id))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def entry_ids(self) -> Iterator[str]:
+        for name in sorted(os.listdir(self._entries)):
+            if name.endswith(".json"):
+                yield name[: -len(".json")]
+
+    # --- maintenance -------------------------------------------------------------
+    def _blobs(self) -> Iterator[str]:
+        for prefix in os.listdir(self._objects):
+            for name in os.listdir(os.path.join(self._objects, prefix)):
+                if name.endswith(BLOB_SUFFIX):
+                    yield os.path.join(self._objects, prefix, name)
+
+    def gc(self, min_age_seconds: float = 3600) -> int:
+        """
+        Deletes blobs no entry points at; returns how many were deleted. Blobs
+        written or reused in the last `min_age_seconds` are kept, since an entry
+        being recorded right now may not point at them yet.
+        """
+        cutoff = time.time() - min_age_seconds
+        referenced = set()
+        for pdb_id in self.entry_ids():
+            entry = self.entry(pdb_id)
+            if entry is not None:
+                referenced.update(document["sha256"] for document in entry["documents"] + entry.get("attached", []))
+        removed = 0
+        for path in list(self._blobs()):
+            if os.path.basename(path)[: -len(BLOB_SUFFIX)] not in referenced and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Entries, references and distinct blobs, and the blobs' size on disk."""
+        references = 0
+        entries = 0
+        for pdb_id in self.entry_ids():
+            entry = self.entry(pdb_id)
+            if entry is not None:
+                entries += 1
+                references += len(entry["documents"]) + len(entry.get("attached", []))
+        blobs = list(self._blobs())
+        return {
+            "entries": entries,
+            "references": references,
+            "objects": len(blobs),
+            "stored_bytes": sum(os.path.getsize(path) for path in blobs),
+        }
+
+
+_store: Optional[RawDocumentStore] = None
+_store_unavailable = False
+_store_lock = threading.Lock()
+
+
+def get_raw_store() -> Optional[RawDocumentStore]:
+    """
+    The process-wide store at RAW_STORE_DIR, opened on first use; None when
+    RAW_STORE_DIR is empty or `zstandard` is missing (logged once).
+    """
+    global _store, _store_unavailable
+    if _store is None and RAW_STORE_DIR and not _store_unavailable:
+        with _store_lock:
+            if _store is None and not _store_unavailable:
+                try:
+                    _store = RawDocumentStore(RAW_STORE_DIR)
+                except ConfigurationError as e:
+                    _store_unavailable = True
+                    logger.warning(f"{e.message} Raw documents will not be kept.")
+    return _store
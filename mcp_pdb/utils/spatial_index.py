@@ -0,0 +1,104 @@
+from typing import Tuple
+
+import numpy as np
+
+
+class CellGrid:
+    """
+    Uniform cell grid over a point cloud for vectorized fixed-radius neighbor search.
+
+    Points are bucketed into cubic cells of `cell_size` Å and sorted by cell;
+    a query visits only the cells within `radius` of each query point, so the
+    work is proportional to the number of nearby points rather than N·M.
+    Building is one `argsort` over the points; queries are NumPy operations
+    over all query points at once (one pass per neighboring cell offset).
+    When the grid is not much larger than the point set, cell ranges are read
+    from a dense per-cell offset table instead of binary searches.
+    """
+
+    DENSE_TABLE_MAX_CELLS = 1 << 22
+
+    def __init__(self, xyz: np.ndarray, cell_size: float = 5.0):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.xyz = np.asarray(xyz, dtype=np.float32)
+        self.cell_size = float(cell_size)
+        if len(self.xyz) == 0:
+            self.origin = np.zeros(3)
+            self.dims = np.ones(3, dtype=np.int64)
+            self.order = np.empty(0, dtype=np.int64)
+            self.sorted_keys = np.empty(0, dtype=np.int64)
+            self.cell_start = None
+            return
+
+        self.origin = self.xyz.min(axis=0).astype(np.float64)
+        cells = self._cells(self.xyz)
+        self.dims = cells.max(axis=0) + 1
+        keys = self._keys(cells)
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+        n_cells = int(np.prod(self.dims))
+        self.cell_start = None  # cell_start[k]:cell_start[k + 1] is cell k's slice of `order`
+        if n_cells <= min(8 * len(self.xyz), self.DENSE_TABLE_MAX_CELLS):
+            self.cell_start = np.searchsorted(self.sorted_keys, np.arange(n_cells + 1))
+
+    def __len__(self) -> int:
+        return len(self.xyz)
+
+    def query_radius(self, points: np.ndarray, radius: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Finds all (query point, indexed point) pairs closer than `radius`.
+
+        Returns:
+            (query_idx, point_idx, distance) arrays of equal length; `point_idx`
+            indexes the `xyz` the grid was built from.
+        """
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+        if len(points) == 0 or len(self.xyz) == 0:
+            return empty
+
+        reach = int(np.ceil(radius / self.cell_size))
+        query_cells = self._cells(points)
+        r2 = np.float32(radius) ** 2
+        found_q, found_p, found_d = [], [], []
+
+        span = np.arange(-reach, reach + 1)
+        for dx in span:
+            for dy in span:
+                for dz in span:
+                    cells = query_cells + np.array([dx, dy, dz])
+                    inside = np.all((cells >= 0) & (cells < self.dims), axis=1)
+                    if not inside.any():
+                        continue
+                    q_idx = np.nonzero(inside)[0]
+                    keys = self._keys(cells[q_idx])
+                    if self.cell_start is not None:
+                        starts, ends = self.cell_start[keys], self.cell_start[keys + 1]
+                    else:
+                        starts = np.searchsorted(self.sorted_keys, keys, side="left")
+                        ends = np.searchsorted(self.sorted_keys, keys, side="right")
+                    counts = ends - starts
+                    total = int(counts.sum())
+                    if total == 0:
+                        continue
+                    # Expand each [start, end) range without a Python loop.
+                    q_rep = np.repeat(q_idx, counts)
+                    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+                    p_idx = self.order[np.arange(total) + offsets]
+                    diff = self.xyz[p_idx] - points[q_rep]
+                    d2 = np.einsum("ij,ij->i", diff, diff)
+                    close = d2 <= r2
+                    found_q.append(q_rep[close])
+                    found_p.append(p_idx[close])
+                    found_d.append(np.sqrt(d2[close]))
+
+        if not found_q:
+            return empty
+        return np.concatenate(found_q), np.concatenate(found_p), np.concatenate(found_d)
+
+    def _cells(self, xyz: np.ndarray) -> np.ndarray:
+        return np.floor((xyz - self.origin) / self.cell_size).astype(np.int64)
+
+    def _keys(self, cells: np.ndarray) -> np.ndarray:
+        return (cells[:, 0] * self.dims[1] + cells[:, 1]) * self.dims[2] + cells[:, 2]
@@ -0,0 +1,31 @@
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from mcp_pdb.config import CACHE_TTL_AGE_FRACTION, CACHE_TTL_MAX_SECONDS, CACHE_TTL_MIN_SECONDS, CACHE_TTL_SECONDS
+
+DAY_SECONDS = 24 * 3600
+
+
+def adaptive_ttl(
+    release_date: Optional[date],
+    revision_date: Optional[date] = None,
+    today: Optional[date] = None,
+    fraction: float = CACHE_TTL_AGE_FRACTION,
+    min_seconds: float = CACHE_TTL_MIN_SECONDS,
+    max_seconds: float = CACHE_TTL_MAX_SECONDS,
+) -> float:
+    """
+    Cache lifetime for an entry, proportional to how long it has gone unchanged.
+
+    The entry's last change is its latest revision (else its initial release);
+    the TTL is `fraction` of the time since then, clamped to
+    `[min_seconds, max_seconds]`. An entry released last week is rechecked
+    within hours, one untouched for ten years only at `max_seconds`. Without
+    any date the flat CACHE_TTL_SECONDS applies.
+    """
+    last_change = max((d for d in (release_date, revision_date) if d is not None), default=None)
+    if last_change is None:
+        return float(CACHE_TTL_SECONDS)
+    today = today or datetime.now(timezone.utc).date()
+    age_seconds = max(0, (today - last_change).days) * DAY_SECONDS
+    return float(min(max_seconds, max(min_seconds, age_seconds * fraction)))
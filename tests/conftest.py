@@ -1 +1,17 @@
+import pytest
 
+from mcp_pdb.processing import metadata, similarity
+
+
+@pytest.fixture(autouse=True)
+def isolated_sequence_index(tmp_path, monkeypatch):
+    """Keeps the process-wide sequence index out of ~/.cache: each test starts empty and saves under tmp_path."""
+    monkeypatch.setattr(similarity, "SEQUENCE_INDEX_PATH", str(tmp_path / "sequence_index.npz"))
+    monkeypatch.setattr(similarity, "_sequence_index", None)
+
+
+@pytest.fixture(autouse=True)
+def isolated_metadata_index(tmp_path, monkeypatch):
+    """Same for the metadata index: indexed entries go to a per-test SQLite file."""
+    monkeypatch.setattr(metadata, "METADATA_INDEX_PATH", str(tmp_path / "metadata.sqlite3"))
+    monkeypatch.setattr(metadata, "_metadata_index", None)
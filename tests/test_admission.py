@@ -0,0 +1,155 @@
+import asyncio
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from mcp_pdb.adapter.admission import BULK, INTERACTIVE, FairScheduler, admission_context, current_client, parse_client_weights
+from mcp_pdb.adapter.pdb_client import PDBClient
+from mcp_pdb.exceptions import OverloadedError
+
+BASE_URL = "https://data.example.org"
+
+
+async def run_in_order(scheduler: FairScheduler, jobs, served):
+    """Starts `jobs` ((client, priority, label) tuples) while the only slot is held, then releases it."""
+    gate = asyncio.Event()
+
+    async def hold():
+        async with scheduler.slot("holder", INTERACTIVE):
+            await gate.wait()
+
+    async def job(client_id, priority, label):
+        async with scheduler.slot(client_id, priority):
+            served.append(label)
+            await asyncio.sleep(0)
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    tasks = [asyncio.create_task(job(*spec)) for spec in jobs]
+    await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(holder, *tasks)
+
+
+def test_parse_client_weights():
+    assert parse_client_weights("team-a=4, batch=0.5,bad,neg=-1,=3") == {"team-a": 4.0, "batch": 0.5}
+
+
+@pytest.mark.asyncio
+async def test_interactive_overtakes_bulk_backlog():
+    scheduler = FairScheduler(max_in_flight=1, interactive_weight=8, client_weights={})
+    served = []
+    jobs = [("batch", BULK, f"bulk-{i}") for i in range(10)] + [("agent", INTERACTIVE, "agent")]
+
+    await run_in_order(scheduler, jobs, served)
+
+    # Queued last, the interactive call is dispatched after at most one bulk call.
+    assert served.index("agent") <= 1
+    assert scheduler.stats()["admitted"] == {INTERACTIVE: 2, BULK: 10}
+
+
+@pytest.mark.asyncio
+async def test_clients_share_in_proportion_to_weight():
+    scheduler = FairScheduler(max_in_flight=1, client_weights={"heavy": 3.0})
+    served = []
+    jobs = [("heavy", BULK, "heavy") for _ in range(12)] + [("light", BULK, "light") for _ in range(12)]
+
+    await run_in_order(scheduler, jobs, served)
+
+    # While both clients are backlogged, the heavier one gets three turns for every one.
+    assert served[:8].count("heavy") == 6 and served[:8].count("light") == 2
+
+
+@pytest.mark.asyncio
+async def test_full_queues_shed_with_retry_after():
+    scheduler = FairScheduler(max_in_flight=1, max_queued=4, max_queued_per_client=2, max_queue_wait=60)
+    gate = asyncio.Event()
+
+    async def call(client_id):
+        async with scheduler.slot(client_id, BULK):
+            await gate.wait()
+
+    tasks = [asyncio.create_task(call(client)) for client in ("a", "a", "a", "b")]
+    await asyncio.sleep(0)
+    # One running; "a" has reached its per-client cap and the global queue has room for one more.
+    assert scheduler.stats()["in_flight"] == 1 and scheduler.stats()["queued"] == 3
+    with pytest.raises(OverloadedError):
+        scheduler.check("a")
+    scheduler.check("c")
+    with pytest.raises(OverloadedError) as excinfo:
+        async with scheduler.slot("a", BULK):
+            pass
+    assert excinfo.value.retry_after >= 1
+
+    tasks.append(asyncio.create_task(call("c")))
+    await asyncio.sleep(0)
+    with pytest.raises(OverloadedError):
+        scheduler.check("d")  # Global queue full
+
+    gate.set()
+    await asyncio.gather(*tasks)
+    assert scheduler.stats()["shed"][BULK] == 1 and scheduler.stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_long_estimated_wait_is_shed():
+    scheduler = FairScheduler(max_in_flight=1, max_queue_wait=1.0)
+    scheduler._service_time = 0.6
+    gate = asyncio.Event()
+
+    async def call():
+        async with scheduler.slot("a", BULK):
+            await gate.wait()
+
+    tasks = [asyncio.create_task(call()) for _ in range(2)]
+    await asyncio.sleep(0)
+    with pytest.raises(OverloadedError) as excinfo:
+        scheduler.check("b")  # Two calls ahead of it at 0.6 s each
+    assert excinfo.value.retry_after == 2
+
+    gate.set()
+    await asyncio.gather(*tasks)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_frees_its_place():
+    scheduler = FairScheduler(max_in_flight=1)
+    gate = asyncio.Event()
+    served = []
+
+    async def call(label):
+        async with scheduler.slot("a", BULK):
+            served.append(label)
+            await gate.wait()
+
+    first = asyncio.create_task(call("first"))
+    await asyncio.sleep(0)
+    doomed = asyncio.create_task(call("doomed"))
+    last = asyncio.create_task(call("last"))
+    await asyncio.sleep(0)
+    doomed.cancel()
+    await asyncio.sleep(0)
+    assert scheduler.stats()["queued"] == 1
+
+    gate.set()
+    await asyncio.gather(first, last)
+    assert served == ["first", "last"] and scheduler.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pdb_client_calls_are_attributed_to_context(respx_mock: MockRouter):
+    respx_mock.get(f"{BASE_URL}/rest/v1/core/entry/1ABC").mock(return_value=httpx.Response(200, json={}))
+    client = PDBClient(base_url=BASE_URL, scheduler=FairScheduler(max_in_flight=2))
+
+    assert current_client() == ("anonymous", INTERACTIVE)
+    with admission_context("batch-key", BULK):
+        assert current_client() == ("batch-key", BULK)
+        await client._get_json("/rest/v1/core/entry/1ABC", "1ABC")
+    assert current_client() == ("anonymous", INTERACTIVE)
+
+    assert client.scheduler.stats()["admitted"] == {INTERACTIVE: 0, BULK: 1}
+    with pytest.raises(ValueError):
+        with admission_context("x", "urgent"):
+            pass
+    await client.close()
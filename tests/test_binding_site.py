@@ -0,0 +1,135 @@
+import threading
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from mcp_pdb.adapter.coordinate_client import AtomSiteParser
+from mcp_pdb.exceptions import DataValidationError
+from mcp_pdb.processing.binding_site import binding_site_cache, build_binding_site_context, find_binding_sites, grid_cache
+from mcp_pdb.processing.coordinates import coordinate_cache
+from mcp_pdb.schemas import Provenance
+from mcp_pdb.utils.spatial_index import CellGrid
+
+# Two ATP copies: the one in chain A is contacted by LYS 72 (3.0 Å), MG 501 (2.0 Å) and a water;
+# ASP 80 sits at 6 Å. The copy in chain B only touches GLY 10.
+POCKET_CIF = """data_1ATP
+loop_
+_atom_site.group_PDB
+_atom_site.id
+_atom_site.type_symbol
+_atom_site.label_atom_id
+_atom_site.label_comp_id
+_atom_site.auth_asym_id
+_atom_site.auth_seq_id
+_atom_site.Cartn_x
+_atom_site.Cartn_y
+_atom_site.Cartn_z
+ATOM   1 N  N   LYS A 72  3.0 0.0 0.0
+ATOM   2 C  CA  LYS A 72  3.5 1.0 0.0
+ATOM   3 C  CA  ASP A 80  0.0 6.0 0.0
+HETATM 4 P  PA  ATP A 401 0.0 0.0 0.0
+HETATM 5 P  PB  ATP A 401 0.0 0.0 1.5
+HETATM 6 MG MG  MG  A 501 0.0 -2.0 0.0
+HETATM 7 O  O   HOH A 601 -1.0 0.0 0.0
+ATOM   8 C  CA  GLY B 10  50.0 50.0 53.5
+HETATM 9 P  PA  ATP B 401 50.0 50.0 50.0
+#
+"""
+
+
+@pytest.fixture
+def pocket_atoms():
+    parser = AtomSiteParser("1ATP")
+    for line in POCKET_CIF.splitlines():
+        parser.feed_line(line)
+    return parser.finish()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for cache in (binding_site_cache, grid_cache, coordinate_cache):
+        cache.clear()
+    yield
+    for cache in (binding_site_cache, grid_cache, coordinate_cache):
+        cache.clear()
+
+
+def test_cell_grid_matches_brute_force():
+    rng = np.random.default_rng(0)
+    points = rng.uniform(0, 40, size=(2000, 3)).astype(np.float32)
+    queries = rng.uniform(-5, 45, size=(50, 3)).astype(np.float32)
+
+    q_idx, p_idx, dist = CellGrid(points, cell_size=3.0).query_radius(queries, 4.5)
+
+    all_d = np.linalg.norm(queries[:, None, :] - points[None, :, :], axis=2)
+    expected = set(zip(*np.nonzero(all_d <= 4.5)))
+    assert set(zip(q_idx.tolist(), p_idx.tolist())) == expected
+    np.testing.assert_allclose(dist, all_d[q_idx, p_idx], rtol=1e-5)
+
+
+def test_cell_grid_sparse_cloud_skips_dense_table():
+    # Two atoms 1 km apart span ~8e9 cells: the table would dwarf the points.
+    points = np.array([[0, 0, 0], [1000, 1000, 1000]], dtype=np.float32)
+    grid = CellGrid(points, cell_size=0.5)
+    assert grid.cell_start is None
+    q_idx, p_idx, _ = grid.query_radius(points, 1.0)
+    assert sorted(zip(q_idx.tolist(), p_idx.tolist())) == [(0, 0), (1, 1)]
+    compact = np.random.default_rng(0).uniform(0, 20, size=(500, 3))
+    assert CellGrid(compact, cell_size=5.0).cell_start is not None
+
+
+def test_find_binding_sites_groups_contacts_per_instance(pocket_atoms):
+    sites = find_binding_sites(pocket_atoms, "atp", cutoff=4.0)
+
+    assert [(s.chain_id, s.res_seq, s.atom_count) for s in sites] == [("A", 401, 2), ("B", 401, 1)]
+    site_a, site_b = sites
+    # Closest first; water excluded; the ligand's own atoms are never contacts.
+    assert [(r.res_name, r.res_seq, r.hetero) for r in site_a.residues] == [("MG", 501, True), ("LYS", 72, False)]
+    assert site_a.residues[0].min_distance == pytest.approx(2.0)
+    assert site_a.residues[1].min_distance == pytest.approx(3.0)
+    assert [(r.chain_id, r.res_name, r.min_distance) for r in site_b.residues] == [("B", "GLY", 3.5)]
+
+
+def test_find_binding_sites_absent_ligand(pocket_atoms):
+    assert find_binding_sites(pocket_atoms, "HEM", cutoff=4.0) == []
+    # Polymer residues with the same name are not treated as ligands.
+    assert find_binding_sites(pocket_atoms, "LYS", cutoff=4.0) == []
+
+
+@pytest.mark.asyncio
+@patch('mcp_pdb.utils.cache.CACHE_ENABLED', True)
+async def test_build_binding_site_context_uses_stored_coordinates_and_caches(pocket_atoms):
+    provenance = Provenance(source="RCSB PDB", retrieved="2024-01-01T00:00:00Z", api_url="https://data.rcsb.org/rest/v1/core/entry/1ATP")
+    coordinate_cache.set("1ATP", (pocket_atoms, provenance))
+
+    first = await build_binding_site_context("1atp", "ATP", 6.5, pdb_client=None, coordinate_client=None)
+
+    assert first.cutoff == 6.5
+    assert "ASP" in [r.res_name for r in first.sites[0].residues]
+    assert first.provenance == provenance
+    assert await build_binding_site_context("1ATP", "atp", 6.5, pdb_client=None, coordinate_client=None) is first
+
+
+@pytest.mark.asyncio
+async def test_binding_sites_are_searched_off_the_event_loop(pocket_atoms):
+    provenance = Provenance(source="RCSB PDB", retrieved="2024-01-01T00:00:00Z", api_url="https://data.rcsb.org/rest/v1/core/entry/1ATP")
+    threads = []
+
+    def recording_find(atoms, chem_id, cutoff):
+        threads.append(threading.get_ident())
+        return find_binding_sites(atoms, chem_id, cutoff)
+
+    with patch("mcp_pdb.processing.binding_site.load_coordinates", AsyncMock(return_value=(pocket_atoms, provenance))), \
+            patch("mcp_pdb.processing.binding_site.find_binding_sites", recording_find):
+        result = await build_binding_site_context("1ATP", "ATP", 4.0, pdb_client=None, coordinate_client=None)
+
+    assert len(result.sites) == 2
+    assert threads and threading.get_ident() not in threads
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cutoff", [0.0, -1.0, 25.0])
+async def test_build_binding_site_context_rejects_bad_cutoff(cutoff):
+    with pytest.raises(DataValidationError):
+        await build_binding_site_context("1ATP", "ATP", cutoff, pdb_client=None, coordinate_client=None)
@@ -66,6 +66,31 @@ def test_cache_len(no_ttl_cache: LRUCache):
     no_ttl_cache.clear()
     assert len(no_ttl_cache) == 0
 
+@patch('mcp_pdb.utils.cache.CACHE_ENABLED', True)
+def test_delete_matching(no_ttl_cache: LRUCache):
+    no_ttl_cache.set(("1ABC", 4.0), "a")
+    no_ttl_cache.set(("1ABC", 8.0), "b")
+    no_ttl_cache.set(("2XYZ", 4.0), "c")
+    assert no_ttl_cache.delete_matching(lambda key: key[0] == "1ABC") == 2
+    assert no_ttl_cache.get(("2XYZ", 4.0)) == "c"
+    assert len(no_ttl_cache) == 1
+
+@patch('mcp_pdb.utils.cache.CACHE_ENABLED', True)
+def test_per_entry_ttl_and_distribution(cache: LRUCache):
+    cache.set("short", "a")  # Cache-wide 0.1 s
+    cache.set("day", "b", ttl_seconds=20 * 3600)
+    cache.set("month", "c", ttl_seconds=30 * 24 * 3600)
+    time.sleep(0.2)
+    assert cache.get("short") is None
+    assert cache.get("day") == "b"
+
+    report = cache.ttl_distribution()
+    assert report["entries"] == 2
+    assert report["min_seconds"] == 20 * 3600 and report["max_seconds"] == 30 * 24 * 3600
+    assert report["histogram"]["<=1d"] == 1 and report["histogram"]["<=30d"] == 1
+    with pytest.raises(ValueError):
+        cache.set("bad", "d", ttl_seconds=0)
+
 @patch('mcp_pdb.utils.cache.CACHE_ENABLED', False)
 def test_cache_disabled(no_ttl_cache: LRUCache):
     no_ttl_cache.set("key1", "value1")
@@ -0,0 +1,106 @@
+import json
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+
+import numpy as np
+
+from mcp_pdb.processing import cache_stats
+from mcp_pdb.processing.compact import CompactStructureCache, PackedStructure, pack_structure, unpack_structure
+from mcp_pdb.schemas import ChainGeometry, ChainInfo, LigandDataset, Provenance, StructureDataset
+from mcp_pdb.utils.cache import deep_sizeof
+
+
+def parsed(value: str) -> str:
+    """A fresh string object, as each decoded upstream JSON document would give."""
+    return json.loads(json.dumps(value))
+
+
+def make_structure(n: int) -> StructureDataset:
+    pdb_id = f"{1000 + n}"
+    return StructureDataset(
+        pdb_id=pdb_id,
+        title=f"Crystal structure of kinase domain in complex with inhibitor {n}",
+        method=parsed("X-RAY DIFFRACTION"),
+        resolution=2.1,
+        release_date=date(2015, 1, 2),
+        revision_date=date(2020, 3, 4),
+        chains=[
+            ChainInfo(chain_id="A", sequence_length=250, organism=parsed("Homo sapiens")),
+            ChainInfo(chain_id="B", sequence_length=250, organism=parsed("Homo sapiens")),
+            ChainInfo(chain_id="C", sequence_length=12),
+            ChainInfo(chain_id="D", sequence_length=250, organism=parsed("Homo sapiens")),
+        ],
+        ligands=[
+            LigandDataset(chem_id=parsed("HEM"), name=parsed("PROTOPORPHYRIN IX CONTAINING FE"), count=4),
+            LigandDataset(chem_id=parsed("SO4"), name=parsed("SULFATE ION"), count=2),
+        ],
+        provenance=Provenance(
+            source=parsed("RCSB PDB"),
+            retrieved=datetime(2024, 5, 1, tzinfo=timezone.utc),
+            api_url=f"https://data.rcsb.org/rest/v1/core/entry/{pdb_id}",
+        ),
+    )
+
+
+def test_round_trip_groups_chains_by_entity():
+    structure = make_structure(0)
+    packed = pack_structure(structure)
+
+    # Runs of identical chains collapse; order is kept, so D is its own group.
+    assert packed.chains == (("A,B", 250, "Homo sapiens"), ("C", 12, None), ("D", 250, "Homo sapiens"))
+    restored = unpack_structure(packed)
+    assert restored == structure
+    assert restored.json() == structure.json()
+    assert str(restored.provenance.api_url) == "https://data.rcsb.org/rest/v1/core/entry/1000"
+
+
+def test_repeated_values_are_stored_once():
+    first, second = pack_structure(make_structure(1)), pack_structure(make_structure(2))
+    assert first.method is second.method
+    assert first.chains[0][2] is second.chains[0][2]
+    assert first.ligands[0][1] is second.ligands[0][1]
+
+
+def test_packed_entries_are_several_times_smaller():
+    structures = [make_structure(n) for n in range(500)]
+    packed = [pack_structure(s) for s in structures]
+    assert deep_sizeof(structures) / deep_sizeof(packed) >= 3
+
+
+def test_deep_sizeof_counts_shared_objects_once():
+    shared = "x" * 1000
+    assert deep_sizeof([(shared,), (shared,)]) < deep_sizeof([(shared,), ("y" * 1000,)])
+    array = np.zeros(10_000)
+    assert deep_sizeof([array]) >= array.nbytes
+    assert deep_sizeof([array[:10]]) >= array.nbytes  # A view keeps its base's buffer alive
+
+
+@patch("mcp_pdb.utils.cache.CACHE_ENABLED", True)
+def test_cache_packs_on_set_and_materializes_on_get():
+    cache = CompactStructureCache(max_size=10)
+    structure = make_structure(3)
+    cache.set(structure.pdb_id, structure)
+
+    assert isinstance(cache._cache[structure.pdb_id][0], PackedStructure)
+    assert cache.get(structure.pdb_id) == structure
+
+    # Bundles with extras and non-bundle values are stored as given.
+    with_geometry = structure.copy(update={"chains": [structure.chains[0].copy(update={"geometry": ChainGeometry(
+        atom_count=80, residue_count=10, centroid=[0, 0, 0], radius_of_gyration=5.0, bbox_min=[-5, -5, -5], bbox_max=[5, 5, 5])})]})
+    cache.set("geo", with_geometry)
+    cache.set("raw", {"some": "value"})
+    assert cache.get("geo") is with_geometry and cache.get("raw") == {"some": "value"}
+
+
+@patch("mcp_pdb.utils.cache.CACHE_ENABLED", True)
+def test_memory_report_compares_with_models():
+    cache = CompactStructureCache(max_size=100)
+    for n in range(20):
+        structure = make_structure(n)
+        cache.set(structure.pdb_id, structure)
+
+    with patch.object(cache_stats, "named_caches", return_value={"structure": cache}):
+        [report] = cache_stats.memory_report()
+    assert report.cache == "structure" and report.entries == 20 and report.sampled == 20
+    assert report.estimated_bytes == round(report.bytes_per_entry * 20)
+    assert report.materialized_bytes_per_entry > 2 * report.bytes_per_entry
@@ -0,0 +1,112 @@
+import gzip
+
+import httpx
+import numpy as np
+import pytest
+from respx import MockRouter
+
+from mcp_pdb.adapter.coordinate_client import AtomSiteParser, CoordinateClient
+from mcp_pdb.exceptions import DataValidationError, PDBAPIError
+
+# Minimal mmCIF: two models, an alternate location, a quoted nucleic-acid atom name and a ligand.
+SAMPLE_CIF = """data_1ABC
+#
+loop_
+_entity.id
+_entity.type
+1 polymer
+#
+loop_
+_atom_site.group_PDB
+_atom_site.id
+_atom_site.type_symbol
+_atom_site.label_atom_id
+_atom_site.label_alt_id
+_atom_site.label_comp_id
+_atom_site.auth_asym_id
+_atom_site.auth_seq_id
+_atom_site.Cartn_x
+_atom_site.Cartn_y
+_atom_site.Cartn_z
+_atom_site.pdbx_PDB_model_num
+ATOM   1 N N    . ALA A 1 1.000 2.000 3.000 1
+ATOM   2 C CA   . ALA A 1 2.000 2.000 3.000 1
+ATOM   3 C CB   A ALA A 1 3.000 2.000 3.000 1
+ATOM   4 C CB   B ALA A 1 3.100 2.100 3.100 1
+ATOM   5 O "O5'" . DA  B 5 4.000 0.500 -1.250 1
+HETATM 6 P PG   . ATP C 101 10.000 10.000 10.000 1
+ATOM   7 N N    . ALA A 1 9.000 9.000 9.000 2
+#
+loop_
+_atom_site_anisotrop.id
+1
+"""
+
+
+def parse(text: str, chunk_atoms: int = 2):
+    parser = AtomSiteParser("1ABC", chunk_atoms=chunk_atoms)
+    data = text.encode()
+    for i in range(0, len(data), 7):  # Deliberately split lines across byte chunks
+        parser.feed_bytes(data[i:i + 7])
+    return parser.finish()
+
+
+def test_parser_decodes_first_model_and_first_altloc():
+    atoms = parse(SAMPLE_CIF)
+
+    assert len(atoms) == 5
+    assert atoms.xyz.dtype == np.float32
+    np.testing.assert_allclose(atoms.xyz[3], [4.0, 0.5, -1.25])
+    assert [atoms.atom_names[c] for c in atoms.atom_name] == ["N", "CA", "CB", "O5'", "PG"]
+    assert [atoms.chain_ids[c] for c in atoms.chain] == ["A", "A", "A", "B", "C"]
+    assert [atoms.res_names[c] for c in atoms.res_name] == ["ALA", "ALA", "ALA", "DA", "ATP"]
+    assert atoms.res_seq.tolist() == [1, 1, 1, 5, 101]
+    assert atoms.hetero.tolist() == [False, False, False, False, True]
+    assert atoms.element_names[atoms.element[-1]] == "P"
+
+
+def test_parser_chunking_does_not_change_result():
+    small = parse(SAMPLE_CIF, chunk_atoms=1)
+    large = parse(SAMPLE_CIF, chunk_atoms=10_000)
+    np.testing.assert_array_equal(small.xyz, large.xyz)
+    assert [small.chain_ids[c] for c in small.chain] == [large.chain_ids[c] for c in large.chain]
+
+
+def test_parser_stops_after_atom_site_loop():
+    parser = AtomSiteParser("1ABC")
+    for line in SAMPLE_CIF.splitlines():
+        parser.feed_line(line)
+        if line.startswith("_atom_site_anisotrop"):
+            break
+    assert parser.done
+
+
+def test_parser_without_atom_site_raises():
+    with pytest.raises(DataValidationError):
+        parse("data_1ABC\nloop_\n_entity.id\n1\n")
+
+
+@pytest.mark.asyncio
+async def test_stream_atom_arrays(respx_mock: MockRouter):
+    client = CoordinateClient(base_url="https://files.example.org")
+    respx_mock.get("https://files.example.org/download/1ABC.cif.gz").mock(
+        return_value=httpx.Response(200, content=gzip.compress(SAMPLE_CIF.encode()))
+    )
+
+    atoms = await client.stream_atom_arrays("1abc")
+
+    assert atoms.pdb_id == "1ABC"
+    assert len(atoms) == 5
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_atom_arrays_not_found(respx_mock: MockRouter):
+    client = CoordinateClient(base_url="https://files.example.org")
+    respx_mock.get("https://files.example.org/download/0XXX.cif.gz").mock(return_value=httpx.Response(404))
+
+    with pytest.raises(PDBAPIError) as excinfo:
+        await client.stream_atom_arrays("0xxx")
+
+    assert excinfo.value.status_code == 404
+    await client.close()
@@ -0,0 +1,116 @@
+import os
+import time
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from mcp_pdb.adapter.coordinate_client import AtomArrays, CoordinateClient
+from mcp_pdb.adapter.pdb_client import PDBClient
+from mcp_pdb.processing import coordinates
+from mcp_pdb.schemas import Provenance, StructureDataset
+from mcp_pdb.utils.coordinate_store import CoordinateStore
+
+
+def make_arrays(n: int):
+    return {"xyz": np.arange(n * 3, dtype=np.float32).reshape(n, 3), "chain": np.zeros(n, dtype=np.int32)}
+
+
+def test_put_get_returns_memory_maps(tmp_path):
+    store = CoordinateStore(root=str(tmp_path), max_bytes=10**6)
+    store.put("1abc", make_arrays(4), {"pdb_id": "1ABC"})
+
+    arrays, meta = store.get("1ABC")
+
+    assert isinstance(arrays["xyz"], np.memmap)
+    assert not arrays["xyz"].flags.writeable
+    np.testing.assert_array_equal(arrays["xyz"], make_arrays(4)["xyz"])
+    assert meta == {"pdb_id": "1ABC"}
+    assert "1ABC" in store
+    assert store.get("2XYZ") is None
+
+
+def test_eviction_by_total_size_is_lru(tmp_path):
+    store = CoordinateStore(root=str(tmp_path), max_bytes=10**6)
+    store.put("1AAA", make_arrays(100), {})
+    entry_size = store.total_bytes
+    store.max_bytes = int(entry_size * 2.5)
+
+    store.put("1BBB", make_arrays(100), {})
+    store.get("1AAA")  # 1BBB is now least recently used
+    store.put("1CCC", make_arrays(100), {})
+
+    assert "1AAA" in store and "1CCC" in store
+    assert "1BBB" not in store
+    assert not os.path.exists(tmp_path / "1BBB")
+    assert store.total_bytes <= store.max_bytes
+
+
+def test_index_and_recency_survive_restart(tmp_path):
+    store = CoordinateStore(root=str(tmp_path), max_bytes=10**6)
+    store.put("1AAA", make_arrays(10), {})
+    store.put("1BBB", make_arrays(10), {})
+    old = time.time() - 100
+    os.utime(tmp_path / "1BBB" / "meta.json", (old, old))  # 1BBB looks older on disk
+    os.makedirs(tmp_path / ".tmp-1CCC-deadbeef")  # Interrupted write
+
+    reopened = CoordinateStore(root=str(tmp_path), max_bytes=store.total_bytes // 2 + 1)
+
+    assert len(reopened) == 1
+    assert "1AAA" in reopened
+    assert not os.path.exists(tmp_path / ".tmp-1CCC-deadbeef")
+
+
+def test_replace_and_delete(tmp_path):
+    store = CoordinateStore(root=str(tmp_path), max_bytes=10**6)
+    store.put("1AAA", make_arrays(10), {"v": 1})
+    store.put("1AAA", make_arrays(20), {"v": 2})
+    arrays, meta = store.get("1AAA")
+    assert arrays["xyz"].shape == (20, 3) and meta == {"v": 2}
+
+    store.delete("1AAA")
+    assert len(store) == 0 and store.total_bytes == 0
+
+
+def test_invalid_key_rejected(tmp_path):
+    store = CoordinateStore(root=str(tmp_path))
+    with pytest.raises(ValueError):
+        store.put("../etc", make_arrays(1), {})
+
+
+@pytest.mark.asyncio
+async def test_load_coordinates_tiers_share_provenance(tmp_path, monkeypatch):
+    monkeypatch.setattr(coordinates, "coordinate_store", CoordinateStore(root=str(tmp_path)))
+    coordinates.coordinate_cache.clear()
+    provenance = Provenance(source="RCSB PDB", retrieved=datetime(2024, 5, 19, tzinfo=timezone.utc), api_url="https://data.rcsb.org/rest/v1/core/entry/1ABC")
+    summary = StructureDataset(pdb_id="1ABC", title="t", method="X-RAY DIFFRACTION", chains=[], ligands=[], provenance=provenance)
+    atoms = AtomArrays(
+        pdb_id="1ABC",
+        xyz=np.zeros((2, 3), dtype=np.float32),
+        element=np.zeros(2, dtype=np.uint16),
+        res_name=np.zeros(2, dtype=np.uint16),
+        atom_name=np.zeros(2, dtype=np.uint16),
+        chain=np.zeros(2, dtype=np.int32),
+        res_seq=np.array([1, 2], dtype=np.int32),
+        hetero=np.zeros(2, dtype=bool),
+        element_names=("C",), res_names=("ALA",), atom_names=("CA",), chain_ids=("A",),
+    )
+    pdb_client = AsyncMock(spec=PDBClient)
+    pdb_client.get_structure_summary = AsyncMock(return_value=summary)
+    coordinate_client = CoordinateClient(base_url="https://files.example.org")
+    coordinate_client.stream_atom_arrays = AsyncMock(return_value=atoms)
+
+    loaded, loaded_provenance = await coordinates.load_coordinates("1abc", pdb_client, coordinate_client)
+
+    assert isinstance(loaded.xyz, np.memmap)
+    assert loaded.chain_ids == ("A",)
+    assert loaded_provenance.retrieved == provenance.retrieved
+    assert loaded_provenance.api_url == provenance.api_url
+    assert loaded_provenance.coordinates_url == "https://files.example.org/download/1ABC.cif.gz"
+
+    coordinates.coordinate_cache.clear()
+    again, again_provenance = await coordinates.load_coordinates("1ABC", pdb_client, coordinate_client)
+    coordinate_client.stream_atom_arrays.assert_awaited_once()  # Second load served from disk
+    assert again_provenance == loaded_provenance
+    np.testing.assert_array_equal(again.res_seq, [1, 2])
@@ -1,9 +1,10 @@
+import asyncio
 import pytest
 # import json # No longer needed for embedded sample_pdb_data_json
 # from pathlib import Path # No longer needed for embedded sample_pdb_data_json
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from mcp_pdb.processing.dataset_builder import build_structure_context, cache as dataset_builder_cache
+from mcp_pdb.processing.dataset_builder import build_ligand_context, build_structure_context, build_structure_contexts, cache as dataset_builder_cache, ligand_cache
 from mcp_pdb.schemas import StructureDataset
 from mcp_pdb.adapter.pdb_client import PDBClient
 from mcp_pdb.exceptions import PDBAPIError, DataValidationError
@@ -136,3 +137,111 @@ async def test_build_structure_context_pdb_client_returns_none(mock_pdb_client:
     # build_structure_context has: `if structure_data: cache.set(pdb_id, structure_data)`
     # So, if structure_data is None, it will not be cached.
     assert dataset_builder_cache.get(pdb_id) is None
+
+@pytest.fixture
+def atp_component():
+    from mcp_pdb.schemas import ChemicalComponent
+    return ChemicalComponent(chem_id="ATP", name="ADENOSINE-5'-TRIPHOSPHATE", formula="C10 H16 N5 O13 P3", formula_weight=507.181)
+
+@pytest.fixture
+def atp_structure() -> StructureDataset:
+    from mcp_pdb.schemas import LigandDataset, Provenance
+    return StructureDataset(
+        pdb_id="1ATP",
+        title="Kinase with ATP",
+        method="X-RAY DIFFRACTION",
+        resolution=2.2,
+        chains=[],
+        ligands=[LigandDataset(chem_id="ATP", name="ADENOSINE-5'-TRIPHOSPHATE", count=2)],
+        provenance=Provenance(source="RCSB PDB", retrieved="2024-05-19T12:00:00Z", api_url="https://data.rcsb.org/rest/v1/core/entry/1ATP"),
+    )
+
+@pytest.fixture(autouse=True)
+def clear_ligand_cache_before_each_test():
+    ligand_cache.clear()
+    yield
+    ligand_cache.clear()
+
+@pytest.mark.asyncio
+@patch('mcp_pdb.utils.cache.CACHE_ENABLED', True)
+async def test_build_ligand_context_fetches_once(mock_pdb_client: PDBClient, atp_component):
+    mock_pdb_client.get_chemical_component = AsyncMock(return_value=atp_component)
+
+    first = await build_ligand_context("atp", mock_pdb_client)
+    second = await build_ligand_context("ATP", mock_pdb_client)
+
+    assert first == second == atp_component
+    mock_pdb_client.get_chemical_component.assert_awaited_once_with("ATP")
+
+@pytest.mark.asyncio
+async def test_build_ligand_context_concurrent_misses_share_one_fetch(mock_pdb_client: PDBClient, atp_component):
+    async def slow_fetch(chem_id):
+        await asyncio.sleep(0.01)
+        return atp_component
+    mock_pdb_client.get_chemical_component = AsyncMock(side_effect=slow_fetch)
+
+    results = await asyncio.gather(*(build_ligand_context("ATP", mock_pdb_client) for _ in range(5)))
+
+    assert all(result == atp_component for result in results)
+    assert mock_pdb_client.get_chemical_component.await_count == 1
+
+@pytest.mark.asyncio
+async def test_cancelled_first_caller_does_not_cancel_shared_ligand_fetch(mock_pdb_client: PDBClient, atp_component):
+    release = asyncio.Event()
+    async def slow_fetch(chem_id):
+        await release.wait()
+        return atp_component
+    mock_pdb_client.get_chemical_component = AsyncMock(side_effect=slow_fetch)
+
+    first = asyncio.ensure_future(build_ligand_context("ATP", mock_pdb_client))
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(build_ligand_context("ATP", mock_pdb_client))
+    await asyncio.sleep(0)
+    first.cancel()  # e.g. the first client disconnected
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == atp_component
+    assert first.cancelled()
+    assert mock_pdb_client.get_chemical_component.await_count == 1
+
+@pytest.mark.asyncio
+@patch('mcp_pdb.utils.cache.CACHE_ENABLED', True)
+async def test_build_structure_context_with_ligand_details(mock_pdb_client: PDBClient, atp_structure, atp_component):
+    mock_pdb_client.get_structure_summary = AsyncMock(return_value=atp_structure)
+    mock_pdb_client.get_chemical_component = AsyncMock(return_value=atp_component)
+
+    result = await build_structure_context("1ATP", mock_pdb_client, include_ligand_details=True)
+
+    assert result.ligands[0].component.formula == "C10 H16 N5 O13 P3"
+    assert result.ligands[0].component.provenance is None
+    # The cached bundle stays lean; details are attached from the ligand cache on the way out.
+    assert dataset_builder_cache.get("1ATP").ligands[0].component is None
+
+    await build_structure_context("1ATP", mock_pdb_client, include_ligand_details=True)
+    mock_pdb_client.get_chemical_component.assert_awaited_once_with("ATP")
+
+@pytest.mark.asyncio
+async def test_ligand_detail_failure_does_not_fail_bundle(mock_pdb_client: PDBClient, atp_structure):
+    mock_pdb_client.get_structure_summary = AsyncMock(return_value=atp_structure)
+    mock_pdb_client.get_chemical_component = AsyncMock(side_effect=PDBAPIError(pdb_id="ATP", status_code=500))
+
+    result = await build_structure_context("1ATP", mock_pdb_client, include_ligand_details=True)
+
+    assert result.ligands[0].component is None
+
+@pytest.mark.asyncio
+async def test_build_structure_contexts_dedupes_and_skips_errors(mock_pdb_client: PDBClient, atp_structure):
+    async def fetch(pdb_id):
+        if pdb_id == "BAD1":
+            raise PDBAPIError(pdb_id=pdb_id, status_code=404)
+        return atp_structure
+    mock_pdb_client.get_structure_summary = AsyncMock(side_effect=fetch)
+
+    results = await build_structure_contexts(["1ATP", "BAD1", "1ATP"], mock_pdb_client, skip_errors=True)
+
+    assert results == [atp_structure]
+    assert mock_pdb_client.get_structure_summary.await_count == 2
+
+    with pytest.raises(PDBAPIError):
+        await build_structure_contexts(["BAD1"], mock_pdb_client)
@@ -0,0 +1,136 @@
+import asyncio
+import io
+import threading
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.parquet as pq  # noqa: E402
+
+from mcp_pdb.exceptions import DataValidationError, PDBAPIError
+from mcp_pdb.processing import export, metadata
+from mcp_pdb.schemas import ChainInfo, LigandDataset, Provenance, StructureDataset
+from mcp_pdb.utils.metadata_index import MetadataIndex
+
+
+def make_structure(pdb_id: str) -> StructureDataset:
+    provenance = Provenance(source="RCSB PDB", retrieved=datetime(2024, 5, 1, tzinfo=timezone.utc), api_url=f"https://data.rcsb.org/rest/v1/core/entry/{pdb_id}")
+    return StructureDataset(
+        pdb_id=pdb_id,
+        title=f"Entry {pdb_id}",
+        method="X-RAY DIFFRACTION",
+        resolution=2.0,
+        release_date="2020-01-15",
+        chains=[ChainInfo(chain_id="A", sequence_length=100, organism="Homo sapiens"), ChainInfo(chain_id="B", sequence_length=90)],
+        ligands=[LigandDataset(chem_id="HEM", name="HEME", count=2)],
+        provenance=provenance,
+    )
+
+
+class FakeClient:
+    """Serves any ID except those in `missing`, tracking how many fetches run at once."""
+
+    def __init__(self, missing=()):
+        self.missing = set(missing)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fetched = 0
+
+    async def get_structure_summary(self, pdb_id: str) -> StructureDataset:
+        self.fetched += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0)
+            if pdb_id in self.missing:
+                raise PDBAPIError(pdb_id=pdb_id, status_code=404, detail="not found")
+            return make_structure(pdb_id)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture(autouse=True)
+def memory_index():
+    with patch.object(metadata, "_metadata_index", MetadataIndex(":memory:")):
+        yield
+
+
+async def collect(chunks) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+@pytest.mark.asyncio
+async def test_nested_parquet_streams_one_row_group_per_batch():
+    ids = ["1AAA", "2BBB", "9BAD", "3CCC", "4DDD", "5EEE"]
+    data = await collect(export.iter_export(ids, FakeClient(missing={"9BAD"}), "nested", "parquet", batch_rows=2))
+
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.column("pdb_id").to_pylist() == ["1AAA", "2BBB", "3CCC", "4DDD", "5EEE"]  # Failed entry skipped
+    first = table.slice(0, 1).to_pylist()[0]
+    assert first["chains"] == [
+        {"chain_id": "A", "sequence_length": 100, "organism": "Homo sapiens"},
+        {"chain_id": "B", "sequence_length": 90, "organism": None},
+    ]
+    assert first["ligands"] == [{"chem_id": "HEM", "name": "HEME", "count": 2}]
+    assert table.schema.field("release_date").type == pa.date32()
+
+
+@pytest.mark.asyncio
+async def test_exploded_tables_as_arrow_stream():
+    data = await collect(export.iter_export(["1AAA", "2BBB"], FakeClient(), "chains", "arrow"))
+
+    table = pa.ipc.open_stream(data).read_all()
+    assert table.column_names == ["pdb_id", "chain_id", "sequence_length", "organism"]
+    assert table.column("pdb_id").to_pylist() == ["1AAA", "1AAA", "2BBB", "2BBB"]
+
+    with pytest.raises(DataValidationError):
+        await collect(export.iter_export(["1AAA"], FakeClient(), "atoms", "arrow"))
+
+
+@pytest.mark.asyncio
+async def test_batches_are_encoded_off_the_event_loop():
+    loop_thread = threading.get_ident()
+    write_threads = []
+    write_batch = export._write_batch
+
+    def recording_write_batch(*args):
+        write_threads.append(threading.get_ident())
+        return write_batch(*args)
+
+    with patch.object(export, "_write_batch", recording_write_batch):
+        await collect(export.iter_export(["1AAA", "2BBB"], FakeClient(), "nested", "parquet", batch_rows=1))
+
+    assert len(write_threads) == 2 and loop_thread not in write_threads
+
+
+@pytest.mark.asyncio
+async def test_export_parquet_writes_exploded_files(tmp_path):
+    report = await export.export_parquet(["1AAA", "2BBB", "3CCC"], FakeClient(), str(tmp_path), layout="exploded", batch_rows=2)
+
+    assert report.entries == 3 and report.rows == {"entries": 3, "chains": 6, "ligands": 3}
+    assert pq.read_table(tmp_path / "ligands.parquet").column("pdb_id").to_pylist() == ["1AAA", "2BBB", "3CCC"]
+    assert pq.read_table(tmp_path / "entries.parquet").num_rows == 3
+
+
+@pytest.mark.asyncio
+async def test_batches_keep_memory_bounded():
+    client = FakeClient()
+    consumed = 0
+
+    def ids():
+        nonlocal consumed
+        for n in range(2_000):
+            consumed += 1
+            yield f"{1000 + n}"
+
+    batches = export.iter_structure_batches(ids(), client, batch_rows=50, concurrency=4)
+    first = await batches.__anext__()
+    # Only one batch plus the fetch window has been pulled from the input.
+    assert len(first) == 50 and consumed <= 50 + 4
+    sizes = [len(first)] + [len(batch) async for batch in batches]
+    assert sum(sizes) == 2_000 and max(sizes) == 50
+    assert client.max_in_flight <= 4
@@ -0,0 +1,178 @@
+import threading
+from dataclasses import replace
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from mcp_pdb.adapter.coordinate_client import AtomArrays, AtomSiteParser
+from mcp_pdb.adapter.sources import summary_chain_id
+from mcp_pdb.exceptions import DataValidationError
+from mcp_pdb.processing.coordinates import coordinate_cache
+from mcp_pdb.processing.geometry import attach_chain_geometry, build_chain_geometry, compute_chain_geometry, geometry_cache
+from mcp_pdb.schemas import ChainInfo, Provenance, StructureDataset
+
+# Chain A: three residues 4 Å apart along x (CA atoms) plus a side-chain atom; chain B: one residue; a ligand.
+CHAINS_CIF = """data_2GEO
+loop_
+_atom_site.group_PDB
+_atom_site.id
+_atom_site.type_symbol
+_atom_site.label_atom_id
+_atom_site.label_comp_id
+_atom_site.auth_asym_id
+_atom_site.auth_seq_id
+_atom_site.Cartn_x
+_atom_site.Cartn_y
+_atom_site.Cartn_z
+ATOM   1 N N   GLY A 1 0.0 1.0 0.0
+ATOM   2 C CA  GLY A 1 0.0 0.0 0.0
+ATOM   3 C CA  ALA A 2 4.0 0.0 0.0
+ATOM   4 C CB  ALA A 2 4.0 -1.0 0.0
+ATOM   5 C CA  SER A 3 8.0 0.0 0.0
+ATOM   6 C CA  GLY B 7 20.0 20.0 20.0
+HETATM 7 P PA  ATP A 401 100.0 100.0 100.0
+#
+"""
+
+
+@pytest.fixture
+def chain_atoms():
+    parser = AtomSiteParser("2GEO")
+    for line in CHAINS_CIF.splitlines():
+        parser.feed_line(line)
+    return parser.finish()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    geometry_cache.clear()
+    coordinate_cache.clear()
+    yield
+    geometry_cache.clear()
+    coordinate_cache.clear()
+
+
+def test_descriptors_match_per_chain_numpy(chain_atoms):
+    geometry = compute_chain_geometry(chain_atoms)
+
+    assert sorted(geometry) == ["A", "B"]  # Ligand atoms are not part of any chain's descriptors
+    a = geometry["A"]
+    xyz = chain_atoms.xyz[:5].astype(np.float64)
+    np.testing.assert_allclose(a.centroid, xyz.mean(axis=0), atol=1e-3)
+    rg = np.sqrt(((xyz - xyz.mean(axis=0)) ** 2).sum(axis=1).mean())
+    assert a.radius_of_gyration == pytest.approx(rg, abs=1e-3)
+    assert a.bbox_min == [0.0, -1.0, 0.0] and a.bbox_max == [8.0, 1.0, 0.0]
+    assert (a.atom_count, a.residue_count) == (5, 3)
+    assert geometry["B"].radius_of_gyration == 0.0
+    assert a.contact_map is None
+
+
+def test_contact_map_is_sparse_upper_triangle(chain_atoms):
+    geometry = compute_chain_geometry(chain_atoms, contact_cutoff=5.0)
+
+    contacts = geometry["A"].contact_map
+    assert contacts.residues == [1, 2, 3]
+    # CA-CA distances are 4, 4 and 8 Å, so only neighbours are in contact.
+    assert list(zip(contacts.row, contacts.col)) == [(0, 1), (1, 2)]
+    assert geometry["B"].contact_map.row == []
+
+
+def test_batched_descriptors_for_many_chains():
+    rng = np.random.default_rng(1)
+    n_chains, per_chain = 100, 200
+    chain = np.repeat(np.arange(n_chains, dtype=np.int32), per_chain)
+    rng.shuffle(chain)  # Chains need not be contiguous
+    atoms = AtomArrays(
+        pdb_id="9BIG",
+        xyz=rng.normal(scale=60.0, size=(len(chain), 3)).astype(np.float32),
+        element=np.zeros(len(chain), dtype=np.uint16),
+        res_name=np.zeros(len(chain), dtype=np.uint16),
+        atom_name=np.zeros(len(chain), dtype=np.uint16),
+        chain=chain,
+        res_seq=np.arange(len(chain), dtype=np.int32) % per_chain,
+        hetero=np.zeros(len(chain), dtype=bool),
+        element_names=("C",),
+        res_names=("ALA",),
+        atom_names=("CA",),
+        chain_ids=tuple(f"C{i}" for i in range(n_chains)),
+    )
+
+    geometry = compute_chain_geometry(atoms, contact_cutoff=8.0)
+
+    assert len(geometry) == n_chains
+    picked = chain == 42
+    xyz = atoms.xyz[picked].astype(np.float64)
+    np.testing.assert_allclose(geometry["C42"].centroid, xyz.mean(axis=0), atol=1e-3)
+    np.testing.assert_allclose(geometry["C42"].bbox_max, xyz.max(axis=0), atol=1e-3)
+
+
+@pytest.mark.asyncio
+@patch('mcp_pdb.utils.cache.CACHE_ENABLED', True)
+async def test_attach_chain_geometry_uses_cached_coordinates(chain_atoms):
+    provenance = Provenance(source="RCSB PDB", retrieved="2024-01-01T00:00:00Z", api_url="https://data.rcsb.org/rest/v1/core/entry/2GEO")
+    coordinate_cache.set("2GEO", (chain_atoms, provenance))
+    structure = StructureDataset(
+        pdb_id="2GEO",
+        title="Geometry fixture",
+        method="X-RAY DIFFRACTION",
+        ligands=[],
+        chains=[ChainInfo(chain_id="A", sequence_length=3), ChainInfo(chain_id="C", sequence_length=10)],
+        provenance=provenance,
+    )
+
+    enriched = await attach_chain_geometry(structure, pdb_client=None, coordinate_client=None)
+
+    assert enriched.chains[0].geometry.residue_count == 3
+    assert enriched.chains[1].geometry is None  # No coordinates for chain C
+    assert structure.chains[0].geometry is None  # Original bundle is untouched
+    assert geometry_cache.get(("2GEO", None)) is not None
+
+
+@pytest.mark.asyncio
+@patch('mcp_pdb.utils.cache.CACHE_ENABLED', True)
+async def test_attach_chain_geometry_matches_truncated_chain_ids(chain_atoms):
+    atoms = replace(chain_atoms, chain_ids=("AAA", "BBB"))
+    provenance = Provenance(source="RCSB PDB", retrieved="2024-01-01T00:00:00Z", api_url="https://data.rcsb.org/rest/v1/core/entry/3GEO")
+    coordinate_cache.set("3GEO", (atoms, provenance))
+    structure = StructureDataset(
+        pdb_id="3GEO",
+        title="Long chain IDs",
+        method="X-RAY DIFFRACTION",
+        ligands=[],
+        chains=[ChainInfo(chain_id=summary_chain_id("AAA"), sequence_length=3)],
+        provenance=provenance,
+    )
+
+    enriched = await attach_chain_geometry(structure, pdb_client=None, coordinate_client=None)
+
+    assert enriched.chains[0].chain_id == "AA"
+    assert enriched.chains[0].geometry.residue_count == 3
+
+    geometry_cache.clear()
+    coordinate_cache.set("3GEO", (replace(chain_atoms, chain_ids=("AAA", "AAB")), provenance))
+    ambiguous = await attach_chain_geometry(structure, pdb_client=None, coordinate_client=None)
+    assert ambiguous.chains[0].geometry is None  # Two author chains share the summary ID
+
+
+@pytest.mark.asyncio
+async def test_geometry_is_computed_off_the_event_loop(chain_atoms):
+    provenance = Provenance(source="RCSB PDB", retrieved="2024-01-01T00:00:00Z", api_url="https://data.rcsb.org/rest/v1/core/entry/2GEO")
+    threads = []
+
+    def recording_compute(atoms, contact_cutoff=None):
+        threads.append(threading.get_ident())
+        return compute_chain_geometry(atoms, contact_cutoff)
+
+    with patch("mcp_pdb.processing.geometry.load_coordinates", AsyncMock(return_value=(chain_atoms, provenance))), \
+            patch("mcp_pdb.processing.geometry.compute_chain_geometry", recording_compute):
+        geometry = await build_chain_geometry("2GEO", None, None, contact_cutoff=5.0)
+
+    assert geometry["A"].residue_count == 3
+    assert threads and threading.get_ident() not in threads
+
+
+@pytest.mark.asyncio
+async def test_build_chain_geometry_rejects_bad_cutoff():
+    with pytest.raises(DataValidationError):
+        await build_chain_geometry("2GEO", None, None, contact_cutoff=0)
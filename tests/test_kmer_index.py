@@ -0,0 +1,148 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from mcp_pdb.processing import similarity
+from mcp_pdb.schemas import SimilarityRequest
+from mcp_pdb.utils.kmer_index import KmerIndex
+
+AMINO = "ACDEFGHIKLMNPQRSTVWY"
+
+
+def random_protein(rng, length=150):
+    return "".join(rng.choice(list(AMINO), size=length))
+
+
+def mutate(rng, sequence, n):
+    letters = list(sequence)
+    for i in rng.choice(len(letters), size=n, replace=False):
+        letters[i] = rng.choice(list(AMINO))
+    return "".join(letters)
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(7)
+
+
+def test_query_ranks_closest_sequence_first(rng):
+    base = random_protein(rng)
+    index = KmerIndex(k=3)
+    index.add("1AAA", "1", random_protein(rng))
+    index.add("2BBB", "1", mutate(rng, base, 30))
+    index.add("3CCC", "1", mutate(rng, base, 5))
+
+    hits = index.query(base, top_k=2)
+
+    assert [h[0] for h in hits] == ["3CCC", "2BBB"]
+    assert 0 < hits[1][2] < hits[0][2] <= 1
+
+
+def test_identical_sequences_are_indexed_once(rng):
+    seq = random_protein(rng)
+    index = KmerIndex(k=3)
+    assert index.add("4HHB", "1", seq)
+    assert index.add("1A3N", "1", seq)
+    assert not index.add("4HHB", "1", seq)
+
+    assert (len(index), index.sequence_count) == (2, 1)
+    hits = index.query(seq, top_k=5)
+    assert sorted(h[0] for h in hits) == ["1A3N", "4HHB"]
+    assert all(h[2] == 1.0 for h in hits)
+
+
+def test_entry_is_reported_once_with_its_best_entity(rng):
+    seq = random_protein(rng)
+    index = KmerIndex(k=3)
+    index.add("5DDD", "1", mutate(rng, seq, 40))
+    index.add("5DDD", "2", seq)
+
+    assert index.query(seq, top_k=5) == [("5DDD", "2", 1.0, len(index._kmer_codes(seq)))]
+
+
+def test_incremental_adds_between_queries(rng):
+    index = KmerIndex(k=3)
+    sequences = {f"{i}XYZ": random_protein(rng) for i in range(1, 6)}
+    for pdb_id, seq in sequences.items():
+        index.add(pdb_id, "1", seq)
+        assert index.query(seq, top_k=1)[0][0] == pdb_id  # Newly added entry is immediately queryable
+
+
+def test_readding_entity_with_new_sequence_and_discard(rng):
+    old, new = random_protein(rng), random_protein(rng)
+    index = KmerIndex(k=3)
+    index.add("6EEE", "1", old)
+    index.add("6EEE", "1", new)
+
+    assert index.query(old, top_k=1) == []  # The stale sequence no longer maps to any entry
+    assert index.query(new, top_k=1)[0][0] == "6EEE"
+    assert index.discard("6eee") == 1
+    assert index.query(new, top_k=1) == []
+
+
+def test_save_and_load_round_trip(tmp_path, rng):
+    index = KmerIndex(k=3)
+    seqs = [random_protein(rng) for _ in range(20)]
+    for i, seq in enumerate(seqs):
+        index.add(f"{i + 1}ABC", "1", seq)
+    path = str(tmp_path / "index.npz")
+
+    index.save(path)
+    loaded = KmerIndex.load(path, k=3)
+
+    assert len(loaded) == 20
+    assert loaded.query(seqs[7], top_k=3) == index.query(seqs[7], top_k=3)
+    loaded.add("99ZZ", "1", seqs[7])  # Still incremental after loading
+    assert {h[0] for h in loaded.query(seqs[7], top_k=2)} == {"8ABC", "99ZZ"}
+    assert KmerIndex.load(path, k=4) is None  # Built with another k
+    assert KmerIndex.load(str(tmp_path / "missing.npz"), k=3) is None
+
+
+def test_storage_grows_with_data_not_with_k(tmp_path, rng):
+    index = KmerIndex(k=6)
+    seq = random_protein(rng)
+    index.add("1AAA", "1", seq)
+    assert index.query(seq, top_k=1)[0][0] == "1AAA"
+    assert index.nbytes < 10_000
+
+    path = tmp_path / "empty.npz"
+    KmerIndex(k=4).save(str(path))
+    assert path.stat().st_size < 10_000
+
+
+def test_discarded_sequences_are_compacted(tmp_path, rng):
+    index = KmerIndex(k=3)
+    seqs = [random_protein(rng) for _ in range(8)]
+    for i, seq in enumerate(seqs):
+        index.add(f"{i + 1}ABC", "1", seq)
+    index.query(seqs[0])
+    full = len(index._postings)
+
+    index.discard("1ABC")
+    index.query(seqs[0])
+    assert len(index._postings) == full  # One dead sequence in eight: below the threshold
+    for pdb_id in ("2ABC", "3ABC"):
+        index.discard(pdb_id)
+    assert all(hit[0] not in ("1ABC", "2ABC", "3ABC") for hit in index.query(seqs[1]))
+    assert index.sequence_count == 5 and len(index._postings) < full
+
+    index.add("1ABC", "1", seqs[0])  # A compacted-away sequence is indexed afresh
+    assert index.query(seqs[0], top_k=1)[0][:3] == ("1ABC", "1", 1.0)
+    assert index.query(seqs[7], top_k=1)[0][0] == "8ABC"
+
+    index.discard("8ABC")
+    path = str(tmp_path / "index.npz")
+    index.save(path)  # Saving always compacts
+    assert index.sequence_count == 5 and KmerIndex.load(path, k=3).query(seqs[6], top_k=1)[0][0] == "7ABC"
+
+
+def test_find_similar_structures_uses_process_index(rng):
+    seq = random_protein(rng)
+    with patch.object(similarity, "_sequence_index", KmerIndex(k=4)):
+        similarity.get_sequence_index().add("7GGG", "2", seq)
+
+        results = similarity.find_similar_structures(SimilarityRequest(sequence=seq[10:120], top_k=3))
+
+    assert results.kmer_size == 4 and results.indexed_entities == 1
+    assert results.hits[0].pdb_id == "7GGG" and results.hits[0].entity_id == "2"
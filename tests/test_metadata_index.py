@@ -0,0 +1,79 @@
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from mcp_pdb.processing import metadata
+from mcp_pdb.schemas import ChainInfo, LigandDataset, MetadataFilter, Provenance, StructureDataset
+from mcp_pdb.utils.metadata_index import MetadataIndex
+
+
+@pytest.fixture
+def index() -> MetadataIndex:
+    index = MetadataIndex(":memory:")
+    index.upsert_many([
+        ("4HHB", "X-RAY DIFFRACTION", 1.74, "1984-07-17", 4, ["Homo sapiens"], ["HEM", "PO4"]),
+        ("1A3N", "X-RAY DIFFRACTION", 1.8, "1998-04-29", 4, ["Homo sapiens"], ["HEM"]),
+        ("2HHB", "X-RAY DIFFRACTION", 2.5, "1984-07-17", 4, ["Homo sapiens"], ["HEM"]),
+        ("1MBN", "X-RAY DIFFRACTION", 2.0, "1977-04-05", 1, ["Physeter catodon"], ["HEM"]),
+        ("2K39", "SOLUTION NMR", None, "2008-06-10", 1, ["Homo sapiens"], []),
+    ])
+    yield index
+    index.close()
+
+
+def test_combined_filter(index):
+    total, rows = index.query(method="x-ray", max_resolution=2.0, organism="homo sapiens", ligands=["hem"])
+
+    assert total == 2
+    assert [row["pdb_id"] for row in rows] == ["4HHB", "1A3N"]  # Best resolution first
+    assert rows[0] == {"pdb_id": "4HHB", "method": "X-RAY DIFFRACTION", "resolution": 1.74, "release_date": "1984-07-17", "chain_count": 4}
+
+
+def test_all_ligands_must_match_and_paging(index):
+    assert index.query(ligands=["HEM", "PO4"])[0] == 1
+    total, rows = index.query(ligands=["HEM"], limit=2, offset=2)
+    assert total == 4
+    assert [row["pdb_id"] for row in rows] == ["1MBN", "2HHB"]
+
+
+def test_dates_chains_and_unknown_resolution_last(index):
+    total, rows = index.query(released_after="1990-01-01")
+    assert [row["pdb_id"] for row in rows] == ["1A3N", "2K39"]
+    assert index.query(min_chains=2)[0] == 3
+    assert index.query(method="SOLUTION")[1][0]["resolution"] is None
+
+
+def test_upsert_replaces_links_and_delete(index):
+    index.upsert("4hhb", "X-RAY DIFFRACTION", 1.74, "1984-07-17", 4, organisms=["Homo sapiens"], ligands=["O2"])
+
+    assert index.query(ligands=["PO4"])[0] == 0
+    assert index.query(ligands=["O2"])[1][0]["pdb_id"] == "4HHB"
+    index.delete("4HHB")
+    assert "4HHB" not in index and len(index) == 4
+
+
+def test_method_prefix_is_not_a_pattern(index):
+    assert index.query(method="%")[0] == 0
+
+
+def test_index_structure_and_filter_structures(tmp_path):
+    structure = StructureDataset(
+        pdb_id="4HHB",
+        title="Deoxyhaemoglobin",
+        method="X-RAY DIFFRACTION",
+        resolution=1.74,
+        release_date=date(1984, 7, 17),
+        chains=[ChainInfo(chain_id=c, sequence_length=141, organism="Homo sapiens") for c in "ABCD"],
+        ligands=[LigandDataset(chem_id="HEM", name="PROTOPORPHYRIN IX CONTAINING FE", count=4)],
+        provenance=Provenance(source="RCSB PDB", retrieved=datetime.now(timezone.utc), api_url="https://data.rcsb.org/rest/v1/core/entry/4HHB"),
+    )
+    with patch.object(metadata, "_metadata_index", MetadataIndex(str(tmp_path / "metadata.sqlite3"))):
+        metadata.index_structure(structure)
+
+        results = metadata.filter_structures(MetadataFilter(method="X-RAY", max_resolution=2.0, ligands=["HEM"], organism="Homo sapiens"))
+
+    assert results.total_count == 1 and results.indexed_entries == 1
+    assert results.entries[0].pdb_id == "4HHB"
+    assert results.entries[0].release_date == date(1984, 7, 17)
+    assert results.entries[0].chain_count == 4
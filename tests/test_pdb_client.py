@@ -96,3 +96,52 @@ async def test_get_structure_summary_network_error(client: PDBClient, respx_rout
 
     assert "Connection failed" in excinfo.value.message
     await client.close()
+
+@pytest.mark.asyncio
+async def test_get_chemical_component_success(client: PDBClient, respx_mock: MockRouter):
+    api_url = f"{PDB_API_BASE_URL}/rest/v1/core/chemcomp/ATP"
+    respx_mock.get(api_url).mock(return_value=httpx.Response(200, json={
+        "chem_comp": {
+            "id": "ATP",
+            "name": "ADENOSINE-5'-TRIPHOSPHATE",
+            "type": "NON-POLYMER",
+            "formula": "C10 H16 N5 O13 P3",
+            "formula_weight": 507.181,
+        },
+        "rcsb_chem_comp_descriptor": {
+            "smiles": "c1nc(c2c(n1)n(cn2)C3C(C(C(O3)COP(=O)(O)OP(=O)(O)OP(=O)(O)O)O)O)N",
+            "smilesstereo": "c1nc(c2c(n1)n(cn2)[C@H]3[C@@H]([C@@H]([C@H](O3)CO[P@@](=O)(O)O[P@](=O)(O)OP(=O)(O)O)O)O)N",
+            "in_ch_ikey": "ZKHQWZAMYRWXGA-KQYNXXCUSA-N",
+        },
+    }))
+
+    component = await client.get_chemical_component("ATP")
+
+    assert component.chem_id == "ATP"
+    assert component.formula == "C10 H16 N5 O13 P3"
+    assert component.formula_weight == pytest.approx(507.181)
+    assert "[C@H]" in component.smiles  # Stereo SMILES preferred
+    assert component.inchikey == "ZKHQWZAMYRWXGA-KQYNXXCUSA-N"
+    assert component.provenance.api_url == api_url
+    await client.close()
+
+@pytest.mark.asyncio
+async def test_get_chemical_component_not_found(client: PDBClient, respx_mock: MockRouter):
+    respx_mock.get(f"{PDB_API_BASE_URL}/rest/v1/core/chemcomp/ZZZ").mock(return_value=httpx.Response(404))
+
+    with pytest.raises(PDBAPIError) as excinfo:
+        await client.get_chemical_component("ZZZ")
+
+    assert excinfo.value.status_code == 404
+    assert excinfo.value.resource == "Chemical component"
+    await client.close()
+
+@pytest.mark.asyncio
+async def test_search_no_hits(client: PDBClient, respx_mock: MockRouter):
+    route = respx_mock.post(client.search_url).mock(return_value=httpx.Response(204))
+
+    page = await client.search({"query": {"type": "terminal", "service": "full_text", "parameters": {"value": "zzz"}}})
+
+    assert page == {"total_count": 0, "result_set": []}
+    assert route.called
+    await client.close()
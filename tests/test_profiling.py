@@ -0,0 +1,96 @@
+import cProfile
+import threading
+import time
+
+import pytest
+
+from mcp_pdb.adapter.sources import parse_sources
+from mcp_pdb.utils import profiling
+
+TOKEN = "s3cret"
+
+
+def busy_work(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_is_admin_requires_a_configured_token():
+    assert profiling.is_admin(TOKEN, TOKEN)
+    assert not profiling.is_admin("wrong", TOKEN)
+    assert not profiling.is_admin(None, TOKEN)
+    assert not profiling.is_admin("", "")  # Unset ADMIN_TOKEN admits nobody
+
+
+def test_sampler_emits_collapsed_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_work, args=(stop,), name="busy-worker")
+    worker.start()
+    sampler = profiling.StackSampler(interval=0.002)
+    sampler.start()
+    time.sleep(0.1)
+    sampler.stop()
+    stop.set()
+    worker.join()
+
+    assert sampler.samples > 5
+    lines = sampler.collapsed().splitlines()
+    busy = [line for line in lines if line.startswith("busy-worker;") and "busy_work (test_profiling.py:" in line]
+    assert busy
+    stack, count = busy[0].rsplit(" ", 1)
+    assert int(count) >= 1 and ";" in stack
+    assert not any("mcp-pdb-stack-sampler" in line for line in lines)  # Never samples itself
+
+
+def test_top_functions_and_server_timing():
+    profile = cProfile.Profile()
+    profile.enable()
+    for _ in range(3):
+        parse_sources("rcsb")
+        profiling.is_admin(TOKEN, TOKEN)
+    profile.disable()
+
+    rows = profiling.top_functions(profile, limit=5)
+    calls = {label: calls for label, calls, _ in rows}
+    assert calls[next(label for label in calls if label.startswith("sources.py:") and "(parse_sources)" in label)] == 3
+    assert not any("(is_admin)" in label for label in calls)  # The profiler's own module is left out
+
+    header = profiling.server_timing([("a.py:1(f)", 2, 0.0125), ('b.py:2("g")', 1, 0.001)])
+    assert header == 'f1;dur=12.500;desc="a.py:1(f) x2", f2;dur=1.000;desc="b.py:2(\'g\') x1"'
+
+
+async def plain_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def call(app, headers):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "headers": [(k.encode(), v.encode()) for k, v in headers.items()]}
+    await app(scope, receive, send)
+    return dict(messages[0]["headers"])
+
+
+@pytest.mark.asyncio
+async def test_middleware_profiles_only_admin_requests():
+    app = profiling.ProfilingMiddleware(plain_app, admin_token=TOKEN)
+
+    assert b"server-timing" not in await call(app, {})
+    assert b"server-timing" not in await call(app, {"x-profile": "1", "x-admin-token": "wrong"})
+    assert b"server-timing" not in await call(app, {"x-admin-token": TOKEN})
+
+    headers = await call(app, {"x-profile": "1", "x-admin-token": TOKEN})
+    assert b"server-timing" in headers
+    assert profiling.try_acquire()  # Slot released after the response
+    try:
+        busy = await call(app, {"x-profile": "1", "x-admin-token": TOKEN})
+    finally:
+        profiling.release()
+    assert busy[b"x-profile"] == b"busy" and b"server-timing" not in busy
@@ -0,0 +1,179 @@
+import os
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+pytest.importorskip("zstandard")
+
+from mcp_pdb.adapter.pdb_client import PDBClient  # noqa: E402
+from mcp_pdb.adapter.resilience import RetryPolicy  # noqa: E402
+from mcp_pdb.exceptions import DataValidationError  # noqa: E402
+from mcp_pdb.processing import dataset_builder, metadata, raw_documents, sequences  # noqa: E402
+from mcp_pdb.utils.metadata_index import MetadataIndex  # noqa: E402
+from mcp_pdb.utils.raw_store import RawDocumentStore  # noqa: E402
+
+ENTRY = {
+    "struct": {"title": "Test kinase"},
+    "exptl": [{"method": "X-RAY DIFFRACTION"}],
+    "refine": [{"ls_d_res_high": 1.8}],
+    "rcsb_accession_info": {"initial_release_date": "2020-01-15T00:00:00+0000", "revision_date": "2023-03-01T00:00:00+0000"},
+    "polymer_entities": [{
+        "entity_poly": {"pdbx_strand_id": "A,B", "rcsb_sample_sequence_length": 120},
+        "rcsb_entity_source_organism": [{"ncbi_scientific_name": "Homo sapiens"}],
+    }],
+}
+
+
+SEQ_ENTRY = {
+    "struct": {"title": "Two entities"},
+    "exptl": [{"method": "X-RAY DIFFRACTION"}],
+    "rcsb_accession_info": {"initial_release_date": "2020-01-15T00:00:00+0000", "revision_date": "2023-03-01T00:00:00+0000"},
+    "rcsb_entry_container_identifiers": {"polymer_entity_ids": ["1", "2"]},
+}
+
+
+def polymer_entity(entity_id: str, sequence: str) -> dict:
+    return {
+        "entity_poly": {"pdbx_seq_one_letter_code_can": sequence, "pdbx_strand_id": chr(ord("A") + int(entity_id) - 1)},
+        "rcsb_polymer_entity_container_identifiers": {"entity_id": entity_id},
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return RawDocumentStore(str(tmp_path / "raw"), level=3)
+
+
+@pytest.fixture(autouse=True)
+def memory_index():
+    with patch.object(metadata, "_metadata_index", MetadataIndex(":memory:")):
+        yield
+
+
+def make_client(store: RawDocumentStore, requests: list) -> PDBClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if request.url.path == "/rest/v1/core/entry/1ABC":
+            return httpx.Response(200, json=ENTRY)
+        if request.url.path == "/rest/v1/core/entry/2SEQ":
+            return httpx.Response(200, json=SEQ_ENTRY)
+        if request.url.path.startswith("/rest/v1/core/polymer_entity/2SEQ/"):
+            entity_id = request.url.path.rsplit("/", 1)[-1]
+            return httpx.Response(200, json=polymer_entity(entity_id, "MKTAYIAK" * int(entity_id)))
+        return httpx.Response(404)
+
+    return PDBClient(
+        base_url="https://data.example.org",
+        client=httpx.AsyncClient(base_url="https://data.example.org", transport=httpx.MockTransport(handler)),
+        retry_policy=RetryPolicy(max_retries=0),
+        raw_store=store,
+    )
+
+
+def test_documents_are_content_addressed_and_compressed(store):
+    document = {"b": [1, 2, 3] * 200, "a": "x" * 2000}
+    digest = store.put(document)
+    assert store.put({"a": "x" * 2000, "b": [1, 2, 3] * 200}) == digest  # Key order does not matter
+    assert store.get(digest) == document
+    assert store.stats()["objects"] == 1 and store.stats()["stored_bytes"] < 200
+
+    path = os.path.join(store.root, "objects", digest[:2], f"{digest}.json.zst")
+    with open(path, "wb") as fh:
+        fh.write(store._zstd.ZstdCompressor().compress(b'{"a":"tampered"}'))
+    with pytest.raises(DataValidationError):
+        store.get(digest)
+    with pytest.raises(KeyError):
+        store.get("0" * 64)
+
+
+def test_entries_share_blobs_and_gc_keeps_referenced_ones(store):
+    retrieved = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    store.record("1abc", "rcsb", "https://x/1ABC", retrieved, ["/a", "/b"], [{"shared": True}, {"id": 1}])
+    store.record("2DEF", "rcsb", "https://x/2DEF", retrieved, ["/a", "/b"], [{"shared": True}, {"id": 2}])
+    assert list(store.entry_ids()) == ["1ABC", "2DEF"]
+    stats = store.stats()
+    assert (stats["entries"], stats["references"], stats["objects"]) == (2, 4, 3)
+    assert store.documents(store.entry("1ABC")) == [{"shared": True}, {"id": 1}]
+
+    assert store.delete("2def") and not store.delete("2DEF")
+    assert store.gc() == 0  # Just written: inside the grace period
+    assert store.gc(min_age_seconds=-1) == 1
+    assert store.documents(store.entry("1ABC")) == [{"shared": True}, {"id": 1}]
+    with pytest.raises(ValueError):
+        store.entry("../../etc")
+
+
+@pytest.mark.asyncio
+async def test_fetched_entries_rebuild_without_network(store):
+    requests = []
+    client = make_client(store, requests)
+    try:
+        fetched = await client.get_structure_summary("1ABC")
+    finally:
+        await client.close()
+
+    entry = store.entry("1ABC")
+    assert entry["source"] == "rcsb" and [d["path"] for d in entry["documents"]] == ["/rest/v1/core/entry/1ABC"]
+    assert raw_documents.rebuild_structure("1ABC", store) == fetched
+    assert raw_documents.rebuild_structure("9XYZ", store) is None
+    assert requests == ["/rest/v1/core/entry/1ABC"]
+
+    report = raw_documents.rebuild_all(store)
+    assert report.rebuilt == 1 and not report.failed
+    assert "1ABC" in metadata.get_metadata_index()
+
+
+@pytest.mark.asyncio
+@patch("mcp_pdb.utils.cache.CACHE_ENABLED", True)
+async def test_builder_prefers_fresh_local_documents(store):
+    dataset_builder.cache.clear()
+    requests = []
+    client = make_client(store, requests)
+    try:
+        await dataset_builder.build_structure_context("1ABC", client)
+        dataset_builder.cache.clear()
+        rebuilt = await dataset_builder.build_structure_context("1ABC", client)
+        assert rebuilt.title == "Test kinase" and len(requests) == 1  # Served from the raw store
+
+        # Documents older than the entry's adaptive TTL are refetched.
+        entry = store.entry("1ABC")
+        old = datetime.now(timezone.utc) - timedelta(days=365)
+        store.record("1ABC", "rcsb", entry["api_url"], old, ["/rest/v1/core/entry/1ABC"], store.documents(entry))
+        dataset_builder.cache.clear()
+        await dataset_builder.build_structure_context("1ABC", client)
+        assert len(requests) == 2
+    finally:
+        await client.close()
+        dataset_builder.cache.clear()
+
+
+@pytest.mark.asyncio
+@patch("mcp_pdb.utils.cache.CACHE_ENABLED", True)
+async def test_sequences_are_rebuilt_from_attached_documents(store):
+    sequences.sequence_cache.clear()
+    requests = []
+    client = make_client(store, requests)
+    try:
+        fetched = await client.get_sequences("2SEQ")
+        assert sorted(requests) == ["/rest/v1/core/entry/2SEQ", "/rest/v1/core/polymer_entity/2SEQ/1", "/rest/v1/core/polymer_entity/2SEQ/2"]
+        entry = store.entry("2SEQ")
+        assert entry["source"] == "rcsb" and len(entry["attached"]) == 3
+
+        local = raw_documents.fresh_sequences("2SEQ", store)
+        assert [e.sequence for e in local.entities] == [e.sequence for e in fetched.entities]
+        assert raw_documents.rebuild_structure("2SEQ", store).title == "Two entities"  # Attachments leave the summary alone
+
+        requests.clear()
+        dataset = await sequences.build_sequence_context("2SEQ", client)
+        assert len(dataset.entities) == 2 and requests == []  # No network
+
+        # A missing entity document means the network is used after all.
+        entry["attached"] = [d for d in entry["attached"] if not d["path"].endswith("/2")]
+        store.record("2SEQ", "rcsb", entry["api_url"], datetime.fromisoformat(entry["retrieved"]), ["/rest/v1/core/entry/2SEQ"], [SEQ_ENTRY])
+        store.attach("2SEQ", [d["path"] for d in entry["attached"]], [store.get(d["sha256"]) for d in entry["attached"]])
+        assert raw_documents.fresh_sequences("2SEQ", store) is None
+    finally:
+        await client.close()
+        sequences.sequence_cache.clear()
@@ -0,0 +1,269 @@
+import asyncio
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from mcp_pdb.adapter.pdb_client import PDBClient
+from mcp_pdb.adapter.resilience import CircuitBreaker, Hedger, RetryPolicy, TokenBucket, parse_retry_after
+from mcp_pdb.exceptions import CircuitOpenError, NetworkError, PDBAPIError
+
+BASE_URL = "https://data.example.org"
+ENTRY_URL = f"{BASE_URL}/rest/v1/core/entry/1ABC"
+SEARCH_URL = "https://search.example.org/query"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_client(max_retries: int = 2, failure_threshold: int = 100, clock=None) -> PDBClient:
+    return PDBClient(
+        base_url=BASE_URL,
+        search_url=SEARCH_URL,
+        rate_limiter=TokenBucket(rate=1000, burst=100),
+        retry_policy=RetryPolicy(max_retries=max_retries, backoff_base=0.001, backoff_max=0.01),
+        circuit_breaker=CircuitBreaker(failure_threshold=failure_threshold, reset_timeout=30, clock=clock or FakeClock()),
+    )
+
+
+def test_parse_retry_after():
+    now = datetime(2024, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("Sat, 01 Jun 2024 12:00:30 GMT", now=now) == 30.0
+    assert parse_retry_after("Sat, 01 Jun 2024 11:00:00 GMT", now=now) == 0.0
+    assert parse_retry_after("soon") is None and parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_halves_rate_on_429_and_recovers():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=2, clock=clock)
+    await bucket.acquire()
+    await bucket.acquire()
+
+    bucket.on_throttled(retry_after=5)
+    assert bucket.rate == 5 and bucket._blocked_until == clock.now + 5
+    bucket.on_throttled()
+    bucket.on_throttled()
+    bucket.on_throttled()
+    bucket.on_throttled()
+    assert bucket.rate == bucket.min_rate == 0.5
+    for _ in range(200):
+        bucket.on_success()
+    assert bucket.rate == 10
+
+
+def test_retry_policy_bounds():
+    policy = RetryPolicy(max_retries=2, backoff_base=1, backoff_max=3)
+    assert all(0 <= policy.delay(1) <= 2 for _ in range(50))
+    assert policy.delay(2) is None
+    assert policy.delay(0, retry_after=2.5) == 2.5
+    assert policy.delay(0, retry_after=60) is None  # Longer than we are willing to hold a request
+
+
+def test_circuit_breaker_opens_then_probes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+    assert breaker.retry_after() == 30
+
+    clock.now += 30
+    assert breaker.allow()  # The one half-open probe
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_get_is_retried_on_5xx_and_429(respx_mock: MockRouter):
+    route = respx_mock.get(ENTRY_URL).mock(side_effect=[
+        httpx.Response(503),
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(200, json={"rcsb_id": "1ABC"}),
+    ])
+    client = make_client()
+
+    assert await client._get_json("/rest/v1/core/entry/1ABC", "1ABC") == {"rcsb_id": "1ABC"}
+    assert route.call_count == 3
+    assert client.rate_limiter.rate < client.rate_limiter.max_rate  # Slowed down by the 429
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_retries_are_bounded_and_post_is_not_retried(respx_mock: MockRouter):
+    get_route = respx_mock.get(ENTRY_URL).mock(side_effect=httpx.ConnectError("refused"))
+    post_route = respx_mock.post(SEARCH_URL).mock(return_value=httpx.Response(502))
+    client = make_client(max_retries=2)
+
+    with pytest.raises(NetworkError):
+        await client._get_json("/rest/v1/core/entry/1ABC", "1ABC")
+    with pytest.raises(PDBAPIError) as excinfo:
+        await client.search({"query": {}})
+
+    assert get_route.call_count == 3
+    assert post_route.call_count == 1 and excinfo.value.status_code == 502
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_or_serves_stale(respx_mock: MockRouter):
+    respx_mock.get(ENTRY_URL).mock(side_effect=[httpx.Response(200, json={"rcsb_id": "1ABC"}), httpx.Response(500)])
+    other = respx_mock.get(f"{BASE_URL}/rest/v1/core/entry/2XYZ").mock(return_value=httpx.Response(200, json={}))
+    client = make_client(max_retries=0, failure_threshold=1)
+
+    assert await client._get_json("/rest/v1/core/entry/1ABC", "1ABC") == {"rcsb_id": "1ABC"}
+    # Upstream fails: the breaker opens and the last good body is served instead of the error.
+    assert await client._get_json("/rest/v1/core/entry/1ABC", "1ABC") == {"rcsb_id": "1ABC"}
+    assert client.circuit_breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError) as excinfo:
+        await client._get_json("/rest/v1/core/entry/2XYZ", "2XYZ")
+    assert other.call_count == 0 and excinfo.value.retry_after == 30
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_is_released_after_429_or_cancellation(respx_mock: MockRouter):
+    route = respx_mock.get(ENTRY_URL).mock(side_effect=[httpx.Response(500), httpx.Response(429), httpx.Response(200, json={})])
+    clock = FakeClock()
+    client = make_client(max_retries=0, failure_threshold=1, clock=clock)
+
+    with pytest.raises(PDBAPIError):
+        await client._get_json("/rest/v1/core/entry/1ABC", "1ABC")
+    clock.now += 30
+    with pytest.raises(PDBAPIError) as excinfo:  # The probe is throttled: no verdict either way
+        await client._get_json("/rest/v1/core/entry/1ABC", "1ABC")
+    assert excinfo.value.status_code == 429 and client.circuit_breaker.state == CircuitBreaker.HALF_OPEN
+
+    # A probe cancelled while waiting for a rate-limiter token frees the slot too.
+    acquire = client.rate_limiter.acquire
+    client.rate_limiter.acquire = lambda: asyncio.sleep(3600)
+    probe = asyncio.ensure_future(client._get_json("/rest/v1/core/entry/1ABC", "1ABC"))
+    await asyncio.sleep(0.01)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    client.rate_limiter.acquire = acquire
+
+    assert await client._get_json("/rest/v1/core/entry/1ABC", "1ABC") == {}
+    assert route.call_count == 3 and client.circuit_breaker.state == CircuitBreaker.CLOSED
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_not_found_is_not_retried(respx_mock: MockRouter):
+    route = respx_mock.get(ENTRY_URL).mock(return_value=httpx.Response(404))
+    client = make_client()
+
+    with pytest.raises(PDBAPIError) as excinfo:
+        await client._get_json("/rest/v1/core/entry/1ABC", "1ABC")
+
+    assert excinfo.value.status_code == 404 and route.call_count == 1
+    assert client.circuit_breaker.state == CircuitBreaker.CLOSED
+    await client.close()
+
+
+def make_hedger(calls: int = 100, **kwargs) -> Hedger:
+    """A hedger that has already seen `calls` calls, all taking 10 ms."""
+    hedger = Hedger(**{"quantile": 0.9, "budget": 0.5, "min_samples": 5, "min_delay": 0.01, **kwargs})
+    hedger._latencies.extend([0.01] * 100)
+    hedger.calls = calls
+    return hedger
+
+
+@pytest.mark.asyncio
+async def test_hedge_fires_on_slow_call_and_wins():
+    hedger = make_hedger()
+    delays = iter([1.0, 0.0])
+
+    async def send():
+        delay = next(delays)
+        await asyncio.sleep(delay)
+        return delay
+
+    assert await asyncio.wait_for(hedger.run(send), timeout=0.5) == 0.0
+    assert hedger.stats()["hedges_fired"] == 1 and hedger.stats()["win_rate"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_for_fast_calls_or_without_samples():
+    hedger = make_hedger()
+
+    async def fast():
+        return "ok"
+
+    assert await hedger.run(fast) == "ok"
+    assert Hedger(min_samples=5).delay() is None
+    assert hedger.hedges_fired == 0
+
+
+@pytest.mark.asyncio
+async def test_hedge_budget_caps_extra_requests():
+    hedger = make_hedger(calls=0, budget=0.25)
+    sent = 0
+
+    async def slow():
+        nonlocal sent
+        sent += 1
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    for _ in range(8):
+        await hedger.run(slow)
+
+    # Hedges may not exceed 25% of calls: only the 4th and 8th call can be hedged.
+    assert hedger.hedges_fired == 2 and hedger.budget_denied == 6
+    assert sent == 10
+
+
+@pytest.mark.asyncio
+async def test_hedge_survives_failed_primary():
+    hedger = make_hedger()
+    calls = 0
+
+    async def flaky():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(0.05)
+            raise httpx.ConnectError("reset")
+        await asyncio.sleep(0.1)
+        return "hedge"
+
+    assert await hedger.run(flaky) == "hedge"
+    assert hedger.hedges_won == 1
+
+
+@pytest.mark.asyncio
+async def test_pdb_client_hedges_slow_gets(respx_mock: MockRouter):
+    delays = [1.0, 0.0]
+    sent = []
+
+    async def upstream(request):
+        sent.append(request)
+        await asyncio.sleep(delays[len(sent) - 1])
+        return httpx.Response(200, json={"rcsb_id": "1ABC"})
+
+    respx_mock.get(ENTRY_URL).mock(side_effect=upstream)
+    client = make_client()
+    client.hedger = make_hedger()
+
+    result = await asyncio.wait_for(client._get_json("/rest/v1/core/entry/1ABC", "1ABC"), timeout=0.5)
+
+    assert result == {"rcsb_id": "1ABC"} and len(sent) == 2
+    assert client.hedger.stats()["hedges_won"] == 1
+    await client.close()
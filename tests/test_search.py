@@ -0,0 +1,127 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from mcp_pdb.adapter.pdb_client import PDBClient
+from mcp_pdb.exceptions import DataValidationError, PDBAPIError
+from mcp_pdb.processing.search import (
+    build_search_query,
+    iter_search_hits,
+    query_cache_key,
+    search_cache,
+    search_structures,
+)
+from mcp_pdb.schemas import AttributeFilter, SearchRequest
+
+
+def make_page(ids, total_count):
+    return {"total_count": total_count, "result_set": [{"identifier": i, "score": 1.0} for i in ids]}
+
+
+@pytest.fixture
+def mock_pdb_client() -> PDBClient:
+    return AsyncMock(spec=PDBClient)
+
+
+@pytest.fixture(autouse=True)
+def clear_search_cache():
+    search_cache.clear()
+    yield
+    search_cache.clear()
+
+
+def test_equivalent_queries_share_a_cache_key():
+    a = SearchRequest(
+        text="  insulin   receptor ",
+        sequence="mkt ayiak",
+        attributes=[AttributeFilter(attribute="exptl.method", value="X-RAY DIFFRACTION")],
+    )
+    b = SearchRequest(
+        text="insulin receptor",
+        sequence="MKTAYIAK",
+        attributes=[AttributeFilter(attribute="exptl.method", value="X-RAY DIFFRACTION")],
+    )
+    assert query_cache_key(build_search_query(a)) == query_cache_key(build_search_query(b))
+    assert query_cache_key(build_search_query(a)) != query_cache_key(build_search_query(SearchRequest(text="insulin")))
+
+
+def test_list_values_of_any_type_are_normalized():
+    def key(value):
+        return query_cache_key(build_search_query(SearchRequest(attributes=[AttributeFilter(attribute="a", operator="in", value=value)])))
+
+    assert key([3, 1, 2]) == key([1, 2, 3])
+    assert key(["B", 1, None]) == key([None, "B", 1])
+    assert key([{"x": 2}, {"x": 1}]) == key([{"x": 1}, {"x": 2}])
+
+
+def test_single_clause_is_not_wrapped_in_group():
+    query = build_search_query(SearchRequest(smiles="CCO"))
+    assert query["service"] == "chemical"
+    assert query["parameters"]["descriptor_type"] == "SMILES"
+
+
+def test_empty_request_is_rejected():
+    with pytest.raises(DataValidationError):
+        build_search_query(SearchRequest())
+
+
+@pytest.mark.asyncio
+async def test_iter_search_hits_fetches_pages_lazily(mock_pdb_client):
+    pages = {0: make_page(["1AAA", "1AAB"], 5), 2: make_page(["1AAC", "1AAD"], 5), 4: make_page(["1AAE"], 5)}
+    mock_pdb_client.search = AsyncMock(side_effect=lambda body: pages[body["request_options"]["paginate"]["start"]])
+    query = build_search_query(SearchRequest(text="kinase"))
+
+    hits = iter_search_hits(query, mock_pdb_client, page_size=2)
+    assert (await hits.__anext__()).pdb_id == "1AAA"
+    assert mock_pdb_client.search.await_count == 1  # Only the first page so far
+
+    rest = [hit.pdb_id async for hit in hits]
+    assert rest == ["1AAB", "1AAC", "1AAD", "1AAE"]
+    assert mock_pdb_client.search.await_count == 3
+
+
+@pytest.mark.asyncio
+@patch('mcp_pdb.utils.cache.CACHE_ENABLED', True)
+async def test_repeated_search_is_served_from_cache(mock_pdb_client):
+    mock_pdb_client.search = AsyncMock(return_value=make_page(["4HHB", "1A3N"], 2))
+    request = SearchRequest(text="hemoglobin", max_results=10)
+
+    first = await search_structures(request, mock_pdb_client)
+    second = await search_structures(SearchRequest(text=" hemoglobin ", max_results=10), mock_pdb_client)
+
+    assert [hit.pdb_id for hit in first.hits] == ["4HHB", "1A3N"]
+    assert first.total_count == 2
+    assert second.hits == first.hits
+    assert mock_pdb_client.search.await_count == 1
+
+
+@pytest.mark.asyncio
+@patch('mcp_pdb.utils.cache.CACHE_ENABLED', True)
+async def test_max_results_does_not_change_the_page_fetched(mock_pdb_client):
+    mock_pdb_client.search = AsyncMock(return_value=make_page(["4HHB", "1A3N", "2HHB"], 3))
+
+    few = await search_structures(SearchRequest(text="hemoglobin", max_results=1), mock_pdb_client, page_size=50)
+    more = await search_structures(SearchRequest(text="hemoglobin", max_results=3), mock_pdb_client, page_size=50)
+
+    assert [hit.pdb_id for hit in few.hits] == ["4HHB"] and few.total_count == 3
+    assert [hit.pdb_id for hit in more.hits] == ["4HHB", "1A3N", "2HHB"]
+    assert mock_pdb_client.search.await_count == 1
+    assert mock_pdb_client.search.await_args.args[0]["request_options"]["paginate"]["rows"] == 50
+
+
+@pytest.mark.asyncio
+async def test_search_structures_hydrates_through_batch_path(mock_pdb_client):
+    mock_pdb_client.search = AsyncMock(return_value=make_page(["4HHB", "1A3N"], 2))
+    with patch("mcp_pdb.processing.search.build_structure_contexts", AsyncMock(return_value=[])) as mock_batch:
+        results = await search_structures(SearchRequest(text="hemoglobin", hydrate=True), mock_pdb_client)
+
+    mock_batch.assert_awaited_once()
+    assert mock_batch.await_args.args[0] == ["4HHB", "1A3N"]
+    assert mock_batch.await_args.kwargs["skip_errors"] is True
+    assert results.structures == []
+
+
+@pytest.mark.asyncio
+async def test_search_rejected_query_raises_validation_error(mock_pdb_client):
+    mock_pdb_client.search = AsyncMock(side_effect=PDBAPIError(pdb_id="search", status_code=400, detail="bad attribute"))
+    with pytest.raises(DataValidationError):
+        await search_structures(SearchRequest(text="x"), mock_pdb_client)
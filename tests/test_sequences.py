@@ -0,0 +1,112 @@
+import hashlib
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from mcp_pdb.adapter.pdb_client import PDBClient
+from mcp_pdb.config import PDB_API_BASE_URL
+from mcp_pdb.exceptions import PDBAPIError
+from mcp_pdb.processing.sequences import build_sequence_context, format_fasta, iter_fasta, sequence_cache
+from mcp_pdb.schemas import EntitySequence, Provenance, SequenceDataset
+
+ALPHA = "VLSPADKTNVKAAWGKVGAHAGEYGAEALERMFLSFPTTKTYFPHF"
+BETA = "VHLTPEEKSAVTALWGKVNVDEVGGEALGRLLVVYPWTQRFFESFGDLST"
+
+
+def make_dataset(pdb_id: str, *entities) -> SequenceDataset:
+    return SequenceDataset(
+        pdb_id=pdb_id,
+        entities=[
+            EntitySequence(
+                entity_id=str(i),
+                chain_ids=chains,
+                sequence=seq,
+                description=desc,
+                digest=hashlib.sha256(seq.encode()).hexdigest()[:16],
+            )
+            for i, (chains, seq, desc) in enumerate(entities, start=1)
+        ],
+        provenance=Provenance(source="RCSB PDB", retrieved=datetime.now(timezone.utc), api_url=f"{PDB_API_BASE_URL}/rest/v1/core/entry/{pdb_id}"),
+    )
+
+
+@pytest.fixture
+def mock_pdb_client() -> PDBClient:
+    return AsyncMock(spec=PDBClient)
+
+
+@pytest.fixture(autouse=True)
+def clear_sequence_cache():
+    sequence_cache.clear()
+    yield
+    sequence_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_get_sequences_groups_chains_by_entity(respx_mock: MockRouter):
+    client = PDBClient()
+    respx_mock.get(f"{PDB_API_BASE_URL}/rest/v1/core/entry/4HHB").mock(
+        return_value=httpx.Response(200, json={"rcsb_entry_container_identifiers": {"polymer_entity_ids": ["1", "2"]}})
+    )
+    for entity_id, chains, seq in (("1", "A,C", ALPHA), ("2", "B,D", BETA)):
+        respx_mock.get(f"{PDB_API_BASE_URL}/rest/v1/core/polymer_entity/4HHB/{entity_id}").mock(
+            return_value=httpx.Response(200, json={
+                "entity_poly": {"pdbx_strand_id": chains, "pdbx_seq_one_letter_code_can": seq[:20] + "\n" + seq[20:], "rcsb_entity_polymer_type": "Protein"},
+                "rcsb_polymer_entity_container_identifiers": {"entity_id": entity_id},
+                "rcsb_entity_source_organism": [{"ncbi_scientific_name": "Homo sapiens"}],
+            })
+        )
+
+    dataset = await client.get_sequences("4HHB")
+
+    assert [(e.entity_id, e.chain_ids) for e in dataset.entities] == [("1", ["A", "C"]), ("2", ["B", "D"])]
+    assert dataset.entities[0].sequence == ALPHA  # Line breaks in the upstream code are removed
+    assert dataset.entities[0].digest == hashlib.sha256(ALPHA.encode()).hexdigest()[:16]
+    assert dataset.entities[1].organism == "Homo sapiens"
+    await client.close()
+
+
+@pytest.mark.asyncio
+@patch('mcp_pdb.utils.cache.CACHE_ENABLED', True)
+async def test_identical_sequences_are_stored_once(mock_pdb_client):
+    # Build the strings at runtime so they start out as distinct objects.
+    mock_pdb_client.get_sequences.side_effect = [
+        make_dataset("1AAA", (["A"], "".join(list(ALPHA)), None)),
+        make_dataset("2BBB", (["A", "B"], "".join(list(ALPHA)), None)),
+    ]
+
+    first = await build_sequence_context("1aaa", mock_pdb_client)
+    second = await build_sequence_context("2BBB", mock_pdb_client)
+
+    assert first.entities[0].sequence is second.entities[0].sequence
+    assert await build_sequence_context("1AAA", mock_pdb_client) is first
+    assert mock_pdb_client.get_sequences.await_count == 2
+
+
+def test_format_fasta_one_record_per_entity():
+    fasta = format_fasta(make_dataset("4HHB", (["A", "C"], ALPHA, "Hemoglobin alpha"), (["B"], BETA, None)), line_width=20)
+
+    lines = fasta.splitlines()
+    assert lines[0] == ">4HHB_1|Chains A, C|Hemoglobin alpha"
+    assert lines[1] == ALPHA[:20]
+    assert "".join(lines[1:4]) == ALPHA
+    assert lines[4] == ">4HHB_2|Chain B"
+
+
+@pytest.mark.asyncio
+async def test_iter_fasta_keeps_order_and_skips_failures(mock_pdb_client):
+    datasets = {"1AAA": make_dataset("1AAA", (["A"], ALPHA, None)), "3CCC": make_dataset("3CCC", (["A"], BETA, None))}
+
+    async def get_sequences(pdb_id):
+        if pdb_id not in datasets:
+            raise PDBAPIError(pdb_id=pdb_id, status_code=404, detail="not found")
+        return datasets[pdb_id]
+
+    mock_pdb_client.get_sequences.side_effect = get_sequences
+
+    chunks = [chunk async for chunk in iter_fasta(["1aaa", "0XXX", "3CCC", "1AAA"], mock_pdb_client, concurrency=2)]
+
+    assert [chunk.split("|")[0] for chunk in chunks] == [">1AAA_1", ">3CCC_1"]
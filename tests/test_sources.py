@@ -0,0 +1,248 @@
+import asyncio
+import json
+from collections import Counter
+
+import pytest
+
+from mcp_pdb.adapter.pdb_client import PDBClient
+from mcp_pdb.adapter.resilience import CircuitBreaker, RetryPolicy
+from mcp_pdb.adapter.sources import parse_sources
+from mcp_pdb.exceptions import ConfigurationError, NetworkError, PDBAPIError
+
+ATP_NAME = "ADENOSINE-5'-TRIPHOSPHATE"
+
+# The same entry as each source publishes it.
+RCSB_ENTRY = {
+    "struct": {"title": "Test kinase"},
+    "exptl": [{"method": "X-RAY DIFFRACTION"}],
+    "refine": [{"ls_d_res_high": 1.8}],
+    "rcsb_accession_info": {"initial_release_date": "2020-01-15T00:00:00+0000", "revision_date": "2023-03-01T00:00:00+0000"},
+    "polymer_entities": [{
+        "entity_poly": {"pdbx_strand_id": "A,B", "rcsb_sample_sequence_length": 120},
+        "rcsb_entity_source_organism": [{"ncbi_scientific_name": "Homo sapiens"}],
+    }],
+    "nonpolymer_entities": [{
+        "nonpolymer_comp": {"chem_comp": {"id": "ATP", "name": ATP_NAME}},
+        "rcsb_nonpolymer_entity_container_identifiers": {"instance_count": 2},
+    }],
+}
+PDBE_DOCUMENTS = {
+    "/pdb/entry/summary/1abc": {"1abc": [{
+        "title": "Test kinase", "experimental_method": ["X-ray diffraction"],
+        "release_date": "20200115", "revision_date": "20230301",
+    }]},
+    "/pdb/entry/experiment/1abc": {"1abc": [{"resolution": 1.8, "experimental_method": "X-ray diffraction"}]},
+    "/pdb/entry/molecules/1abc": {"1abc": [
+        {"entity_id": 1, "molecule_type": "polypeptide(L)", "in_chains": ["A", "B"], "length": 120,
+         "source": [{"organism_scientific_name": "Homo sapiens"}]},
+        {"entity_id": 2, "molecule_type": "bound", "chem_comp_ids": ["ATP"], "molecule_name": [ATP_NAME],
+         "in_chains": ["A", "B"], "in_struct_asyms": ["C", "D"]},
+        {"entity_id": 3, "molecule_type": "water", "in_chains": ["A", "B"]},
+    ]},
+}
+PDBJ_DOCUMENT = {"data_1ABC": {
+    "struct": {"title": ["Test kinase"]},
+    "exptl": {"method": ["X-RAY DIFFRACTION"]},
+    "refine": {"ls_d_res_high": [1.8]},
+    "pdbx_audit_revision_history": {"revision_date": ["2020-01-15", "2021-06-02", "2023-03-01"]},
+    "entity_poly": {"entity_id": ["1"], "pdbx_strand_id": ["A,B"], "pdbx_seq_one_letter_code_can": ["M" * 60 + "\n" + "K" * 60]},
+    "entity_src_gen": {"entity_id": ["1"], "pdbx_gene_src_scientific_name": ["Homo sapiens"]},
+    "pdbx_entity_nonpoly": {"entity_id": ["2", "3"], "comp_id": ["ATP", "HOH"], "name": [ATP_NAME, "water"]},
+    "pdbx_nonpoly_scheme": {"entity_id": ["2", "2", "3"], "asym_id": ["C", "D", "E"]},
+}}
+RCSB_PATH = "/rest/v1/core/entry/1ABC"
+PDBJ_PATH = "/pdbjplus/data/pdb/mmjson-noatom/1abc-noatom.json"
+
+
+class StandIn:
+    """Local keep-alive HTTP/1.1 server answering GETs from `routes` (path -> JSON body); other paths get 404."""
+
+    def __init__(self, routes, delay: float = 0.0, status: int = 200):
+        self.routes = routes
+        self.delay = delay
+        self.status = status
+        self.hits = Counter()
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                path = head.split(b" ", 2)[1].decode()
+                self.hits[path] += 1
+                await asyncio.sleep(self.delay)
+                status = self.status if path in self.routes else 404
+                body = json.dumps(self.routes.get(path, {})).encode() if status == 200 else b""
+                writer.write(
+                    f"HTTP/1.1 {status} X\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def make_client(base_url: str, sources: str) -> PDBClient:
+    return PDBClient(base_url=base_url, sources=sources, retry_policy=RetryPolicy(max_retries=0))
+
+
+def comparable(structure) -> dict:
+    return structure.dict(exclude={"provenance"})
+
+
+def test_parse_sources():
+    parsed = parse_sources("rcsb, PDBe ,internal=https://pdb.mirror.local/")
+    assert [(adapter.name, url) for adapter, url in parsed] == [
+        ("rcsb", None), ("pdbe", None), ("internal", "https://pdb.mirror.local")
+    ]
+    with pytest.raises(ConfigurationError):
+        parse_sources("rcsb,ebi")
+    with pytest.raises(ConfigurationError):
+        PDBClient(sources="internal")  # No INTERNAL_MIRROR_BASE_URL configured
+
+
+@pytest.mark.asyncio
+async def test_every_adapter_normalises_to_the_same_dataset():
+    servers = {
+        "rcsb": StandIn({RCSB_PATH: RCSB_ENTRY}),
+        "internal": StandIn({RCSB_PATH: RCSB_ENTRY}),
+        "pdbe": StandIn(PDBE_DOCUMENTS),
+        "pdbj": StandIn({PDBJ_PATH: PDBJ_DOCUMENT}),
+    }
+    results = {}
+    for name, server in servers.items():
+        url = await server.start()
+        client = make_client("https://data.example.org", f"{name}={url}")
+        try:
+            results[name] = await client.get_structure_summary("1ABC")
+        finally:
+            await client.close()
+            await server.stop()
+
+    reference = comparable(results["rcsb"])
+    assert reference["method"] == "X-RAY DIFFRACTION" and reference["resolution"] == 1.8
+    assert [c["chain_id"] for c in reference["chains"]] == ["A", "B"]
+    assert reference["ligands"] == [{"chem_id": "ATP", "name": ATP_NAME, "count": 2, "component": None}]
+    for name in ("internal", "pdbe", "pdbj"):
+        assert comparable(results[name]) == reference, name
+    assert {name: r.provenance.source for name, r in results.items()} == {
+        "rcsb": "RCSB PDB", "internal": "Internal mirror", "pdbe": "PDBe", "pdbj": "PDBj"
+    }
+    assert str(results["pdbe"].provenance.api_url).endswith("/pdb/entry/summary/1abc")
+
+
+@pytest.mark.asyncio
+async def test_requests_follow_the_faster_source():
+    slow, fast = StandIn({RCSB_PATH: RCSB_ENTRY}, delay=0.15), StandIn({PDBJ_PATH: PDBJ_DOCUMENT})
+    slow_url, fast_url = await slow.start(), await fast.start()
+    client = make_client(slow_url, f"rcsb,pdbj={fast_url}")
+    try:
+        for _ in range(5):
+            await client.get_structure_summary("1ABC")
+    finally:
+        await client.close()
+        await slow.stop()
+        await fast.stop()
+
+    # Each source is measured once, then the faster one takes the traffic.
+    assert slow.hits[RCSB_PATH] == 1 and fast.hits[PDBJ_PATH] == 4
+    stats = {s["name"]: s for s in client.router.stats()}
+    assert stats["rcsb"]["latency_ms"] > stats["pdbj"]["latency_ms"]
+    assert stats["pdbj"]["requests"] == 4 and stats["rcsb"]["health"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_fails_over_on_5xx_and_refused_connections():
+    broken, dead, good = StandIn({RCSB_PATH: RCSB_ENTRY}, status=503), StandIn({}), StandIn(PDBE_DOCUMENTS)
+    broken_url, dead_url, good_url = await broken.start(), await dead.start(), await good.start()
+    await dead.stop()  # Port now refuses connections
+    client = make_client(broken_url, f"rcsb,pdbj={dead_url},pdbe={good_url}")
+    try:
+        structure = await client.get_structure_summary("1ABC")
+    finally:
+        await client.close()
+        await broken.stop()
+        await good.stop()
+
+    assert structure.provenance.source == "PDBe"
+    assert broken.hits[RCSB_PATH] == 1  # Not retried: another source was available
+    stats = {s["name"]: s for s in client.router.stats()}
+    assert stats["rcsb"]["failures"] == 1 and stats["pdbj"]["failures"] == 1
+    assert stats["rcsb"]["health"] < 1.0 and stats["pdbe"]["failures"] == 0
+
+
+@pytest.mark.asyncio
+async def test_not_found_is_authoritative_and_total_failure_raises_first_error():
+    missing, spare = StandIn({}), StandIn({PDBJ_PATH: PDBJ_DOCUMENT})
+    missing_url, spare_url = await missing.start(), await spare.start()
+    client = make_client(missing_url, f"rcsb,pdbj={spare_url}")
+    try:
+        with pytest.raises(PDBAPIError) as excinfo:
+            await client.get_structure_summary("1ABC")
+        assert excinfo.value.status_code == 404 and spare.hits[PDBJ_PATH] == 0
+    finally:
+        await client.close()
+        await missing.stop()
+        await spare.stop()
+
+    refused = StandIn({})
+    refused_url = await refused.start()
+    await refused.stop()
+    client = make_client(refused_url, f"rcsb,pdbj={refused_url}/other")
+    try:
+        with pytest.raises(NetworkError) as excinfo:
+            await client.get_structure_summary("1ABC")
+        assert RCSB_PATH in excinfo.value.message
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_lagging_mirror_fails_over_on_not_found():
+    mirror, archive = StandIn({}), StandIn({RCSB_PATH: RCSB_ENTRY})
+    mirror_url, archive_url = await mirror.start(), await archive.start()
+    client = make_client(archive_url, f"internal={mirror_url},rcsb")
+    try:
+        structure = await client.get_structure_summary("1ABC")  # Mirror ranks first (probe), lacks the new entry
+    finally:
+        await client.close()
+        await mirror.stop()
+        await archive.stop()
+
+    assert structure.provenance.source == "RCSB PDB"
+    assert mirror.hits[RCSB_PATH] == 1 and archive.hits[RCSB_PATH] == 1
+    assert {s["name"]: s for s in client.router.stats()}["internal"]["failures"] == 0
+
+
+def test_ranking_probes_idle_sources_and_demotes_open_circuits():
+    client = PDBClient(base_url="https://a.example.org", sources="rcsb,pdbe=https://b.example.org,pdbj=https://c.example.org")
+    router = client.router
+    now = [1000.0]
+    router._clock = lambda: now[0]
+    rcsb, pdbe, pdbj = router.sources
+    for source, latency in ((rcsb, 0.3), (pdbe, 0.1), (pdbj, 0.2)):
+        source.health.record(True, latency, router.alpha)
+        source.health.last_used = now[0]
+
+    assert router.ranked() == [pdbe, pdbj, rcsb]
+    for _ in range(4):
+        pdbe.health.record(False, None, router.alpha)
+    assert router.ranked() == [pdbj, pdbe, rcsb]  # 0.1 s at 41% health costs more than 0.2 s
+
+    now[0] += router.probe_interval
+    rcsb.health.last_used = now[0] - router.probe_interval
+    pdbe.health.last_used = pdbj.health.last_used = now[0]
+    assert router.ranked()[0] is rcsb  # Idle too long: probed once
+
+    rcsb.health.last_used = now[0]
+    pdbj.client.circuit_breaker = CircuitBreaker(failure_threshold=1)
+    pdbj.client.circuit_breaker.record_failure()
+    assert router.ranked() == [pdbe, rcsb, pdbj]
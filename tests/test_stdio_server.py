@@ -0,0 +1,177 @@
+import io
+import json
+import subprocess
+import sys
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from mcp_pdb.exceptions import PDBAPIError
+from mcp_pdb.schemas import Provenance, SequenceDataset, StructureDataset
+from mcp_pdb.stdio_server import INVALID_PARAMS, INVALID_REQUEST, METHOD_NOT_FOUND, PARSE_ERROR, StdioServer
+
+
+@pytest.fixture
+def server():
+    srv = StdioServer(stdin=io.StringIO(), stdout=io.StringIO())
+    yield srv
+    srv.close()
+
+
+@pytest.fixture
+def sample_dataset() -> StructureDataset:
+    return StructureDataset(
+        pdb_id="1ABC",
+        title="Test structure",
+        method="X-RAY DIFFRACTION",
+        resolution=2.0,
+        chains=[],
+        ligands=[],
+        provenance=Provenance(
+            source="RCSB PDB",
+            retrieved=datetime(2024, 5, 19, tzinfo=timezone.utc),
+            api_url="https://data.rcsb.org/rest/v1/core/entry/1ABC",
+        ),
+    )
+
+
+def test_initialize(server: StdioServer):
+    response = server.handle_message({"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}})
+    assert response["id"] == 1
+    assert response["result"]["serverInfo"]["name"] == "pdb-mcp"
+    assert "tools" in response["result"]["capabilities"]
+
+
+def test_tools_list(server: StdioServer):
+    response = server.handle_message({"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+    names = [tool["name"] for tool in response["result"]["tools"]]
+    assert "get_structure" in names
+    assert all("handler" not in tool for tool in response["result"]["tools"])
+
+
+def test_notification_gets_no_response(server: StdioServer):
+    assert server.handle_message({"jsonrpc": "2.0", "method": "notifications/initialized"}) is None
+
+
+def test_unknown_method(server: StdioServer):
+    response = server.handle_message({"jsonrpc": "2.0", "id": 3, "method": "resources/list"})
+    assert response["error"]["code"] == METHOD_NOT_FOUND
+
+
+def test_get_structure_tool_uses_builder(server: StdioServer, sample_dataset: StructureDataset):
+    with patch(
+        "mcp_pdb.processing.dataset_builder.build_structure_context", AsyncMock(return_value=sample_dataset)
+    ) as mock_build:
+        response = server.handle_message(
+            {"jsonrpc": "2.0", "id": 4, "method": "tools/call", "params": {"name": "get_structure", "arguments": {"pdb_id": "1ABC"}}}
+        )
+
+    mock_build.assert_awaited_once()
+    assert mock_build.await_args.args[0] == "1ABC"
+    result = response["result"]
+    assert result["isError"] is False
+    assert json.loads(result["content"][0]["text"])["pdb_id"] == "1ABC"
+
+
+def test_get_structure_tool_rejects_non_boolean_flags(server: StdioServer, sample_dataset: StructureDataset):
+    with patch("mcp_pdb.processing.dataset_builder.build_structure_context", AsyncMock()) as mock_build:
+        response = server.handle_message({
+            "jsonrpc": "2.0", "id": 5, "method": "tools/call",
+            "params": {"name": "get_structure", "arguments": {"pdb_id": "1ABC", "include_ligand_details": "false"}},
+        })
+
+    assert response["error"]["code"] == INVALID_PARAMS
+    mock_build.assert_not_awaited()
+
+    with patch("mcp_pdb.processing.dataset_builder.build_structure_context", AsyncMock(return_value=sample_dataset)):
+        response = server.handle_message({
+            "jsonrpc": "2.0", "id": 6, "method": "tools/call",
+            "params": {"name": "get_structure", "arguments": {"pdb_id": "1ABC", "include_geometry": "no"}},
+        })
+    assert response["error"]["code"] == INVALID_PARAMS
+
+
+def test_get_sequences_tool_validates_format_and_skips_failed_entries(server: StdioServer, sample_dataset: StructureDataset):
+    def call(arguments):
+        return server.handle_message({"jsonrpc": "2.0", "id": 9, "method": "tools/call", "params": {"name": "get_sequences", "arguments": arguments}})
+
+    assert call({"pdb_ids": ["1ABC"], "format": "xml"})["error"]["code"] == INVALID_PARAMS
+
+    async def fetch(pdb_id, pdb_client):
+        if pdb_id == "404X":
+            raise PDBAPIError(pdb_id=pdb_id, status_code=404, detail="not found")
+        return SequenceDataset(pdb_id=pdb_id, entities=[], provenance=sample_dataset.provenance)
+
+    with patch("mcp_pdb.processing.sequences.build_sequence_context", AsyncMock(side_effect=fetch)):
+        response = call({"pdb_ids": ["1ABC", "404X", "2DEF"]})
+    assert [dataset["pdb_id"] for dataset in json.loads(response["result"]["content"][0]["text"])] == ["1ABC", "2DEF"]
+
+
+def test_get_structure_tool_reports_api_errors_in_result(server: StdioServer):
+    error = PDBAPIError(pdb_id="404X", status_code=404, detail="not found")
+    with patch("mcp_pdb.processing.dataset_builder.build_structure_context", AsyncMock(side_effect=error)):
+        response = server.handle_message(
+            {"jsonrpc": "2.0", "id": 5, "method": "tools/call", "params": {"name": "get_structure", "arguments": {"pdb_id": "404X"}}}
+        )
+    assert response["result"]["isError"] is True
+    assert "404X" in response["result"]["content"][0]["text"]
+
+
+def test_tool_call_invalid_params(server: StdioServer):
+    response = server.handle_message(
+        {"jsonrpc": "2.0", "id": 6, "method": "tools/call", "params": {"name": "get_structure", "arguments": {}}}
+    )
+    assert response["error"]["code"] == INVALID_PARAMS
+    response = server.handle_message(
+        {"jsonrpc": "2.0", "id": 7, "method": "tools/call", "params": {"name": "no_such_tool"}}
+    )
+    assert response["error"]["code"] == INVALID_PARAMS
+
+
+@pytest.mark.parametrize("params", [["get_structure"], "get_structure", {"name": ["get_structure"]}, {"name": {"a": 1}}])
+def test_malformed_tool_call_params_are_rejected(server: StdioServer, params):
+    response = server.handle_message({"jsonrpc": "2.0", "id": 8, "method": "tools/call", "params": params})
+    assert response["error"]["code"] == INVALID_PARAMS
+
+
+def test_malformed_messages_do_not_stop_the_server():
+    stdin = io.StringIO(
+        '{"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": [1]}\n'
+        '{"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {"name": []}}\n'
+        '{"jsonrpc": "2.0", "id": 3, "method": ["ping"]}\n'
+        '{"jsonrpc": "2.0", "id": 4, "method": "ping"}\n'
+    )
+    stdout = io.StringIO()
+    StdioServer(stdin=stdin, stdout=stdout).serve_forever()
+    lines = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert [line["error"]["code"] for line in lines[:3]] == [INVALID_PARAMS, INVALID_PARAMS, INVALID_REQUEST]
+    assert lines[3] == {"jsonrpc": "2.0", "id": 4, "result": {}}
+
+
+def test_serve_forever_writes_one_line_per_request():
+    stdin = io.StringIO(
+        '{"jsonrpc": "2.0", "id": 1, "method": "ping"}\n'
+        "not json\n"
+        '{"jsonrpc": "2.0", "method": "notifications/initialized"}\n'
+    )
+    stdout = io.StringIO()
+    StdioServer(stdin=stdin, stdout=stdout).serve_forever()
+    lines = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert lines[0] == {"jsonrpc": "2.0", "id": 1, "result": {}}
+    assert lines[1]["error"]["code"] == PARSE_ERROR
+    assert len(lines) == 2
+
+
+def test_startup_does_not_import_http_stack():
+    # Runs in a fresh interpreter: this test process has already imported everything.
+    probe = (
+        "import sys, json\n"
+        "from mcp_pdb.stdio_server import StdioServer\n"
+        "srv = StdioServer()\n"
+        "srv.handle_message({'jsonrpc': '2.0', 'id': 1, 'method': 'initialize'})\n"
+        "srv.handle_message({'jsonrpc': '2.0', 'id': 2, 'method': 'tools/list'})\n"
+        "print(json.dumps([m for m in ('fastapi', 'uvicorn', 'pydantic', 'httpx', 'asyncio') if m in sys.modules]))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True, text=True).stdout
+    assert json.loads(out) == []
@@ -0,0 +1,160 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from mcp_pdb.adapter.pdb_client import PDBClient
+from mcp_pdb.adapter.status_client import StatusListClient, parse_id_list
+from mcp_pdb.exceptions import PDBAPIError
+from mcp_pdb.processing import binding_site, dataset_builder, geometry, metadata, search, sequences, similarity, sync
+from mcp_pdb.schemas import EntitySequence, Provenance, SequenceDataset, StructureDataset
+from mcp_pdb.utils.kmer_index import KmerIndex
+from mcp_pdb.utils.metadata_index import MetadataIndex
+
+STATUS_URL = "https://files.example.org/status/latest"
+
+
+def make_sequences(pdb_id: str) -> SequenceDataset:
+    entity = EntitySequence(entity_id="1", chain_ids=["A"], sequence="GSHMKKLLPT", digest="0")
+    return SequenceDataset(pdb_id=pdb_id, entities=[entity], provenance=make_structure(pdb_id).provenance)
+
+
+def make_structure(pdb_id: str, title: str = "t") -> StructureDataset:
+    provenance = Provenance(source="RCSB PDB", retrieved=datetime.now(timezone.utc), api_url=f"https://data.rcsb.org/rest/v1/core/entry/{pdb_id}")
+    return StructureDataset(pdb_id=pdb_id, title=title, method="X-RAY DIFFRACTION", chains=[], ligands=[], provenance=provenance)
+
+
+@pytest.fixture
+def local_state():
+    """Fresh caches and in-memory indexes holding 1AAA (modified), 2BBB (obsolete) and 3CCC (unchanged)."""
+    index = MetadataIndex(":memory:")
+    kmers = KmerIndex(3)
+    with patch("mcp_pdb.utils.cache.CACHE_ENABLED", True), \
+            patch.object(metadata, "_metadata_index", index), \
+            patch.object(similarity, "_sequence_index", kmers), \
+            patch.object(sync, "invalidate_coordinates", return_value=False) as invalidate_coordinates:
+        for cache in (dataset_builder.cache, sequences.sequence_cache, geometry.geometry_cache, binding_site.binding_site_cache, search.search_cache):
+            cache.clear()
+        for pdb_id in ("1AAA", "2BBB", "3CCC"):
+            dataset_builder.cache.set(pdb_id, make_structure(pdb_id, title="old"))
+            geometry.geometry_cache.set((pdb_id, None), {})
+            binding_site.binding_site_cache.set((pdb_id, "HEM", 4.0), object())
+            index.upsert(pdb_id, "X-RAY DIFFRACTION", 2.0, "2020-01-01", 1)
+            kmers.add(pdb_id, "1", "MVLSPADKTNVKAAW")
+        search.search_cache.set("page", {"total_count": 0})
+        yield index, kmers, invalidate_coordinates
+
+
+def test_parse_id_list_skips_noise_and_duplicates():
+    assert parse_id_list("1abc\n\n  \n# comment\n2XYZ extra\n1ABC\nTOOLONG\n") == ["1ABC", "2XYZ"]
+
+
+@pytest.mark.asyncio
+async def test_status_lists_from_directory(tmp_path):
+    (tmp_path / "added.pdb").write_text("9ZZZ\n")
+    (tmp_path / "obsolete.pdb").write_text("2bbb\n")
+
+    lists = await StatusListClient(str(tmp_path)).get_update_lists()
+
+    assert (lists.added, lists.modified, lists.obsolete) == (["9ZZZ"], [], ["2BBB"])
+
+
+@pytest.mark.asyncio
+async def test_status_lists_from_url(respx_mock: MockRouter):
+    respx_mock.get(f"{STATUS_URL}/added.pdb").mock(return_value=httpx.Response(200, text="9ZZZ\n"))
+    respx_mock.get(f"{STATUS_URL}/modified.pdb").mock(return_value=httpx.Response(200, text="1AAA\n"))
+    respx_mock.get(f"{STATUS_URL}/obsolete.pdb").mock(return_value=httpx.Response(404))
+
+    client = StatusListClient(STATUS_URL + "/")
+    with pytest.raises(PDBAPIError) as excinfo:
+        await client.get_update_lists()
+    await client.close()
+
+    assert excinfo.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_sync_invalidates_all_tiers_and_refreshes_modified(tmp_path, local_state):
+    index, kmers, invalidate_coordinates = local_state
+    (tmp_path / "added.pdb").write_text("9ZZZ\n")
+    (tmp_path / "modified.pdb").write_text("1aaa\n")
+    (tmp_path / "obsolete.pdb").write_text("2BBB\n")
+    pdb_client = AsyncMock(spec=PDBClient)
+    pdb_client.get_structure_summary = AsyncMock(side_effect=lambda pdb_id: make_structure(pdb_id, title="new"))
+    pdb_client.get_sequences = AsyncMock(side_effect=make_sequences)
+
+    report = await sync.sync_updates(str(tmp_path), pdb_client, refresh_modified=True)
+
+    assert (report.added, report.modified, report.obsolete) == (1, 1, 1)
+    assert report.cache_entries_removed == 6
+    assert report.index_entries_removed == 4
+    assert report.refreshed == ["1AAA"] and report.search_cache_cleared
+    pdb_client.get_structure_summary.assert_awaited_once_with("1AAA")
+    assert dataset_builder.cache.get("1AAA").title == "new"
+    assert "1AAA" in index and "2BBB" not in index and "3CCC" in index
+    assert dataset_builder.cache.get("2BBB") is None and geometry.geometry_cache.get(("2BBB", None)) is None
+    assert dataset_builder.cache.get("3CCC").title == "old"  # Unchanged entries keep their cache
+    assert binding_site.binding_site_cache.get(("3CCC", "HEM", 4.0)) is not None
+    assert [hit[0] for hit in kmers.query("MVLSPADKTNVKAAW", top_k=10)] == ["3CCC"]
+    assert [hit[0] for hit in kmers.query("GSHMKKLLPT", top_k=10)] == ["1AAA"]  # Sequences refetched
+    assert search.search_cache.get("page") is None
+    assert {call.args[0] for call in invalidate_coordinates.call_args_list} == {"1AAA", "2BBB", "9ZZZ"}
+
+
+@pytest.mark.asyncio
+async def test_sync_without_refresh_only_invalidates(tmp_path, local_state):
+    (tmp_path / "modified.pdb").write_text("1AAA\n")
+    pdb_client = AsyncMock(spec=PDBClient)
+
+    report = await sync.sync_updates(str(tmp_path), pdb_client, refresh_modified=False)
+
+    assert report.refreshed == [] and not report.search_cache_cleared
+    pdb_client.get_structure_summary.assert_not_awaited()
+    assert dataset_builder.cache.get("1AAA") is None
+    assert search.search_cache.get("page") is not None
+
+
+@pytest.mark.asyncio
+async def test_sync_refreshes_entries_known_only_from_raw_documents_or_coordinates(tmp_path, local_state):
+    _, _, invalidate_coordinates = local_state
+    invalidate_coordinates.side_effect = lambda pdb_id: pdb_id == "5EEE"  # Only 5EEE has stored coordinates
+    raw_store = MagicMock()
+    raw_store.delete = lambda pdb_id: pdb_id == "4DDD"  # Only 4DDD has stored raw documents
+    (tmp_path / "modified.pdb").write_text("4DDD\n5EEE\n6FFF\n")
+    pdb_client = AsyncMock(spec=PDBClient)
+    pdb_client.get_structure_summary = AsyncMock(side_effect=lambda pdb_id: make_structure(pdb_id, title="new"))
+
+    with patch.object(sync, "get_raw_store", return_value=raw_store):
+        report = await sync.sync_updates(str(tmp_path), pdb_client, refresh_modified=True)
+
+    assert sorted(report.refreshed) == ["4DDD", "5EEE"]  # 6FFF was never fetched here
+
+
+def test_invalidate_entries_makes_one_pass_per_cache(local_state):
+    with patch("mcp_pdb.utils.cache.LRUCache.delete_matching", autospec=True, side_effect=lambda cache, predicate: 0) as delete_matching:
+        results = sync.invalidate_entries(["1aaa", "2BBB", "3CCC", "1AAA"])
+
+    assert list(results) == ["1AAA", "2BBB", "3CCC"]
+    assert delete_matching.call_count == len(sync.PER_ENTRY_CACHES)
+    assert all(result.was_indexed and result.had_sequences for result in results.values())
+
+
+@pytest.mark.asyncio
+async def test_sync_forgets_last_good_bodies_of_updated_entries(tmp_path, local_state):
+    (tmp_path / "modified.pdb").write_text("1AAA\n")
+    (tmp_path / "obsolete.pdb").write_text("2BBB\n")
+    pdb_client = PDBClient(base_url="https://data.example.org", sources="rcsb,pdbe=https://pdbe.example.org,pdbj=https://pdbj.example.org")
+    pdbe, pdbj = (source.client for source in pdb_client.router.sources[1:])
+    for url in ("https://data.example.org/rest/v1/core/entry/1AAA", "https://data.example.org/rest/v1/core/polymer_entity/1AAA/1",
+                "https://data.example.org/rest/v1/core/entry/3CCC", "https://data.example.org/rest/v1/core/chemcomp/ATP"):
+        pdb_client._remember(url, {"old": True})
+    pdbe._remember("https://pdbe.example.org/pdb/entry/summary/1aaa", {"old": True})
+    pdbj._remember("https://pdbj.example.org/pdbjplus/data/pdb/mmjson-noatom/2bbb-noatom.json", {"old": True})
+
+    await sync.sync_updates(str(tmp_path), pdb_client, refresh_modified=False)
+
+    assert list(pdb_client._stale) == ["https://data.example.org/rest/v1/core/entry/3CCC", "https://data.example.org/rest/v1/core/chemcomp/ATP"]
+    assert not pdbe._stale and not pdbj._stale
+    await pdb_client.close()
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from mcp_pdb.adapter.pdb_client import PDBClient
+from mcp_pdb.adapter.transport import MeteredTransport, PoolMetrics, TransportSettings, build_async_client
+
+
+async def start_local_server(delay: float = 0.05):
+    """Minimal keep-alive HTTP/1.1 server on 127.0.0.1 answering every request with `{}` after `delay`."""
+    connections = []
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connections.append(writer)
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                await asyncio.sleep(delay)
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 2\r\n\r\n{}")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}", connections
+
+
+def test_settings_are_applied():
+    settings = TransportSettings(http2=True, max_connections=7, max_keepalive_connections=3, read_timeout=4.0, pool_timeout=2.0)
+    client = build_async_client("https://data.example.org", settings)
+
+    assert isinstance(client._transport, MeteredTransport)
+    assert client.timeout.read == 4.0 and client.timeout.pool == 2.0
+    pool = client._transport._pool
+    assert pool._max_connections == 7 and pool._max_keepalive_connections == 3
+    assert pool._http2 is True
+    assert TransportSettings().with_read_timeout(60).read_timeout == 60
+
+
+@pytest.mark.asyncio
+async def test_pool_wait_is_measured_under_starvation():
+    server, base_url, connections = await start_local_server(delay=0.05)
+    metrics = PoolMetrics()
+    client = build_async_client(base_url, TransportSettings(http2=False, max_connections=1, max_keepalive_connections=1), metrics)
+    try:
+        responses = await asyncio.gather(*(client.get("/") for _ in range(4)))
+    finally:
+        await client.aclose()
+        server.close()
+        await server.wait_closed()
+
+    assert all(r.status_code == 200 for r in responses)
+    snapshot = metrics.snapshot()
+    assert snapshot["requests"] == 4
+    assert snapshot["new_connections"] == 1 and len(connections) == 1  # One kept-alive connection served all four
+    # With one connection and a 50 ms server, the last request queued behind three others.
+    assert snapshot["pool_wait_ms_max"] >= 100
+    assert snapshot["pool_wait_ms_p50"] is not None
+
+
+@pytest.mark.asyncio
+async def test_pdb_client_uses_metered_pool():
+    server, base_url, _ = await start_local_server(delay=0)
+    client = PDBClient(base_url=base_url, transport_settings=TransportSettings(http2=False))
+    try:
+        assert await client._get_json("/rest/v1/core/entry/1ABC", "1ABC") == {}
+    finally:
+        await client.close()
+        server.close()
+        await server.wait_closed()
+
+    assert client.pool_metrics.snapshot()["requests"] == 1
@@ -0,0 +1,40 @@
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+
+from mcp_pdb.config import CACHE_TTL_SECONDS
+from mcp_pdb.processing import dataset_builder
+from mcp_pdb.schemas import Provenance, StructureDataset
+from mcp_pdb.utils.ttl_policy import DAY_SECONDS, adaptive_ttl
+
+TODAY = date(2024, 6, 1)
+BOUNDS = dict(today=TODAY, fraction=0.1, min_seconds=3600, max_seconds=30 * DAY_SECONDS)
+
+
+def test_ttl_grows_with_time_since_last_change():
+    assert adaptive_ttl(date(2024, 6, 1), **BOUNDS) == 3600  # Released today: clamped to the minimum
+    assert adaptive_ttl(date(2024, 5, 31), **BOUNDS) == 0.1 * DAY_SECONDS
+    assert adaptive_ttl(date(2024, 5, 22), **BOUNDS) == 1 * DAY_SECONDS  # 10 days -> 1 day
+    assert adaptive_ttl(date(2014, 6, 1), **BOUNDS) == 30 * DAY_SECONDS  # A decade: the maximum
+
+
+def test_latest_revision_counts_as_last_change():
+    assert adaptive_ttl(date(2014, 6, 1), revision_date=date(2024, 5, 22), **BOUNDS) == DAY_SECONDS
+    assert adaptive_ttl(None, revision_date=date(2024, 5, 22), **BOUNDS) == DAY_SECONDS
+
+
+def test_no_dates_falls_back_to_flat_ttl():
+    assert adaptive_ttl(None, None, **BOUNDS) == CACHE_TTL_SECONDS
+
+
+@patch("mcp_pdb.utils.cache.CACHE_ENABLED", True)
+def test_structure_cache_uses_adaptive_ttl():
+    provenance = Provenance(source="RCSB PDB", retrieved=datetime.now(timezone.utc), api_url="https://data.rcsb.org/rest/v1/core/entry/4HHB")
+    structure = StructureDataset(pdb_id="4HHB", title="t", method="X-RAY DIFFRACTION", release_date=date(1984, 7, 17),
+                                 revision_date=date(1990, 1, 1), chains=[], ligands=[], provenance=provenance)
+    cache = dataset_builder.cache
+    cache.clear()
+
+    cache.set("4HHB", structure, ttl_seconds=dataset_builder.structure_ttl(structure))
+
+    assert cache.ttl_distribution()["max_seconds"] == adaptive_ttl(date(1984, 7, 17), date(1990, 1, 1))
+    cache.clear()